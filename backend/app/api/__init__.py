@@ -1,6 +1,10 @@
 from fastapi import APIRouter
-from app.api.routes import auth, entities
+from app.api.routes import admin, auth, connections, entities, feed, jobs
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
 api_router.include_router(entities.router)
+api_router.include_router(connections.router)
+api_router.include_router(feed.router)
+api_router.include_router(jobs.router)
+api_router.include_router(admin.router)
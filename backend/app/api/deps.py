@@ -0,0 +1,70 @@
+"""Shared API Dependencies.
+
+This module contains FastAPI dependencies reused across route modules.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.entity import Entity
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+def require_admin(
+    x_admin_token: Optional[str] = Header(None, description="Admin API token"),
+) -> None:
+    """Require a valid ``X-Admin-Token`` header.
+
+    The admin API is disabled entirely (404) unless ``ADMIN_TOKEN`` is set.
+
+    Args:
+        x_admin_token: Token supplied by the caller.
+
+    Raises:
+        HTTPException: 404 if the admin API is disabled, 403 if the token is
+            missing or wrong.
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        logger.warning("Rejected admin API request with invalid token")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token",
+        )
+
+
+def require_entity(db: Session, uid: str) -> None:
+    """Raise 404 unless an entity exists (a primary-key probe).
+
+    Routes call this only when a query on a child table came back empty,
+    to tell "no rows" from "no such entity".
+
+    Args:
+        db: Database session.
+        uid: Entity to look up.
+
+    Raises:
+        HTTPException: 404 if there is no entity ``uid``.
+    """
+    if db.execute(select(Entity.uid).where(Entity.uid == uid)).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entity with uid '{uid}' not found",
+        )
@@ -0,0 +1,190 @@
+"""Admin API Routes.
+
+This module defines operational endpoints for diagnosing performance, such as
+the slow-query report and captured request profiles. All routes require the
+``X-Admin-Token`` header.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.api.deps import require_admin
+from app.core.profiling import get_profile_store
+from app.core.slow_query import get_slow_query_log
+from app.core.timing import TimedRoute
+from app.db.queries import compiled_cache_stats
+from app.db.session import engine
+from app.schemas.admin import (
+    ProfileSummary,
+    SlowQueryEntry,
+    SlowQueryFingerprint,
+    SlowQueryReport,
+    SqlCacheStats,
+)
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Create API router for admin endpoints
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    route_class=TimedRoute,
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.get("/slow-queries", response_model=SlowQueryReport, status_code=status.HTTP_200_OK)
+def slow_queries(
+    limit: int = Query(20, ge=1, le=500, description="Maximum entries per section"),
+) -> SlowQueryReport:
+    """Report slow SQL statements recorded by this worker.
+
+    Args:
+        limit: Maximum number of fingerprints and recent statements returned.
+
+    Returns:
+        SlowQueryReport: Slowest fingerprints by total time (with captured
+        plans) and the most recent slow statements.
+    """
+    log = get_slow_query_log()
+    return SlowQueryReport(
+        threshold_ms=log.threshold_ms,
+        fingerprints=[
+            SlowQueryFingerprint(
+                fingerprint=s.fingerprint,
+                statement=s.normalized,
+                count=s.count,
+                total_ms=round(s.total_ms, 3),
+                mean_ms=round(s.total_ms / s.count, 3) if s.count else 0.0,
+                max_ms=round(s.max_ms, 3),
+                routes=dict(s.routes),
+                explain=s.explain,
+            )
+            for s in log.top(limit)
+        ],
+        recent=[
+            SlowQueryEntry(
+                fingerprint=q.fingerprint,
+                statement=q.statement,
+                parameters=q.parameters,
+                duration_ms=round(q.duration_ms, 3),
+                route=q.route,
+                recorded_at=datetime.fromtimestamp(q.recorded_at, tz=timezone.utc),
+            )
+            for q in log.recent_queries(limit)
+        ],
+    )
+
+
+@router.delete(
+    "/slow-queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+)
+def clear_slow_queries() -> Response:
+    """Clear the slow-query log of this worker.
+
+    Returns:
+        Response: Empty 204 response.
+    """
+    logger.info("Slow-query log cleared via admin API")
+    get_slow_query_log().clear()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/sql-cache", response_model=SqlCacheStats, status_code=status.HTTP_200_OK)
+def sql_cache() -> SqlCacheStats:
+    """Report compiled SQL statement cache statistics for this worker.
+
+    Returns:
+        SqlCacheStats: Hit/miss counts and cache occupancy.
+    """
+    return SqlCacheStats(**compiled_cache_stats(engine))
+
+
+@router.get("/profiles", response_model=List[ProfileSummary], status_code=status.HTTP_200_OK)
+def list_profiles() -> List[ProfileSummary]:
+    """List request profiles captured by the workers of this host, newest first.
+
+    Returns:
+        List[ProfileSummary]: Captured profiles (see ``PROFILING_ENABLED``).
+    """
+    return [
+        ProfileSummary(
+            profile_id=p.profile_id,
+            method=p.method,
+            path=p.path,
+            route=p.route,
+            status=p.status,
+            started_at=datetime.fromtimestamp(p.started_at, tz=timezone.utc),
+            duration_ms=round(p.duration_ms, 3),
+            samples=p.samples,
+        )
+        for p in get_profile_store().list()
+    ]
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Profile not found"}},
+)
+def get_profile(
+    profile_id: str,
+    format: Literal["speedscope", "collapsed"] = Query(
+        "speedscope",
+        description="speedscope JSON, or collapsed stacks for flamegraph.pl/inferno",
+    ),
+) -> Response:
+    """Download a captured profile.
+
+    Args:
+        profile_id: Identifier from the ``X-Profile-Id`` response header.
+        format: Output format.
+
+    Returns:
+        Response: speedscope JSON document or collapsed-stack text.
+
+    Raises:
+        HTTPException: 404 if the profile is unknown or was evicted.
+    """
+    profile = get_profile_store().get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile '{profile_id}' not found",
+        )
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    return JSONResponse(
+        profile.speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'},
+    )
+
+
+@router.delete(
+    "/profiles",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+)
+def clear_profiles() -> Response:
+    """Drop all captured profiles.
+
+    Returns:
+        Response: Empty 204 response.
+    """
+    get_profile_store().clear()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
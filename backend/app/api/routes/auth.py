@@ -10,13 +10,20 @@ License: Apache 2.0
 from __future__ import annotations
 
 import logging
+import math
 import secrets
 from datetime import datetime, timedelta
 from typing import Dict, Any
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
+from app.api.deps import require_admin
+from app.core.config import settings
+from app.core.guest_sessions import get_guest_registry
+from app.core.ratelimit import RateLimitRule, get_rate_limiter
+from app.core.timing import TimedRoute
 from app.schemas.auth import (
     AuthResponse,
     GuestSession,
@@ -29,7 +36,13 @@ from app.schemas.auth import (
 logger = logging.getLogger(__name__)
 
 # Create API router for authentication endpoints
-router = APIRouter(prefix="/auth", tags=["authentication"])
+router = APIRouter(prefix="/auth", tags=["authentication"], route_class=TimedRoute)
+
+# Per-username login throttle (complements the per-IP limits applied by
+# RateLimitMiddleware, which cannot see the username in the request body)
+LOGIN_USER_RULE = RateLimitRule.per_minute(
+    settings.RATE_LIMIT_LOGIN_USER_PER_MINUTE, settings.RATE_LIMIT_LOGIN_USER_BURST
+)
 
 # In-memory user storage (for demo purposes - replace with database in production)
 USERS_DB: Dict[str, Dict[str, Any]] = {
@@ -77,7 +90,8 @@ async def login(credentials: UserLogin) -> AuthResponse:
         AuthResponse: Authentication response with access token
 
     Raises:
-        HTTPException: If credentials are invalid (401)
+        HTTPException: If credentials are invalid (401) or too many attempts
+            were made for this username (429)
 
     Example:
         POST /api/auth/login
@@ -89,6 +103,17 @@ async def login(credentials: UserLogin) -> AuthResponse:
     try:
         logger.info(f"Login attempt for user: {credentials.username}")
 
+        allowed, retry_after = await get_rate_limiter().ahit(
+            f"login-user:{credentials.username.lower()}", LOGIN_USER_RULE
+        )
+        if not allowed:
+            logger.warning(f"Login throttled for user: {credentials.username}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts. Please try again later.",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
         # Check if user exists
         user = USERS_DB.get(credentials.username)
 
@@ -228,8 +253,10 @@ async def guest_login(session: GuestSession) -> AuthResponse:
     try:
         logger.info("Guest login request")
 
-        # Generate unique guest ID
-        guest_id = f"guest-{secrets.token_hex(4)}"
+        # Register a new guest session (bounded, TTL-expiring)
+        registry = get_guest_registry()
+        record = await run_in_threadpool(registry.create) if registry.blocking else registry.create()
+        guest_id = record.guest_id
 
         # Generate access token
         access_token = generate_token()
@@ -254,6 +281,28 @@ async def guest_login(session: GuestSession) -> AuthResponse:
         ) from e
 
 
+@router.get(
+    "/guest/stats",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_admin)],
+    responses={403: {"description": "Invalid admin token"}},
+)
+def guest_stats() -> Dict[str, int]:
+    """Report guest session metrics.
+
+    Covers all workers when sessions are shared through Redis, and only the
+    worker answering otherwise. Requires the ``X-Admin-Token`` header.
+
+    Returns:
+        dict: Live session count, capacity, and created/expired/evicted totals.
+
+    Raises:
+        HTTPException:
+            - 403: Missing or invalid admin token
+    """
+    return get_guest_registry().stats()
+
+
 @router.get("/profile/{user_id}", response_model=UserProfile, status_code=status.HTTP_200_OK)
 async def get_profile(user_id: str) -> UserProfile:
     """Get user profile information.
@@ -265,20 +314,32 @@ async def get_profile(user_id: str) -> UserProfile:
         UserProfile: User profile data
 
     Raises:
-        HTTPException: If user not found (404)
+        HTTPException: If user or guest session not found (404)
     """
     try:
         logger.info(f"Profile request for user: {user_id}")
 
-        # Handle guest users
+        # Handle guest users (only sessions that are still live, when every
+        # worker's sessions are visible; otherwise another worker may own it)
         if user_id.startswith("guest-"):
+            registry = get_guest_registry()
+            if registry.blocking:
+                record = await run_in_threadpool(registry.get, user_id)
+            else:
+                record = registry.get(user_id)
+            if record is None and registry.shared:
+                logger.warning(f"Guest session not found or expired: {user_id}")
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Guest session not found or expired",
+                )
             return UserProfile(
                 id=user_id,
                 name="Guest User",
                 role="Preview Mode",
                 email=None,
                 avatar_url="https://api.dicebear.com/7.x/bottts/svg?seed=Guest",
-                created_at=None,
+                created_at=record.created_at_iso if record is not None else None,
             )
 
         # Get user from database
@@ -0,0 +1,253 @@
+"""API Routes for the Agent Connection Graph.
+
+This module defines FastAPI route handlers for connecting and disconnecting
+entities, listing an entity's connections and suggesting new ones ("people
+you may know").
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api.deps import require_admin, require_entity
+from app.core.config import settings
+from app.core.timing import TimedRoute
+from app.db.graph import get_connection_graph, suggestions_query
+from app.db.session import get_db
+from app.models.connection import Connection
+from app.models.entity import Entity
+from app.schemas.connection import ConnectionItem, ConnectionPage, ConnectionSuggestion
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Create API router for connection endpoints
+router = APIRouter(prefix="/entities", tags=["connections"], route_class=TimedRoute)
+
+
+@router.get(
+    "/{uid}/connections",
+    response_model=ConnectionPage,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Entity not found"}},
+)
+def list_connections(
+    uid: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100, description="Maximum connections to return"),
+    after: Optional[str] = Query(
+        None,
+        description="Keyset cursor: only connections after this uid (from `next_after`)",
+    ),
+) -> ConnectionPage:
+    """List the connections of an entity, ordered by connected uid.
+
+    Keyset pagination on the ``(src, dst)`` primary key: each page is one
+    index range scan, however many connections the entity has.
+
+    Args:
+        uid: Unique identifier of the entity.
+        db: Database session (injected by FastAPI).
+        limit: Page size.
+        after: Cursor returned as ``next_after`` by the previous page.
+
+    Returns:
+        ConnectionPage: Connections and the cursor of the next page.
+
+    Raises:
+        HTTPException:
+            - 404: Entity not found
+
+    Example:
+        GET /api/entities/agent-12345/connections?limit=20&after=agent-20001
+    """
+    stmt = (
+        select(
+            Connection.dst.label("id"),
+            Entity.type,
+            Entity.name,
+            Connection.created_at.label("connected_at"),
+        )
+        .join(Entity, Entity.uid == Connection.dst)
+        .where(Connection.src == uid)
+        .order_by(Connection.dst)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(Connection.dst > after)
+    rows = db.execute(stmt).all()
+    if not rows:
+        require_entity(db, uid)
+    items = [ConnectionItem.model_validate(row._mapping) for row in rows[:limit]]
+    next_after = items[-1].id if len(rows) > limit else None
+    return ConnectionPage(items=items, next_after=next_after)
+
+
+@router.put(
+    "/{uid}/connections/{other}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+    dependencies=[Depends(require_admin)],
+    responses={
+        400: {"description": "Self-connection"},
+        403: {"description": "Invalid admin token"},
+        404: {"description": "Entity not found"},
+    },
+)
+def connect(uid: str, other: str, db: Session = Depends(get_db)) -> Response:
+    """Connect two entities (idempotent).
+
+    Both directions are stored, so either side lists the other. Requires
+    the ``X-Admin-Token`` header.
+
+    Args:
+        uid: Unique identifier of the entity.
+        other: Unique identifier of the entity to connect to.
+        db: Database session (injected by FastAPI).
+
+    Returns:
+        Response: 204 No Content, whether or not the link already existed.
+
+    Raises:
+        HTTPException:
+            - 400: ``uid`` and ``other`` are the same entity
+            - 403: Missing or invalid admin token
+            - 404: Either entity not found
+
+    Example:
+        PUT /api/entities/agent-12345/connections/agent-67890
+    """
+    if uid == other:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An entity cannot connect to itself",
+        )
+    if db.get(Connection, (uid, other)) is not None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    found = set(db.execute(select(Entity.uid).where(Entity.uid.in_([uid, other]))).scalars())
+    for missing in (uid, other):
+        if missing not in found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Entity with uid '{missing}' not found",
+            )
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        Connection(src=uid, dst=other, created_at=now),
+        Connection(src=other, dst=uid, created_at=now),
+    ])
+    try:
+        db.commit()
+    except IntegrityError:
+        # Connected concurrently by another request
+        db.rollback()
+    else:
+        logger.info(f"Connected {uid} <-> {other}")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.delete(
+    "/{uid}/connections/{other}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+    dependencies=[Depends(require_admin)],
+    responses={403: {"description": "Invalid admin token"}},
+)
+def disconnect(uid: str, other: str, db: Session = Depends(get_db)) -> Response:
+    """Remove the connection between two entities (idempotent).
+
+    Requires the ``X-Admin-Token`` header.
+
+    Args:
+        uid: Unique identifier of the entity.
+        other: Unique identifier of the connected entity.
+        db: Database session (injected by FastAPI).
+
+    Returns:
+        Response: 204 No Content, whether or not the entities were connected.
+
+    Raises:
+        HTTPException:
+            - 403: Missing or invalid admin token
+
+    Example:
+        DELETE /api/entities/agent-12345/connections/agent-67890
+    """
+    rows = db.execute(
+        select(Connection).where(
+            tuple_(Connection.src, Connection.dst).in_([(uid, other), (other, uid)])
+        )
+    ).scalars().all()
+    if rows:
+        # Deleted through the ORM so that the connection graph sees the change
+        for row in rows:
+            db.delete(row)
+        db.commit()
+        logger.info(f"Disconnected {uid} <-> {other}")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get(
+    "/{uid}/suggestions",
+    response_model=List[ConnectionSuggestion],
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Entity not found"}},
+)
+def suggest_connections(
+    uid: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(10, ge=1, le=50, description="Maximum suggestions to return"),
+) -> List[ConnectionSuggestion]:
+    """Suggest entities to connect to ("people you may know").
+
+    Candidates are the entities two hops away, ranked by the number of
+    connections they share with ``uid``. The in-process connection graph
+    answers without SQL; if it is disabled or not built yet, the same
+    ranking is computed by a self-join of ``connection``.
+
+    Args:
+        uid: Unique identifier of the entity.
+        db: Database session (injected by FastAPI).
+        limit: Maximum number of suggestions.
+
+    Returns:
+        List[ConnectionSuggestion]: Suggestions, most mutual connections first.
+
+    Raises:
+        HTTPException:
+            - 404: Entity not found
+
+    Example:
+        GET /api/entities/agent-12345/suggestions?limit=5
+    """
+    ranked = None
+    if settings.CONNECTION_GRAPH_ENABLED:
+        ranked = get_connection_graph().suggestions(uid, limit)
+    if ranked is None:
+        ranked = [tuple(row) for row in db.execute(suggestions_query(uid, limit))]
+    if not ranked:
+        require_entity(db, uid)
+        return []
+    mutuals = dict(ranked)
+    rows = db.execute(
+        select(Entity.uid, Entity.type, Entity.name).where(Entity.uid.in_(list(mutuals)))
+    ).all()
+    found = {row.uid: row for row in rows}
+    return [
+        ConnectionSuggestion(id=other, type=found[other].type, name=found[other].name, mutuals=count)
+        for other, count in ranked
+        if other in found
+    ]
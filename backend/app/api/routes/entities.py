@@ -13,21 +13,123 @@ License:
 from __future__ import annotations
 
 import logging
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import String, select
-from sqlalchemy.orm import Session
-
+from typing import Any, Iterator, List, Literal, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.api.deps import require_entity
+from app.core.blobs import BlobNotFoundError, BlobResponse, blob_etag, etag_matches, get_blob_store
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.core.readme import get_readme_renderer
+from app.core.semver import SemVer, parse_range, parse_version
+from app.core.timing import TimedRoute
+from app.db.protocols import get_protocol_matrix_cache
+from app.db.queries import compatible_entities_query, list_entities_query
+from app.db.search_index import get_search_index
 from app.db.session import get_db
-from app.models.entity import Entity
-from app.schemas.entity import EntityRead, EntitySearchItem
+from app.db.snapshot import get_catalog_snapshots
+from app.db.versions import reconstruct
+from app.models.entity import Entity, EntityManifest, EntityVersion
+from app.schemas.entity import (
+    EntityRead,
+    EntitySearchItem,
+    EntityVersionPage,
+    EntityVersionRead,
+    EntityVersionSummary,
+    ProtocolMatrixRead,
+    ProtocolVersionInfo,
+)
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Rows fetched (and written) per batch by the NDJSON export
+EXPORT_BATCH_SIZE = 500
+
+# READMEs never change under a reference, but an entity may point at a new one
+README_CACHE_CONTROL = "public, no-cache"
+
 # Create API router for entity endpoints
-router = APIRouter(prefix="/entities", tags=["entities"])
+router = APIRouter(prefix="/entities", tags=["entities"], route_class=TimedRoute)
+
+
+def _list_rows(
+    db: Session,
+    q: Optional[str],
+    type: Optional[str],
+    protocol: Optional[str],
+    limit: int,
+    offset: int,
+    version_range: Sequence[Tuple[str, SemVer]] = (),
+    sort: str = "quality",
+) -> Sequence[Any]:
+    """Fetch one page of list rows from the fastest available source.
+
+    The in-process search index is tried first, then the shared catalog
+    snapshot, then the pre-built SQL templates. All three return rows with
+    the same attribute names and order. Version filters and version order
+    are answered by SQL only (from the semver index).
+    """
+    if version_range or sort != "quality":
+        stmt, params = list_entities_query(q, type, protocol, limit, offset, version_range, sort)
+        return db.execute(stmt, params).all()
+    if settings.SEARCH_INDEX_ENABLED:
+        rows = get_search_index().list_entities(q, type, protocol, limit, offset)
+        record_cache("search_index", rows is not None)
+        if rows is not None:
+            return rows
+    if settings.CATALOG_SNAPSHOT_ENABLED:
+        snapshot = get_catalog_snapshots().current()
+        record_cache("catalog_snapshot", snapshot is not None)
+        if snapshot is not None:
+            return snapshot.list_entities(q, type, protocol, limit, offset)
+    # Pre-built statement for this filter combination (compiled once)
+    stmt, params = list_entities_query(q, type, protocol, limit, offset)
+    return db.execute(stmt, params).all()
+
+
+def _search_item(row: Any) -> EntitySearchItem:
+    """Convert a list row (``LIST_COLUMNS``) to its API representation."""
+    return EntitySearchItem(
+        id=row.uid,
+        type=row.type,
+        name=row.name,
+        version=row.version,
+        summary=row.summary or "",
+        capabilities=row.capabilities or [],
+        frameworks=row.frameworks or [],
+        providers=row.providers or [],
+        score=float(row.quality_score or 0.0),
+    )
+
+
+def _entity_read(row: Entity) -> EntityRead:
+    """Convert an ``Entity`` to its full API representation."""
+    return EntityRead(
+        id=row.uid,
+        type=row.type,
+        name=row.name,
+        version=row.version,
+        summary=row.summary,
+        description=row.description,
+        capabilities=row.capabilities or [],
+        frameworks=row.frameworks or [],
+        providers=row.providers or [],
+        license=row.license,
+        homepage=row.homepage,
+        source_url=row.source_url,
+        quality_score=float(row.quality_score or 0.0),
+        release_ts=row.release_ts,
+        readme_blob_ref=row.readme_blob_ref,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        protocols=row.protocols or [],
+        manifests=row.manifests or None,
+    )
 
 
 @router.get("", response_model=List[EntitySearchItem], status_code=status.HTTP_200_OK)
@@ -48,6 +150,15 @@ def list_entities(
         description="Filter by protocol tag (e.g., a2a@1.0, mcp@0.1)",
         max_length=50,
     ),
+    version: Optional[str] = Query(
+        None,
+        description="Semantic version range, comma-separated comparators (e.g., >=2.0,<3)",
+        max_length=100,
+    ),
+    sort: Literal["quality", "version"] = Query(
+        "quality",
+        description="quality: ranking (default) | version: newest semantic version first",
+    ),
     limit: int = Query(
         20,
         ge=1,
@@ -64,13 +175,16 @@ def list_entities(
 
     This endpoint provides a searchable, filterable list of entities (agents,
     tools, MCP servers) from the MatrixHub catalog. Results are ranked by
-    quality score and creation date.
+    quality score and creation date, or by semantic version.
 
     Args:
         db: Database session (injected by FastAPI).
         q: Optional search query string for name/summary.
         type: Optional filter for entity type.
         protocol: Optional filter for protocol support.
+        version: Optional semantic version range (SemVer precedence;
+            versions that are not SemVer-like never match).
+        sort: Result order.
         limit: Maximum number of results (1-100).
         offset: Pagination offset.
 
@@ -83,60 +197,26 @@ def list_entities(
     Example:
         GET /api/entities?q=data&type=agent&limit=10
         Returns up to 10 agents matching "data" in name or summary.
+
+        GET /api/entities?version=>=2.0,<3&sort=version
+        Returns 2.x entities, newest version first.
     """
+    try:
+        version_range = parse_range(version) if version else []
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)) from e
+
     try:
         logger.info(
             f"Listing entities: q={q}, type={type}, protocol={protocol}, "
-            f"limit={limit}, offset={offset}"
+            f"version={version}, sort={sort}, limit={limit}, offset={offset}"
         )
 
-        # Build base query
-        stmt = select(Entity)
-
-        # Apply filters
-        if type:
-            stmt = stmt.where(Entity.type == type)
-            logger.debug(f"Filtered by type: {type}")
-
-        if q:
-            pattern = f"%{q}%"
-            stmt = stmt.where(
-                (Entity.name.ilike(pattern)) | (Entity.summary.ilike(pattern))
-            )
-            logger.debug(f"Filtered by search query: {q}")
-
-        if protocol:
-            # Naive JSON string match; production can use GIN index
-            pattern = f"%{protocol}%"
-            stmt = stmt.where(Entity.protocols.cast(String).ilike(pattern))
-            logger.debug(f"Filtered by protocol: {protocol}")
-
-        # Order by quality score (desc) and creation date (desc)
-        stmt = (
-            stmt.order_by(Entity.quality_score.desc(), Entity.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-        )
-
-        # Execute query
-        rows = db.execute(stmt).scalars().all()
+        rows = _list_rows(db, q, type, protocol, limit, offset, version_range, sort)
         logger.info(f"Found {len(rows)} entities")
 
         # Convert to response schema
-        return [
-            EntitySearchItem(
-                id=row.uid,
-                type=row.type,
-                name=row.name,
-                version=row.version,
-                summary=row.summary or "",
-                capabilities=row.capabilities or [],
-                frameworks=row.frameworks or [],
-                providers=row.providers or [],
-                score=float(row.quality_score or 0.0),
-            )
-            for row in rows
-        ]
+        return [_search_item(row) for row in rows]
 
     except Exception as e:
         logger.error(f"Error listing entities: {e}", exc_info=True)
@@ -146,6 +226,184 @@ def list_entities(
         ) from e
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def export_entities(
+    db: Session = Depends(get_db),
+    type: Optional[str] = Query(
+        None,
+        description="Filter by entity type: agent | tool | mcp_server",
+    ),
+) -> StreamingResponse:
+    """Stream the full catalog as newline-delimited JSON.
+
+    One ``EntityRead`` object per line, in list order. Rows are fetched in
+    batches of ``EXPORT_BATCH_SIZE`` and written as they are read, so memory
+    use does not grow with the catalog; compression (if negotiated) is
+    applied per batch.
+
+    Args:
+        db: Database session (injected by FastAPI); only its engine is used,
+            since the stream outlives the request-scoped session.
+        type: Optional filter for entity type.
+
+    Returns:
+        StreamingResponse: ``application/x-ndjson`` body.
+
+    Example:
+        GET /api/entities/export?type=agent
+        Streams every agent, one JSON object per line.
+    """
+    bind = db.get_bind()
+    stmt = (
+        select(Entity)
+        .options(selectinload(Entity.manifest_rows))
+        .order_by(Entity.quality_score.desc(), Entity.created_at.desc())
+    )
+    if type:
+        stmt = stmt.where(Entity.type == type)
+    logger.info(f"Exporting entities: type={type}")
+
+    def lines() -> Iterator[bytes]:
+        with Session(bind) as session:
+            result = session.scalars(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            for batch in result.partitions():
+                yield b"".join(
+                    _entity_read(entity).model_dump_json().encode() + b"\n" for entity in batch
+                )
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="entities.ndjson"'},
+    )
+
+
+@router.get(
+    "/compatible",
+    response_model=List[EntitySearchItem],
+    status_code=status.HTTP_200_OK,
+    responses={422: {"description": "Invalid version bound"}},
+)
+def list_compatible_entities(
+    db: Session = Depends(get_db),
+    protocol: str = Query(
+        ...,
+        description="Protocol family, e.g. mcp or a2a",
+        min_length=1,
+        max_length=50,
+    ),
+    minimum: Optional[str] = Query(
+        None,
+        alias="min",
+        description="Lowest acceptable protocol version (inclusive), e.g. 0.1",
+        max_length=50,
+    ),
+    maximum: Optional[str] = Query(
+        None,
+        alias="max",
+        description="Upper protocol version bound (exclusive), e.g. 1.0",
+        max_length=50,
+    ),
+    type: Optional[str] = Query(
+        None,
+        description="Filter by entity type: agent | tool | mcp_server",
+    ),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results to return"),
+    offset: int = Query(0, ge=0, description="Number of results to skip (for pagination)"),
+) -> List[EntitySearchItem]:
+    """List entities speaking a protocol within a version range.
+
+    Protocol tags are stored parsed in ``entity_protocol``, so the range is
+    resolved by an index range scan rather than a substring match. Results
+    are ranked like ``GET /entities``.
+
+    Args:
+        db: Database session (injected by FastAPI).
+        protocol: Protocol family.
+        minimum: Inclusive lower version bound (``min``).
+        maximum: Exclusive upper version bound (``max``).
+        type: Optional filter for entity type.
+        limit: Maximum number of results (1-100).
+        offset: Pagination offset.
+
+    Returns:
+        List[EntitySearchItem]: Matching entities with basic info.
+
+    Raises:
+        HTTPException:
+            - 422: A version bound is not a valid version
+
+    Example:
+        GET /api/entities/compatible?protocol=mcp&min=0.1
+        Returns entities speaking MCP 0.1 or later.
+    """
+    family = protocol.strip().lower()
+    bounds = []
+    for name, value in (("min", minimum), ("max", maximum)):
+        parsed = parse_version(value) if value else None
+        if value and parsed is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Invalid {name} version: {value!r}",
+            )
+        bounds.append(parsed)
+    low, high = bounds
+
+    # The empty answer comes from the index as cheaply as from the matrix,
+    # and unlike the cached matrix it is never stale
+    stmt, params = compatible_entities_query(family, low, high, type, limit, offset)
+    return [_search_item(row) for row in db.execute(stmt, params)]
+
+
+@router.get(
+    "/compatible/matrix",
+    response_model=ProtocolMatrixRead,
+    status_code=status.HTTP_200_OK,
+)
+def get_compatibility_matrix(
+    db: Session = Depends(get_db),
+    protocol: str = Query(
+        ...,
+        description="Protocol family, e.g. mcp or a2a",
+        min_length=1,
+        max_length=50,
+    ),
+) -> ProtocolMatrixRead:
+    """Get the compatibility matrix of a protocol family.
+
+    Lists every version of the family spoken in the catalog, the number of
+    entities speaking it, and the spoken versions that satisfy it under the
+    caret rule. Served from a per-family cache.
+
+    Args:
+        db: Database session (injected by FastAPI).
+        protocol: Protocol family.
+
+    Returns:
+        ProtocolMatrixRead: Versions, oldest first.
+
+    Example:
+        GET /api/entities/compatible/matrix?protocol=a2a
+    """
+    matrix = get_protocol_matrix_cache().get(db, protocol.strip().lower())
+    return ProtocolMatrixRead(
+        protocol=matrix.protocol,
+        versions=[
+            ProtocolVersionInfo(
+                version=v.version,
+                entities=v.entities,
+                compatible=matrix.compatible[v.version],
+            )
+            for v in matrix.versions
+        ],
+    )
+
+
 @router.get(
     "/{uid}",
     response_model=EntityRead,
@@ -163,7 +421,9 @@ def get_entity(
 
     This endpoint retrieves the full profile of an entity, including all metadata,
     protocols, manifests, and capability information. It's designed for the
-    LinkedIn-style entity detail page.
+    LinkedIn-style entity detail page. Manifests live in ``entity_manifest``
+    and are loaded with a second query; clients needing one protocol should
+    use ``GET /api/entities/{uid}/manifests/{protocol}``.
 
     Args:
         uid: Unique identifier of the entity to retrieve.
@@ -197,27 +457,7 @@ def get_entity(
         logger.info(f"Entity found: {uid} (type={row.type}, name={row.name})")
 
         # Convert to response schema
-        return EntityRead(
-            id=row.uid,
-            type=row.type,
-            name=row.name,
-            version=row.version,
-            summary=row.summary,
-            description=row.description,
-            capabilities=row.capabilities or [],
-            frameworks=row.frameworks or [],
-            providers=row.providers or [],
-            license=row.license,
-            homepage=row.homepage,
-            source_url=row.source_url,
-            quality_score=float(row.quality_score or 0.0),
-            release_ts=row.release_ts,
-            readme_blob_ref=row.readme_blob_ref,
-            created_at=row.created_at,
-            updated_at=row.updated_at,
-            protocols=row.protocols or [],
-            manifests=row.manifests or None,
-        )
+        return _entity_read(row)
 
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -228,3 +468,248 @@ def get_entity(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve entity. Please try again later.",
         ) from e
+
+
+@router.get(
+    "/{uid}/readme",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"content": {"text/markdown": {}, "text/html": {}}},
+        206: {"description": "Partial content (Range request)"},
+        304: {"description": "Not modified"},
+        404: {"description": "Entity or README not found"},
+    },
+)
+def get_entity_readme(
+    uid: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    format: Literal["markdown", "html"] = Query(
+        "markdown",
+        description="Raw Markdown or rendered HTML",
+    ),
+) -> Response:
+    """Get the README of an entity.
+
+    Only the blob reference is read from the database; the content comes
+    from the blob store. The ETag is the content digest, so revalidation
+    (``If-None-Match``) costs one indexed lookup. Markdown is streamed from
+    disk and supports ``Range``/``If-Range``; HTML is rendered once per
+    README and served from a bounded in-memory cache.
+
+    Args:
+        uid: Unique identifier of the entity.
+        request: Incoming request (conditional headers).
+        db: Database session (injected by FastAPI).
+        format: ``markdown`` (default) or ``html``.
+
+    Returns:
+        Response: README content, 206 partial content or 304 Not Modified.
+
+    Raises:
+        HTTPException:
+            - 404: Entity not found or it has no README
+
+    Example:
+        GET /api/entities/agent-12345/readme?format=html
+    """
+    found = db.execute(select(Entity.readme_blob_ref).where(Entity.uid == uid)).first()
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entity with uid '{uid}' not found",
+        )
+    ref = found[0]
+    store = get_blob_store()
+    try:
+        stored = ref is not None and store.exists(ref)
+    except ValueError:
+        stored = False
+    if not stored:
+        if ref is not None:
+            logger.error(f"README blob missing or invalid for {uid}: {ref!r}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entity with uid '{uid}' has no README",
+        )
+
+    etag = blob_etag(ref, "html" if format == "html" else "")
+    headers = {"ETag": etag, "Cache-Control": README_CACHE_CONTROL}
+    if etag_matches(etag, request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if format == "markdown":
+        return BlobResponse(
+            store.path(ref),
+            etag=etag,
+            media_type="text/markdown; charset=utf-8",
+            headers={"Cache-Control": README_CACHE_CONTROL},
+        )
+    try:
+        html = get_readme_renderer().html(ref)
+    except BlobNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entity with uid '{uid}' has no README",
+        ) from None
+    return Response(html, media_type="text/html; charset=utf-8", headers=headers)
+
+
+@router.get(
+    "/{uid}/manifests/{protocol}",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"content": {"application/json": {}}},
+        304: {"description": "Not modified"},
+        404: {"description": "Entity or manifest not found"},
+    },
+)
+def get_entity_manifest(
+    uid: str,
+    protocol: str,
+    request: Request,
+    db: Session = Depends(get_db),
+) -> Response:
+    """Get the manifest of one protocol of an entity.
+
+    A primary-key lookup on ``entity_manifest``; the entity row itself is
+    not read. The manifest's content hash is the ETag, so clients can
+    revalidate with ``If-None-Match``.
+
+    Args:
+        uid: Unique identifier of the entity.
+        protocol: Protocol key of the manifest (e.g., "mcp@0.1").
+        request: Incoming request (conditional headers).
+        db: Database session (injected by FastAPI).
+
+    Returns:
+        Response: Manifest document, or 304 Not Modified.
+
+    Raises:
+        HTTPException:
+            - 404: No such entity or no manifest for the protocol
+
+    Example:
+        GET /api/entities/mcp_server-12345/manifests/mcp@0.1
+    """
+    found = db.execute(
+        select(EntityManifest.body, EntityManifest.hash).where(
+            EntityManifest.uid == uid, EntityManifest.protocol == protocol
+        )
+    ).first()
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No '{protocol}' manifest for entity '{uid}'",
+        )
+    etag = f'"{found.hash}"'
+    if etag_matches(etag, request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return JSONResponse(found.body, headers={"ETag": etag})
+
+
+@router.get(
+    "/{uid}/versions",
+    response_model=EntityVersionPage,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Entity not found"}},
+)
+def list_entity_versions(
+    uid: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100, description="Maximum releases to return"),
+    before: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Keyset cursor: only releases older than this seq (from `next_before`)",
+    ),
+) -> EntityVersionPage:
+    """List the releases of an entity, newest first.
+
+    Keyset pagination on the ``(uid, seq)`` primary key: each page is one
+    index range scan, however deep the history, unlike ``OFFSET``.
+
+    Args:
+        uid: Unique identifier of the entity.
+        db: Database session (injected by FastAPI).
+        limit: Page size.
+        before: Cursor returned as ``next_before`` by the previous page.
+
+    Returns:
+        EntityVersionPage: Releases and the cursor of the next page.
+
+    Raises:
+        HTTPException:
+            - 404: Entity not found
+
+    Example:
+        GET /api/entities/agent-12345/versions?limit=20&before=41
+    """
+    stmt = (
+        select(
+            EntityVersion.seq,
+            EntityVersion.version,
+            EntityVersion.release_ts,
+            EntityVersion.created_at,
+        )
+        .where(EntityVersion.uid == uid)
+        .order_by(EntityVersion.seq.desc())
+        .limit(limit + 1)
+    )
+    if before is not None:
+        stmt = stmt.where(EntityVersion.seq < before)
+    rows = db.execute(stmt).all()
+    if not rows:
+        require_entity(db, uid)
+    items = [EntityVersionSummary.model_validate(row._mapping) for row in rows[:limit]]
+    next_before = items[-1].seq if len(rows) > limit else None
+    return EntityVersionPage(items=items, next_before=next_before)
+
+
+@router.get(
+    "/{uid}/versions/{version}",
+    response_model=EntityVersionRead,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Entity or version not found"}},
+)
+def get_entity_version(
+    uid: str,
+    version: str,
+    db: Session = Depends(get_db),
+) -> EntityVersionRead:
+    """Get the state of an entity at one release.
+
+    The release is rebuilt from the nearest preceding snapshot and the
+    deltas after it. If a version string was released more than once, the
+    latest release wins.
+
+    Args:
+        uid: Unique identifier of the entity.
+        version: Version string of the release.
+        db: Database session (injected by FastAPI).
+
+    Returns:
+        EntityVersionRead: Entity fields as of the release.
+
+    Raises:
+        HTTPException:
+            - 404: Entity or version not found
+
+    Example:
+        GET /api/entities/agent-12345/versions/1.2.0
+    """
+    seq = db.execute(
+        select(func.max(EntityVersion.seq)).where(
+            EntityVersion.uid == uid, EntityVersion.version == version
+        )
+    ).scalar()
+    found = reconstruct(db, uid, seq) if seq is not None else None
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entity '{uid}' has no version '{version}'",
+        )
+    row, document = found
+    # Unset fields fall back to the schema defaults (e.g. empty lists)
+    fields = {key: value for key, value in document.items() if value is not None}
+    return EntityVersionRead(**fields, seq=row.seq, created_at=row.created_at)
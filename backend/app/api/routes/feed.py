@@ -0,0 +1,173 @@
+"""API Routes for the Activity Feed.
+
+This module defines FastAPI route handlers for writing posts, listing an
+entity's own posts and reading its timeline (the dashboard feed).
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import require_admin, require_entity
+from app.core.config import settings
+from app.core.timing import TimedRoute
+from app.db.feed import author_posts, get_timeline_cache, publish, timeline_page
+from app.db.session import get_db
+from app.models.entity import Entity
+from app.schemas.feed import FeedItem, FeedPage, PostCreate
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Create API router for feed endpoints
+router = APIRouter(prefix="/entities", tags=["feed"], route_class=TimedRoute)
+
+
+@router.post(
+    "/{uid}/posts",
+    response_model=FeedItem,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
+    responses={403: {"description": "Invalid admin token"}, 404: {"description": "Entity not found"}},
+)
+def create_post(uid: str, payload: PostCreate, db: Session = Depends(get_db)) -> FeedItem:
+    """Write a post as an entity.
+
+    The post is pushed to the timelines of the author and its connections
+    in the same transaction, unless the author has more than
+    ``FEED_FANOUT_MAX_FOLLOWERS`` connections, in which case readers pull it.
+    Requires the ``X-Admin-Token`` header.
+
+    Args:
+        uid: Unique identifier of the author.
+        payload: Post content.
+        db: Database session (injected by FastAPI).
+
+    Returns:
+        FeedItem: The new post.
+
+    Raises:
+        HTTPException:
+            - 403: Missing or invalid admin token
+            - 404: Entity not found
+
+    Example:
+        POST /api/entities/agent-12345/posts
+        {"content": "Shipped v2 of the planner"}
+    """
+    author = db.get(Entity, uid)
+    if author is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entity with uid '{uid}' not found",
+        )
+    post, owners = publish(db, uid, payload.content, settings.FEED_FANOUT_MAX_FOLLOWERS)
+    db.commit()
+    get_timeline_cache().invalidate(owners)
+    return FeedItem(
+        id=post.id,
+        author=uid,
+        author_name=author.name,
+        author_type=author.type,
+        content=post.content,
+        likes=post.likes,
+        comments=post.comments,
+        created_at=post.created_at,
+    )
+
+
+@router.get(
+    "/{uid}/posts",
+    response_model=FeedPage,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Entity not found"}},
+)
+def list_posts(
+    uid: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100, description="Maximum posts to return"),
+    before: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Keyset cursor: only posts older than this id (from `next_before`)",
+    ),
+) -> FeedPage:
+    """List the posts written by an entity, newest first.
+
+    Args:
+        uid: Unique identifier of the author.
+        db: Database session (injected by FastAPI).
+        limit: Page size.
+        before: Cursor returned as ``next_before`` by the previous page.
+
+    Returns:
+        FeedPage: Posts and the cursor of the next page.
+
+    Raises:
+        HTTPException:
+            - 404: Entity not found
+
+    Example:
+        GET /api/entities/agent-12345/posts?limit=20
+    """
+    rows, next_before = author_posts(db, uid, limit, before)
+    if not rows:
+        require_entity(db, uid)
+    return FeedPage(items=[FeedItem.model_validate(row._mapping) for row in rows], next_before=next_before)
+
+
+@router.get(
+    "/{uid}/feed",
+    response_model=FeedPage,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Entity not found"}},
+)
+def read_feed(
+    uid: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100, description="Maximum posts to return"),
+    before: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Keyset cursor: only posts older than this id (from `next_before`)",
+    ),
+) -> FeedPage:
+    """Read an entity's timeline: its own posts and its connections', newest first.
+
+    The first page is usually served from the per-worker timeline cache;
+    other pages are index range scans of the materialized timeline, merged
+    with pulled posts of large authors (see ``app.db.feed``).
+
+    Args:
+        uid: Unique identifier of the entity.
+        db: Database session (injected by FastAPI).
+        limit: Page size.
+        before: Cursor returned as ``next_before`` by the previous page.
+
+    Returns:
+        FeedPage: Posts and the cursor of the next page.
+
+    Raises:
+        HTTPException:
+            - 404: Entity not found
+
+    Example:
+        GET /api/entities/agent-12345/feed?limit=20&before=90817
+    """
+    if before is None:
+        rows, next_before = get_timeline_cache().get(db, uid, limit)
+    else:
+        rows, next_before = timeline_page(db, uid, limit, before)
+    if not rows:
+        require_entity(db, uid)
+    return FeedPage(items=[FeedItem.model_validate(row._mapping) for row in rows], next_before=next_before)
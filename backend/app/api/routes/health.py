@@ -0,0 +1,75 @@
+"""Health Check Routes.
+
+This module defines the liveness and readiness endpoints used by container
+orchestrators and load balancers:
+
+- ``GET /health/live``: the process is up and serving requests (no I/O).
+- ``GET /health/ready``: the worker can serve traffic (not shutting down,
+  database reachable, pool not saturated, schema at the migration head).
+  Results are cached for ``HEALTH_CACHE_SECONDS``.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.health import ReadinessProbe, get_readiness_probe
+from app.core.lifespan import Lifecycle, get_lifecycle
+from app.core.timing import TimedRoute
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Create router for health endpoints (mounted at the application root)
+router = APIRouter(prefix="/health", tags=["meta"], route_class=TimedRoute)
+
+
+@router.get("/live", status_code=status.HTTP_200_OK)
+async def live() -> Dict[str, str]:
+    """Liveness probe.
+
+    Returns:
+        dict: Static status; answering at all proves the event loop is alive.
+    """
+    return {"status": "ok", "app": settings.APP_NAME}
+
+
+@router.get(
+    "/ready",
+    status_code=status.HTTP_200_OK,
+    responses={503: {"description": "Worker is not ready to serve traffic"}},
+)
+def ready(
+    probe: ReadinessProbe = Depends(get_readiness_probe),
+    lifecycle: Lifecycle = Depends(get_lifecycle),
+) -> JSONResponse:
+    """Readiness probe with cached database, pool and migration checks.
+
+    Args:
+        probe: Readiness probe (injected by FastAPI).
+        lifecycle: Worker lifecycle state (injected by FastAPI).
+
+    Returns:
+        JSONResponse: 200 with check details when ready, 503 otherwise
+        (including while the worker drains for shutdown).
+    """
+    is_ready, checks = probe.check()
+    if lifecycle.draining:
+        is_ready = False
+        checks = {**checks, "lifecycle": {"status": "fail", "reason": "shutting down"}}
+    body: Dict[str, Any] = {"status": "ok" if is_ready else "unavailable", "checks": checks}
+    return JSONResponse(
+        content=body,
+        status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
@@ -0,0 +1,279 @@
+"""API Routes for the Jobs Marketplace.
+
+This module defines FastAPI route handlers for posting, listing and
+updating jobs, and for matching open jobs to entities and entities to jobs.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import require_admin
+from app.core.timing import TimedRoute
+from app.db.jobs import get_match_index, match_tags
+from app.db.session import get_db
+from app.models.entity import Entity
+from app.models.job import Job
+from app.schemas.job import JobCandidate, JobCreate, JobMatch, JobPage, JobRead, JobUpdate
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Create API router for job endpoints
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=TimedRoute)
+
+
+def _get_job(db: Session, job_id: int) -> Job:
+    job = db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+    return job
+
+
+@router.get("", response_model=JobPage, status_code=status.HTTP_200_OK)
+def list_jobs(
+    db: Session = Depends(get_db),
+    job_status: Literal["open", "closed"] = Query("open", alias="status", description="Job status"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum jobs to return"),
+    before: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Keyset cursor: only jobs older than this id (from `next_before`)",
+    ),
+) -> JobPage:
+    """List jobs, newest first.
+
+    Keyset pagination on ``ix_job_status_id``.
+
+    Args:
+        db: Database session (injected by FastAPI).
+        job_status: Jobs to list ("open" or "closed").
+        limit: Page size.
+        before: Cursor returned as ``next_before`` by the previous page.
+
+    Returns:
+        JobPage: Jobs and the cursor of the next page.
+
+    Example:
+        GET /api/jobs?limit=20&before=1042
+    """
+    stmt = select(Job).where(Job.status == job_status).order_by(Job.id.desc()).limit(limit + 1)
+    if before is not None:
+        stmt = stmt.where(Job.id < before)
+    jobs = db.execute(stmt).scalars().all()
+    items = [JobRead.model_validate(job) for job in jobs[:limit]]
+    next_before = items[-1].id if len(jobs) > limit else None
+    return JobPage(items=items, next_before=next_before)
+
+
+@router.post(
+    "",
+    response_model=JobRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_admin)],
+    responses={403: {"description": "Invalid admin token"}},
+)
+def create_job(payload: JobCreate, db: Session = Depends(get_db)) -> JobRead:
+    """Post a job. Requires the ``X-Admin-Token`` header.
+
+    Args:
+        payload: Job fields.
+        db: Database session (injected by FastAPI).
+
+    Returns:
+        JobRead: The new (open) job.
+
+    Raises:
+        HTTPException:
+            - 403: Missing or invalid admin token
+
+    Example:
+        POST /api/jobs
+        {"title": "Log File Analysis", "company": "ServerCorps",
+         "capabilities": ["log-analysis"], "protocols": ["mcp@0.1"]}
+    """
+    now = datetime.now(timezone.utc)
+    job = Job(**payload.model_dump(), status="open", created_at=now, updated_at=now)
+    db.add(job)
+    db.commit()
+    get_match_index().put_job(job)
+    logger.info(f"Posted job {job.id}: {job.title}")
+    return JobRead.model_validate(job)
+
+
+@router.get(
+    "/match",
+    response_model=List[JobMatch],
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Entity not found"}},
+)
+def match_jobs(
+    entity: str = Query(..., description="Entity uid to match open jobs against"),
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100, description="Maximum jobs to return"),
+    min_score: float = Query(0.0, ge=0.0, le=1.0, description="Lowest share of requirements met"),
+) -> List[JobMatch]:
+    """Find the open jobs an entity is best suited for.
+
+    Jobs are scored by the share of their required capabilities and
+    protocol families the entity has, using the in-memory posting lists
+    of ``app.db.jobs``; only the jobs on the page are then read.
+
+    Args:
+        entity: Unique identifier of the entity.
+        db: Database session (injected by FastAPI).
+        limit: Maximum number of jobs.
+        min_score: Lowest score returned.
+
+    Returns:
+        List[JobMatch]: Jobs, best match first.
+
+    Raises:
+        HTTPException:
+            - 404: Entity not found
+
+    Example:
+        GET /api/jobs/match?entity=agent-12345&min_score=0.5
+    """
+    found = db.execute(
+        select(Entity.capabilities, Entity.protocols).where(Entity.uid == entity)
+    ).first()
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entity with uid '{entity}' not found",
+        )
+    matches = get_match_index().jobs_for(db, match_tags(found.capabilities, found.protocols), limit, min_score)
+    if not matches:
+        return []
+    jobs = {job.id: job for job in db.execute(select(Job).where(Job.id.in_([m.key for m in matches]))).scalars()}
+    return [
+        JobMatch(job=JobRead.model_validate(jobs[m.key]), score=m.score, matched=m.matched)
+        for m in matches
+        if m.key in jobs
+    ]
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobRead,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Job not found"}},
+)
+def get_job(job_id: int, db: Session = Depends(get_db)) -> JobRead:
+    """Get a job by id.
+
+    Args:
+        job_id: Job id.
+        db: Database session (injected by FastAPI).
+
+    Returns:
+        JobRead: The job.
+
+    Raises:
+        HTTPException:
+            - 404: Job not found
+    """
+    return JobRead.model_validate(_get_job(db, job_id))
+
+
+@router.patch(
+    "/{job_id}",
+    response_model=JobRead,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_admin)],
+    responses={403: {"description": "Invalid admin token"}, 404: {"description": "Job not found"}},
+)
+def update_job(job_id: int, payload: JobUpdate, db: Session = Depends(get_db)) -> JobRead:
+    """Update a job, e.g. change its requirements or close it.
+
+    Requires the ``X-Admin-Token`` header.
+
+    Args:
+        job_id: Job id.
+        payload: Fields to change.
+        db: Database session (injected by FastAPI).
+
+    Returns:
+        JobRead: The updated job.
+
+    Raises:
+        HTTPException:
+            - 403: Missing or invalid admin token
+            - 404: Job not found
+
+    Example:
+        PATCH /api/jobs/1042
+        {"status": "closed"}
+    """
+    job = _get_job(db, job_id)
+    for field, value in payload.model_dump(exclude_unset=True).items():
+        setattr(job, field, value)
+    job.updated_at = datetime.now(timezone.utc)
+    db.commit()
+    get_match_index().put_job(job)
+    return JobRead.model_validate(job)
+
+
+@router.get(
+    "/{job_id}/candidates",
+    response_model=List[JobCandidate],
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Job not found"}},
+)
+def job_candidates(
+    job_id: int,
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100, description="Maximum entities to return"),
+    min_score: float = Query(0.0, ge=0.0, le=1.0, description="Lowest share of requirements met"),
+) -> List[JobCandidate]:
+    """Find the entities best suited for a job.
+
+    Entities are scored by the share of the job's requirements they meet
+    (ties broken by quality score), using the in-memory posting lists of
+    ``app.db.jobs``.
+
+    Args:
+        job_id: Job id.
+        db: Database session (injected by FastAPI).
+        limit: Maximum number of entities.
+        min_score: Lowest score returned.
+
+    Returns:
+        List[JobCandidate]: Entities, best match first.
+
+    Raises:
+        HTTPException:
+            - 404: Job not found
+
+    Example:
+        GET /api/jobs/1042/candidates?limit=10
+    """
+    job = _get_job(db, job_id)
+    matches = get_match_index().entities_for(db, match_tags(job.capabilities, job.protocols), limit, min_score)
+    if not matches:
+        return []
+    rows = db.execute(
+        select(Entity.uid, Entity.type, Entity.name).where(Entity.uid.in_([m.key for m in matches]))
+    ).all()
+    found = {row.uid: row for row in rows}
+    return [
+        JobCandidate(id=m.key, type=found[m.key].type, name=found[m.key].name, score=m.score, matched=m.matched)
+        for m in matches
+        if m.key in found
+    ]
@@ -0,0 +1,205 @@
+"""Content-Addressed Blob Storage.
+
+Large, rarely read content (entity READMEs) is kept out of the ``entity``
+table: rows store only a reference such as ``sha256:<hex>`` in
+``readme_blob_ref``, and the bytes live in a blob store on local disk laid
+out like an object store (``<root>/ab/cd/<hex>``).
+
+Because a reference is the digest of the content, blobs are immutable,
+identical uploads are stored once, and the digest doubles as a strong ETag.
+Writes go to a temporary file first and are renamed into place, so readers
+never see a partial blob.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Iterable, Mapping, Optional
+
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Reference format stored in Entity.readme_blob_ref
+BLOB_REF = re.compile(r"^sha256:([0-9a-f]{64})$")
+
+# Bytes read at a time when hashing or copying streams
+CHUNK_SIZE = 64 * 1024
+
+
+class BlobNotFoundError(LookupError):
+    """Raised when a referenced blob is not in the store."""
+
+
+class BlobStore:
+    """Content-addressed blob store on a local directory.
+
+    Args:
+        root: Directory holding the blobs (created on first write).
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    @staticmethod
+    def digest(ref: str) -> str:
+        """Return the hex digest of a reference.
+
+        Raises:
+            ValueError: If ``ref`` is not a ``sha256:<hex>`` reference.
+        """
+        match = BLOB_REF.match(ref)
+        if match is None:
+            raise ValueError(f"Invalid blob reference: {ref!r}")
+        return match.group(1)
+
+    def path(self, ref: str) -> Path:
+        """Return the file that holds (or would hold) a blob."""
+        digest = self.digest(ref)
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` (once) and return its reference."""
+        ref = f"sha256:{hashlib.sha256(data).hexdigest()}"
+        path = self.path(ref)
+        if path.exists():
+            return ref
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return ref
+
+    def put_stream(self, source: BinaryIO) -> str:
+        """Store the content of a binary stream without loading it in memory."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := source.read(CHUNK_SIZE):
+                    hasher.update(chunk)
+                    out.write(chunk)
+            ref = f"sha256:{hasher.hexdigest()}"
+            path = self.path(ref)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return ref
+
+    def stat(self, ref: str) -> os.stat_result:
+        """Return file metadata of a blob.
+
+        Raises:
+            BlobNotFoundError: If the blob is missing.
+        """
+        try:
+            return self.path(ref).stat()
+        except FileNotFoundError as e:
+            raise BlobNotFoundError(ref) from e
+
+    def read(self, ref: str) -> bytes:
+        """Return the content of a blob.
+
+        Raises:
+            BlobNotFoundError: If the blob is missing.
+        """
+        try:
+            return self.path(ref).read_bytes()
+        except FileNotFoundError as e:
+            raise BlobNotFoundError(ref) from e
+
+    def exists(self, ref: str) -> bool:
+        """Whether a blob is stored."""
+        return self.path(ref).is_file()
+
+
+def blob_etag(ref: str, variant: str = "") -> str:
+    """Return the strong ETag of a blob (or of a derived representation).
+
+    Args:
+        ref: Blob reference.
+        variant: Suffix distinguishing derived representations, e.g. ``html``.
+    """
+    digest = BlobStore.digest(ref)
+    return f'"{digest}.{variant}"' if variant else f'"{digest}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Evaluate ``If-None-Match`` against an ETag (weak comparison).
+
+    Weak comparison is required here, and also lets the weakened tags set by
+    the compression middleware revalidate.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class BlobResponse(FileResponse):
+    """File response for a blob, validated by its digest.
+
+    Starlette's ``FileResponse`` streams the file and serves single and
+    multipart ``Range`` requests, but evaluates ``If-Range`` against its own
+    mtime-based ETag. Here the ETag is the content digest, so an ``If-Range``
+    carrying it is known to match and is dropped before delegating, and the
+    range is honoured.
+
+    Args:
+        path: File of the blob.
+        etag: Strong ETag of the blob.
+        media_type: Content type of the blob.
+        headers: Extra response headers.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        etag: str,
+        media_type: str,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        super().__init__(path, media_type=media_type, headers={**(headers or {}), "etag": etag})
+        self.etag = etag
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        raw: Iterable = scope.get("headers", [])
+        if any(k == b"if-range" and v.decode("latin-1").strip() == self.etag for k, v in raw):
+            scope = {**scope, "headers": [(k, v) for k, v in raw if k != b"if-range"]}
+        await super().__call__(scope, receive, send)
+
+
+@lru_cache(maxsize=1)
+def get_blob_store() -> BlobStore:
+    """Get the process-wide blob store.
+
+    Returns:
+        BlobStore: Store rooted at ``BLOB_STORE_DIR``.
+    """
+    return BlobStore(settings.BLOB_STORE_DIR)
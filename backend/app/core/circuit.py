@@ -0,0 +1,89 @@
+"""Circuit Breaker for Optional Network Dependencies.
+
+Shared state such as rate-limit buckets and guest sessions lives in Redis
+when it is configured, with a local fallback. Without a breaker, every
+request made during an outage would wait out the socket timeout and log a
+warning before falling back. :class:`CircuitBreaker` instead opens after a
+failure: callers go straight to their fallback for a cool-down that doubles
+with every consecutive failure (up to a cap), and one trial call is let
+through when it ends. The first success closes the circuit.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Skip calls to a failing dependency for an exponential cool-down.
+
+    Args:
+        name: Dependency name, for log messages.
+        base_delay: Cool-down after the first failure, in seconds.
+        max_delay: Longest cool-down, in seconds.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+
+    def _delay(self) -> float:
+        return min(self.max_delay, self.base_delay * 2 ** max(self._failures - 1, 0))
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently skipped."""
+        return self._clock() < self._open_until
+
+    def allow(self) -> bool:
+        """Return whether the caller should try the dependency now."""
+        now = self._clock()
+        with self._lock:
+            if now < self._open_until:
+                return False
+            if self._failures:
+                # Half-open: this caller makes the trial call, others keep
+                # using the fallback until it reports back
+                self._open_until = now + self._delay()
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if not self._failures:
+            return
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+        logger.info(f"{self.name} is reachable again")
+
+    def record_failure(self, error: BaseException) -> None:
+        """Open the circuit after a failed call."""
+        with self._lock:
+            self._failures += 1
+            delay = self._delay()
+            self._open_until = self._clock() + delay
+        logger.warning(f"{self.name} unavailable, using the local fallback for {delay:.0f}s: {error}")
@@ -0,0 +1,420 @@
+"""Response Compression.
+
+``CompressionMiddleware`` compresses responses in the application itself, so
+deployments that expose uvicorn directly (Render) get compressed JSON too:
+
+- the encoding is negotiated from ``Accept-Encoding``; brotli (``br``) and
+  zstandard (``zstd``) are offered when their packages are installed, gzip
+  always;
+- single-body responses below ``COMPRESSION_MINIMUM_SIZE`` bytes, already
+  encoded responses, partial content and non-text media types pass through;
+- streamed responses (``more_body``) are compressed incrementally and each
+  chunk is flushed, so NDJSON consumers still see rows as they are produced;
+- compressed single bodies are kept in a bounded LRU keyed by the digest of
+  the uncompressed body, so a hot page produced again is not recompressed:
+  hashing is an order of magnitude cheaper than compressing.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import abc
+import functools
+import hashlib
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Bodies larger than this are compressed in the threadpool, off the event loop
+THREADPOOL_THRESHOLD = 256 * 1024
+
+# Media types worth compressing (prefix match on the Content-Type)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class StreamCompressor(abc.ABC):
+    """Incremental compressor for one response body."""
+
+    @abc.abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress ``data`` and flush it so the client can decode it now."""
+
+    @abc.abstractmethod
+    def finish(self) -> bytes:
+        """Return the end of the compressed stream."""
+
+
+class _GzipStream(StreamCompressor):
+    def __init__(self, level: int) -> None:
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class Codec:
+    """A content coding: one-shot and streaming compression.
+
+    Args:
+        name: ``Content-Encoding`` token.
+        compress: One-shot compression function.
+        stream: Factory of incremental compressors.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        compress: Callable[[bytes], bytes],
+        stream: Callable[[], StreamCompressor],
+    ) -> None:
+        self.name = name
+        self.compress = compress
+        self.stream = stream
+
+
+def _gzip_codec(level: int) -> Codec:
+    def compress(data: bytes) -> bytes:
+        obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return obj.compress(data) + obj.flush()
+
+    return Codec("gzip", compress, lambda: _GzipStream(level))
+
+
+def _brotli_codec(quality: int) -> Optional[Codec]:
+    try:
+        import brotli  # Optional dependency
+    except ImportError:
+        return None
+
+    class _BrotliStream(StreamCompressor):
+        def __init__(self) -> None:
+            self._obj = brotli.Compressor(quality=quality)
+
+        def compress(self, data: bytes) -> bytes:
+            return self._obj.process(data) + self._obj.flush()
+
+        def finish(self) -> bytes:
+            return self._obj.finish()
+
+    return Codec("br", lambda data: brotli.compress(data, quality=quality), _BrotliStream)
+
+
+def _zstd_codec(level: int) -> Optional[Codec]:
+    try:
+        import zstandard  # Optional dependency
+    except ImportError:
+        return None
+    compressor = zstandard.ZstdCompressor(level=level)
+
+    class _ZstdStream(StreamCompressor):
+        def __init__(self) -> None:
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+        def compress(self, data: bytes) -> bytes:
+            return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+        def finish(self) -> bytes:
+            return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+    return Codec("zstd", compressor.compress, _ZstdStream)
+
+
+def available_codecs(
+    preference: Sequence[str] = ("br", "zstd", "gzip"),
+    gzip_level: int = 6,
+    brotli_quality: int = 4,
+    zstd_level: int = 3,
+) -> List[Codec]:
+    """Build the codecs usable in this environment, in server preference order.
+
+    Args:
+        preference: Encodings in order of preference; unknown or uninstalled
+            ones are skipped.
+        gzip_level: zlib compression level.
+        brotli_quality: brotli quality (4-5 suits dynamic responses).
+        zstd_level: zstandard level.
+
+    Returns:
+        List[Codec]: Available codecs.
+    """
+    factories: Dict[str, Callable[[], Optional[Codec]]] = {
+        "gzip": lambda: _gzip_codec(gzip_level),
+        "br": lambda: _brotli_codec(brotli_quality),
+        "zstd": lambda: _zstd_codec(zstd_level),
+    }
+    codecs = []
+    for name in preference:
+        factory = factories.get(name)
+        codec = factory() if factory else None
+        if codec is not None:
+            codecs.append(codec)
+        else:
+            logger.debug(f"Compression encoding '{name}' unavailable")
+    return codecs
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Parse an ``Accept-Encoding`` header into ``{coding: q}``.
+
+    Example:
+        >>> parse_accept_encoding("gzip, br;q=0.8, zstd;q=0")
+        {'gzip': 1.0, 'br': 0.8, 'zstd': 0.0}
+    """
+    accepted: Dict[str, float] = {}
+    for item in value.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, number = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(accept_encoding: str, codecs: Sequence[Codec]) -> Optional[Codec]:
+    """Pick the codec for a request.
+
+    The client's highest q-value wins; ties go to the server's preference.
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best: Optional[Codec] = None
+    best_q = 0.0
+    for codec in codecs:
+        q = accepted.get(codec.name, wildcard)
+        if q > best_q:
+            best, best_q = codec, q
+    return best
+
+
+class BytesLRU:
+    """Thread-safe LRU of byte strings bounded by their total size.
+
+    Args:
+        max_bytes: Total size of the values kept.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the value for ``key`` (marking it recently used), or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: bytes) -> None:
+        """Keep ``value``, evicting least recently used values beyond ``max_bytes``.
+
+        Values larger than ``max_bytes`` are not kept.
+        """
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PrecompressedCache(BytesLRU):
+    """LRU of compressed bodies keyed by encoding and uncompressed digest.
+
+    Args:
+        max_bytes: Total size of the compressed bodies kept.
+    """
+
+    def get_or_compress(self, codec: Codec, body: bytes) -> bytes:
+        """Return ``body`` compressed with ``codec``, from the cache if possible."""
+        if self.max_bytes <= 0:
+            return codec.compress(body)
+        key = (codec.name, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.get(key)
+        record_cache("compressed_body", compressed is not None)
+        if compressed is not None:
+            return compressed
+        compressed = codec.compress(body)
+        self.put(key, compressed)
+        return compressed
+
+
+@lru_cache(maxsize=1)
+def get_compression_cache() -> PrecompressedCache:
+    """Get the process-wide precompressed body cache.
+
+    Returns:
+        PrecompressedCache: Shared cache sized by ``COMPRESSION_CACHE_BYTES``.
+    """
+    return PrecompressedCache(settings.COMPRESSION_CACHE_BYTES)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing eligible responses.
+
+    Args:
+        app: Downstream ASGI application.
+        codecs: Available codecs in server preference order.
+        minimum_size: Single-body responses smaller than this are sent as is.
+        cache: Precompressed body cache (None disables caching).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        codecs: Optional[Sequence[Codec]] = None,
+        minimum_size: int = 1024,
+        cache: Optional[PrecompressedCache] = None,
+    ) -> None:
+        self.app = app
+        self.codecs = list(codecs) if codecs is not None else available_codecs()
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codec = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.codecs)
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponse(self, codec, send).run(scope, receive)
+
+
+class _CompressedResponse:
+    """Send wrapper holding the state of one response."""
+
+    def __init__(self, middleware: CompressionMiddleware, codec: Codec, send: Send) -> None:
+        self.middleware = middleware
+        self.codec = codec
+        self.send = send
+        self.start: Optional[Message] = None
+        self.eligible = False
+        self.stream: Optional[StreamCompressor] = None
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.wrapped_send)
+
+    def _is_eligible(self, message: Message) -> bool:
+        headers = Headers(raw=message.get("headers", []))
+        content_type = headers.get("content-type", "")
+        return (
+            message["status"] not in (204, 206, 304)
+            and "content-encoding" not in headers
+            and "content-range" not in headers
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+        )
+
+    def _headers(self, length: Optional[int]) -> Message:
+        assert self.start is not None
+        headers = MutableHeaders(raw=list(self.start.get("headers", [])))
+        headers["content-encoding"] = self.codec.name
+        headers.add_vary_header("Accept-Encoding")
+        # Byte ranges would address the identity body, not this one
+        if "accept-ranges" in headers:
+            del headers["accept-ranges"]
+        if length is None:
+            del headers["content-length"]
+        else:
+            headers["content-length"] = str(length)
+        # The representation changed: a strong validator would be wrong
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+        return {**self.start, "headers": headers.raw}
+
+    async def wrapped_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.eligible = self._is_eligible(message)
+            if not self.eligible:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or not self.eligible:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self.stream is None and not more_body:
+            # Whole body in one message: threshold, then (cached) one-shot compression
+            if len(body) < self.middleware.minimum_size:
+                assert self.start is not None
+                headers = MutableHeaders(raw=list(self.start.get("headers", [])))
+                headers.add_vary_header("Accept-Encoding")
+                await self.send({**self.start, "headers": headers.raw})
+                await self.send(message)
+                return
+            cache = self.middleware.cache
+            compress = (
+                functools.partial(cache.get_or_compress, self.codec)
+                if cache is not None
+                else self.codec.compress
+            )
+            if len(body) > THREADPOOL_THRESHOLD:
+                compressed = await run_in_threadpool(compress, body)
+            else:
+                compressed = compress(body)
+            await self.send(self._headers(len(compressed)))
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+
+        if self.stream is None:
+            self.stream = self.codec.stream()
+            await self.send(self._headers(None))
+        chunk = self.stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
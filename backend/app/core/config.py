@@ -15,7 +15,7 @@ from __future__ import annotations
 
 import json
 from functools import lru_cache
-from typing import Any, List, Union
+from typing import Any, List, Optional, Union
 
 from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -36,7 +36,30 @@ class Settings(BaseSettings):
         APP_ENV: Deployment environment (dev, staging, production).
         APP_DEBUG: Enable debug mode for detailed logging and error traces.
         DATABASE_URL: SQLAlchemy database connection string.
+        DATABASE_ECHO: Log every SQL statement emitted by the engine.
+        DB_*: Connection pool sizing and the PostgreSQL connection budget.
         BACKEND_CORS_ORIGINS: List of allowed CORS origins for API access.
+        RATE_LIMIT_*: Token-bucket limits applied to authentication routes.
+        GUEST_SESSION_*: Lifetime, capacity and shared store of preview-mode guest sessions.
+        TIMING_ENABLED: Enable request timing middleware and latency histograms.
+        COMPRESSION_*: Response compression encodings, threshold and body cache.
+        METRICS_*: Prometheus exposition and multi-worker aggregation.
+        SLOW_QUERY_*: Slow-statement threshold, retention and EXPLAIN capture.
+        PROFILING_*: On-demand request profiler (X-Profile header or sampling).
+        CATALOG_SNAPSHOT_*: Shared, memory-mapped list-view snapshot of the catalog.
+        SEARCH_INDEX_*: In-process search index answering entity lists without SQL.
+        CONNECTION_GRAPH_*: In-process adjacency answering connection suggestions.
+        FEED_*: Fan-out threshold and hot timeline cache of the activity feed.
+        JOB_MATCH_REFRESH_SECONDS: Refresh interval of the job matching posting lists.
+        PROTOCOL_MATRIX_TTL_SECONDS: Lifetime of cached protocol compatibility matrices.
+        VERSION_SNAPSHOT_INTERVAL: Releases per full snapshot in entity version history.
+        BLOB_STORE_DIR: Root of the content-addressed store holding README blobs.
+        README_HTML_CACHE_BYTES: Size bound of the rendered README cache.
+        STARTUP_*: Warm-up performed before a worker accepts traffic.
+        SHUTDOWN_DRAIN_SECONDS: Grace period for in-flight requests on shutdown.
+        SERVER_*, WORKERS*: Production server bind address, preload and worker sizing.
+        HEALTH_*: Readiness probe caching and pool saturation threshold.
+        ADMIN_TOKEN: Shared secret protecting the admin API.
 
     Example:
         >>> settings = get_settings()
@@ -66,6 +89,30 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("DATABASE_URL", "database_url"),
         description="SQLAlchemy database connection string",
     )
+    DATABASE_ECHO: bool = Field(
+        default=False,
+        description="Log every SQL statement (very verbose; prefer the slow-query log)",
+    )
+    DB_POOL_SIZE: int = Field(
+        default=5,
+        ge=1,
+        description="Persistent connections per worker (non-SQLite databases)",
+    )
+    DB_MAX_OVERFLOW: int = Field(
+        default=10,
+        ge=0,
+        description="Extra connections a worker may open above DB_POOL_SIZE under load",
+    )
+    DB_POOL_TIMEOUT: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds to wait for a free pooled connection",
+    )
+    DB_CONNECTION_BUDGET: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Connections all workers may hold together (pools are scaled to fit)",
+    )
 
     # CORS configuration
     BACKEND_CORS_ORIGINS: Union[List[str], str] = Field(
@@ -74,6 +121,336 @@ class Settings(BaseSettings):
         description="Allowed CORS origins (comma-separated string or JSON list)",
     )
 
+    # Rate limiting configuration
+    RATE_LIMIT_ENABLED: bool = Field(
+        default=True,
+        description="Enable token-bucket rate limiting on authentication routes",
+    )
+    RATE_LIMIT_AUTH_PER_MINUTE: float = Field(
+        default=30.0,
+        gt=0,
+        description="Sustained requests per minute per client IP on each auth route",
+    )
+    RATE_LIMIT_AUTH_BURST: int = Field(
+        default=10,
+        ge=1,
+        description="Maximum burst size per client IP on each auth route",
+    )
+    RATE_LIMIT_LOGIN_USER_PER_MINUTE: float = Field(
+        default=10.0,
+        gt=0,
+        description="Sustained login attempts per minute for a single username",
+    )
+    RATE_LIMIT_LOGIN_USER_BURST: int = Field(
+        default=5,
+        ge=1,
+        description="Maximum burst of login attempts for a single username",
+    )
+    RATE_LIMIT_SWEEP_INTERVAL: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds between sweeps that evict idle in-memory buckets",
+    )
+    RATE_LIMIT_REDIS_URL: Optional[str] = Field(
+        default=None,
+        description="Optional Redis-compatible URL for limits shared across workers",
+    )
+
+    # Guest sessions (preview mode)
+    GUEST_SESSION_TTL_SECONDS: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Idle lifetime of a guest session in seconds (sliding)",
+    )
+    GUEST_SESSION_MAX: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum live guest sessions (per worker, or in Redis) before LRU eviction",
+    )
+    GUEST_SESSION_REDIS_URL: Optional[str] = Field(
+        default=None,
+        description="Redis-compatible URL for guest sessions shared across workers "
+        "(defaults to RATE_LIMIT_REDIS_URL)",
+    )
+
+    # Request instrumentation
+    TIMING_ENABLED: bool = Field(
+        default=True,
+        description="Measure per-request handler, DB and serialization time",
+    )
+    SERVER_TIMING_HEADER: bool = Field(
+        default=True,
+        description="Expose request timings in the Server-Timing response header",
+    )
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = Field(
+        default=True,
+        description="Compress responses in the application (gzip; br/zstd when installed)",
+    )
+    COMPRESSION_ENCODINGS: str = Field(
+        default="br,zstd,gzip",
+        description="Offered content codings in server preference order (comma-separated)",
+    )
+    COMPRESSION_MINIMUM_SIZE: int = Field(
+        default=1024,
+        ge=0,
+        description="Responses smaller than this many bytes are sent uncompressed",
+    )
+    COMPRESSION_GZIP_LEVEL: int = Field(
+        default=6,
+        ge=1,
+        le=9,
+        description="gzip compression level",
+    )
+    COMPRESSION_BROTLI_QUALITY: int = Field(
+        default=4,
+        ge=0,
+        le=11,
+        description="brotli quality (4-5 suits dynamic responses)",
+    )
+    COMPRESSION_ZSTD_LEVEL: int = Field(
+        default=3,
+        ge=1,
+        le=22,
+        description="zstandard compression level",
+    )
+    COMPRESSION_CACHE_BYTES: int = Field(
+        default=16 * 1024 * 1024,
+        ge=0,
+        description="Memory for compressed bodies reused across identical responses (0 disables)",
+    )
+
+    # Metrics exposition
+    METRICS_ENABLED: bool = Field(
+        default=True,
+        description="Expose Prometheus metrics at GET /metrics",
+    )
+    METRICS_MULTIPROC_DIR: Optional[str] = Field(
+        default=None,
+        description="Shared directory for aggregating metrics across uvicorn workers",
+    )
+    METRICS_FLUSH_INTERVAL: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds between worker metric snapshot flushes (multiprocess mode)",
+    )
+
+    # Slow-query log
+    SLOW_QUERY_ENABLED: bool = Field(
+        default=True,
+        description="Record SQL statements slower than SLOW_QUERY_THRESHOLD_MS",
+    )
+    SLOW_QUERY_THRESHOLD_MS: float = Field(
+        default=200.0,
+        ge=0,
+        description="Duration in milliseconds above which a statement is logged as slow",
+    )
+    SLOW_QUERY_LOG_SIZE: int = Field(
+        default=200,
+        ge=1,
+        description="Number of recent slow statements kept per worker",
+    )
+    SLOW_QUERY_EXPLAIN: bool = Field(
+        default=False,
+        description="Capture EXPLAIN (ANALYZE, BUFFERS) for the slowest SELECT fingerprints",
+    )
+    SLOW_QUERY_EXPLAIN_TOP: int = Field(
+        default=10,
+        ge=1,
+        description="Only the N slowest fingerprints are explained",
+    )
+
+    # Profiling
+    PROFILING_ENABLED: bool = Field(
+        default=False,
+        description="Install the request profiling middleware",
+    )
+    PROFILING_SAMPLE_RATE: float = Field(
+        default=0.0,
+        ge=0,
+        le=1,
+        description="Fraction of requests profiled automatically",
+    )
+    PROFILING_INTERVAL_MS: float = Field(
+        default=5.0,
+        gt=0,
+        description="Stack sampling interval in milliseconds",
+    )
+    PROFILING_MAX_PROFILES: int = Field(
+        default=50,
+        ge=1,
+        description="Captured profiles kept, shared by the workers of a host",
+    )
+    PROFILING_DIR: Optional[str] = Field(
+        default=None,
+        description="Directory for captured profiles (default /dev/shm/matrixhub-profiles)",
+    )
+
+    # Catalog snapshot
+    CATALOG_SNAPSHOT_ENABLED: bool = Field(
+        default=False,
+        description="Serve entity lists from a memory-mapped snapshot shared by all workers",
+    )
+    CATALOG_SNAPSHOT_DIR: Optional[str] = Field(
+        default=None,
+        description="Directory for snapshot generations (default /dev/shm/matrixhub-catalog)",
+    )
+    CATALOG_SNAPSHOT_REFRESH_SECONDS: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds between checks for entity changes and new generations",
+    )
+
+    # In-memory search index
+    SEARCH_INDEX_ENABLED: bool = Field(
+        default=False,
+        description="Answer entity lists from an in-process index built at start-up",
+    )
+    SEARCH_INDEX_MAX_ENTITIES: int = Field(
+        default=500_000,
+        ge=1,
+        description="Catalogs larger than this are served from SQL instead",
+    )
+    SEARCH_INDEX_REFRESH_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds between checks for changes made by other processes",
+    )
+
+    # Connection graph
+    CONNECTION_GRAPH_ENABLED: bool = Field(
+        default=True,
+        description="Answer connection suggestions from an in-process adjacency built at start-up",
+    )
+    CONNECTION_GRAPH_REFRESH_SECONDS: float = Field(
+        default=10.0,
+        gt=0,
+        description="Seconds between checks for connections made by other processes",
+    )
+
+    # Activity feed
+    FEED_FANOUT_MAX_FOLLOWERS: int = Field(
+        default=5000,
+        ge=0,
+        description="Posts by authors with more connections are pulled at read time, not pushed",
+    )
+    FEED_CACHE_TTL_SECONDS: float = Field(
+        default=15.0,
+        ge=0,
+        description="Seconds a cached timeline page is served",
+    )
+    FEED_CACHE_MAX_TIMELINES: int = Field(
+        default=10_000,
+        ge=0,
+        description="Timelines whose first page is cached per worker (0 disables)",
+    )
+    FEED_CACHE_ITEMS: int = Field(
+        default=50,
+        ge=1,
+        description="Posts cached per timeline",
+    )
+
+    # Jobs marketplace
+    JOB_MATCH_REFRESH_SECONDS: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds between checks for changed jobs and entities in the match index",
+    )
+
+    # Protocol compatibility
+    PROTOCOL_MATRIX_TTL_SECONDS: float = Field(
+        default=60.0,
+        ge=0,
+        description="Seconds a protocol family's compatibility matrix is cached",
+    )
+
+    # Version history
+    VERSION_SNAPSHOT_INTERVAL: int = Field(
+        default=10,
+        ge=1,
+        description="Store a full snapshot every N releases (deltas in between)",
+    )
+
+    # Blob storage
+    BLOB_STORE_DIR: str = Field(
+        default="./data/blobs",
+        description="Directory of the content-addressed blob store (READMEs)",
+    )
+    README_HTML_CACHE_BYTES: int = Field(
+        default=8 * 1024 * 1024,
+        ge=0,
+        description="Bytes of rendered README HTML kept per worker",
+    )
+
+    # Start-up
+    STARTUP_WARMUP: bool = Field(
+        default=True,
+        description="Pre-build OpenAPI, open pool connections and compile queries at start-up",
+    )
+    STARTUP_WARM_CONNECTIONS: int = Field(
+        default=2,
+        ge=1,
+        description="Pool connections opened during start-up warm-up",
+    )
+
+    # Shutdown
+    SHUTDOWN_DRAIN_SECONDS: float = Field(
+        default=25.0,
+        ge=0,
+        description="Seconds to wait for in-flight requests on shutdown",
+    )
+
+    # Production server (python -m app.server)
+    SERVER_HOST: str = Field(
+        default="0.0.0.0",
+        description="Address the production server binds to",
+    )
+    SERVER_PORT: int = Field(
+        default=8000,
+        validation_alias=AliasChoices("SERVER_PORT", "PORT"),
+        description="Port the production server binds to",
+    )
+    SERVER_PRELOAD: bool = Field(
+        default=True,
+        description="Import the app once before forking workers (copy-on-write sharing)",
+    )
+    WORKERS: Optional[int] = Field(
+        default=None,
+        ge=1,
+        validation_alias=AliasChoices("WORKERS", "WEB_CONCURRENCY"),
+        description="Worker processes (derived from the container CPU limit if unset)",
+    )
+    WORKERS_PER_CPU: float = Field(
+        default=1.0,
+        gt=0,
+        description="Workers started per available CPU when WORKERS is unset",
+    )
+    WORKERS_MAX: int = Field(
+        default=16,
+        ge=1,
+        description="Upper bound on the derived worker count",
+    )
+
+    # Health checks
+    HEALTH_CACHE_SECONDS: float = Field(
+        default=2.0,
+        ge=0,
+        description="Seconds a readiness probe result is reused",
+    )
+    HEALTH_POOL_SATURATION: float = Field(
+        default=0.95,
+        gt=0,
+        le=1,
+        description="Pool usage fraction at which the worker reports not ready",
+    )
+
+    # Administration
+    ADMIN_TOKEN: Optional[str] = Field(
+        default=None,
+        description="Token required in X-Admin-Token for /api/admin (admin API disabled if unset)",
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -131,6 +508,14 @@ class Settings(BaseSettings):
         """
         return self._coerce_list(self.BACKEND_CORS_ORIGINS)
 
+    @field_validator("WORKERS", "DB_CONNECTION_BUDGET", mode="before")
+    @classmethod
+    def empty_as_unset(cls, v: Any) -> Any:
+        """Treat an empty environment value (``WORKERS=``) as unset."""
+        if isinstance(v, str) and not v.strip():
+            return None
+        return v
+
     @field_validator("APP_ENV")
     @classmethod
     def validate_app_env(cls, v: str) -> str:
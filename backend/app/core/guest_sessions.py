@@ -0,0 +1,426 @@
+"""Guest Session Registry.
+
+This module keeps track of preview-mode guest sessions created by
+``POST /api/auth/guest``. Sessions are compact ``__slots__`` records held in an
+LRU-ordered dictionary with a min-heap of expiry deadlines:
+
+- Expiry pops the heap front only, so cleanup never scans every session.
+- Sliding TTL: reading a session extends it; the heap entry is refreshed
+  lazily when its old deadline is reached.
+- A configurable cap evicts the least recently used session, bounding memory
+  no matter how much preview traffic arrives.
+
+With several workers, a registry in one worker's memory only knows the
+sessions that worker created. When ``GUEST_SESSION_REDIS_URL`` (or else
+``RATE_LIMIT_REDIS_URL``) is set, :class:`RedisGuestSessionStore` keeps the
+same structure in Redis instead: a sorted set of deadlines, a hash of
+creation times and a hash of lifetime totals, shared by every worker.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.circuit import CircuitBreaker
+from app.core.config import settings
+from app.core.metrics import GaugeSample
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Lifetime totals reported by ``stats()``
+TOTALS = ("created_total", "expired_total", "evicted_total")
+
+# Expired sessions removed from Redis per call
+EXPIRE_BATCH = 500
+
+
+class GuestRecord:
+    """A single guest session.
+
+    Attributes:
+        guest_id: Public guest identifier (``guest-<hex>``).
+        created_at: Wall-clock creation time (UNIX seconds).
+        expires_at: Deadline after which the session is gone, on the clock
+            of the store that holds it.
+    """
+
+    __slots__ = ("guest_id", "created_at", "expires_at")
+
+    def __init__(self, guest_id: str, created_at: float, expires_at: float) -> None:
+        self.guest_id = guest_id
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    @property
+    def created_at_iso(self) -> str:
+        """Creation timestamp as an ISO-8601 UTC string."""
+        return datetime.fromtimestamp(self.created_at, tz=timezone.utc).isoformat()
+
+
+class GuestSessionRegistry:
+    """Bounded, TTL-expiring store of guest sessions.
+
+    Args:
+        ttl: Session lifetime in seconds, extended on every access.
+        max_sessions: Maximum live sessions before LRU eviction.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    # Only this worker's sessions are known, so a miss proves nothing
+    shared = False
+    # Calls never leave the process, so async callers run them inline
+    blocking = False
+
+    def __init__(
+        self,
+        ttl: float,
+        max_sessions: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._sessions: OrderedDict[str, GuestRecord] = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.created_total = 0
+        self.expired_total = 0
+        self.evicted_total = 0
+
+    def create(self) -> GuestRecord:
+        """Register a new guest session.
+
+        Returns:
+            GuestRecord: The newly created session.
+        """
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            guest_id = f"guest-{secrets.token_hex(4)}"
+            while guest_id in self._sessions:
+                guest_id = f"guest-{secrets.token_hex(4)}"
+            record = GuestRecord(guest_id, time.time(), now + self.ttl)
+            self._sessions[guest_id] = record
+            heapq.heappush(self._expiry, (record.expires_at, guest_id))
+            self.created_total += 1
+            while len(self._sessions) > self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                self.evicted_total += 1
+                logger.debug(f"Evicted guest session (LRU): {evicted_id}")
+            self._compact()
+            return record
+
+    def get(self, guest_id: str) -> Optional[GuestRecord]:
+        """Look up a live session and extend its TTL.
+
+        Args:
+            guest_id: Guest identifier.
+
+        Returns:
+            Optional[GuestRecord]: The session, or None if unknown or expired.
+        """
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            record = self._sessions.get(guest_id)
+            if record is None:
+                return None
+            record.expires_at = now + self.ttl
+            self._sessions.move_to_end(guest_id)
+            return record
+
+    def remove(self, guest_id: str) -> bool:
+        """End a guest session.
+
+        Returns:
+            bool: True if the session existed.
+        """
+        with self._lock:
+            return self._sessions.pop(guest_id, None) is not None
+
+    def _expire(self, now: float) -> None:
+        """Drop sessions whose deadline has passed. Caller holds the lock."""
+        heap = self._expiry
+        while heap and heap[0][0] <= now:
+            _, guest_id = heapq.heappop(heap)
+            record = self._sessions.get(guest_id)
+            if record is None:
+                continue  # Already evicted or removed
+            if record.expires_at > now:
+                # TTL was extended since this entry was pushed
+                heapq.heappush(heap, (record.expires_at, guest_id))
+                continue
+            del self._sessions[guest_id]
+            self.expired_total += 1
+
+    def _compact(self) -> None:
+        """Rebuild the heap when stale entries from evictions dominate it."""
+        if len(self._expiry) > 2 * len(self._sessions) + 64:
+            self._expiry = [(r.expires_at, gid) for gid, r in self._sessions.items()]
+            heapq.heapify(self._expiry)
+
+    def stats(self) -> Dict[str, int]:
+        """Return live-session gauges and lifetime counters.
+
+        Returns:
+            Dict[str, int]: Metrics for monitoring preview-mode traffic.
+        """
+        with self._lock:
+            self._expire(self._clock())
+            return {
+                "live": len(self._sessions),
+                "capacity": self.max_sessions,
+                "created_total": self.created_total,
+                "expired_total": self.expired_total,
+                "evicted_total": self.evicted_total,
+            }
+
+    def clear(self) -> None:
+        """Drop all sessions (counters are kept)."""
+        with self._lock:
+            self._sessions.clear()
+            self._expiry.clear()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class RedisGuestSessionStore:
+    """Guest sessions in a Redis-compatible server, shared by all workers.
+
+    Expiry, the sliding TTL and the LRU cap behave as in
+    :class:`GuestSessionRegistry`, with wall-clock deadlines as the scores of
+    a sorted set. While the server is unreachable, a circuit breaker routes
+    calls to a local registry; sessions created there stay readable by this
+    worker.
+
+    Attributes:
+        created_total, expired_total, evicted_total: Events handled by this
+            worker (``stats()`` reports the totals of all workers).
+
+    Args:
+        url: Redis connection URL (e.g. ``redis://localhost:6379/0``).
+        ttl: Session lifetime in seconds, extended on every access.
+        max_sessions: Maximum live sessions before LRU eviction.
+        fallback: Registry used while Redis is unavailable.
+        prefix: Key prefix.
+        client: Redis client to use instead of connecting to ``url``.
+        circuit: Breaker guarding the server (a default one if omitted).
+        clock: Wall clock, shared by all workers.
+    """
+
+    # Each call is a network round trip
+    blocking = True
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float,
+        max_sessions: int,
+        fallback: GuestSessionRegistry,
+        prefix: str = "matrixhub:guest:",
+        client: Any = None,
+        circuit: Optional[CircuitBreaker] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if client is None:
+            import redis  # Optional dependency, imported lazily
+
+            client = redis.Redis.from_url(url, socket_timeout=0.25, decode_responses=True)
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._client = client
+        self._fallback = fallback
+        self._circuit = circuit or CircuitBreaker("Redis guest sessions")
+        self._clock = clock
+        self._deadlines = prefix + "deadlines"
+        self._created = prefix + "created"
+        self._totals = prefix + "totals"
+        self.created_total = 0
+        self.expired_total = 0
+        self.evicted_total = 0
+
+    @property
+    def shared(self) -> bool:
+        """Whether lookups currently see the sessions of every worker."""
+        return not self._circuit.is_open
+
+    def _call(self, method: Callable[[], Any], fallback: Callable[[], Any]) -> Any:
+        if not self._circuit.allow():
+            return fallback()
+        try:
+            result = method()
+        except Exception as e:
+            self._circuit.record_failure(e)
+            return fallback()
+        self._circuit.record_success()
+        return result
+
+    def create(self) -> GuestRecord:
+        """Register a new guest session.
+
+        Returns:
+            GuestRecord: The newly created session.
+        """
+        return self._call(self._create, self._fallback.create)
+
+    def _create(self) -> GuestRecord:
+        now = self._clock()
+        self._expire(now)
+        guest_id = f"guest-{secrets.token_hex(4)}"
+        while not self._client.zadd(self._deadlines, {guest_id: now + self.ttl}, nx=True):
+            guest_id = f"guest-{secrets.token_hex(4)}"
+        pipe = self._client.pipeline()
+        pipe.hset(self._created, guest_id, now)
+        pipe.hincrby(self._totals, "created_total", 1)
+        pipe.zcard(self._deadlines)
+        live = pipe.execute()[2]
+        self.created_total += 1
+        if live > self.max_sessions:
+            # The earliest deadline is the least recently used session
+            evicted = [member for member, _ in self._client.zpopmin(self._deadlines, live - self.max_sessions)]
+            if evicted:
+                pipe = self._client.pipeline()
+                pipe.hdel(self._created, *evicted)
+                pipe.hincrby(self._totals, "evicted_total", len(evicted))
+                pipe.execute()
+                self.evicted_total += len(evicted)
+        return GuestRecord(guest_id, now, now + self.ttl)
+
+    def get(self, guest_id: str) -> Optional[GuestRecord]:
+        """Look up a live session and extend its TTL.
+
+        Args:
+            guest_id: Guest identifier.
+
+        Returns:
+            Optional[GuestRecord]: The session, or None if unknown or expired.
+        """
+        record = self._call(lambda: self._get(guest_id), lambda: None)
+        return record if record is not None else self._fallback.get(guest_id)
+
+    def _get(self, guest_id: str) -> Optional[GuestRecord]:
+        now = self._clock()
+        pipe = self._client.pipeline()
+        pipe.zscore(self._deadlines, guest_id)
+        pipe.hget(self._created, guest_id)
+        deadline, created = pipe.execute()
+        if deadline is None or float(deadline) <= now:
+            return None
+        self._client.zadd(self._deadlines, {guest_id: now + self.ttl}, xx=True)
+        return GuestRecord(guest_id, float(created) if created is not None else now, now + self.ttl)
+
+    def remove(self, guest_id: str) -> bool:
+        """End a guest session.
+
+        Returns:
+            bool: True if the session existed.
+        """
+        def remove() -> bool:
+            pipe = self._client.pipeline()
+            pipe.zrem(self._deadlines, guest_id)
+            pipe.hdel(self._created, guest_id)
+            return bool(pipe.execute()[0])
+
+        removed = bool(self._call(remove, lambda: False))
+        return self._fallback.remove(guest_id) or removed
+
+    def _expire(self, now: float) -> None:
+        """Remove a batch of sessions whose deadline has passed."""
+        expired = self._client.zrangebyscore(self._deadlines, "-inf", now, start=0, num=EXPIRE_BATCH)
+        if not expired:
+            return
+        pipe = self._client.pipeline()
+        pipe.zrem(self._deadlines, *expired)
+        pipe.hdel(self._created, *expired)
+        # Another worker may have removed some of them first
+        removed = pipe.execute()[0]
+        if removed:
+            self._client.hincrby(self._totals, "expired_total", removed)
+            self.expired_total += removed
+
+    def stats(self) -> Dict[str, int]:
+        """Return live-session gauges and lifetime counters of all workers.
+
+        Returns:
+            Dict[str, int]: Metrics for monitoring preview-mode traffic (this
+            worker's local registry while Redis is unavailable).
+        """
+        def stats() -> Dict[str, int]:
+            self._expire(self._clock())
+            pipe = self._client.pipeline()
+            pipe.zcard(self._deadlines)
+            pipe.hgetall(self._totals)
+            live, totals = pipe.execute()
+            return {
+                "live": int(live),
+                "capacity": self.max_sessions,
+                **{key: int(totals.get(key, 0)) for key in TOTALS},
+            }
+
+        return self._call(stats, self._fallback.stats)
+
+    def clear(self) -> None:
+        """Drop all sessions (counters are kept)."""
+        self._call(lambda: self._client.delete(self._deadlines, self._created), lambda: None)
+        self._fallback.clear()
+
+
+GuestStore = Union[GuestSessionRegistry, RedisGuestSessionStore]
+
+
+@lru_cache(maxsize=1)
+def get_guest_registry() -> GuestStore:
+    """Get the process-wide guest session store.
+
+    Returns:
+        GuestStore: A store shared through Redis if one is configured (and
+        the ``redis`` package is installed), else a registry in this worker.
+    """
+    local = GuestSessionRegistry(
+        ttl=settings.GUEST_SESSION_TTL_SECONDS,
+        max_sessions=settings.GUEST_SESSION_MAX,
+    )
+    url = settings.GUEST_SESSION_REDIS_URL or settings.RATE_LIMIT_REDIS_URL
+    if url:
+        try:
+            store = RedisGuestSessionStore(
+                url, settings.GUEST_SESSION_TTL_SECONDS, settings.GUEST_SESSION_MAX, fallback=local
+            )
+            logger.info("Guest sessions are shared through Redis")
+            return store
+        except ImportError:
+            logger.warning("Guest session Redis URL set but 'redis' is not installed; using local sessions")
+    return local
+
+
+def guest_session_collector() -> Iterable[GaugeSample]:
+    """Report guest session metrics for ``GET /metrics``.
+
+    Totals count the events handled by this worker, so they add up across
+    workers.
+    """
+    store = get_guest_registry()
+    yield GaugeSample("guest_sessions_live", "Live guest sessions", store.stats()["live"])
+    for key in TOTALS:
+        yield GaugeSample(
+            f"guest_sessions_{key}",
+            f"Guest sessions {key.removesuffix('_total')} by this worker",
+            getattr(store, key),
+            kind="counter",
+        )
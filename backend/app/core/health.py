@@ -0,0 +1,165 @@
+"""Readiness Probes.
+
+This module implements the deep health check behind ``GET /health/ready``. The
+probe verifies database connectivity, connection pool saturation and that the
+database schema is at the Alembic head revision.
+
+Probe results are cached for ``HEALTH_CACHE_SECONDS`` and concurrent callers
+share a single in-flight check, so load balancers polling every worker add at
+most one ``SELECT 1`` per interval per worker.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.session import engine as default_engine
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Location of the Alembic migration scripts
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+
+@lru_cache(maxsize=1)
+def migration_heads() -> Optional[Tuple[str, ...]]:
+    """Return the Alembic head revision(s) shipped with this build.
+
+    Returns:
+        Optional[Tuple[str, ...]]: Head revisions, or None if Alembic or the
+        migration scripts are unavailable.
+    """
+    try:
+        from alembic.script import ScriptDirectory  # Optional at runtime
+    except ImportError:
+        return None
+    if not MIGRATIONS_DIR.is_dir():
+        return None
+    try:
+        return tuple(sorted(ScriptDirectory(str(MIGRATIONS_DIR)).get_heads()))
+    except Exception as e:
+        logger.warning(f"Could not read migration heads: {e}")
+        return None
+
+
+class ReadinessProbe:
+    """Cached readiness check against a database engine.
+
+    Args:
+        engine: Engine whose connectivity and pool are checked.
+        cache_seconds: How long a probe result is reused.
+        pool_saturation: Fraction of pool capacity in use above which the
+            worker reports not ready.
+    """
+
+    def __init__(self, engine: Engine, cache_seconds: float, pool_saturation: float) -> None:
+        self.engine = engine
+        self.cache_seconds = cache_seconds
+        self.pool_saturation = pool_saturation
+        self._lock = threading.Lock()
+        self._result: Optional[Tuple[bool, Dict[str, Any]]] = None
+        self._checked_at = float("-inf")
+
+    def check(self) -> Tuple[bool, Dict[str, Any]]:
+        """Return the (possibly cached) readiness result.
+
+        Returns:
+            Tuple of (ready, details) where details maps check names to their
+            status and diagnostic fields.
+        """
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+            return self._result
+        with self._lock:
+            # Another caller may have refreshed the result while we waited
+            if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+                return self._result
+            self._result = self._run()
+            self._checked_at = time.monotonic()
+            return self._result
+
+    def _run(self) -> Tuple[bool, Dict[str, Any]]:
+        checks: Dict[str, Any] = {"pool": self._check_pool()}
+        if checks["pool"]["status"] == "fail":
+            # Do not queue behind a saturated pool just to run SELECT 1
+            checks["database"] = {"status": "skipped", "reason": "pool saturated"}
+            checks["migrations"] = {"status": "skipped", "reason": "pool saturated"}
+        else:
+            checks["database"], current = self._check_database()
+            checks["migrations"] = self._check_migrations(current)
+        ready = all(c["status"] != "fail" for c in checks.values())
+        if not ready:
+            logger.warning(f"Readiness check failed: {checks}")
+        return ready, checks
+
+    def _check_pool(self) -> Dict[str, Any]:
+        pool = self.engine.pool
+        size = getattr(pool, "size", None)
+        checkedout = getattr(pool, "checkedout", None)
+        if not callable(size) or not callable(checkedout):
+            return {"status": "ok", "detail": type(pool).__name__}
+        capacity = size() + max(getattr(pool, "_max_overflow", 0), 0)
+        in_use = checkedout()
+        saturation = in_use / capacity if capacity else 0.0
+        return {
+            "status": "fail" if saturation >= self.pool_saturation else "ok",
+            "in_use": in_use,
+            "capacity": capacity,
+            "saturation": round(saturation, 3),
+        }
+
+    def _check_database(self) -> Tuple[Dict[str, Any], Optional[Tuple[str, ...]]]:
+        started = time.perf_counter()
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                try:
+                    rows = conn.execute(text("SELECT version_num FROM alembic_version"))
+                    current: Optional[Tuple[str, ...]] = tuple(sorted(r[0] for r in rows))
+                except SQLAlchemyError:
+                    conn.rollback()
+                    current = None
+        except SQLAlchemyError as e:
+            return {"status": "fail", "error": type(e).__name__}, None
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        return {"status": "ok", "latency_ms": round(latency_ms, 2)}, current
+
+    @staticmethod
+    def _check_migrations(current: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+        heads = migration_heads()
+        if heads is None or current is None:
+            # No Alembic available, or schema managed by create_all (dev/tests)
+            return {"status": "skipped"}
+        if current != heads:
+            return {"status": "fail", "current": list(current), "head": list(heads)}
+        return {"status": "ok", "revision": list(current)}
+
+
+@lru_cache(maxsize=1)
+def get_readiness_probe() -> ReadinessProbe:
+    """Get the process-wide readiness probe for the application engine.
+
+    Returns:
+        ReadinessProbe: Shared probe configured from settings.
+    """
+    return ReadinessProbe(
+        default_engine,
+        cache_seconds=settings.HEALTH_CACHE_SECONDS,
+        pool_saturation=settings.HEALTH_POOL_SATURATION,
+    )
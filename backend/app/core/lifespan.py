@@ -0,0 +1,218 @@
+"""Application Lifespan and Resource Management.
+
+This module owns the process-level resources of a worker and ties them to
+the ASGI lifespan:
+
+- start-up: background flushers are started and caches, the connection pool
+  and compiled statements are warmed before the first request;
+- shutdown (SIGTERM during a rolling deploy): the signal itself marks the
+  worker as draining, before uvicorn stops accepting connections, so it
+  stops reporting ready and refuses new requests on kept-alive connections
+  with 503. The lifespan shutdown then waits up to
+  ``SHUTDOWN_DRAIN_SECONDS`` for in-flight requests, stops background work
+  and disposes the engine so no PostgreSQL connections are leaked.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+
+from fastapi import FastAPI
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import SnapshotWriter
+from app.core.slow_query import get_slow_query_log
+from app.core.startup import warm_up
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Seconds between in-flight checks while draining
+_DRAIN_POLL = 0.05
+
+
+class Lifecycle:
+    """In-flight request accounting and draining state for this worker.
+
+    Attributes:
+        in_flight: HTTP requests currently being served.
+        draining: Set once shutdown has begun.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.draining = False
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait until no request is in flight.
+
+        Args:
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            bool: True if all requests finished in time.
+        """
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(_DRAIN_POLL)
+        return self.in_flight == 0
+
+    def install_signal_handlers(self) -> None:
+        """Start draining as soon as SIGTERM or SIGINT arrives.
+
+        The new handlers chain to the ones already installed (uvicorn's,
+        which stop the server), so draining is set before the listening
+        sockets close. Signal handlers can only be set from the main thread;
+        elsewhere (e.g. under ``TestClient``) this is a no-op.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._chain(signum, signal.getsignal(signum)))
+
+    def _chain(self, signum: int, previous: Any) -> Callable[[int, Any], None]:
+        def handler(received: int, frame: Any) -> None:
+            if not self.draining:
+                logger.info(f"Received {signal.Signals(received).name}; draining")
+            self.draining = True
+            if callable(previous):
+                previous(received, frame)
+            elif previous == signal.SIG_DFL:
+                signal.signal(signum, signal.SIG_DFL)
+                os.kill(os.getpid(), signum)
+
+        return handler
+
+
+@lru_cache(maxsize=1)
+def get_lifecycle() -> Lifecycle:
+    """Get the process-wide lifecycle state.
+
+    Returns:
+        Lifecycle: Shared lifecycle state.
+    """
+    return Lifecycle()
+
+
+class InFlightMiddleware:
+    """Pure ASGI middleware counting in-flight requests.
+
+    Once the worker is draining, new requests are answered with 503 and
+    ``Connection: close`` so that clients and load balancers retry them on
+    another worker.
+
+    Args:
+        app: Downstream ASGI application.
+        lifecycle: Shared lifecycle state.
+    """
+
+    def __init__(self, app: ASGIApp, lifecycle: Optional[Lifecycle] = None) -> None:
+        self.app = app
+        self.lifecycle = lifecycle or get_lifecycle()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        lifecycle = self.lifecycle
+        if lifecycle.draining:
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"connection", b"close"),
+                    (b"retry-after", b"1"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": b'{"detail":"Shutting down"}'})
+            return
+        lifecycle.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lifecycle.in_flight -= 1
+
+
+class AppResources:
+    """Resources owned by one worker for the lifetime of the application.
+
+    Args:
+        engine: Database engine, disposed on shutdown.
+        lifecycle: Shared lifecycle state.
+        metrics_writer: Optional multiprocess metrics flusher.
+        warmup: Run start-up warm-up (see :mod:`app.core.startup`).
+        warm_connections: Pool connections opened during warm-up.
+        drain_timeout: Seconds to wait for in-flight requests on shutdown.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        lifecycle: Lifecycle,
+        metrics_writer: Optional[SnapshotWriter] = None,
+        warmup: bool = True,
+        warm_connections: int = 2,
+        drain_timeout: float = 25.0,
+    ) -> None:
+        self.engine = engine
+        self.lifecycle = lifecycle
+        self.metrics_writer = metrics_writer
+        self.warmup = warmup
+        self.warm_connections = warm_connections
+        self.drain_timeout = drain_timeout
+        self._startups: List[Callable[[], None]] = []
+        self._cleanups: List[Callable[[], None]] = []
+
+    def add_startup(self, callback: Callable[[], None]) -> None:
+        """Register a blocking callback run (in the threadpool) after warm-up."""
+        self._startups.append(callback)
+
+    def add_cleanup(self, callback: Callable[[], None]) -> None:
+        """Register a callback run on shutdown (in reverse registration order)."""
+        self._cleanups.append(callback)
+
+    async def startup(self, app: FastAPI) -> None:
+        """Start background work and warm caches before traffic arrives."""
+        self.lifecycle.draining = False
+        self.lifecycle.install_signal_handlers()
+        if self.metrics_writer is not None:
+            self.metrics_writer.start()
+        if self.warmup:
+            await run_in_threadpool(warm_up, app, self.engine, self.warm_connections)
+        for callback in self._startups:
+            await run_in_threadpool(callback)
+
+    async def shutdown(self) -> None:
+        """Drain in-flight requests, stop background work and close connections."""
+        self.lifecycle.draining = True
+        if not await self.lifecycle.drain(self.drain_timeout):
+            logger.warning(
+                f"{self.lifecycle.in_flight} request(s) still in flight after "
+                f"{self.drain_timeout:.0f}s; shutting down anyway"
+            )
+        for callback in reversed(self._cleanups):
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Shutdown cleanup {callback!r} failed: {e}")
+        if self.metrics_writer is not None:
+            await run_in_threadpool(self.metrics_writer.stop)
+        get_slow_query_log().shutdown()
+        self.engine.dispose()
+        logger.info("Database connections closed")
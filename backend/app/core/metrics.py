@@ -0,0 +1,592 @@
+"""In-Process Metrics and Prometheus Exposition.
+
+This module provides lightweight, thread-safe metric primitives used by the
+request instrumentation, and renders them in the Prometheus text format for
+``GET /metrics``. Histograms use fixed bucket boundaries so that observations
+cost one bisect and two additions.
+
+Multiple uvicorn workers are supported through a shared directory
+(``METRICS_MULTIPROC_DIR``): each worker periodically writes a snapshot of its
+counters and histograms to ``<dir>/metrics-<pid>.json``, and whichever worker
+answers a scrape merges all snapshots. Counters and histograms are summed;
+the snapshots of exited workers are folded into ``metrics-retired.json`` and
+deleted, so totals never go backwards and the directory does not grow with
+every worker restart. Gauges are reported per live ``pid``.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import bisect
+import fcntl
+import gc
+import json
+import logging
+import os
+import resource
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Default latency buckets in seconds (upper bounds, +Inf implied)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Buckets for small integer counts (e.g. SQL statements per request)
+COUNT_BUCKETS: Tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Accumulated counters and histograms of exited workers (multiprocess mode)
+RETIRED_SNAPSHOT = "metrics-retired.json"
+
+LabelValues = Tuple[str, ...]
+
+
+class HistogramSeries:
+    """Bucket counts, sum and count for one label combination."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.counts: List[int] = [0] * (n_buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Counter:
+    """A labelled, monotonically increasing counter.
+
+    Args:
+        name: Metric name.
+        documentation: Help text.
+        labelnames: Names of the labels, in order.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        """Increment the counter.
+
+        Args:
+            amount: Non-negative increment.
+            *labels: Label values, in ``labelnames`` order.
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        """Return a point-in-time copy of all series."""
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        """Drop all series."""
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """A labelled histogram with fixed bucket boundaries.
+
+    Args:
+        name: Metric name.
+        documentation: Help text.
+        labelnames: Names of the labels, in order.
+        buckets: Sorted bucket upper bounds (an implicit +Inf bucket is added).
+
+    Example:
+        >>> h = Histogram("latency_seconds", "Latency", ("route",))
+        >>> h.observe(0.02, "/api/entities")
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[LabelValues, HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation.
+
+        Args:
+            value: Observed value.
+            *labels: Label values, in ``labelnames`` order.
+        """
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = HistogramSeries(len(self.buckets))
+            series.counts[idx] += 1
+            series.sum += value
+            series.count += 1
+
+    def series(self) -> Dict[LabelValues, HistogramSeries]:
+        """Return a point-in-time copy of all series."""
+        with self._lock:
+            out = {}
+            for labels, s in self._series.items():
+                copy = HistogramSeries(len(self.buckets))
+                copy.counts = list(s.counts)
+                copy.sum = s.sum
+                copy.count = s.count
+                out[labels] = copy
+            return out
+
+    def quantile(self, q: float, *labels: str) -> float:
+        """Estimate a quantile for one series by linear bucket interpolation.
+
+        Args:
+            q: Quantile in [0, 1].
+            *labels: Label values identifying the series.
+
+        Returns:
+            float: Estimated value, or 0.0 if the series is empty.
+        """
+        series = self.series().get(labels)
+        if series is None or series.count == 0:
+            return 0.0
+        rank = q * series.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(series.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else lower
+            if seen + n >= rank and n:
+                return lower + (upper - lower) * ((rank - seen) / n)
+            seen += n
+            lower = upper
+        return lower
+
+    def reset(self) -> None:
+        """Drop all series."""
+        with self._lock:
+            self._series.clear()
+
+
+class GaugeSample:
+    """A point-in-time value produced by a collector.
+
+    Collectors mostly report gauges; ``kind="counter"`` exposes a
+    monotonic value read from elsewhere (e.g. CPU time) as a counter.
+    """
+
+    __slots__ = ("name", "documentation", "labels", "value", "kind")
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None,
+        kind: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels or {}
+        self.value = value
+        self.kind = kind
+
+
+Collector = Callable[[], Iterable[GaugeSample]]
+
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time gauge collectors."""
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Counter | Histogram] = {}
+        self.collectors: List[Collector] = []
+
+    def register(self, metric: Counter | Histogram) -> Any:
+        """Register a counter or histogram and return it."""
+        self.metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callable that yields gauges at scrape time."""
+        self.collectors.append(collector)
+
+    def collect_gauges(self) -> List[GaugeSample]:
+        """Run all collectors, skipping any that fail."""
+        samples: List[GaugeSample] = []
+        for collector in self.collectors:
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector!r} failed: {e}")
+        return samples
+
+    # -- Snapshots (multiprocess mode) -------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serialize this process's metrics to a JSON-compatible dict."""
+        counters: Dict[str, List[Any]] = {}
+        histograms: Dict[str, List[Any]] = {}
+        for name, metric in self.metrics.items():
+            if isinstance(metric, Counter):
+                counters[name] = [[list(k), v] for k, v in metric.values().items()]
+            else:
+                histograms[name] = [
+                    [list(k), s.counts, s.sum, s.count] for k, s in metric.series().items()
+                ]
+        gauges = [[g.name, g.documentation, g.labels, g.value, g.kind] for g in self.collect_gauges()]
+        return {
+            "pid": os.getpid(),
+            "counters": counters,
+            "histograms": histograms,
+            "gauges": gauges,
+        }
+
+    def write_snapshot(self, directory: str) -> None:
+        """Atomically write this process's snapshot into ``directory``."""
+        path = Path(directory) / f"metrics-{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, path)
+
+    # -- Exposition --------------------------------------------------------
+
+    def render(self, multiproc_dir: Optional[str] = None) -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            multiproc_dir: If set, merge snapshots from every worker in this
+                directory instead of reporting only this process.
+
+        Returns:
+            str: Exposition text.
+        """
+        if multiproc_dir:
+            self.write_snapshot(multiproc_dir)
+            snapshots = _read_snapshots(multiproc_dir)
+        else:
+            snapshots = [self.snapshot()]
+
+        lines: List[str] = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            if isinstance(metric, Counter):
+                merged_c: Dict[LabelValues, float] = {}
+                for snap in snapshots:
+                    for labels, value in snap["counters"].get(name, ()):
+                        key = tuple(labels)
+                        merged_c[key] = merged_c.get(key, 0.0) + value
+                for key, value in sorted(merged_c.items()):
+                    lines.append(f"{name}{_labels(metric.labelnames, key)} {_num(value)}")
+            else:
+                merged_h: Dict[LabelValues, HistogramSeries] = {}
+                for snap in snapshots:
+                    for labels, counts, total, count in snap["histograms"].get(name, ()):
+                        key = tuple(labels)
+                        series = merged_h.setdefault(key, HistogramSeries(len(metric.buckets)))
+                        series.counts = [a + b for a, b in zip(series.counts, counts)]
+                        series.sum += total
+                        series.count += count
+                for key, series in sorted(merged_h.items()):
+                    cumulative = 0
+                    bounds = [*(_num(b) for b in metric.buckets), "+Inf"]
+                    for bound, n in zip(bounds, series.counts):
+                        cumulative += n
+                        le = _labels(metric.labelnames + ("le",), key + (bound,))
+                        lines.append(f"{name}_bucket{le} {cumulative}")
+                    base = _labels(metric.labelnames, key)
+                    lines.append(f"{name}_sum{base} {_num(series.sum)}")
+                    lines.append(f"{name}_count{base} {series.count}")
+
+        # Samples of one family must be contiguous, so group across workers first
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+        for snap in snapshots:
+            for gname, doc, glabels, value, *kind in snap["gauges"]:
+                if multiproc_dir:
+                    glabels = {**glabels, "pid": str(snap["pid"])}
+                keys = tuple(glabels)
+                sample = f"{gname}{_labels(keys, tuple(glabels[k] for k in keys))} {_num(value)}"
+                families.setdefault(gname, (doc, kind[0] if kind else "gauge", []))[2].append(sample)
+        for gname, (doc, kind, samples) in families.items():
+            lines.append(f"# HELP {gname} {doc}")
+            lines.append(f"# TYPE {gname} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    inner = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + inner + "}"
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge_snapshot(into: Dict[str, Any], snap: Dict[str, Any]) -> None:
+    """Add the counters and histograms of ``snap`` to ``into`` (gauges are dropped)."""
+    for name, samples in snap["counters"].items():
+        merged = {tuple(labels): value for labels, value in into["counters"].get(name, ())}
+        for labels, value in samples:
+            merged[tuple(labels)] = merged.get(tuple(labels), 0.0) + value
+        into["counters"][name] = [[list(k), v] for k, v in merged.items()]
+    for name, samples in snap["histograms"].items():
+        merged_h = {tuple(labels): rest for labels, *rest in into["histograms"].get(name, ())}
+        for labels, counts, total, count in samples:
+            key = tuple(labels)
+            if key in merged_h:
+                old_counts, old_total, old_count = merged_h[key]
+                counts = [a + b for a, b in zip(old_counts, counts)]
+                total, count = old_total + total, old_count + count
+            merged_h[key] = [counts, total, count]
+        into["histograms"][name] = [[list(k), *rest] for k, rest in merged_h.items()]
+
+
+def _retire_dead(directory: Path, dead: List[Tuple[Path, Dict[str, Any]]]) -> None:
+    """Fold snapshots of exited workers into the retired snapshot and delete them.
+
+    Runs under an exclusive lock on the directory so that concurrent scrapes
+    in different workers never fold the same snapshot twice.
+    """
+    with open(directory / "metrics.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        retired_path = directory / RETIRED_SNAPSHOT
+        try:
+            retired = json.loads(retired_path.read_text())
+        except FileNotFoundError:
+            retired = {"pid": None, "counters": {}, "histograms": {}, "gauges": []}
+        folded = []
+        for path, snap in dead:
+            if path.exists():
+                _merge_snapshot(retired, snap)
+                folded.append(path)
+        if not folded:
+            return
+        tmp = retired_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(retired))
+        os.replace(tmp, retired_path)
+        for path in folded:
+            path.unlink(missing_ok=True)
+    logger.info(f"Retired metrics snapshots of {len(folded)} exited workers")
+
+
+def _read_snapshots(directory: str) -> List[Dict[str, Any]]:
+    root = Path(directory)
+    snapshots = []
+    dead = []
+    for path in root.glob("metrics-*.json"):
+        try:
+            snap = json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            logger.debug(f"Skipping unreadable metrics snapshot {path}: {e}")
+            continue
+        if snap["pid"] is not None and not _pid_alive(snap["pid"]):
+            dead.append((path, snap))
+        else:
+            snapshots.append(snap)
+    if dead:
+        try:
+            _retire_dead(root, dead)
+            retired = json.loads((root / RETIRED_SNAPSHOT).read_text())
+            snapshots = [s for s in snapshots if s["pid"] is not None] + [retired]
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to retire metrics snapshots: {e}")
+            snapshots.extend({**snap, "gauges": []} for _, snap in dead)
+    return snapshots
+
+
+class SnapshotWriter:
+    """Background thread that flushes this worker's snapshot periodically.
+
+    Args:
+        registry: Registry to snapshot.
+        directory: Shared multiprocess directory.
+        interval: Seconds between flushes.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str, interval: float) -> None:
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Create the directory and start flushing."""
+        Path(self.directory).mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the current snapshot, logging (not raising) on failure."""
+        try:
+            self.registry.write_snapshot(self.directory)
+        except OSError as e:
+            logger.warning(f"Failed to write metrics snapshot: {e}")
+
+    def stop(self) -> None:
+        """Stop the thread and write a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+        self.flush()
+
+
+# ---------------------------------------------------------------------------
+# Application metrics
+# ---------------------------------------------------------------------------
+
+REGISTRY = MetricsRegistry()
+
+# Request latency (and, via _count, request totals) per route template,
+# method and status code
+REQUEST_LATENCY: Histogram = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route",
+        ("method", "route", "status"),
+    )
+)
+
+# SQL statements executed per request
+DB_QUERIES_PER_REQUEST: Histogram = REGISTRY.register(
+    Histogram(
+        "db_queries_per_request",
+        "SQL statements executed per HTTP request",
+        ("route",),
+        buckets=COUNT_BUCKETS,
+    )
+)
+
+# Cache lookups by cache name and result (hit/miss)
+CACHE_REQUESTS: Counter = REGISTRY.register(
+    Counter("cache_requests_total", "Cache lookups by cache and result", ("cache", "result"))
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one lookup against a named cache.
+
+    Args:
+        cache: Cache name (e.g. ``sql_compiled``).
+        hit: Whether the lookup was served from the cache.
+    """
+    CACHE_REQUESTS.inc(1.0, cache, "hit" if hit else "miss")
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_compiled_cache(conn: Any, cursor: Any, statement: Any, parameters: Any,
+                          context: Any, executemany: bool) -> None:
+    # Statements that cannot be cached (raw SQL, caching disabled) are ignored
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit is CACHE_HIT:
+        record_cache("sql_compiled", True)
+    elif cache_hit is CACHE_MISS:
+        record_cache("sql_compiled", False)
+
+
+def pool_collector(engine: Engine) -> Collector:
+    """Build a collector reporting connection pool usage for ``engine``.
+
+    Pools without size accounting (e.g. ``StaticPool`` for SQLite) report
+    nothing.
+    """
+
+    def collect() -> Iterable[GaugeSample]:
+        pool = engine.pool
+        for attr, doc in (
+            ("size", "Configured pool size"),
+            ("checkedout", "Connections currently checked out"),
+            ("checkedin", "Idle connections in the pool"),
+            ("overflow", "Connections opened beyond the pool size"),
+        ):
+            method = getattr(pool, attr, None)
+            if callable(method):
+                yield GaugeSample(f"db_pool_{attr}", doc, float(method()))
+
+    return collect
+
+
+def process_collector() -> Iterable[GaugeSample]:
+    """Report resident memory, CPU time, open files and GC statistics."""
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    yield GaugeSample("process_resident_memory_bytes", "Resident memory size", float(rss))
+    yield GaugeSample(
+        "process_cpu_seconds_total", "User and system CPU time", time.process_time(), kind="counter"
+    )
+    try:
+        yield GaugeSample(
+            "process_open_fds", "Open file descriptors", float(len(os.listdir("/proc/self/fd")))
+        )
+    except OSError:
+        pass
+    for generation, stats in enumerate(gc.get_stats()):
+        labels = {"generation": str(generation)}
+        yield GaugeSample(
+            "python_gc_collections_total", "GC runs per generation", stats["collections"], labels,
+            kind="counter",
+        )
+        yield GaugeSample(
+            "python_gc_objects_collected_total", "Objects collected per generation",
+            stats["collected"], labels, kind="counter",
+        )
+    for generation, count in enumerate(gc.get_count()):
+        yield GaugeSample(
+            "python_gc_pending_objects", "Allocations since last collection per generation",
+            float(count), {"generation": str(generation)},
+        )
+
+
+REGISTRY.add_collector(process_collector)
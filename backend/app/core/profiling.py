@@ -0,0 +1,381 @@
+"""On-Demand Request Profiling.
+
+This module provides an opt-in sampling profiler for individual requests.
+A request is profiled when it carries ``X-Profile: 1`` together with a valid
+``X-Admin-Token``, or when it is picked by ``PROFILING_SAMPLE_RATE``. While
+the request runs, a background thread samples the Python stacks of the
+event-loop thread and of the threadpool thread running the route handler
+every ``PROFILING_INTERVAL_MS``.
+
+Captured profiles are written to a bounded directory shared by the workers
+of a host (``PROFILING_DIR``, ``/dev/shm/matrixhub-profiles`` by default),
+so the admin API finds a profile whichever worker captured it. They are
+exported as collapsed stacks (for ``flamegraph.pl``/``inferno``) or
+speedscope JSON. The response carries an ``X-Profile-Id`` header.
+
+``ProfilingMiddleware`` is only installed when ``PROFILING_ENABLED`` is set,
+so there is no per-request cost otherwise.
+
+Note:
+    Samples of the event-loop thread include any other request interleaved
+    on the loop; profile under low concurrency for clean flamegraphs.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Deepest stack recorded per sample
+MAX_STACK_DEPTH = 128
+
+Stack = Tuple[str, ...]
+
+_labels: Dict[CodeType, str] = {}
+
+
+def _label(code: CodeType) -> str:
+    """Return (and cache) a flamegraph frame label for a code object."""
+    label = _labels.get(code)
+    if label is None:
+        label = _labels[code] = f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+    return label
+
+
+def _stack(frame: Optional[FrameType]) -> Stack:
+    """Return the call stack ending at ``frame``, outermost frame first."""
+    labels: List[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class RequestProfile:
+    """Stack samples collected for one request.
+
+    Attributes:
+        profile_id: Identifier returned in the ``X-Profile-Id`` header.
+        method: HTTP method.
+        path: Request path.
+        route: Route template, once known.
+        status: Response status code.
+        started_at: Wall-clock start (UNIX seconds).
+        duration_ms: Request duration.
+        interval_ms: Sampling interval.
+        stacks: Sample counts per distinct stack.
+    """
+
+    def __init__(self, method: str, path: str, interval_ms: float) -> None:
+        self.profile_id = secrets.token_hex(8)
+        self.method = method
+        self.path = path
+        self.route = ""
+        self.status = 0
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+        self.interval_ms = interval_ms
+        self.stacks: Counter[Stack] = Counter()
+        self._threads: Counter[int] = Counter()
+        self._lock = threading.Lock()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the finished profile for the shared store."""
+        return {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "interval_ms": self.interval_ms,
+            "stacks": [[list(stack), count] for stack, count in self.stacks.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RequestProfile":
+        """Restore a profile written by :meth:`to_dict`."""
+        profile = cls(data["method"], data["path"], data["interval_ms"])
+        profile.profile_id = data["profile_id"]
+        profile.route = data["route"]
+        profile.status = data["status"]
+        profile.started_at = data["started_at"]
+        profile.duration_ms = data["duration_ms"]
+        profile.stacks = Counter({tuple(stack): count for stack, count in data["stacks"]})
+        return profile
+
+    @property
+    def samples(self) -> int:
+        """Total number of samples taken."""
+        return sum(self.stacks.values())
+
+    def enter_thread(self) -> None:
+        """Start sampling the calling thread (nestable)."""
+        with self._lock:
+            self._threads[threading.get_ident()] += 1
+
+    def exit_thread(self) -> None:
+        """Stop sampling the calling thread once every ``enter_thread`` is undone."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] -= 1
+            if self._threads[ident] <= 0:
+                del self._threads[ident]
+
+    def sample(self) -> None:
+        """Record the current stack of every registered thread."""
+        frames = sys._current_frames()
+        with self._lock:
+            idents = list(self._threads)
+        for ident in idents:
+            frame = frames.get(ident)
+            # Skip an idle event loop waiting in the selector
+            if frame is not None and not frame.f_code.co_filename.endswith("selectors.py"):
+                self.stacks[_stack(frame)] += 1
+
+    def collapsed(self) -> str:
+        """Render samples in the collapsed-stack format (``a;b;c count``)."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def speedscope(self) -> Dict[str, Any]:
+        """Render samples as a speedscope ``sampled`` profile document."""
+        frames: List[Dict[str, Any]] = []
+        index: Dict[str, int] = {}
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self.stacks.items():
+            ids = []
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    name, _, location = label.partition(" (")
+                    file, _, line = location.rstrip(")").rpartition(":")
+                    frames.append({"name": name, "file": file, "line": int(line or 0)})
+                ids.append(index[label])
+            samples.append(ids)
+            weights.append(count * self.interval_ms)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path}",
+            "exporter": "network-matrixhub",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"{self.method} {self.route or self.path}",
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+_active: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Return the profile of the request being handled, if it is being profiled."""
+    return _active.get()
+
+
+class _Sampler(threading.Thread):
+    """Background thread sampling one profile until stopped."""
+
+    def __init__(self, profile: RequestProfile) -> None:
+        super().__init__(name=f"profiler-{profile.profile_id}", daemon=True)
+        self.profile = profile
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        interval = self.profile.interval_ms / 1000.0
+        while not self.stopped.wait(interval):
+            self.profile.sample()
+
+
+def default_profile_dir() -> str:
+    """Return ``PROFILING_DIR``, or a RAM-backed default location."""
+    if settings.PROFILING_DIR:
+        return settings.PROFILING_DIR
+    shm = Path("/dev/shm")
+    root = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return str(root / "matrixhub-profiles")
+
+
+class ProfileStore:
+    """Bounded store of captured profiles shared through a directory.
+
+    Each profile is one JSON file named after the time it was stored, so
+    every worker pointed at the same directory sees (and evicts, oldest
+    first) the profiles of all of them.
+
+    Args:
+        directory: Directory shared by the workers of this host.
+        max_profiles: Maximum number of profiles kept.
+    """
+
+    def __init__(self, directory: str, max_profiles: int) -> None:
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def _files(self) -> List[Path]:
+        """Return the stored profile files, oldest first."""
+        return sorted(self.directory.glob("profile-*.json"))
+
+    @staticmethod
+    def _read(path: Path) -> Optional[RequestProfile]:
+        try:
+            return RequestProfile.from_dict(json.loads(path.read_text()))
+        except (OSError, ValueError, KeyError) as e:
+            # Evicted by another worker in the meantime, or unreadable
+            logger.debug(f"Skipping profile {path.name}: {e}")
+            return None
+
+    def add(self, profile: RequestProfile) -> None:
+        """Store a finished profile, evicting the oldest beyond the bound."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"profile-{time.time_ns():020d}-{profile.profile_id}.json"
+        tmp = self.directory / f".{name}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(profile.to_dict()))
+        os.replace(tmp, self.directory / name)
+        for path in self._files()[: -self.max_profiles]:
+            path.unlink(missing_ok=True)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        """Return a stored profile by id."""
+        if not profile_id.isalnum():
+            return None
+        for path in self.directory.glob(f"profile-*-{profile_id}.json"):
+            return self._read(path)
+        return None
+
+    def list(self) -> List[RequestProfile]:
+        """Return stored profiles, newest first."""
+        profiles = (self._read(path) for path in reversed(self._files()))
+        return [profile for profile in profiles if profile is not None]
+
+    def clear(self) -> None:
+        """Drop all stored profiles."""
+        for path in self._files():
+            path.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)
+def get_profile_store() -> ProfileStore:
+    """Get the process-wide profile store.
+
+    Returns:
+        ProfileStore: Store in ``default_profile_dir()`` sized by
+        ``PROFILING_MAX_PROFILES``.
+    """
+    return ProfileStore(default_profile_dir(), settings.PROFILING_MAX_PROFILES)
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware profiling selected requests.
+
+    Args:
+        app: Downstream ASGI application.
+        sample_rate: Fraction of requests profiled without being asked.
+        interval_ms: Sampling interval in milliseconds.
+        admin_token: Token required alongside ``X-Profile`` (header-triggered
+            profiling is disabled when empty).
+        store: Where finished profiles are kept.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 0.0,
+        interval_ms: float = 5.0,
+        admin_token: Optional[str] = None,
+        store: Optional[ProfileStore] = None,
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval_ms = interval_ms
+        self.admin_token = admin_token
+        self.store = store or get_profile_store()
+
+    def _requested(self, scope: Scope) -> bool:
+        if not self.admin_token or _header(scope, b"x-profile") not in ("1", "true"):
+            return False
+        token = _header(scope, b"x-admin-token")
+        return token is not None and secrets.compare_digest(token, self.admin_token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (
+            self._requested(scope) or (self.sample_rate and random.random() < self.sample_rate)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], self.interval_ms)
+        header = (b"x-profile-id", profile.profile_id.encode())
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        token = _active.set(profile)
+        profile.enter_thread()  # The event-loop thread
+        sampler = _Sampler(profile)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stopped.set()
+            await run_in_threadpool(sampler.join)
+            profile.exit_thread()
+            _active.reset(token)
+            profile.duration_ms = (time.perf_counter() - started) * 1000.0
+            route = scope.get("route")
+            profile.route = getattr(route, "path", "")
+            await run_in_threadpool(self.store.add, profile)
+            logger.info(
+                f"Captured profile {profile.profile_id} for {profile.method} {profile.path} "
+                f"({profile.samples} samples, {profile.duration_ms:.1f} ms)"
+            )
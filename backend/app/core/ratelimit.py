@@ -0,0 +1,386 @@
+"""Token-Bucket Rate Limiting.
+
+This module provides rate limiting for the Network MatrixHub backend using the
+token-bucket algorithm. Buckets are keyed by an arbitrary string (client IP,
+username, route) and cost O(1) memory per active key. Idle buckets are evicted
+periodically: a bucket that has been idle long enough to refill completely is
+indistinguishable from a fresh one, so dropping it never changes a decision.
+
+Two backends are available:
+
+- ``InMemoryRateLimitBackend``: per-process buckets (default).
+- ``RedisRateLimitBackend``: buckets stored in a Redis-compatible server so
+  limits hold across all uvicorn workers. Requires the optional ``redis``
+  package and ``RATE_LIMIT_REDIS_URL``. While the server is unreachable, a
+  :class:`~app.core.circuit.CircuitBreaker` sends hits to local buckets
+  without waiting for a timeout on each one.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.circuit import CircuitBreaker
+from app.core.config import settings
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """A token-bucket limit.
+
+    Attributes:
+        rate: Tokens added per second (sustained request rate).
+        burst: Bucket capacity (maximum burst size).
+    """
+
+    rate: float
+    burst: int
+
+    @classmethod
+    def per_minute(cls, per_minute: float, burst: int) -> "RateLimitRule":
+        """Build a rule from a per-minute rate.
+
+        Args:
+            per_minute: Sustained requests per minute.
+            burst: Maximum burst size.
+
+        Returns:
+            RateLimitRule: The equivalent per-second rule.
+        """
+        return cls(rate=per_minute / 60.0, burst=burst)
+
+    @property
+    def idle_ttl(self) -> float:
+        """Seconds after which an untouched bucket is full again."""
+        return self.burst / self.rate
+
+
+class TokenBucket:
+    """Compact token-bucket state for a single key.
+
+    Attributes:
+        tokens: Tokens currently available.
+        updated: Monotonic timestamp of the last refill.
+        ttl: Idle time after which the bucket is full and can be evicted.
+    """
+
+    __slots__ = ("tokens", "updated", "ttl")
+
+    def __init__(self, tokens: float, updated: float, ttl: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+        self.ttl = ttl
+
+    def take(self, rule: RateLimitRule, now: float) -> Tuple[bool, float]:
+        """Refill the bucket and try to consume one token.
+
+        Args:
+            rule: Limit to apply.
+            now: Current monotonic time.
+
+        Returns:
+            Tuple of (allowed, retry_after_seconds).
+        """
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(float(rule.burst), self.tokens + elapsed * rule.rate)
+            self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True, 0.0
+        return False, (1.0 - self.tokens) / rule.rate
+
+
+class InMemoryRateLimitBackend:
+    """Process-local bucket storage with periodic idle-key eviction.
+
+    Args:
+        sweep_interval: Minimum seconds between eviction sweeps.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    # Hits never leave the process, so async callers run them inline
+    blocking = False
+
+    def __init__(
+        self,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._sweep_interval = sweep_interval
+        self._next_sweep = clock() + sweep_interval
+
+    def hit(self, key: str, rule: RateLimitRule) -> Tuple[bool, float]:
+        """Consume one token from the bucket for ``key``.
+
+        Args:
+            key: Bucket key.
+            rule: Limit to apply.
+
+        Returns:
+            Tuple of (allowed, retry_after_seconds).
+        """
+        now = self._clock()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(float(rule.burst), now, rule.idle_ttl)
+                self._buckets[key] = bucket
+            return bucket.take(rule, now)
+
+    def _sweep(self, now: float) -> None:
+        """Evict buckets that have refilled completely. Caller holds the lock."""
+        idle = [k for k, b in self._buckets.items() if now - b.updated >= b.ttl]
+        for key in idle:
+            del self._buckets[key]
+        self._next_sweep = now + self._sweep_interval
+        if idle:
+            logger.debug(f"Evicted {len(idle)} idle rate-limit buckets")
+
+    def reset(self) -> None:
+        """Drop all buckets."""
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Atomic token-bucket update executed server-side. State is a hash of
+# {tokens, ts}; the key expires once the bucket would be full again, which
+# gives the same idle eviction as the in-memory backend.
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = burst
+  ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return {allowed, tostring(retry)}
+"""
+
+
+class RedisRateLimitBackend:
+    """Bucket storage in a Redis-compatible server, shared by all workers.
+
+    Falls back to a local in-memory backend if the server is unreachable so
+    authentication keeps working during a cache outage. After a failure,
+    hits skip Redis until the circuit breaker lets a trial call through.
+
+    Args:
+        url: Redis connection URL (e.g. ``redis://localhost:6379/0``).
+        fallback: Backend used when Redis errors.
+        prefix: Key prefix for bucket entries.
+        client: Redis client to use instead of connecting to ``url``.
+        circuit: Breaker guarding the server (a default one if omitted).
+    """
+
+    # Each hit is a network round trip
+    blocking = True
+
+    def __init__(
+        self,
+        url: str,
+        fallback: InMemoryRateLimitBackend,
+        prefix: str = "matrixhub:rl:",
+        client: Any = None,
+        circuit: Optional[CircuitBreaker] = None,
+    ) -> None:
+        if client is None:
+            import redis  # Optional dependency, imported lazily
+
+            client = redis.Redis.from_url(url, socket_timeout=0.25)
+        self._client = client
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+        self._fallback = fallback
+        self._prefix = prefix
+        self._circuit = circuit or CircuitBreaker("Redis rate limiter")
+
+    def hit(self, key: str, rule: RateLimitRule) -> Tuple[bool, float]:
+        """Consume one token from the shared bucket for ``key``.
+
+        Args:
+            key: Bucket key.
+            rule: Limit to apply.
+
+        Returns:
+            Tuple of (allowed, retry_after_seconds).
+        """
+        if not self._circuit.allow():
+            return self._fallback.hit(key, rule)
+        try:
+            allowed, retry = self._script(
+                keys=[self._prefix + key],
+                args=[rule.rate, rule.burst, time.time()],
+            )
+        except Exception as e:
+            self._circuit.record_failure(e)
+            return self._fallback.hit(key, rule)
+        self._circuit.record_success()
+        return bool(int(allowed)), float(retry)
+
+    def reset(self) -> None:
+        """Drop local fallback buckets (shared buckets expire on their own)."""
+        self._fallback.reset()
+
+
+class RateLimiter:
+    """Facade over a bucket backend.
+
+    Args:
+        backend: Storage backend for buckets.
+        enabled: When False every request is allowed.
+    """
+
+    def __init__(
+        self,
+        backend: InMemoryRateLimitBackend | RedisRateLimitBackend,
+        enabled: bool = True,
+    ) -> None:
+        self.backend = backend
+        self.enabled = enabled
+
+    def hit(self, key: str, rule: RateLimitRule) -> Tuple[bool, float]:
+        """Consume one token for ``key`` under ``rule``.
+
+        Returns:
+            Tuple of (allowed, retry_after_seconds).
+        """
+        if not self.enabled:
+            return True, 0.0
+        return self.backend.hit(key, rule)
+
+    async def ahit(self, key: str, rule: RateLimitRule) -> Tuple[bool, float]:
+        """Consume one token for ``key`` from async code.
+
+        Backends that do network I/O run in the threadpool so the event
+        loop is never blocked on Redis.
+
+        Returns:
+            Tuple of (allowed, retry_after_seconds).
+        """
+        if not self.enabled:
+            return True, 0.0
+        if self.backend.blocking:
+            return await run_in_threadpool(self.backend.hit, key, rule)
+        return self.backend.hit(key, rule)
+
+    def reset(self) -> None:
+        """Forget all bucket state held by this process."""
+        self.backend.reset()
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter configured from settings.
+
+    Returns:
+        RateLimiter: Shared limiter instance.
+    """
+    local = InMemoryRateLimitBackend(sweep_interval=settings.RATE_LIMIT_SWEEP_INTERVAL)
+    backend: InMemoryRateLimitBackend | RedisRateLimitBackend = local
+    if settings.RATE_LIMIT_REDIS_URL:
+        try:
+            backend = RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL, fallback=local)
+            logger.info("Rate limiting uses shared Redis backend")
+        except ImportError:
+            logger.warning("RATE_LIMIT_REDIS_URL set but 'redis' is not installed; using local buckets")
+    return RateLimiter(backend, enabled=settings.RATE_LIMIT_ENABLED)
+
+
+def client_ip(scope: Mapping[str, Any]) -> str:
+    """Return the client address for an ASGI scope.
+
+    uvicorn's ``--proxy-headers`` already resolves ``X-Forwarded-For`` into
+    ``scope["client"]``, so no header parsing is done here.
+    """
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware enforcing per-IP, per-route token buckets.
+
+    Args:
+        app: Downstream ASGI application.
+        rules: Mapping of exact request path to the rule applied to it.
+        limiter: Limiter to use (defaults to the process-wide limiter).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Mapping[str, RateLimitRule],
+        limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        self.app = app
+        self.rules = dict(rules)
+        self.limiter = limiter or get_rate_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        rule = self.rules.get(scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = await self.limiter.ahit(f"ip:{client_ip(scope)}:{scope['path']}", rule)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        logger.warning(f"Rate limit exceeded: {client_ip(scope)} {scope['path']}")
+        body = json.dumps({"detail": "Too many requests. Please slow down."}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
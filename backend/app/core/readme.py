@@ -0,0 +1,95 @@
+"""README Rendering.
+
+READMEs are stored as Markdown blobs (see :mod:`app.core.blobs`) and can be
+served rendered to HTML. Rendering is comparatively expensive, so rendered
+documents are kept in a bounded LRU keyed by blob reference; since blobs are
+content-addressed, an entry can never go stale.
+
+Markdown is rendered with ``markdown-it-py`` (the ``readme`` extra) in
+CommonMark mode with raw HTML disabled, so README content cannot inject
+markup. Without it, the escaped source is returned in a ``<pre>`` block.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import html
+import logging
+from functools import lru_cache
+from typing import Callable, Optional
+
+from app.core.blobs import BlobStore, get_blob_store
+from app.core.compression import BytesLRU
+from app.core.config import settings
+from app.core.metrics import record_cache
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _markdown_renderer() -> Optional[Callable[[str], str]]:
+    try:
+        from markdown_it import MarkdownIt  # Optional dependency
+    except ImportError:
+        logger.info("markdown-it-py is not installed; READMEs render as preformatted text")
+        return None
+    return MarkdownIt("commonmark", {"html": False}).render
+
+
+def render_markdown(text: str) -> str:
+    """Render Markdown to safe HTML.
+
+    Args:
+        text: Markdown source.
+
+    Returns:
+        str: HTML fragment.
+    """
+    render = _markdown_renderer()
+    if render is None:
+        return f"<pre>{html.escape(text)}</pre>\n"
+    return render(text)
+
+
+class ReadmeRenderer:
+    """Renders README blobs to HTML through a byte-bounded LRU.
+
+    Args:
+        store: Blob store holding the Markdown sources.
+        max_bytes: Total size of the rendered documents kept.
+    """
+
+    def __init__(self, store: BlobStore, max_bytes: int) -> None:
+        self.store = store
+        self.cache = BytesLRU(max_bytes)
+
+    def html(self, ref: str) -> bytes:
+        """Return the rendered HTML (UTF-8) of a README blob.
+
+        Raises:
+            BlobNotFoundError: If the blob is missing.
+        """
+        rendered = self.cache.get(ref)
+        record_cache("readme_html", rendered is not None)
+        if rendered is not None:
+            return rendered
+        source = self.store.read(ref).decode("utf-8", errors="replace")
+        rendered = render_markdown(source).encode()
+        self.cache.put(ref, rendered)
+        return rendered
+
+
+@lru_cache(maxsize=1)
+def get_readme_renderer() -> ReadmeRenderer:
+    """Get the process-wide README renderer.
+
+    Returns:
+        ReadmeRenderer: Renderer sized by ``README_HTML_CACHE_BYTES``.
+    """
+    return ReadmeRenderer(get_blob_store(), settings.README_HTML_CACHE_BYTES)
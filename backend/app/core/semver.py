@@ -0,0 +1,169 @@
+"""Semantic Version Parsing.
+
+``Entity.version`` is free-form text. To filter and sort by version in the
+database, each version is parsed on write into sortable components stored in
+indexed columns: integer major/minor/patch and a prerelease *sort key*, a
+string whose byte order matches SemVer 2.0 precedence:
+
+- a release sorts after all of its prereleases (key ``"~"``);
+- prerelease identifiers compare numerically when numeric (``beta.2`` <
+  ``beta.11``), numeric identifiers sort before alphanumeric ones, and a
+  shorter identifier list sorts before a longer one sharing its prefix.
+
+Versions that are not SemVer-like get major ``-1`` (``UNPARSED``): they sort
+after every real version in descending order and never match a range.
+
+Lenient input is accepted: a leading ``v``, missing minor/patch (``2`` and
+``2.0`` mean ``2.0.0``) and build metadata (ignored, as SemVer specifies).
+
+Protocol tags (``mcp@0.1``) are split into a lower-case family name and a
+parsed version by :func:`parse_protocol`; :func:`caret_compatible` is the
+compatibility rule used for protocol versions.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+VERSION_PATTERN = re.compile(
+    r"^\s*[vV]?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+[0-9A-Za-z.-]+)?\s*$"
+)
+RANGE_PATTERN = re.compile(r"^\s*(>=|<=|==|!=|>|<|=)?\s*(\S+?)\s*$")
+
+# Prerelease sort key of a release: above every prerelease key
+RELEASE_KEY = "~"
+
+# Major component of versions that could not be parsed
+UNPARSED = -1
+
+# Components are stored in 32-bit integer columns
+MAX_COMPONENT = 2**31 - 1
+
+# Comparison operators accepted in range specifications
+OPERATORS = ("==", "!=", ">=", ">", "<=", "<")
+
+
+class SemVer(NamedTuple):
+    """Sortable components of a version: compare tuples to compare versions."""
+
+    major: int
+    minor: int
+    patch: int
+    prerelease: str
+
+
+# Components stored for versions that are not SemVer-like
+UNPARSED_VERSION = SemVer(UNPARSED, 0, 0, "")
+
+
+def prerelease_key(prerelease: Optional[str]) -> str:
+    """Encode prerelease identifiers so that string order is SemVer order.
+
+    Numeric identifiers become ``0`` + two-digit length + digits (so longer
+    numbers sort later), alphanumeric ones ``1`` + text; identifiers are
+    joined with ``,``, which sorts below every identifier character.
+
+    Example:
+        >>> prerelease_key("beta.2") < prerelease_key("beta.11") < RELEASE_KEY
+        True
+    """
+    if not prerelease:
+        return RELEASE_KEY
+    parts = []
+    for identifier in prerelease.split("."):
+        if identifier.isdigit():
+            digits = str(int(identifier))
+            parts.append(f"0{len(digits):02d}{digits}")
+        else:
+            parts.append(f"1{identifier}")
+    return ",".join(parts)
+
+
+def parse_version(text: Optional[str]) -> Optional[SemVer]:
+    """Parse a version string.
+
+    Args:
+        text: Version such as ``1.2.3``, ``v2.0`` or ``1.0.0-rc.1+build.5``.
+
+    Returns:
+        Optional[SemVer]: Sortable components, or None if not SemVer-like.
+
+    Example:
+        >>> parse_version("v2.1")
+        SemVer(major=2, minor=1, patch=0, prerelease='~')
+    """
+    match = VERSION_PATTERN.match(text or "")
+    if match is None:
+        return None
+    major, minor, patch = (int(part or 0) for part in match.group(1, 2, 3))
+    if max(major, minor, patch) > MAX_COMPONENT:
+        return None
+    return SemVer(major, minor, patch, prerelease_key(match.group(4)))
+
+
+def parse_range(spec: str) -> List[Tuple[str, SemVer]]:
+    """Parse a comma-separated version range such as ``>=2.0,<3``.
+
+    Each comparator is one of ``==``, ``!=``, ``>=``, ``>``, ``<=``, ``<``
+    (``=`` and a bare version mean ``==``), compared by SemVer precedence.
+
+    Args:
+        spec: Range specification.
+
+    Returns:
+        List of ``(operator, version)`` comparators, all of which must hold.
+
+    Raises:
+        ValueError: If a comparator or its version cannot be parsed.
+
+    Example:
+        >>> [op for op, _ in parse_range(">=2.0, <3")]
+        ['>=', '<']
+    """
+    comparators = []
+    for part in spec.split(","):
+        match = RANGE_PATTERN.match(part)
+        version = parse_version(match.group(2)) if match else None
+        if match is None or version is None:
+            raise ValueError(f"Invalid version comparator: {part.strip()!r}")
+        operator = match.group(1) or "=="
+        comparators.append(("==" if operator == "=" else operator, version))
+    return comparators
+
+
+def parse_protocol(tag: str) -> Tuple[str, str, SemVer]:
+    """Split a protocol tag into family, version string and parsed version.
+
+    Example:
+        >>> parse_protocol("MCP@0.1")[:2]
+        ('mcp', '0.1')
+    """
+    name, _, version = tag.strip().partition("@")
+    return name.lower(), version, parse_version(version) or UNPARSED_VERSION
+
+
+def caret_compatible(required: SemVer, offered: SemVer) -> bool:
+    """Whether ``offered`` satisfies ``^required`` (npm/Cargo caret rule).
+
+    At or above ``required`` and within the same major version; for ``0.x``
+    versions, within the same minor version.
+
+    Example:
+        >>> caret_compatible(parse_version("0.1"), parse_version("0.1.3"))
+        True
+        >>> caret_compatible(parse_version("0.1"), parse_version("0.2"))
+        False
+    """
+    if required.major == UNPARSED or offered < required:
+        return False
+    if required.major > 0:
+        return offered.major == required.major
+    return offered.major == 0 and offered.minor == required.minor
@@ -0,0 +1,327 @@
+"""Slow-Query Log and EXPLAIN Capture.
+
+This module hooks SQLAlchemy engine events to record statements that exceed
+``SLOW_QUERY_THRESHOLD_MS``. Each slow statement is reduced to a normalized
+fingerprint (literals and bind markers replaced by ``?``, ``IN`` lists
+collapsed) so that the same query shape with different filter values is
+aggregated into one entry. Parameters are redacted to type/length markers
+before they are stored.
+
+When ``SLOW_QUERY_EXPLAIN`` is enabled, the plan of the slowest ``SELECT``
+fingerprints is captured in a background thread (``EXPLAIN (ANALYZE,
+BUFFERS)`` on PostgreSQL, ``EXPLAIN QUERY PLAN`` on SQLite). Results are
+served by the admin API.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.timing import current_timings
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+_perf = time.perf_counter
+
+# Normalization patterns, applied in order
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_BINDS = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Minimum seconds between EXPLAIN captures for the same fingerprint
+EXPLAIN_COOLDOWN = 300.0
+
+
+def normalize_sql(statement: str) -> str:
+    """Reduce a SQL statement to its shape.
+
+    Args:
+        statement: SQL text as sent to the driver.
+
+    Returns:
+        str: Statement with literals and bind markers replaced by ``?``.
+
+    Example:
+        >>> normalize_sql("SELECT * FROM entity WHERE type = 'agent' LIMIT 10")
+        'SELECT * FROM entity WHERE type = ? LIMIT ?'
+    """
+    sql = _COMMENTS.sub(" ", statement)
+    sql = _STRINGS.sub("?", sql)
+    sql = _BINDS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("(?...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint_id(normalized: str) -> str:
+    """Return a short stable identifier for a normalized statement."""
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def redact_value(value: Any) -> str:
+    """Describe a bound value without revealing it."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    if isinstance(value, (list, tuple, dict)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Redact driver parameters to type/length markers.
+
+    Args:
+        parameters: Mapping or sequence of bound values (or a list of them
+            for ``executemany``).
+        executemany: Whether ``parameters`` holds several parameter sets.
+
+    Returns:
+        Redacted structure safe to log or return from the admin API.
+    """
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_value(value) for value in parameters]
+    return redact_value(parameters)
+
+
+class SlowQuery:
+    """One recorded slow statement (normalized SQL and redacted parameters)."""
+
+    __slots__ = ("fingerprint", "statement", "parameters", "duration_ms", "route", "recorded_at")
+
+    def __init__(self, fingerprint: str, statement: str, parameters: Any,
+                 duration_ms: float, route: str, recorded_at: float) -> None:
+        self.fingerprint = fingerprint
+        self.statement = statement
+        self.parameters = parameters
+        self.duration_ms = duration_ms
+        self.route = route
+        self.recorded_at = recorded_at
+
+
+class FingerprintStats:
+    """Aggregate statistics for one statement shape."""
+
+    __slots__ = ("fingerprint", "normalized", "count", "total_ms", "max_ms", "routes",
+                 "explain", "explained_at")
+
+    def __init__(self, fingerprint: str, normalized: str) -> None:
+        self.fingerprint = fingerprint
+        self.normalized = normalized
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.routes: Dict[str, int] = {}
+        self.explain: Optional[str] = None
+        self.explained_at = 0.0
+
+
+class SlowQueryLog:
+    """Bounded store of slow statements aggregated by fingerprint.
+
+    Args:
+        threshold_ms: Minimum duration for a statement to be recorded.
+        max_recent: Number of individual slow statements kept.
+        max_fingerprints: Number of distinct fingerprints kept; when full, the
+            fingerprint with the lowest total time is dropped.
+        explain: Capture plans for the slowest SELECT fingerprints.
+        explain_top: Only fingerprints ranked in the top N by max duration are
+            explained.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        max_recent: int = 200,
+        max_fingerprints: int = 500,
+        explain: bool = False,
+        explain_top: int = 10,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.max_fingerprints = max_fingerprints
+        self.explain_enabled = explain
+        self.explain_top = explain_top
+        self.recent: Deque[SlowQuery] = deque(maxlen=max_recent)
+        self.fingerprints: Dict[str, FingerprintStats] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def record(
+        self,
+        engine: Engine,
+        statement: str,
+        parameters: Any,
+        duration_ms: float,
+        executemany: bool,
+    ) -> None:
+        """Record a statement that exceeded the threshold.
+
+        Args:
+            engine: Engine that executed the statement (used for EXPLAIN).
+            statement: SQL text.
+            parameters: Raw driver parameters (redacted before storing).
+            duration_ms: Execution time in milliseconds.
+            executemany: Whether this was an ``executemany`` call.
+        """
+        normalized = normalize_sql(statement)
+        fp = fingerprint_id(normalized)
+        timings = current_timings()
+        route = timings.route if timings is not None and timings.route else "<background>"
+        redacted = redact_parameters(parameters, executemany)
+
+        with self._lock:
+            stats = self.fingerprints.get(fp)
+            if stats is None:
+                if len(self.fingerprints) >= self.max_fingerprints:
+                    coldest = min(self.fingerprints.values(), key=lambda s: s.total_ms)
+                    del self.fingerprints[coldest.fingerprint]
+                stats = self.fingerprints[fp] = FingerprintStats(fp, normalized)
+            new_max = duration_ms > stats.max_ms
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.routes[route] = stats.routes.get(route, 0) + 1
+            self.recent.append(
+                SlowQuery(fp, normalized, redacted, duration_ms, route, time.time())
+            )
+            should_explain = (
+                self.explain_enabled
+                and new_max
+                and not executemany
+                and normalized.lstrip("( ").upper().startswith(("SELECT", "WITH"))
+                and time.monotonic() - stats.explained_at > EXPLAIN_COOLDOWN
+                and self._in_top(stats)
+            )
+            if should_explain:
+                stats.explained_at = time.monotonic()
+
+        logger.warning(f"Slow query {fp} ({duration_ms:.1f} ms, route={route}): {normalized[:200]}")
+        if should_explain:
+            if self._executor is None:
+                # Imported lazily: EXPLAIN capture is off by default
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+            self._executor.submit(self._capture_explain, engine, stats, statement, parameters)
+
+    def _in_top(self, stats: FingerprintStats) -> bool:
+        """Whether ``stats`` ranks among the slowest fingerprints. Caller holds the lock."""
+        slower = sum(1 for s in self.fingerprints.values() if s.max_ms > stats.max_ms)
+        return slower < self.explain_top
+
+    @staticmethod
+    def _capture_explain(engine: Engine, stats: FingerprintStats, statement: str,
+                         parameters: Any) -> None:
+        """Run EXPLAIN for a statement on a separate connection."""
+        if engine.dialect.name == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+        elif engine.dialect.name == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            prefix = "EXPLAIN "
+        try:
+            with engine.connect() as conn:
+                conn.info["slow_query_skip"] = True
+                try:
+                    rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+                finally:
+                    conn.info.pop("slow_query_skip", None)
+                    conn.rollback()
+            stats.explain = "\n".join(" | ".join(str(col) for col in row) for row in rows)
+        except Exception as e:
+            logger.warning(f"EXPLAIN capture failed for {stats.fingerprint}: {e}")
+
+    def top(self, limit: int = 20) -> List[FingerprintStats]:
+        """Return the fingerprints with the highest total time."""
+        with self._lock:
+            ranked = sorted(self.fingerprints.values(), key=lambda s: s.total_ms, reverse=True)
+        return ranked[:limit]
+
+    def recent_queries(self, limit: int = 50) -> List[SlowQuery]:
+        """Return the most recent slow statements, newest first."""
+        with self._lock:
+            return list(self.recent)[-limit:][::-1]
+
+    def shutdown(self) -> None:
+        """Stop the EXPLAIN worker thread, abandoning queued captures."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def clear(self) -> None:
+        """Drop all recorded statements and fingerprints."""
+        with self._lock:
+            self.recent.clear()
+            self.fingerprints.clear()
+
+
+@lru_cache(maxsize=1)
+def get_slow_query_log() -> SlowQueryLog:
+    """Get the process-wide slow-query log configured from settings.
+
+    Returns:
+        SlowQueryLog: Shared slow-query log.
+    """
+    return SlowQueryLog(
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        max_recent=settings.SLOW_QUERY_LOG_SIZE,
+        explain=settings.SLOW_QUERY_EXPLAIN,
+        explain_top=settings.SLOW_QUERY_EXPLAIN_TOP,
+    )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn: Any, cursor: Any, statement: Any, parameters: Any,
+                           context: Any, executemany: bool) -> None:
+    if settings.SLOW_QUERY_ENABLED:
+        conn.info.setdefault("slow_query_start", []).append(_perf())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn: Any, cursor: Any, statement: Any, parameters: Any,
+                          context: Any, executemany: bool) -> None:
+    starts = conn.info.get("slow_query_start")
+    if not starts:
+        return
+    duration_ms = (_perf() - starts.pop()) * 1000.0
+    log = get_slow_query_log()
+    if duration_ms >= log.threshold_ms and not conn.info.get("slow_query_skip"):
+        log.record(conn.engine, statement, parameters, duration_ms, executemany)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context: Any) -> None:
+    # after_cursor_execute does not fire for failed statements
+    conn = context.connection
+    starts = conn.info.get("slow_query_start") if conn is not None else None
+    if starts:
+        starts.pop()
@@ -0,0 +1,98 @@
+"""Worker Start-Up Warm-Up.
+
+This module moves first-request costs into worker start-up, which uvicorn
+completes before it accepts connections:
+
+- the OpenAPI schema is generated once (otherwise built on the first
+  ``/docs`` or ``/openapi.json`` hit),
+- ``STARTUP_WARM_CONNECTIONS`` pool connections are opened and validated,
+- every pre-built entity list statement is compiled into the engine's
+  compiled cache by executing it with ``LIMIT 0``.
+
+Each step is timed and failures are logged rather than raised, so a worker
+whose database is not reachable yet still starts (and reports not ready).
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import time
+from typing import Callable, Dict
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.queries import SORT_ORDERS, list_entities_query
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+def _warm_pool(engine: Engine, connections: int) -> None:
+    """Open, validate and return ``connections`` pooled connections."""
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        connections = min(connections, size())
+    opened = []
+    try:
+        for _ in range(max(connections, 1)):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+def _warm_statements(engine: Engine) -> None:
+    """Compile every entity list template into the compiled cache."""
+    with Session(engine) as session:
+        flags = itertools.product((False, True), repeat=3)
+        for (has_q, has_type, has_protocol), sort in itertools.product(flags, SORT_ORDERS):
+            stmt, params = list_entities_query(
+                "warmup" if has_q else None,
+                "warmup" if has_type else None,
+                "warmup" if has_protocol else None,
+                limit=0,
+                offset=0,
+                sort=sort,
+            )
+            session.execute(stmt, params).all()
+
+
+def warm_up(app: FastAPI, engine: Engine, connections: int = 2) -> Dict[str, float]:
+    """Run all warm-up steps.
+
+    Args:
+        app: Application whose OpenAPI schema is pre-generated.
+        engine: Engine whose pool and compiled cache are warmed.
+        connections: Pool connections to open ahead of traffic.
+
+    Returns:
+        Dict[str, float]: Duration of each successful step in milliseconds.
+    """
+    steps: Dict[str, Callable[[], object]] = {
+        "openapi": app.openapi,
+        "pool": lambda: _warm_pool(engine, connections),
+        "sql_cache": lambda: _warm_statements(engine),
+    }
+    durations: Dict[str, float] = {}
+    for name, step in steps.items():
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Warm-up step '{name}' failed: {e}")
+            continue
+        durations[name] = round((time.perf_counter() - started) * 1000.0, 2)
+    logger.info(f"Warm-up completed: {durations}")
+    return durations
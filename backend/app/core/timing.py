@@ -0,0 +1,275 @@
+"""Request Timing Instrumentation.
+
+This module measures where request time goes and reports it as a
+``Server-Timing`` response header plus per-route latency histograms:
+
+- ``queue``: time between the proxy accepting the request (``X-Request-Start``)
+  and the worker starting on it.
+- ``handler``: time spent inside the route function.
+- ``db``: time spent in cursor executions (SQLAlchemy engine events).
+- ``ser``: response validation, encoding and rendering after the handler.
+- ``app``: total time from the worker receiving the request to the first
+  response byte.
+
+``TimingMiddleware`` is pure ASGI (no ``BaseHTTPMiddleware``), and state is a
+single ``__slots__`` object in a context variable, so the overhead is a few
+``perf_counter`` calls per request.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Mapping, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import DB_QUERIES_PER_REQUEST, REQUEST_LATENCY
+from app.core.profiling import current_profile
+
+_perf = time.perf_counter
+
+
+class RequestTimings:
+    """Accumulated timings for the current request (seconds).
+
+    Attributes:
+        started: ``perf_counter`` value when the middleware saw the request.
+        queue: Time spent waiting in front of the worker.
+        handler: Time spent inside the route function.
+        handler_end: ``perf_counter`` value when the route function returned.
+        db: Time spent executing SQL statements.
+        db_count: Number of SQL statements executed.
+        route: Route template that handled the request.
+    """
+
+    __slots__ = ("started", "queue", "handler", "handler_end", "db", "db_count", "route")
+
+    def __init__(self, started: float, queue: float = 0.0) -> None:
+        self.started = started
+        self.queue = queue
+        self.handler = 0.0
+        self.handler_end = 0.0
+        self.db = 0.0
+        self.db_count = 0
+        self.route = ""
+
+    def server_timing(self, response_start: float) -> str:
+        """Render the ``Server-Timing`` header value.
+
+        Args:
+            response_start: ``perf_counter`` value when the response started.
+
+        Returns:
+            str: Header value with durations in milliseconds.
+        """
+        app = response_start - self.started
+        ser = response_start - self.handler_end if self.handler_end else 0.0
+        parts = [
+            f"app;dur={app * 1000:.2f}",
+            f"handler;dur={self.handler * 1000:.2f}",
+            f'db;dur={self.db * 1000:.2f};desc="{self.db_count} queries"',
+            f"ser;dur={max(ser, 0.0) * 1000:.2f}",
+        ]
+        if self.queue:
+            parts.append(f"queue;dur={self.queue * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Return timings for the request being handled, if any."""
+    return _current.get()
+
+
+def parse_request_start(value: str, now: float) -> float:
+    """Compute queue wait from an ``X-Request-Start`` header.
+
+    Accepts ``t=<epoch>`` or a bare epoch in seconds, milliseconds or
+    microseconds (nginx, Heroku and Render conventions all differ).
+
+    Args:
+        value: Header value.
+        now: Current UNIX time in seconds.
+
+    Returns:
+        float: Queue wait in seconds (0.0 if unparseable or in the future).
+    """
+    try:
+        started = float(value.strip().removeprefix("t="))
+    except ValueError:
+        return 0.0
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return max(0.0, now - started)
+
+
+# ---------------------------------------------------------------------------
+# Database timing (registered on the Engine class, so every engine reports)
+# ---------------------------------------------------------------------------
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn: Any, cursor: Any, statement: Any, parameters: Any,
+                           context: Any, executemany: bool) -> None:
+    conn.info.setdefault("query_start", []).append(_perf())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn: Any, cursor: Any, statement: Any, parameters: Any,
+                          context: Any, executemany: bool) -> None:
+    elapsed = _perf() - conn.info["query_start"].pop()
+    timings = _current.get()
+    if timings is not None:
+        timings.db += elapsed
+        timings.db_count += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context: Any) -> None:
+    # after_cursor_execute does not fire for failed statements
+    conn = context.connection
+    starts = conn.info.get("query_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+# ---------------------------------------------------------------------------
+# Handler timing
+# ---------------------------------------------------------------------------
+
+
+def _timed(call: Callable[..., Any], route: str) -> Callable[..., Any]:
+    """Wrap a route function so its execution time and route are recorded."""
+
+    def _begin() -> float:
+        timings = _current.get()
+        if timings is not None:
+            timings.route = route
+        profile = current_profile()
+        if profile is not None:
+            # Sync handlers run in a threadpool thread the profiler must sample
+            profile.enter_thread()
+        return _perf()
+
+    def _record(start: float) -> None:
+        profile = current_profile()
+        if profile is not None:
+            profile.exit_thread()
+        timings = _current.get()
+        if timings is not None:
+            end = _perf()
+            timings.handler += end - start
+            timings.handler_end = end
+
+    if asyncio.iscoroutinefunction(call):
+
+        @functools.wraps(call)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = _begin()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _record(start)
+
+        return async_wrapper
+
+    @functools.wraps(call)
+    def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = _begin()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            _record(start)
+
+    return sync_wrapper
+
+
+class TimedRoute(APIRoute):
+    """``APIRoute`` that records how long its endpoint function runs.
+
+    Use as ``APIRouter(route_class=TimedRoute)`` so that the time between the
+    endpoint returning and the response starting can be reported as
+    serialization time, and so that the route template is known to
+    instrumentation (e.g. the slow-query log) while the handler runs.
+    """
+
+    def get_route_handler(self) -> Callable[..., Any]:
+        if self.dependant.call is not None:
+            self.dependant.call = _timed(self.dependant.call, self.path_format)
+        return super().get_route_handler()
+
+
+# ---------------------------------------------------------------------------
+# ASGI middleware
+# ---------------------------------------------------------------------------
+
+
+def _header(scope: Mapping[str, Any], name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class TimingMiddleware:
+    """Pure ASGI middleware emitting ``Server-Timing`` and latency histograms.
+
+    Args:
+        app: Downstream ASGI application.
+        emit_header: Add the ``Server-Timing`` header to responses.
+    """
+
+    def __init__(self, app: ASGIApp, emit_header: bool = True) -> None:
+        self.app = app
+        self.emit_header = emit_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = _perf()
+        request_start = _header(scope, b"x-request-start")
+        queue = parse_request_start(request_start, time.time()) if request_start else 0.0
+        timings = RequestTimings(started, queue)
+        token = _current.set(timings)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.emit_header:
+                    headers = list(message.get("headers", ()))
+                    headers.append(
+                        (b"server-timing", timings.server_timing(_perf()).encode("latin-1"))
+                    )
+                    message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            timings.route = getattr(route, "path", "<unmatched>")
+            REQUEST_LATENCY.observe(
+                _perf() - started, scope["method"], timings.route, str(status_code)
+            )
+            DB_QUERIES_PER_REQUEST.observe(timings.db_count, timings.route)
@@ -0,0 +1,244 @@
+"""Activity Feed Timelines.
+
+Each entity's dashboard shows posts by the entities it is connected to,
+newest first. Computing that on read would join ``connection`` with every
+connection's posts. Instead, timelines are materialized with a hybrid
+fan-out:
+
+- **Push.** A post by an author with at most ``FEED_FANOUT_MAX_FOLLOWERS``
+  connections is copied into each connection's timeline (one
+  ``timeline_entry`` row each) when it is written. Reading pushed posts is a
+  descending range scan of the ``(owner, post_id)`` primary key.
+- **Pull.** A post by a larger author would cost that many rows, so it is
+  only marked ``fanout = false``. Readers fetch such posts at read time from
+  the partial index ``ix_post_pulled``, which holds only these posts, for
+  the authors they are connected to.
+
+Both sources are read with the same keyset cursor (post ids increase with
+time) and merged. Every author's posts also go to the author's own
+timeline.
+
+The first page of recently read timelines is cached per worker
+(:class:`TimelineCache`). A local post evicts its recipients' entries;
+posts made through other workers and pulled posts show up once an entry
+expires (``FEED_CACHE_TTL_SECONDS``).
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.models.connection import Connection
+from app.models.entity import Entity
+from app.models.feed import Post, TimelineEntry
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# A page of feed rows and the cursor of the next page
+FeedPage = Tuple[List[Any], Optional[int]]
+
+
+def feed_columns() -> Select:
+    """Select posts with the author fields shown in a feed."""
+    return select(
+        Post.id,
+        Post.author,
+        Entity.name.label("author_name"),
+        Entity.type.label("author_type"),
+        Post.content,
+        Post.likes,
+        Post.comments,
+        Post.created_at,
+    ).join(Entity, Entity.uid == Post.author)
+
+
+def _page(rows: Sequence[Any], limit: int) -> FeedPage:
+    """Split ``limit + 1`` rows into a page and its ``next_before`` cursor."""
+    items = list(rows[:limit])
+    return items, (items[-1].id if len(rows) > limit else None)
+
+
+def publish(db: Session, author: str, content: str, max_followers: int) -> Tuple[Post, List[str]]:
+    """Write a post and push it to timelines (not committed).
+
+    Args:
+        db: Database session.
+        author: Entity writing the post.
+        content: Post text.
+        max_followers: Authors with more connections than this are pulled
+            at read time instead of pushed.
+
+    Returns:
+        Tuple[Post, List[str]]: The post, and the owners of the timelines
+        it was written to.
+    """
+    followers = list(
+        db.execute(
+            select(Connection.dst).where(Connection.src == author).limit(max_followers + 1)
+        ).scalars()
+    )
+    fanout = len(followers) <= max_followers
+    post = Post(
+        author=author,
+        content=content,
+        fanout=fanout,
+        likes=0,
+        comments=0,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(post)
+    db.flush()
+    owners = [author, *followers] if fanout else [author]
+    db.execute(insert(TimelineEntry), [{"owner": owner, "post_id": post.id} for owner in owners])
+    logger.debug(f"Post {post.id} by {author} {'pushed to' if fanout else 'pulled by'} {len(followers)} timelines")
+    return post, owners
+
+
+def author_posts(db: Session, author: str, limit: int, before: Optional[int] = None) -> FeedPage:
+    """Read one page of an author's own posts, newest first.
+
+    Args:
+        db: Database session.
+        author: Author entity.
+        limit: Page size.
+        before: Keyset cursor (exclusive post id).
+
+    Returns:
+        FeedPage: Rows of :func:`feed_columns` and the next cursor.
+    """
+    stmt = feed_columns().where(Post.author == author).order_by(Post.id.desc()).limit(limit + 1)
+    if before is not None:
+        stmt = stmt.where(Post.id < before)
+    return _page(db.execute(stmt).all(), limit)
+
+
+def timeline_page(db: Session, owner: str, limit: int, before: Optional[int] = None) -> FeedPage:
+    """Read one page of an entity's timeline, newest first.
+
+    Two index range scans, merged: the owner's materialized entries and
+    the pulled posts of the large authors it is connected to.
+
+    Args:
+        db: Database session.
+        owner: Entity whose timeline is read.
+        limit: Page size.
+        before: Keyset cursor (exclusive post id).
+
+    Returns:
+        FeedPage: Rows of :func:`feed_columns` and the next cursor.
+    """
+    pushed = (
+        feed_columns()
+        .join(TimelineEntry, TimelineEntry.post_id == Post.id)
+        .where(TimelineEntry.owner == owner)
+        .order_by(TimelineEntry.post_id.desc())
+        .limit(limit + 1)
+    )
+    pulled = (
+        feed_columns()
+        .where(
+            ~Post.fanout,
+            Post.author.in_(select(Connection.dst).where(Connection.src == owner)),
+        )
+        .order_by(Post.id.desc())
+        .limit(limit + 1)
+    )
+    if before is not None:
+        pushed = pushed.where(TimelineEntry.post_id < before)
+        pulled = pulled.where(Post.id < before)
+    merged = heapq.merge(db.execute(pushed).all(), db.execute(pulled).all(), key=lambda row: -row.id)
+    return _page(list(itertools.islice(merged, limit + 1)), limit)
+
+
+class TimelineCache:
+    """Per-worker LRU cache of the first page of timelines.
+
+    Args:
+        ttl: Seconds an entry is served.
+        max_owners: Timelines kept.
+        items: Posts cached per timeline; requests for more, and later
+            pages, are read from the database.
+    """
+
+    def __init__(self, ttl: float, max_owners: int, items: int) -> None:
+        self.ttl = ttl
+        self.max_owners = max_owners
+        self.items = items
+        self._entries: "OrderedDict[str, Tuple[float, FeedPage]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, owner: str, limit: int) -> FeedPage:
+        """Return the first ``limit`` posts of a timeline.
+
+        Args:
+            db: Database session (used on a miss).
+            owner: Entity whose timeline is read.
+            limit: Page size; at most ``items`` to be cacheable.
+
+        Returns:
+            FeedPage: Rows and the next cursor.
+        """
+        if limit > self.items or self.max_owners == 0:
+            return timeline_page(db, owner, limit)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(owner)
+            hit = entry is not None and now - entry[0] < self.ttl
+            if hit:
+                self._entries.move_to_end(owner)
+        record_cache("timeline", hit)
+        if hit:
+            rows, next_before = entry[1]
+        else:
+            rows, next_before = timeline_page(db, owner, self.items)
+            with self._lock:
+                self._entries[owner] = (now, (rows, next_before))
+                self._entries.move_to_end(owner)
+                while len(self._entries) > self.max_owners:
+                    self._entries.popitem(last=False)
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1].id
+        return rows, next_before
+
+    def invalidate(self, owners: Iterable[str]) -> None:
+        """Drop the cached pages of timelines that received a post."""
+        with self._lock:
+            for owner in owners:
+                self._entries.pop(owner, None)
+
+    def clear(self) -> None:
+        """Drop all cached pages."""
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache(maxsize=1)
+def get_timeline_cache() -> TimelineCache:
+    """Get the process-wide timeline cache.
+
+    Returns:
+        TimelineCache: Cache sized by the ``FEED_CACHE_*`` settings.
+    """
+    return TimelineCache(
+        settings.FEED_CACHE_TTL_SECONDS, settings.FEED_CACHE_MAX_TIMELINES, settings.FEED_CACHE_ITEMS
+    )
@@ -0,0 +1,371 @@
+"""In-Process Connection Graph.
+
+"People you may know" ranks the 2-hop neighbours of an entity by the number
+of connections they share with it. In SQL that is a self-join of
+``connection`` grouped over every neighbour's neighbours, which gets slow
+for well-connected entities. This module keeps the graph in memory instead,
+per worker, in compressed sparse row (CSR) form:
+
+- entity uids are mapped to dense integers (``ids`` / ``index``);
+- ``targets`` holds every node's neighbours back to back, sorted, and
+  ``offsets[i]:offsets[i + 1]`` is node ``i``'s slice of it.
+
+The arrays take 4 bytes per edge (``targets``) plus 8 bytes per node
+(``offsets``), and a 2-hop query is a walk over a few contiguous slices.
+
+CSR arrays are immutable, so changes go to small per-node delta sets
+(``added`` / ``removed``) consulted on every read. Writes made through an
+ORM session of this worker are applied after commit. Rows written by other
+processes are picked up every ``CONNECTION_GRAPH_REFRESH_SECONDS`` by
+reading the rows created since the last refresh (``ix_connection_created_at``);
+a full rebuild happens only when the edge count shows something else
+changed (a removal elsewhere). The deltas are folded back into fresh arrays
+once they grow past ``COMPACT_RATIO`` of the graph. Polling and the session
+hooks follow :class:`app.db.refresher.BackgroundRefresher`.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import Select, exists, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.metrics import GaugeSample
+from app.db.refresher import BackgroundRefresher
+from app.models.connection import Connection
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Fold the delta sets back into the arrays once they hold this fraction of the edges
+COMPACT_RATIO = 0.05
+COMPACT_MIN = 1024
+
+
+def suggestions_query(uid: str, limit: int) -> Select:
+    """Build the SQL equivalent of :meth:`ConnectionGraph.suggestions`.
+
+    Used when the in-memory graph is disabled or not built yet.
+
+    Args:
+        uid: Entity to suggest connections for.
+        limit: Maximum suggestions.
+
+    Returns:
+        Select: Rows of ``(uid, mutuals)``, most mutual connections first.
+    """
+    first = aliased(Connection)
+    second = aliased(Connection)
+    mutuals = func.count().label("mutuals")
+    return (
+        select(second.dst.label("uid"), mutuals)
+        .select_from(first)
+        .join(second, second.src == first.dst)
+        .where(
+            first.src == uid,
+            second.dst != uid,
+            ~exists().where(Connection.src == uid, Connection.dst == second.dst),
+        )
+        .group_by(second.dst)
+        .order_by(mutuals.desc(), second.dst)
+        .limit(limit)
+    )
+
+
+def _compress(nodes: int, sources: "array[int]", targets: "array[int]") -> Tuple["array[int]", "array[int]"]:
+    """Turn parallel edge arrays into CSR ``offsets`` and sorted ``targets``."""
+    counts = [0] * (nodes + 1)
+    for src in sources:
+        counts[src + 1] += 1
+    offsets = array("q", itertools.accumulate(counts))
+    cursor = list(offsets[:-1])
+    packed = array("i", bytes(4 * len(targets)))
+    for src, dst in zip(sources, targets):
+        packed[cursor[src]] = dst
+        cursor[src] += 1
+    for node in range(nodes):
+        lo, hi = offsets[node], offsets[node + 1]
+        if hi - lo > 1:
+            packed[lo:hi] = array("i", sorted(packed[lo:hi]))
+    return offsets, packed
+
+
+class ConnectionGraph(BackgroundRefresher):
+    """Adjacency of the ``connection`` table, held in memory.
+
+    All state is guarded by one lock; queries hold it for the duration of a
+    2-hop walk, which touches only the slices of the nodes involved.
+
+    Args:
+        engine: Engine to read connections from.
+        interval: Seconds between incremental refreshes.
+    """
+
+    thread_name = "connection-graph"
+    label = "Connection graph"
+    fallback = "serving suggestions from SQL"
+
+    def __init__(self, engine: Engine, interval: float = 10.0) -> None:
+        super().__init__(interval)
+        self.engine = engine
+        self._lock = threading.RLock()
+        self._ready = False
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._offsets = array("q", [0])
+        self._targets = array("i")
+        self._added: Dict[int, Set[int]] = {}
+        self._removed: Dict[int, Set[int]] = {}
+        self._delta = 0
+        self._edges = 0
+        self._watermark: Optional[datetime] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the graph has been built."""
+        return self._ready
+
+    # -- Building ----------------------------------------------------------
+
+    def _intern(self, uid: str) -> int:
+        node = self._index.get(uid)
+        if node is None:
+            node = self._index[uid] = len(self._ids)
+            self._ids.append(uid)
+        return node
+
+    def build(self) -> None:
+        """(Re)build the graph from the database."""
+        started = time.perf_counter()
+        ids: List[str] = []
+        index: Dict[str, int] = {}
+        sources, targets = array("i"), array("i")
+        with self.engine.connect() as conn:
+            watermark = conn.execute(select(func.max(Connection.created_at))).scalar()
+            stmt = select(Connection.src, Connection.dst)
+            for src, dst in conn.execution_options(yield_per=10_000).execute(stmt):
+                for uid, column in ((src, sources), (dst, targets)):
+                    node = index.get(uid)
+                    if node is None:
+                        node = index[uid] = len(ids)
+                        ids.append(uid)
+                    column.append(node)
+        offsets, packed = _compress(len(ids), sources, targets)
+        with self._lock:
+            self._ids, self._index = ids, index
+            self._offsets, self._targets = offsets, packed
+            self._added, self._removed = {}, {}
+            self._delta = 0
+            self._edges = len(packed)
+            self._watermark = watermark
+            self._ready = True
+        logger.info(
+            f"Built connection graph over {len(ids)} entities and {len(packed)} edges "
+            f"in {(time.perf_counter() - started) * 1000.0:.0f} ms"
+        )
+
+    def _compact(self) -> None:
+        """Fold the delta sets into new arrays (no database access)."""
+        nodes = len(self._ids)
+        sources, targets = array("i"), array("i")
+        for node in range(nodes):
+            neighbours = list(self._neighbours(node))
+            sources.extend(itertools.repeat(node, len(neighbours)))
+            targets.extend(neighbours)
+        self._offsets, self._targets = _compress(nodes, sources, targets)
+        self._added, self._removed = {}, {}
+        self._delta = 0
+
+    # -- Adjacency -----------------------------------------------------------
+
+    def _in_base(self, src: int, dst: int) -> bool:
+        if src >= len(self._offsets) - 1:
+            return False
+        lo, hi = self._offsets[src], self._offsets[src + 1]
+        position = bisect_left(self._targets, dst, lo, hi)
+        return position < hi and self._targets[position] == dst
+
+    def _neighbours(self, node: int) -> Iterable[int]:
+        base: Iterable[int] = ()
+        if node < len(self._offsets) - 1:
+            base = self._targets[self._offsets[node]:self._offsets[node + 1]]
+        removed = self._removed.get(node)
+        if removed:
+            base = [other for other in base if other not in removed]
+        added = self._added.get(node)
+        return itertools.chain(base, added) if added else base
+
+    def _add(self, src: int, dst: int) -> None:
+        if self._in_base(src, dst):
+            removed = self._removed.get(src)
+            if removed and dst in removed:
+                removed.discard(dst)
+                self._delta -= 1
+                self._edges += 1
+            return
+        added = self._added.setdefault(src, set())
+        if dst not in added:
+            added.add(dst)
+            self._delta += 1
+            self._edges += 1
+
+    def _remove(self, src: int, dst: int) -> None:
+        if self._in_base(src, dst):
+            removed = self._removed.setdefault(src, set())
+            if dst not in removed:
+                removed.add(dst)
+                self._delta += 1
+                self._edges -= 1
+            return
+        added = self._added.get(src)
+        if added and dst in added:
+            added.discard(dst)
+            self._delta -= 1
+            self._edges -= 1
+
+    # -- Incremental updates ----------------------------------------------
+
+    def apply(
+        self,
+        adds: Iterable[Tuple[str, str]] = (),
+        removes: Iterable[Tuple[str, str]] = (),
+    ) -> None:
+        """Apply connection rows added or removed (idempotent).
+
+        Args:
+            adds: ``(src, dst)`` rows inserted.
+            removes: ``(src, dst)`` rows deleted.
+        """
+        with self._lock:
+            if not self._ready:
+                return
+            for src, dst in adds:
+                self._add(self._intern(src), self._intern(dst))
+            for src, dst in removes:
+                if src in self._index and dst in self._index:
+                    self._remove(self._index[src], self._index[dst])
+
+    def refresh(self) -> None:
+        """Catch up with rows written by other processes.
+
+        New rows are read from ``ix_connection_created_at``; if the edge
+        count still disagrees with the table afterwards (rows were deleted,
+        or committed with an older timestamp), the graph is rebuilt.
+        """
+        if not self._ready:
+            self.build()
+            return
+        stmt = select(Connection.src, Connection.dst, Connection.created_at)
+        if self._watermark is not None:
+            stmt = stmt.where(Connection.created_at >= self._watermark)
+        with self.engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+            count = conn.execute(select(func.count()).select_from(Connection)).scalar()
+        with self._lock:
+            self.apply((row.src, row.dst) for row in rows)
+            if rows:
+                latest = max(row.created_at for row in rows)
+                self._watermark = latest if self._watermark is None else max(self._watermark, latest)
+            edges = self._edges
+            if edges == count and self._delta > max(COMPACT_MIN, COMPACT_RATIO * len(self._targets)):
+                self._compact()
+        if edges != count:
+            logger.info(f"Connection graph has {edges} edges, table has {count}; rebuilding")
+            self.build()
+
+    def _after_flush(self, session: Session, flush_context: Any) -> None:
+        pending = session.info.setdefault("connection_graph_pending", [])
+        for obj in session.new:
+            if isinstance(obj, Connection):
+                pending.append((True, obj.src, obj.dst))
+        for obj in session.deleted:
+            if isinstance(obj, Connection):
+                pending.append((False, obj.src, obj.dst))
+
+    def _after_commit(self, session: Session) -> None:
+        pending = session.info.pop("connection_graph_pending", None)
+        if pending:
+            with self._lock:
+                for added, src, dst in pending:
+                    if added:
+                        self.apply(adds=[(src, dst)])
+                    else:
+                        self.apply(removes=[(src, dst)])
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop("connection_graph_pending", None)
+
+    # -- Queries -------------------------------------------------------------
+
+    def suggestions(self, uid: str, limit: int) -> Optional[List[Tuple[str, int]]]:
+        """Rank the 2-hop neighbours of an entity by mutual connections.
+
+        Args:
+            uid: Entity to suggest connections for.
+            limit: Maximum suggestions.
+
+        Returns:
+            Optional[List[Tuple[str, int]]]: ``(uid, mutuals)`` pairs, most
+            mutual connections first (ties by uid, as in
+            :func:`suggestions_query`), or None if the graph is not built.
+        """
+        with self._lock:
+            if not self._ready:
+                return None
+            node = self._index.get(uid)
+            if node is None:
+                return []
+            first = set(self._neighbours(node))
+            counts: Counter[int] = Counter()
+            for neighbour in first:
+                counts.update(self._neighbours(neighbour))
+            counts.pop(node, None)
+            for neighbour in first:
+                counts.pop(neighbour, None)
+            ids = self._ids
+            top = heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], ids[item[0]]))
+            return [(ids[other], mutuals) for other, mutuals in top]
+
+    # -- Metrics -------------------------------------------------------------
+
+    def collect(self) -> Iterator[GaugeSample]:
+        """Report graph gauges for ``GET /metrics``."""
+        if not self._ready:
+            return
+        yield GaugeSample("connection_graph_nodes", "Entities in the connection graph",
+                          float(len(self._ids)))
+        yield GaugeSample("connection_graph_edges", "Directed edges in the connection graph",
+                          float(self._edges))
+        yield GaugeSample("connection_graph_delta", "Edge changes since the last compaction",
+                          float(self._delta))
+
+
+@lru_cache(maxsize=1)
+def get_connection_graph() -> ConnectionGraph:
+    """Get the process-wide connection graph.
+
+    Returns:
+        ConnectionGraph: Graph over the application engine.
+    """
+    from app.db.session import engine
+
+    return ConnectionGraph(engine, settings.CONNECTION_GRAPH_REFRESH_SECONDS)
@@ -0,0 +1,338 @@
+"""Job Matching by Tag Overlap.
+
+Jobs and entities are both described by tags: capabilities
+(``capability:summarization``) and protocol families (``protocol:mcp``;
+versions are not compared). A job matches an entity by the share of the
+job's tags the entity has:
+
+    score = |job tags ∩ entity tags| / |job tags|
+
+Scanning every job's JSON arrays for each request would not scale, so each
+worker keeps inverted indexes (:class:`TagPostings`) from every tag to the
+open jobs, and to the entities, that carry it. Matching one entity against
+the board walks only the posting lists of its handful of tags and counts
+hits per job. With 100k open jobs this takes milliseconds.
+
+The indexes are built on first use from the request's session. After
+that they are refreshed at most every ``JOB_MATCH_REFRESH_SECONDS``:
+
+- nothing is read unless the ``job`` or ``entity`` change counter moved
+  since the last refresh (see ``app.db.changes``);
+- rows stamped with a later ``change_seq`` than the counter value read at
+  the last refresh are re-read, using ``ix_job_change_seq`` and
+  ``ix_entity_change_seq``;
+- a side is rebuilt when its row count disagrees with the table, which
+  means rows were deleted.
+
+One request at a time refreshes; the others keep matching against the
+current indexes. The database is read outside the index lock: changed rows
+are applied under it, and rebuilt indexes are built aside and swapped in.
+Job writes made through the API are applied immediately.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, Generic, Hashable, Iterable, List, NamedTuple, Optional, Set, TypeVar
+
+from sqlalchemy import Result, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.semver import parse_protocol
+from app.db.changes import change_markers
+from app.models.entity import Entity
+from app.models.job import Job
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+Key = TypeVar("Key", bound=Hashable)
+
+
+def match_tags(capabilities: Optional[Iterable[str]], protocols: Optional[Iterable[str]]) -> FrozenSet[str]:
+    """Normalize capabilities and protocols into matching tags.
+
+    Example:
+        >>> sorted(match_tags(["Planning"], ["MCP@0.1"]))
+        ['capability:planning', 'protocol:mcp']
+    """
+    tags = {f"capability:{c.strip().lower()}" for c in capabilities or () if c and c.strip()}
+    tags.update(f"protocol:{parse_protocol(p)[0]}" for p in protocols or () if p and p.strip())
+    return frozenset(tags)
+
+
+class TagPostings(Generic[Key]):
+    """Inverted index from tags to the keys (job ids or entity uids) carrying them.
+
+    With ``by_width``, each tag's posting list is split by the number of
+    tags of its keys, so that overlap counts come out grouped by the
+    denominator of the score and each group can be ranked on counts alone.
+
+    Args:
+        by_width: Split posting lists by key width.
+    """
+
+    def __init__(self, by_width: bool = False) -> None:
+        self.by_width = by_width
+        self.tags: Dict[Key, FrozenSet[str]] = {}
+        self.postings: Dict[str, Dict[int, Set[Key]]] = {}
+
+    def put(self, key: Key, tags: FrozenSet[str]) -> None:
+        """Add or replace a key's tags."""
+        self.remove(key)
+        self.tags[key] = tags
+        width = len(tags) if self.by_width else 0
+        for tag in tags:
+            self.postings.setdefault(tag, {}).setdefault(width, set()).add(key)
+
+    def remove(self, key: Key) -> None:
+        """Remove a key (no-op if absent)."""
+        tags = self.tags.pop(key, ())
+        width = len(tags) if self.by_width else 0
+        for tag in tags:
+            lists = self.postings[tag]
+            lists[width].discard(key)
+            if not lists[width]:
+                del lists[width]
+                if not lists:
+                    del self.postings[tag]
+
+    def overlap(self, tags: Iterable[str]) -> Dict[int, Counter]:
+        """Count, per key, how many of ``tags`` it carries, grouped by width.
+
+        Returns:
+            Dict[int, Counter]: Counts per key (keys with none omitted), by
+            key width (a single group 0 unless ``by_width``).
+        """
+        groups: Dict[int, Counter] = {}
+        for tag in tags:
+            for width, posting in self.postings.get(tag, {}).items():
+                groups.setdefault(width, Counter()).update(posting)
+        return groups
+
+
+class TagMatch(NamedTuple):
+    """One match: the job id or entity uid, its score and the shared tags."""
+
+    key: Any
+    score: float
+    matched: List[str]
+
+
+class MatchIndex:
+    """Posting lists of open jobs and of entities, kept per worker.
+
+    Args:
+        interval: Seconds between incremental refreshes.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        # Guards the indexes; held only for in-memory work
+        self._lock = threading.Lock()
+        # Held by the request refreshing the indexes
+        self._refreshing = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget everything; the next query rebuilds from the database."""
+        with self._lock:
+            self.jobs: TagPostings[int] = TagPostings(by_width=True)
+            self.entities: TagPostings[str] = TagPostings()
+            self._quality: Dict[str, float] = {}
+            # Change counter values the indexes are up to date with
+            self._job_mark: Optional[int] = None
+            self._entity_mark: Optional[int] = None
+            self._checked: Optional[float] = None
+
+    # -- Maintenance ---------------------------------------------------------
+
+    def put_job(self, job: Job) -> None:
+        """Apply a job written by this worker (open jobs are indexed, others dropped)."""
+        with self._lock:
+            if self._checked is None:
+                return
+            if job.status == "open":
+                self.jobs.put(job.id, match_tags(job.capabilities, job.protocols))
+            else:
+                self.jobs.remove(job.id)
+
+    @staticmethod
+    def _job_rows(db: Session, since: Optional[int]) -> Result:
+        stmt = select(Job.id, Job.capabilities, Job.protocols, Job.status)
+        if since is not None:
+            stmt = stmt.where(Job.change_seq > since)
+        return db.execute(stmt)
+
+    @staticmethod
+    def _entity_rows(db: Session, since: Optional[int]) -> Result:
+        stmt = select(Entity.uid, Entity.capabilities, Entity.protocols, Entity.quality_score)
+        if since is not None:
+            stmt = stmt.where(Entity.change_seq > since)
+        return db.execute(stmt)
+
+    @staticmethod
+    def _apply_jobs(jobs: TagPostings[int], rows: Iterable[Any]) -> None:
+        for row in rows:
+            if row.status == "open":
+                jobs.put(row.id, match_tags(row.capabilities, row.protocols))
+            else:
+                jobs.remove(row.id)
+
+    @staticmethod
+    def _apply_entities(entities: TagPostings[str], quality: Dict[str, float], rows: Iterable[Any]) -> None:
+        for row in rows:
+            entities.put(row.uid, match_tags(row.capabilities, row.protocols))
+            quality[row.uid] = float(row.quality_score or 0.0)
+
+    def _rebuild(self, db: Session, marks: Dict[str, int], jobs: bool, entities: bool) -> None:
+        """Build fresh indexes aside and swap them in.
+
+        ``marks`` are the change counters read before the rows, so rows
+        written meanwhile are read again by the next refresh rather than missed.
+        """
+        if jobs:
+            postings: TagPostings[int] = TagPostings(by_width=True)
+            self._apply_jobs(postings, self._job_rows(db, None))
+            with self._lock:
+                self.jobs, self._job_mark = postings, marks["job"]
+        if entities:
+            uids: TagPostings[str] = TagPostings()
+            quality: Dict[str, float] = {}
+            self._apply_entities(uids, quality, self._entity_rows(db, None))
+            with self._lock:
+                self.entities, self._quality, self._entity_mark = uids, quality, marks["entity"]
+
+    def _refresh(self, db: Session) -> None:
+        marks = change_markers(db, ("job", "entity"))
+        if self._checked is None:
+            self._rebuild(db, marks, jobs=True, entities=True)
+            return
+        if (marks["job"], marks["entity"]) == (self._job_mark, self._entity_mark):
+            return
+        job_rows = self._job_rows(db, self._job_mark).all()
+        entity_rows = self._entity_rows(db, self._entity_mark).all()
+        open_jobs = db.execute(select(func.count()).select_from(Job).where(Job.status == "open")).scalar()
+        entities = db.execute(select(func.count()).select_from(Entity)).scalar()
+        with self._lock:
+            self._apply_jobs(self.jobs, job_rows)
+            self._apply_entities(self.entities, self._quality, entity_rows)
+            self._job_mark, self._entity_mark = marks["job"], marks["entity"]
+            indexed_jobs, indexed_entities = len(self.jobs.tags), len(self.entities.tags)
+        if open_jobs != indexed_jobs:
+            logger.info(f"Job index has {indexed_jobs} open jobs, table has {open_jobs}; rebuilding")
+        if entities != indexed_entities:
+            logger.info(f"Job index has {indexed_entities} entities, table has {entities}; rebuilding")
+        self._rebuild(db, marks, jobs=open_jobs != indexed_jobs, entities=entities != indexed_entities)
+
+    def sync(self, db: Session) -> None:
+        """Build the indexes, or refresh them if ``interval`` has passed.
+
+        Only the first build makes other requests wait; later refreshes
+        are skipped by requests arriving while one is running.
+        """
+        now = time.monotonic()
+        checked = self._checked
+        if checked is not None and now - checked < self.interval:
+            return
+        if not self._refreshing.acquire(blocking=checked is None):
+            return
+        try:
+            checked = self._checked
+            if checked is not None and now - checked < self.interval:
+                return
+            started = time.perf_counter()
+            self._refresh(db)
+            if checked is None:
+                logger.info(
+                    f"Built job match index over {len(self.jobs.tags)} open jobs and "
+                    f"{len(self.entities.tags)} entities in {(time.perf_counter() - started) * 1000.0:.0f} ms"
+                )
+            self._checked = now
+        finally:
+            self._refreshing.release()
+
+    # -- Queries -------------------------------------------------------------
+
+    def jobs_for(self, db: Session, tags: FrozenSet[str], limit: int, min_score: float = 0.0) -> List[TagMatch]:
+        """Rank open jobs by the share of their tags found in ``tags``.
+
+        Args:
+            db: Database session (used to build or refresh the index).
+            tags: The entity's tags (see :func:`match_tags`).
+            limit: Maximum matches.
+            min_score: Lowest score returned.
+
+        Returns:
+            List[TagMatch]: Job ids, best score first (ties: more shared
+            tags, then newer jobs).
+        """
+        self.sync(db)
+        with self._lock:
+            candidates = []
+            for width, counts in self.jobs.overlap(tags).items():
+                # Within a width the score is the count: rank on counts in C
+                for job, count in heapq.nlargest(limit, counts.items(), key=itemgetter(1, 0)):
+                    if count / width >= min_score:
+                        candidates.append((count / width, count, job))
+            required = self.jobs.tags
+            return [
+                TagMatch(job, score, sorted(required[job] & tags))
+                for score, _, job in heapq.nlargest(limit, candidates)
+            ]
+
+    def entities_for(self, db: Session, tags: FrozenSet[str], limit: int, min_score: float = 0.0) -> List[TagMatch]:
+        """Rank entities by the share of ``tags`` (a job's) they carry.
+
+        Args:
+            db: Database session (used to build or refresh the index).
+            tags: The job's tags (see :func:`match_tags`).
+            limit: Maximum matches.
+            min_score: Lowest score returned.
+
+        Returns:
+            List[TagMatch]: Entity uids, best score first (ties: higher
+            quality score, then uid).
+        """
+        self.sync(db)
+        if not tags:
+            return []
+        with self._lock:
+            counts = self.entities.overlap(tags).get(0, Counter())
+            floor = max(min_score * len(tags), 1)
+            best = heapq.nlargest(limit, counts.values())
+            if best:
+                floor = max(floor, best[-1])
+            quality = self._quality
+            top = heapq.nsmallest(
+                limit,
+                (item for item in counts.items() if item[1] >= floor),
+                key=lambda item: (-item[1], -quality.get(item[0], 0.0), item[0]),
+            )
+            return [
+                TagMatch(uid, count / len(tags), sorted(self.entities.tags[uid] & tags))
+                for uid, count in top
+            ]
+
+
+@lru_cache(maxsize=1)
+def get_match_index() -> MatchIndex:
+    """Get the process-wide job match index.
+
+    Returns:
+        MatchIndex: Index refreshed every ``JOB_MATCH_REFRESH_SECONDS``.
+    """
+    return MatchIndex(settings.JOB_MATCH_REFRESH_SECONDS)
@@ -0,0 +1,176 @@
+"""Protocol Compatibility Matrix.
+
+For each protocol family (``mcp``, ``a2a``, ...), the compatibility matrix
+lists the versions entities actually speak, how many entities speak each,
+and which of those versions satisfy each version under the caret rule
+(``^0.1`` accepts ``0.1.x``, ``^1.0`` accepts ``1.x``; see
+:func:`app.core.semver.caret_compatible`).
+
+Families have a handful of versions, so a matrix is one small ``GROUP BY``
+on ``ix_entity_protocol_version``; it is cached per family for
+``PROTOCOL_MATRIX_TTL_SECONDS``. Protocol rows written through the ORM in
+this worker drop the cached matrix of their family when the transaction
+commits; changes made elsewhere show up once the entry expires.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapper, Session, object_session
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.core.semver import SemVer, caret_compatible
+from app.models.entity import EntityProtocol
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class ProtocolVersion(NamedTuple):
+    """One version of a protocol family as spoken in the catalog."""
+
+    version: str
+    parsed: SemVer
+    entities: int
+
+
+class CompatibilityMatrix:
+    """Versions of one protocol family and their caret compatibility.
+
+    Args:
+        protocol: Protocol family.
+        versions: Versions spoken by at least one entity, oldest first.
+    """
+
+    def __init__(self, protocol: str, versions: List[ProtocolVersion]) -> None:
+        self.protocol = protocol
+        self.versions = versions
+        self.compatible: Dict[str, List[str]] = {
+            required.version: [
+                offered.version
+                for offered in versions
+                if caret_compatible(required.parsed, offered.parsed)
+            ]
+            for required in versions
+        }
+
+
+def build_matrix(db: Session, protocol: str) -> CompatibilityMatrix:
+    """Compute the compatibility matrix of a protocol family.
+
+    Args:
+        db: Database session.
+        protocol: Protocol family (lower case).
+
+    Returns:
+        CompatibilityMatrix: Matrix over the versions currently spoken.
+    """
+    stmt = (
+        select(
+            EntityProtocol.version_major,
+            EntityProtocol.version_minor,
+            EntityProtocol.version_patch,
+            EntityProtocol.version_pre,
+            func.min(EntityProtocol.version),
+            func.count(),
+        )
+        .where(EntityProtocol.name == protocol)
+        .group_by(
+            EntityProtocol.version_major,
+            EntityProtocol.version_minor,
+            EntityProtocol.version_patch,
+            EntityProtocol.version_pre,
+        )
+    )
+    versions = sorted(
+        (
+            ProtocolVersion(version, SemVer(major, minor, patch, pre), count)
+            for major, minor, patch, pre, version, count in db.execute(stmt)
+        ),
+        key=lambda v: v.parsed,
+    )
+    return CompatibilityMatrix(protocol, versions)
+
+
+class ProtocolMatrixCache:
+    """Per-family cache of compatibility matrices.
+
+    Args:
+        ttl: Seconds a matrix is served before it is recomputed.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, CompatibilityMatrix]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, protocol: str) -> CompatibilityMatrix:
+        """Return the matrix of a family, computing it if missing or stale."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(protocol)
+        hit = entry is not None and now - entry[0] < self.ttl
+        record_cache("protocol_matrix", hit)
+        if hit:
+            return entry[1]
+        matrix = build_matrix(db, protocol)
+        with self._lock:
+            self._entries[protocol] = (now, matrix)
+        logger.debug(f"Computed compatibility matrix for '{protocol}' ({len(matrix.versions)} versions)")
+        return matrix
+
+    def invalidate(self, protocols: Iterable[str]) -> None:
+        """Drop the cached matrices of some families."""
+        with self._lock:
+            for protocol in protocols:
+                self._entries.pop(protocol, None)
+
+    def clear(self) -> None:
+        """Drop all cached matrices."""
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache(maxsize=1)
+def get_protocol_matrix_cache() -> ProtocolMatrixCache:
+    """Get the process-wide compatibility matrix cache.
+
+    Returns:
+        ProtocolMatrixCache: Cache with ``PROTOCOL_MATRIX_TTL_SECONDS`` expiry.
+    """
+    return ProtocolMatrixCache(settings.PROTOCOL_MATRIX_TTL_SECONDS)
+
+
+@event.listens_for(EntityProtocol, "after_insert")
+@event.listens_for(EntityProtocol, "after_update")
+@event.listens_for(EntityProtocol, "after_delete")
+def _track_family(mapper: Mapper, connection: Connection, target: EntityProtocol) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("protocol_families", set()).add(target.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_families(session: Session) -> None:
+    families = session.info.pop("protocol_families", None)
+    if families:
+        get_protocol_matrix_cache().invalidate(families)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_families(session: Session) -> None:
+    session.info.pop("protocol_families", None)
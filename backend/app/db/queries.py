@@ -0,0 +1,256 @@
+"""Pre-Built Entity Query Templates.
+
+This module builds the statements behind ``GET /api/entities`` once instead
+of chaining ``.where()`` clauses per request. There is one template per
+filter combination (``q`` x ``type`` x ``protocol`` x sort order, sixteen
+shapes, built at import time), and every value, including ``LIMIT`` and
+``OFFSET``, is a bound parameter. Executing a template therefore:
+
+- never rebuilds the statement object,
+- always produces one of a few cache keys, so after warm-up every execution
+  is a hit in the engine's compiled cache (no Python-side SQL compilation),
+- selects only the columns the list view needs (no descriptions/manifests).
+
+Version range filters (``version=>=2.0,<3``) add one row-value comparison
+per comparator on the parsed version columns, answered by the
+``ix_entity_semver`` index; their templates are keyed by the operator
+sequence and built on first use.
+
+``GET /api/entities/compatible`` uses the same scheme: one template per
+combination of lower bound, upper bound and type filter, resolving the
+protocol version range on the ``ix_entity_protocol_version`` index.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import itertools
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, String, bindparam, select, tuple_
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import CACHE_REQUESTS
+from app.core.semver import UNPARSED, SemVer
+from app.models.entity import Entity, EntityProtocol
+
+# Columns rendered by the list view (EntitySearchItem)
+LIST_COLUMNS = (
+    Entity.uid,
+    Entity.type,
+    Entity.name,
+    Entity.version,
+    Entity.summary,
+    Entity.capabilities,
+    Entity.frameworks,
+    Entity.providers,
+    Entity.quality_score,
+)
+
+# Parsed version columns, in precedence order
+SEMVER_COLUMNS = (
+    Entity.version_major,
+    Entity.version_minor,
+    Entity.version_patch,
+    Entity.version_pre,
+)
+
+# List orderings: ranking (default) and newest semantic version first
+SORT_ORDERS = {
+    "quality": (Entity.quality_score.desc(), Entity.created_at.desc()),
+    "version": tuple(column.desc() for column in SEMVER_COLUMNS) + (Entity.uid.desc(),),
+}
+
+# Template key: (q, type, protocol) presence flags and the sort order
+FilterKey = Tuple[bool, bool, bool, str]
+
+# Comparator operators, mapped to row-value comparisons
+_COMPARE = {
+    "==": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+    ">=": lambda left, right: left >= right,
+    ">": lambda left, right: left > right,
+    "<=": lambda left, right: left <= right,
+    "<": lambda left, right: left < right,
+}
+
+
+def _build_list_statement(key: FilterKey, operators: Tuple[str, ...] = ()) -> Select[Any]:
+    """Build the list statement for one filter combination."""
+    has_q, has_type, has_protocol, sort = key
+    stmt = select(*LIST_COLUMNS)
+    if has_type:
+        stmt = stmt.where(Entity.type == bindparam("type"))
+    if has_q:
+        pattern = bindparam("pattern")
+        stmt = stmt.where(Entity.name.ilike(pattern) | Entity.summary.ilike(pattern))
+    if has_protocol:
+        # Naive JSON string match; production can use GIN index
+        stmt = stmt.where(Entity.protocols.cast(String).ilike(bindparam("protocol_pattern")))
+    if operators:
+        # Unparsed versions never satisfy a range (even "<")
+        stmt = stmt.where(Entity.version_major > UNPARSED)
+    for i, operator in enumerate(operators):
+        bound = tuple_(*(bindparam(f"v{i}_{column.key}") for column in SEMVER_COLUMNS))
+        stmt = stmt.where(_COMPARE[operator](tuple_(*SEMVER_COLUMNS), bound))
+    return stmt.order_by(*SORT_ORDERS[sort]).limit(bindparam("limit")).offset(bindparam("offset"))
+
+
+LIST_TEMPLATES: Dict[FilterKey, Select[Any]] = {
+    (*flags, sort): _build_list_statement((*flags, sort))
+    for flags in itertools.product((False, True), repeat=3)
+    for sort in SORT_ORDERS
+}
+
+
+@lru_cache(maxsize=256)
+def _range_template(key: FilterKey, operators: Tuple[str, ...]) -> Select[Any]:
+    """Template of a filter combination with version comparators (memoized)."""
+    return _build_list_statement(key, operators)
+
+
+def list_entities_query(
+    q: Optional[str],
+    type: Optional[str],
+    protocol: Optional[str],
+    limit: int,
+    offset: int,
+    version_range: Sequence[Tuple[str, SemVer]] = (),
+    sort: str = "quality",
+) -> Tuple[Select[Any], Dict[str, Any]]:
+    """Select the template and bind parameters for a list request.
+
+    Args:
+        q: Free-text search over name/summary.
+        type: Entity type filter.
+        protocol: Protocol tag filter.
+        limit: Page size.
+        offset: Page offset.
+        version_range: Comparators from ``app.core.semver.parse_range``.
+        sort: ``quality`` (ranking) or ``version`` (newest version first).
+
+    Returns:
+        Tuple of the pre-built statement and its parameters, ready for
+        ``session.execute(stmt, params)``.
+
+    Example:
+        >>> stmt, params = list_entities_query("data", "agent", None, 20, 0)
+        >>> sorted(params)
+        ['limit', 'offset', 'pattern', 'type']
+    """
+    params: Dict[str, Any] = {"limit": limit, "offset": offset}
+    if q:
+        params["pattern"] = f"%{q}%"
+    if type:
+        params["type"] = type
+    if protocol:
+        params["protocol_pattern"] = f"%{protocol}%"
+    key = (bool(q), bool(type), bool(protocol), sort)
+    if not version_range:
+        return LIST_TEMPLATES[key], params
+    for i, (_, version) in enumerate(version_range):
+        for column, value in zip(SEMVER_COLUMNS, version):
+            params[f"v{i}_{column.key}"] = value
+    return _range_template(key, tuple(op for op, _ in version_range)), params
+
+
+def _build_compatible_statement(key: Tuple[bool, bool, bool]) -> Select[Any]:
+    """Build the compatible-entities statement for one filter combination."""
+    has_minimum, has_maximum, has_type = key
+    offered = tuple_(
+        EntityProtocol.version_major,
+        EntityProtocol.version_minor,
+        EntityProtocol.version_patch,
+        EntityProtocol.version_pre,
+    )
+    speakers = select(EntityProtocol.uid).where(EntityProtocol.name == bindparam("protocol"))
+    if has_minimum:
+        speakers = speakers.where(
+            EntityProtocol.version_major > UNPARSED,
+            offered >= tuple_(*(bindparam(f"min_{c.key}") for c in SEMVER_COLUMNS)),
+        )
+    if has_maximum:
+        speakers = speakers.where(
+            EntityProtocol.version_major > UNPARSED,
+            offered < tuple_(*(bindparam(f"max_{c.key}") for c in SEMVER_COLUMNS)),
+        )
+    stmt = select(*LIST_COLUMNS).where(Entity.uid.in_(speakers))
+    if has_type:
+        stmt = stmt.where(Entity.type == bindparam("type"))
+    return (
+        stmt.order_by(*SORT_ORDERS["quality"])
+        .limit(bindparam("limit"))
+        .offset(bindparam("offset"))
+    )
+
+
+COMPATIBLE_TEMPLATES: Dict[Tuple[bool, bool, bool], Select[Any]] = {
+    key: _build_compatible_statement(key)
+    for key in itertools.product((False, True), repeat=3)
+}
+
+
+def compatible_entities_query(
+    protocol: str,
+    minimum: Optional[SemVer],
+    maximum: Optional[SemVer],
+    type: Optional[str],
+    limit: int,
+    offset: int,
+) -> Tuple[Select[Any], Dict[str, Any]]:
+    """Select the template and bind parameters for a compatibility request.
+
+    Args:
+        protocol: Protocol family (lower case, e.g. ``mcp``).
+        minimum: Inclusive lower version bound.
+        maximum: Exclusive upper version bound.
+        type: Entity type filter.
+        limit: Page size.
+        offset: Page offset.
+
+    Returns:
+        Tuple of the pre-built statement and its parameters.
+    """
+    params: Dict[str, Any] = {"protocol": protocol, "limit": limit, "offset": offset}
+    for prefix, bound in (("min", minimum), ("max", maximum)):
+        if bound is not None:
+            for column, value in zip(SEMVER_COLUMNS, bound):
+                params[f"{prefix}_{column.key}"] = value
+    if type:
+        params["type"] = type
+    key = (minimum is not None, maximum is not None, bool(type))
+    return COMPATIBLE_TEMPLATES[key], params
+
+
+def compiled_cache_stats(engine: Engine) -> Dict[str, Any]:
+    """Report compiled-statement cache usage for ``engine``.
+
+    Hits and misses are counted for this worker by the metrics module's
+    engine listener (all engines); size and capacity come from the engine's
+    own LRU cache.
+
+    Args:
+        engine: Engine whose compiled cache is inspected.
+
+    Returns:
+        Dict[str, Any]: ``hits``, ``misses``, ``hit_ratio``, ``size``,
+        ``capacity`` and the number of list ``templates``.
+    """
+    values = CACHE_REQUESTS.values()
+    hits = int(values.get(("sql_compiled", "hit"), 0))
+    misses = int(values.get(("sql_compiled", "miss"), 0))
+    cache = engine._compiled_cache
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "size": len(cache) if cache is not None else 0,
+        "capacity": getattr(cache, "capacity", 0),
+        "templates": len(LIST_TEMPLATES),
+    }
@@ -0,0 +1,108 @@
+"""Background Refresh of Per-Worker Views.
+
+The search index, the connection graph and the catalog snapshot are views
+of database tables held in each worker's memory. They share one lifecycle,
+implemented here by :class:`BackgroundRefresher`:
+
+- ``start()`` loads the view, registers the subclass's ORM session hooks
+  (so that writes committed by this worker are applied at once) and starts
+  a daemon thread that calls ``refresh()`` every ``interval`` seconds to
+  pick up writes made by other processes;
+- ``stop()`` stops the thread and removes the session hooks.
+
+A failed load or refresh is logged; the view keeps serving its last state
+(or reports not ready and callers fall back to SQL).
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import abc
+import logging
+import threading
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Session events a refresher follows, each handled by the method ``_<event>``
+SESSION_EVENTS = ("after_flush", "after_commit", "after_rollback")
+
+
+class BackgroundRefresher(abc.ABC):
+    """Base class for a per-worker view refreshed by a background thread.
+
+    Subclasses implement :meth:`refresh` (which must also do the initial
+    load) and override the session hooks they need.
+
+    Attributes:
+        thread_name: Name of the refresh thread.
+        label: What the view is, for log messages.
+        fallback: What requests do while the view is unavailable.
+
+    Args:
+        interval: Seconds between refreshes.
+    """
+
+    thread_name = "background-refresher"
+    label = "View"
+    fallback = "serving from SQL"
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @abc.abstractmethod
+    def refresh(self) -> None:
+        """Load the view, or catch up with changes made by other processes."""
+
+    # -- Session hooks ------------------------------------------------------
+
+    def _after_flush(self, session: Session, flush_context: Any) -> None:
+        """Record the changes of a flush (applied if the transaction commits)."""
+
+    def _after_commit(self, session: Session) -> None:
+        """Apply the changes recorded for a committed transaction."""
+
+    def _after_rollback(self, session: Session) -> None:
+        """Forget the changes recorded for a rolled back transaction."""
+
+    # -- Lifecycle ----------------------------------------------------------
+
+    def start(self) -> None:
+        """Load the view, follow local writes and poll for external changes."""
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"{self.label} unavailable, {self.fallback}: {e}")
+        for name in SESSION_EVENTS:
+            event.listen(Session, name, getattr(self, f"_{name}"))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"{self.label} refresh failed: {e}")
+
+    def stop(self) -> None:
+        """Stop polling and following writes."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+        for name in SESSION_EVENTS:
+            listener = getattr(self, f"_{name}")
+            if event.contains(Session, name, listener):
+                event.remove(Session, name, listener)
@@ -0,0 +1,473 @@
+"""In-Process Entity Search Index.
+
+For catalogs that fit in memory, this module answers ``GET /api/entities``
+without SQL. The index is built at start-up from the ``entity`` table and
+holds, per worker:
+
+- every entity's list-view fields, in list order (``quality_score DESC,
+  created_at DESC``); a document's position in that order is its bit;
+- an inverted index from name/summary tokens to their positions, stored as
+  a bitset (Python int) for frequent tokens and a sorted array for rare ones;
+- one bitset per entity type and per protocol tag.
+
+A query intersects bitsets (``&``) and reads the page off the result in rank
+order; selecting the ``offset``-th match is a binary search over
+``int.bit_count``, so deep pages cost no more than the first one.
+
+``q`` keeps its substring semantics: every word of ``q`` must occur inside
+some token of a match, so the union of the bitsets of those tokens narrows
+the candidates, and candidates are then checked against the exact text.
+
+Writes made through an ORM session of this worker are applied after commit:
+the old position is cleared from a ``live`` mask and the new version goes to
+a small sorted overflow list merged into every query. The overflow is folded
+back (a rebuild from memory) once it grows past ``COMPACT_RATIO`` of the
+index. Writes from other processes are picked up by a full rebuild when the
+catalog fingerprint changes (polled every ``SEARCH_INDEX_REFRESH_SECONDS``
+by an :class:`app.db.refresher.BackgroundRefresher` thread).
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from array import array
+from bisect import insort
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import GaugeSample
+from app.db.queries import LIST_COLUMNS
+from app.db.refresher import BackgroundRefresher
+from app.db.snapshot import SnapshotRow, catalog_fingerprint
+from app.models.entity import Entity
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Fold the overflow list back into the index once it holds this fraction of it
+COMPACT_RATIO = 0.05
+COMPACT_MIN = 256
+
+# Distinct query words whose candidate bitsets are cached per index generation
+TERM_CACHE_SIZE = 1024
+
+_WORD = re.compile(r"\w+")
+
+# Characters that only occur in the JSON text of the protocol list, not in tags
+_JSON_SYNTAX = frozenset('[]",\\ ')
+
+RankKey = Tuple[float, float, str]
+
+# Positions of the documents containing a token
+Postings = Union[int, "array[int]"]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split lower-cased text into word tokens."""
+    return _WORD.findall(text.lower())
+
+
+class Document:
+    """An indexed entity: list-view row, rank key and lower-cased match text."""
+
+    __slots__ = ("row", "key", "name", "summary", "protocol_list", "tags")
+
+    def __init__(
+        self,
+        row: SnapshotRow,
+        protocols: Optional[List[str]],
+        created_at: Optional[datetime],
+    ) -> None:
+        self.row = row
+        self.key: RankKey = (
+            -row.quality_score,
+            -(created_at.timestamp() if created_at is not None else 0.0),
+            row.uid,
+        )
+        self.name = row.name.lower()
+        self.summary = row.summary.lower()
+        self.protocol_list = protocols
+        self.tags = [tag.lower() for tag in protocols or []]
+
+    @classmethod
+    def from_entity(cls, entity: Any) -> "Document":
+        """Build a document from an ``Entity`` instance."""
+        row = SnapshotRow(
+            uid=entity.uid,
+            type=entity.type,
+            name=entity.name,
+            version=entity.version,
+            summary=entity.summary or "",
+            capabilities=list(entity.capabilities or []),
+            frameworks=list(entity.frameworks or []),
+            providers=list(entity.providers or []),
+            quality_score=float(entity.quality_score or 0.0),
+        )
+        return cls(row, entity.protocols, entity.created_at)
+
+    @classmethod
+    def from_row(cls, values: Tuple[Any, ...]) -> "Document":
+        """Build a document from a ``LIST_COLUMNS + (protocols, created_at)`` row.
+
+        Unpacked by position: attribute access on result rows dominates the
+        build time of large indexes.
+        """
+        (uid, type, name, version, summary, capabilities, frameworks, providers,
+         quality_score, protocols, created_at) = values
+        row = SnapshotRow(
+            uid, type, name, version, summary or "", capabilities or [], frameworks or [],
+            providers or [], float(quality_score or 0.0),
+        )
+        return cls(row, protocols, created_at)
+
+    def matches(self, q: Optional[str], type: Optional[str], protocol: Optional[str]) -> bool:
+        """Check the list filters exactly (same semantics as the SQL templates)."""
+        if type and self.row.type != type:
+            return False
+        if q and q not in self.name and q not in self.summary:
+            return False
+        if not protocol:
+            return True
+        # SQL matches the protocol filter against the JSON text of the list
+        return self.protocol_list is not None and protocol in json.dumps(
+            self.protocol_list
+        ).lower()
+
+
+def _set_bits(buffer: bytearray, positions: Iterable[int]) -> None:
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+
+
+def _bits(positions: List[int]) -> int:
+    """Build a bitset from ascending positions (linear, unlike repeated ``|=``)."""
+    if not positions:
+        return 0
+    buffer = bytearray(positions[-1] // 8 + 1)
+    _set_bits(buffer, positions)
+    return int.from_bytes(buffer, "little")
+
+
+def _select(bits: int, rank: int, size: int) -> int:
+    """Return the position of the ``rank``-th (0-based) set bit, or ``size``."""
+    low, high = 0, size
+    while low < high:
+        middle = (low + high) // 2
+        if (bits & ((1 << (middle + 1)) - 1)).bit_count() > rank:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def _positions(bits: int, start: int = 0) -> Iterator[int]:
+    """Yield set bit positions at or above ``start`` in ascending order."""
+    bits >>= start
+    position = start
+    while bits:
+        low = bits & -bits
+        shift = low.bit_length()
+        position += shift
+        bits >>= shift
+        yield position - 1
+
+
+class Segment:
+    """Immutable index over a list of documents in rank order.
+
+    Args:
+        documents: Documents sorted by rank key.
+    """
+
+    def __init__(self, documents: List[Document]) -> None:
+        self.documents = documents
+        self.size = len(documents)
+        self.all = (1 << self.size) - 1
+        self.positions = {doc.row.uid: i for i, doc in enumerate(documents)}
+
+        types: Dict[str, List[int]] = {}
+        tags: Dict[str, List[int]] = {}
+        tokens: Dict[str, List[int]] = {}
+        for i, doc in enumerate(documents):
+            types.setdefault(doc.row.type, []).append(i)
+            for tag in set(doc.tags):
+                tags.setdefault(tag, []).append(i)
+            for token in set(tokenize(doc.name) + tokenize(doc.summary)):
+                tokens.setdefault(token, []).append(i)
+        self.types = {key: _bits(value) for key, value in types.items()}
+        self.tags = {key: _bits(value) for key, value in tags.items()}
+        # A bitset costs size/8 bytes, a position array 4 bytes per posting
+        self.tokens: Dict[str, Postings] = {
+            key: _bits(value) if len(value) * 32 > self.size else array("I", value)
+            for key, value in tokens.items()
+        }
+        self._terms: Dict[str, int] = {}
+
+    def term_candidates(self, term: str) -> int:
+        """Bitset of the documents with a token containing ``term``."""
+        bits = self._terms.get(term)
+        if bits is None:
+            bits = 0
+            sparse = bytearray(self.size // 8 + 1)
+            for token, postings in self.tokens.items():
+                if term in token:
+                    if isinstance(postings, int):
+                        bits |= postings
+                    else:
+                        _set_bits(sparse, postings)
+            bits |= int.from_bytes(sparse, "little")
+            if len(self._terms) >= TERM_CACHE_SIZE:
+                self._terms.clear()
+            self._terms[term] = bits
+        return bits
+
+    def tag_candidates(self, term: str) -> Optional[int]:
+        """Union of the bitsets of every protocol tag containing ``term``.
+
+        Returns None when ``term`` includes JSON syntax, so it may match
+        across tags and candidates cannot be narrowed by tag.
+        """
+        if _JSON_SYNTAX.intersection(term):
+            return None
+        bits = 0
+        for tag, tag_bits in self.tags.items():
+            if term in tag:
+                bits |= tag_bits
+        return bits
+
+
+class IndexState(NamedTuple):
+    """What a query reads: replaced as a whole on every change."""
+
+    segment: Segment
+    live: int
+    overflow: List[Tuple[RankKey, Document]]
+    fingerprint: str
+
+
+class SearchIndex(BackgroundRefresher):
+    """Per-worker search index over the entity catalog.
+
+    Args:
+        engine: Engine the index is built from.
+        max_entities: Refuse to build (and keep serving from SQL) above this size.
+        interval: Seconds between catalog fingerprint checks.
+    """
+
+    thread_name = "search-index"
+    label = "Search index"
+    fallback = "serving lists from SQL"
+
+    def __init__(self, engine: Engine, max_entities: int = 500_000, interval: float = 30.0) -> None:
+        super().__init__(interval)
+        self.engine = engine
+        self.max_entities = max_entities
+        self._state: Optional[IndexState] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built."""
+        return self._state is not None
+
+    # -- Building ----------------------------------------------------------
+
+    def build(self) -> bool:
+        """(Re)build the index from the database.
+
+        Returns:
+            bool: False if the catalog exceeds ``max_entities``.
+        """
+        started = time.perf_counter()
+        fingerprint = catalog_fingerprint(self.engine)
+        count = int(fingerprint.split(":", 1)[0])
+        if count > self.max_entities:
+            logger.warning(
+                f"Catalog has {count} entities (limit {self.max_entities}); "
+                "search index disabled, serving lists from SQL"
+            )
+            self._state = None
+            return False
+        stmt = select(*LIST_COLUMNS, Entity.protocols, Entity.created_at)
+        with self.engine.connect() as conn:
+            documents = [
+                Document.from_row(row)
+                for row in conn.execution_options(yield_per=1000).execute(stmt)
+            ]
+        documents.sort(key=lambda doc: doc.key)
+        segment = Segment(documents)
+        with self._lock:
+            self._state = IndexState(segment, segment.all, [], fingerprint)
+        logger.info(
+            f"Built search index over {segment.size} entities ({len(segment.tokens)} tokens) "
+            f"in {(time.perf_counter() - started) * 1000.0:.0f} ms"
+        )
+        return True
+
+    def refresh(self) -> None:
+        """Build the index, or rebuild it if the catalog fingerprint changed."""
+        state = self._state
+        if state is None or catalog_fingerprint(self.engine) != state.fingerprint:
+            self.build()
+
+    def _compact(self, state: IndexState) -> IndexState:
+        """Fold the overflow list into a new segment (no database access)."""
+        segment = state.segment
+        live = [segment.documents[i] for i in _positions(state.live)]
+        documents = list(heapq.merge(live, (doc for _, doc in state.overflow), key=lambda d: d.key))
+        compacted = Segment(documents)
+        return IndexState(compacted, compacted.all, [], state.fingerprint)
+
+    # -- Incremental updates ----------------------------------------------
+
+    def apply(self, upserts: Iterable[Document], deletes: Iterable[str] = ()) -> None:
+        """Apply committed writes made by this worker.
+
+        Args:
+            upserts: New or updated documents.
+            deletes: uids of deleted entities.
+        """
+        upserts = list(upserts)
+        with self._lock:
+            state = self._state
+            if state is None:
+                return
+            segment, live = state.segment, state.live
+            changed = {doc.row.uid for doc in upserts} | set(deletes)
+            overflow = [item for item in state.overflow if item[1].row.uid not in changed]
+            for uid in changed:
+                position = segment.positions.get(uid)
+                if position is not None:
+                    live &= ~(1 << position)
+            for doc in upserts:
+                insort(overflow, (doc.key, doc), key=lambda item: item[0])
+            state = IndexState(segment, live, overflow, state.fingerprint)
+            if len(overflow) > max(COMPACT_MIN, COMPACT_RATIO * segment.size):
+                state = self._compact(state)
+            self._state = state
+
+    def _after_flush(self, session: Session, flush_context: Any) -> None:
+        pending = session.info.setdefault("search_index_pending", {})
+        for obj in itertools.chain(session.new, session.dirty):
+            if isinstance(obj, Entity):
+                pending[obj.uid] = Document.from_entity(obj)
+        for obj in session.deleted:
+            if isinstance(obj, Entity):
+                pending[obj.uid] = None
+
+    def _after_commit(self, session: Session) -> None:
+        pending = session.info.pop("search_index_pending", None)
+        if pending:
+            self.apply(
+                [doc for doc in pending.values() if doc is not None],
+                [uid for uid, doc in pending.items() if doc is None],
+            )
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop("search_index_pending", None)
+
+    # -- Queries -------------------------------------------------------------
+
+    def list_entities(
+        self,
+        q: Optional[str],
+        type: Optional[str],
+        protocol: Optional[str],
+        limit: int,
+        offset: int,
+    ) -> Optional[List[SnapshotRow]]:
+        """Answer a list request (same filters and order as the SQL templates).
+
+        Args:
+            q: Case-insensitive substring of name or summary.
+            type: Exact entity type.
+            protocol: Case-insensitive substring of the protocol list.
+            limit: Page size.
+            offset: Page offset.
+
+        Returns:
+            Optional[List[SnapshotRow]]: The requested page, or None if the
+            index is not built.
+        """
+        state = self._state
+        if state is None:
+            return None
+        segment = state.segment
+        q = q.lower() if q else None
+        protocol = protocol.lower() if protocol else None
+
+        bits = state.live
+        verify = False
+        if type:
+            bits &= segment.types.get(type, 0)
+        if protocol and bits:
+            tags = segment.tag_candidates(protocol)
+            if tags is None:
+                verify = True
+            else:
+                bits &= tags
+        if q and bits:
+            words = tokenize(q)
+            for word in words:
+                bits &= segment.term_candidates(word)
+            # A single word equal to q needs no check; anything else might
+            # span tokens or include punctuation
+            verify = verify or words != [q]
+
+        extra = [doc for _, doc in state.overflow if doc.matches(q, type, protocol)]
+        if not verify and not extra:
+            start = _select(bits, offset, segment.size)
+            page = itertools.islice(_positions(bits, start), limit)
+            return [segment.documents[i].row for i in page]
+
+        base: Iterable[Document] = (segment.documents[i] for i in _positions(bits))
+        if verify:
+            base = (doc for doc in base if doc.matches(q, type, protocol))
+        merged = heapq.merge(base, extra, key=lambda doc: doc.key)
+        return [doc.row for doc in itertools.islice(merged, offset, offset + limit)]
+
+    # -- Metrics -------------------------------------------------------------
+
+    def collect(self) -> Iterator[GaugeSample]:
+        """Report index gauges for ``GET /metrics``."""
+        state = self._state
+        if state is None:
+            return
+        yield GaugeSample("search_index_entities", "Live entities in the search index",
+                          float(state.live.bit_count() + len(state.overflow)))
+        yield GaugeSample("search_index_tokens", "Distinct tokens in the search index",
+                          float(len(state.segment.tokens)))
+        yield GaugeSample("search_index_overflow", "Entities updated since the last compaction",
+                          float(len(state.overflow)))
+
+
+@lru_cache(maxsize=1)
+def get_search_index() -> SearchIndex:
+    """Get the process-wide search index.
+
+    Returns:
+        SearchIndex: Index over the application engine.
+    """
+    from app.db.session import engine
+
+    return SearchIndex(
+        engine, settings.SEARCH_INDEX_MAX_ENTITIES, settings.SEARCH_INDEX_REFRESH_SECONDS
+    )
@@ -14,7 +14,7 @@ License:
 from __future__ import annotations
 
 import logging
-from typing import Generator
+from typing import Any, Dict, Generator
 
 from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
@@ -22,6 +22,8 @@ from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
+from app.db import changes  # noqa: F401  (registers the change-counter session hook)
+from app.db import versions  # noqa: F401  (registers the version-history mapper events)
 
 # Configure module logger
 logger = logging.getLogger(__name__)
@@ -29,12 +31,23 @@ logger = logging.getLogger(__name__)
 # Database engine configuration
 # pool_pre_ping=True ensures connections are validated before use
 # This prevents "MySQL server has gone away" and similar errors
+# Pool sizes come from settings; app.server scales them down so that all
+# workers together stay within DB_CONNECTION_BUDGET
+if "sqlite" in settings.DATABASE_URL:
+    # Use StaticPool for SQLite to avoid threading issues
+    _pool_options: Dict[str, Any] = {"poolclass": StaticPool}
+else:
+    _pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    # Use StaticPool for SQLite to avoid threading issues
-    poolclass=StaticPool if "sqlite" in settings.DATABASE_URL else None,
-    echo=settings.APP_DEBUG,  # Log SQL queries in debug mode
+    echo=settings.DATABASE_ECHO,  # Log every SQL statement (see also slow-query log)
+    **_pool_options,
 )
 
 # Session factory for creating database sessions
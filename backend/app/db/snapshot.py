@@ -0,0 +1,543 @@
+"""Shared-Memory Catalog Snapshot.
+
+This module serves ``GET /api/entities`` from a compact, read-only snapshot of
+the list-view columns of every entity, shared by all workers of a host:
+
+- one worker (the holder of an ``flock`` on ``<dir>/refresh.lock``) builds the
+  snapshot into a file under ``CATALOG_SNAPSHOT_DIR`` (``/dev/shm`` by
+  default, i.e. RAM) and publishes it by atomically replacing ``CURRENT``;
+- every worker ``mmap``s the published file read-only, so the data lives once
+  in the page cache however many workers there are, and is read in place;
+- the leader polls a cheap fingerprint (row count and the ``entity`` change
+  counter, see ``app.db.changes``) every ``CATALOG_SNAPSHOT_REFRESH_SECONDS``
+  and publishes a new generation when it changes; workers swap to it on
+  their next poll. Readers of the old generation keep their mapping until
+  they drop it;
+- a worker that commits entity changes stops serving lists from any
+  snapshot built before that commit (requests fall back to SQL) until a
+  newer generation is mapped, so clients read their own writes.
+
+File layout (little-endian)::
+
+    "MHCS" | u16 format | u16 reserved | u32 header length | header JSON | sections
+
+Section offsets in the header are relative to the 8-byte aligned end of the
+header.
+
+Rows are stored presorted by ``quality_score DESC, created_at DESC`` (the
+list order) in columnar sections: ``score`` (f64), ``type`` (u8 code) and,
+per text column, u64 row offsets plus UTF-8 data. ``search`` holds the
+lower-cased name and summary and ``protocols`` the lower-cased JSON protocol
+list, each row terminated by NUL, so filters are ``mmap.find`` scans that
+never decode non-matching rows.
+
+Note:
+    Search terms are matched literally: unlike SQL ``ILIKE``, ``%`` and ``_``
+    in ``q`` are not wildcards.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import GaugeSample
+from app.db.changes import change_marker
+from app.db.queries import LIST_COLUMNS
+from app.db.refresher import BackgroundRefresher
+from app.models.entity import Entity
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MHCS"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<4sHHI")
+
+# Separator for list columns (capabilities, frameworks, providers)
+LIST_SEPARATOR = "\x1f"
+
+# Terminator between rows (and between name and summary) in search sections
+_NUL = "\x00"
+
+# Text columns returned by the list view
+TEXT_COLUMNS = ("uid", "name", "version", "summary", "capabilities", "frameworks", "providers")
+
+# Returns the first matching row at or after the given row, or -1
+Matcher = Callable[[int], int]
+
+
+class SnapshotRow(NamedTuple):
+    """List-view fields of one entity (same names as the SQL list row)."""
+
+    uid: str
+    type: str
+    name: str
+    version: str
+    summary: str
+    capabilities: List[str]
+    frameworks: List[str]
+    providers: List[str]
+    quality_score: float
+
+
+class _TextColumn:
+    """Row offsets and UTF-8 data of one text section being built."""
+
+    def __init__(self) -> None:
+        self.offsets = array("Q", [0])
+        self.data = bytearray()
+
+    def append(self, value: str) -> None:
+        self.data += value.encode()
+        self.offsets.append(len(self.data))
+
+
+def catalog_fingerprint(engine: Engine) -> str:
+    """Return a value that changes whenever entities are added, removed or updated."""
+    with engine.connect() as conn:
+        count = conn.execute(select(func.count()).select_from(Entity)).scalar()
+        marker = change_marker(conn, "entity")
+    return f"{count}:{marker}"
+
+
+def write_snapshot(engine: Engine, out: IO[bytes], generation: int) -> Dict[str, Any]:
+    """Build a snapshot of the catalog and write it to ``out``.
+
+    Args:
+        engine: Engine to read entities from.
+        out: Binary file to write to.
+        generation: Generation number stored in the header.
+
+    Returns:
+        Dict[str, Any]: The snapshot header.
+
+    Raises:
+        ValueError: If there are more than 256 distinct entity types.
+    """
+    # Stamped before reading: a write committed during the read may be missing
+    # from the snapshot, so it must not count as included (read-your-writes)
+    built_at = time.time()
+    fingerprint = catalog_fingerprint(engine)
+    scores = array("d")
+    types = bytearray()
+    type_codes: Dict[str, int] = {}
+    text = {name: _TextColumn() for name in (*TEXT_COLUMNS, "search", "protocols")}
+
+    stmt = select(*LIST_COLUMNS, Entity.protocols).order_by(
+        Entity.quality_score.desc(), Entity.created_at.desc()
+    )
+    with engine.connect() as conn:
+        for row in conn.execution_options(yield_per=1000).execute(stmt):
+            code = type_codes.setdefault(row.type, len(type_codes))
+            if code > 255:
+                raise ValueError("Catalog snapshots support at most 256 entity types")
+            types.append(code)
+            scores.append(float(row.quality_score or 0.0))
+            summary = row.summary or ""
+            for name, value in (
+                ("uid", row.uid),
+                ("name", row.name),
+                ("version", row.version),
+                ("summary", summary),
+                ("capabilities", LIST_SEPARATOR.join(row.capabilities or [])),
+                ("frameworks", LIST_SEPARATOR.join(row.frameworks or [])),
+                ("providers", LIST_SEPARATOR.join(row.providers or [])),
+                ("search", f"{row.name.lower()}{_NUL}{summary.lower()}{_NUL}"),
+                (
+                    "protocols",
+                    f"{json.dumps(row.protocols).lower() if row.protocols is not None else ''}"
+                    f"{_NUL}",
+                ),
+            ):
+                text[name].append(value)
+
+    sections: Dict[str, bytes] = {"score": scores.tobytes(), "type": bytes(types)}
+    for name, column in text.items():
+        sections[f"{name}.offsets"] = column.offsets.tobytes()
+        sections[f"{name}.data"] = bytes(column.data)
+
+    header: Dict[str, Any] = {
+        "generation": generation,
+        "rows": len(scores),
+        "built_at": built_at,
+        "fingerprint": fingerprint,
+        "types": sorted(type_codes, key=type_codes.__getitem__),
+        "sections": {},
+    }
+    # Section offsets are relative to the (8-byte aligned) end of the header
+    position = 0
+    for name, data in sections.items():
+        header["sections"][name] = [position, len(data)]
+        position = _align(position + len(data))
+    encoded = json.dumps(header).encode()
+
+    out.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, 0, len(encoded)))
+    out.write(encoded)
+    out.write(b"\x00" * (_align(_PREFIX.size + len(encoded)) - _PREFIX.size - len(encoded)))
+    position = 0
+    for name, data in sections.items():
+        start = header["sections"][name][0]
+        out.write(b"\x00" * (start - position))
+        out.write(data)
+        position = start + len(data)
+    return header
+
+
+def _align(position: int) -> int:
+    return (position + 7) & ~7
+
+
+class CatalogSnapshot:
+    """A published snapshot, mapped read-only.
+
+    Args:
+        path: Snapshot file.
+
+    Raises:
+        ValueError: If the file is not a snapshot of a supported format.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, header_length = _PREFIX.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a catalog snapshot (format {FORMAT_VERSION})")
+        self.header: Dict[str, Any] = json.loads(
+            self._mm[_PREFIX.size:_PREFIX.size + header_length]
+        )
+        self.generation: int = self.header["generation"]
+        self.rows: int = self.header["rows"]
+        self.fingerprint: str = self.header["fingerprint"]
+        self.built_at: float = self.header["built_at"]
+        self._type_names: List[str] = self.header["types"]
+        self._type_codes = {name: code for code, name in enumerate(self._type_names)}
+
+        base = _align(_PREFIX.size + header_length)
+        sections = {
+            name: [base + start, length]
+            for name, (start, length) in self.header["sections"].items()
+        }
+        view = memoryview(self._mm)
+        self._scores = view[_slice(sections["score"])].cast("d")
+        self._types_at = sections["type"][0]
+        self._text: Dict[str, Tuple[Any, int]] = {
+            name: (
+                view[_slice(sections[f"{name}.offsets"])].cast("Q"),
+                sections[f"{name}.data"][0],
+            )
+            for name in (*TEXT_COLUMNS, "search", "protocols")
+        }
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the mapped file."""
+        return len(self._mm)
+
+    def _string(self, column: str, row: int) -> str:
+        offsets, base = self._text[column]
+        return self._mm[base + offsets[row]:base + offsets[row + 1]].decode()
+
+    def _list(self, column: str, row: int) -> List[str]:
+        value = self._string(column, row)
+        return value.split(LIST_SEPARATOR) if value else []
+
+    def row(self, index: int) -> SnapshotRow:
+        """Decode one row (rows are in list order)."""
+        return SnapshotRow(
+            uid=self._string("uid", index),
+            type=self._type_names[self._mm[self._types_at + index]],
+            name=self._string("name", index),
+            version=self._string("version", index),
+            summary=self._string("summary", index),
+            capabilities=self._list("capabilities", index),
+            frameworks=self._list("frameworks", index),
+            providers=self._list("providers", index),
+            quality_score=self._scores[index],
+        )
+
+    def _type_matcher(self, code: int) -> Matcher:
+        needle = bytes((code,))
+        start, end = self._types_at, self._types_at + self.rows
+
+        def next_row(row: int) -> int:
+            position = self._mm.find(needle, start + row, end)
+            return -1 if position == -1 else position - start
+
+        return next_row
+
+    def _text_matcher(self, column: str, needle: bytes) -> Matcher:
+        offsets, base = self._text[column]
+        end = base + offsets[self.rows]
+
+        def next_row(row: int) -> int:
+            if row >= self.rows:
+                return -1
+            position = self._mm.find(needle, base + offsets[row], end)
+            return -1 if position == -1 else bisect_right(offsets, position - base) - 1
+
+        return next_row
+
+    def _matches(self, matchers: List[Matcher]) -> Iterator[int]:
+        """Yield rows accepted by every matcher, in order (leapfrog intersection)."""
+        if not matchers:
+            yield from range(self.rows)
+            return
+        row, agreed, i = 0, 0, 0
+        while row < self.rows:
+            found = matchers[i](row)
+            if found == -1:
+                return
+            if found == row:
+                agreed += 1
+            else:
+                row, agreed = found, 1
+            if agreed == len(matchers):
+                yield row
+                row, agreed = row + 1, 0
+            i = (i + 1) % len(matchers)
+
+    def list_entities(
+        self,
+        q: Optional[str],
+        type: Optional[str],
+        protocol: Optional[str],
+        limit: int,
+        offset: int,
+    ) -> List[SnapshotRow]:
+        """Answer a list request (same filters and order as the SQL templates).
+
+        Args:
+            q: Case-insensitive substring of name or summary.
+            type: Exact entity type.
+            protocol: Case-insensitive substring of the protocol list.
+            limit: Page size.
+            offset: Page offset.
+
+        Returns:
+            List[SnapshotRow]: The requested page.
+        """
+        matchers: List[Matcher] = []
+        if type:
+            code = self._type_codes.get(type)
+            if code is None:
+                return []
+            matchers.append(self._type_matcher(code))
+        for column, term in (("search", q), ("protocols", protocol)):
+            if term:
+                if _NUL in term:
+                    return []
+                matchers.append(self._text_matcher(column, term.lower().encode()))
+        rows = itertools.islice(self._matches(matchers), offset, offset + limit)
+        return [self.row(index) for index in rows]
+
+
+def _slice(section: List[int]) -> slice:
+    return slice(section[0], section[0] + section[1])
+
+
+def default_snapshot_dir() -> str:
+    """Return ``CATALOG_SNAPSHOT_DIR``, or a RAM-backed default location."""
+    if settings.CATALOG_SNAPSHOT_DIR:
+        return settings.CATALOG_SNAPSHOT_DIR
+    shm = Path("/dev/shm")
+    root = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return str(root / "matrixhub-catalog")
+
+
+class CatalogSnapshots(BackgroundRefresher):
+    """Publishes (leader only) and maps the current catalog snapshot.
+
+    Args:
+        engine: Engine the snapshot is built from.
+        directory: Directory shared by the workers of this host.
+        interval: Seconds between refresh polls.
+    """
+
+    CURRENT = "CURRENT"
+    thread_name = "catalog-snapshot"
+    label = "Catalog snapshot"
+    fallback = "serving lists from SQL"
+
+    def __init__(self, engine: Engine, directory: str, interval: float = 5.0) -> None:
+        super().__init__(interval)
+        self.engine = engine
+        self.directory = Path(directory)
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # Wall time of this worker's last committed entity change
+        self._written_at = 0.0
+        self._lock_file: Optional[IO[str]] = None
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """Return the snapshot mapped by this worker, if any.
+
+        None as well while the mapped snapshot predates an entity change
+        committed by this worker.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.built_at < self._written_at:
+            return None
+        return snapshot
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this worker builds and publishes snapshots."""
+        return self._lock_file is not None
+
+    def _acquire_leadership(self) -> bool:
+        if self._lock_file is not None:
+            return True
+        try:
+            import fcntl
+        except ImportError:  # No flock (Windows): every process publishes
+            self._lock_file = open(os.devnull)
+            return True
+        lock_file = open(self.directory / "refresh.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        logger.info(f"Worker {os.getpid()} is the catalog snapshot publisher")
+        return True
+
+    def _reload(self) -> None:
+        """Map the published generation if it is not the one already mapped."""
+        try:
+            name = (self.directory / self.CURRENT).read_text().strip()
+        except FileNotFoundError:
+            return
+        if self._snapshot is not None and self._snapshot.path.name == name:
+            return
+        self._snapshot = CatalogSnapshot(self.directory / name)
+        logger.info(
+            f"Mapped catalog snapshot generation {self._snapshot.generation} "
+            f"({self._snapshot.rows} entities, {self._snapshot.size_bytes} bytes)"
+        )
+
+    def publish(self) -> CatalogSnapshot:
+        """Build a new generation and make it current.
+
+        Returns:
+            CatalogSnapshot: The published snapshot, mapped.
+        """
+        generation = self._snapshot.generation + 1 if self._snapshot is not None else 1
+        name = f"catalog-{generation:010d}.snap"
+        tmp = self.directory / f".{name}.{os.getpid()}.tmp"
+        started = time.perf_counter()
+        with open(tmp, "wb") as out:
+            write_snapshot(self.engine, out, generation)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, self.directory / name)
+        pointer = self.directory / f".{self.CURRENT}.{os.getpid()}.tmp"
+        pointer.write_text(name)
+        os.replace(pointer, self.directory / self.CURRENT)
+        logger.info(
+            f"Published catalog snapshot generation {generation} "
+            f"in {(time.perf_counter() - started) * 1000.0:.0f} ms"
+        )
+        self._prune(keep=name)
+        self._reload()
+        assert self._snapshot is not None
+        return self._snapshot
+
+    def _prune(self, keep: str) -> None:
+        """Delete all but the two newest generations and abandoned temporary files.
+
+        The previous generation is kept for workers that read ``CURRENT`` just
+        before it changed; unlinked files stay readable where already mapped.
+        """
+        published = sorted(self.directory.glob("catalog-*.snap"))
+        stale = [path for path in published[:-2] if path.name != keep]
+        stale.extend(self.directory.glob(".catalog-*.tmp"))
+        for path in stale:
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.debug(f"Could not remove {path}: {e}")
+
+    def refresh(self) -> None:
+        """Pick up a newer generation and, as leader, publish one if entities changed."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._reload()
+        if self._acquire_leadership():
+            current = self._snapshot
+            if (
+                current is None
+                or current.built_at < self._written_at
+                or current.fingerprint != catalog_fingerprint(self.engine)
+            ):
+                self.publish()
+
+    def _after_flush(self, session: Session, flush_context: Any) -> None:
+        if any(
+            isinstance(obj, Entity)
+            for obj in itertools.chain(session.new, session.dirty, session.deleted)
+        ):
+            session.info["catalog_snapshot_stale"] = True
+
+    def _after_commit(self, session: Session) -> None:
+        if session.info.pop("catalog_snapshot_stale", False):
+            self._written_at = time.time()
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop("catalog_snapshot_stale", None)
+
+    def stop(self) -> None:
+        """Stop refreshing, following writes and give up leadership."""
+        super().stop()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def collect(self) -> Iterator[GaugeSample]:
+        """Report snapshot gauges for ``GET /metrics``."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        yield GaugeSample("catalog_snapshot_generation", "Mapped snapshot generation",
+                          float(snapshot.generation))
+        yield GaugeSample("catalog_snapshot_entities", "Entities in the mapped snapshot",
+                          float(snapshot.rows))
+        yield GaugeSample("catalog_snapshot_bytes", "Size of the mapped snapshot",
+                          float(snapshot.size_bytes))
+
+
+@lru_cache(maxsize=1)
+def get_catalog_snapshots() -> CatalogSnapshots:
+    """Get the process-wide catalog snapshot manager.
+
+    Returns:
+        CatalogSnapshots: Manager for the application engine.
+    """
+    from app.db.session import engine
+
+    return CatalogSnapshots(
+        engine, default_snapshot_dir(), settings.CATALOG_SNAPSHOT_REFRESH_SECONDS
+    )
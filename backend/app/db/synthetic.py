@@ -0,0 +1,392 @@
+"""Synthetic Catalog Generator.
+
+This module generates large, realistic entity catalogs for performance work
+and local development. Generation is fully deterministic for a given seed:
+
+- Capability, framework, provider and protocol tags follow Zipf
+  distributions (a few very common tags, a long tail of rare ones).
+- Description and manifest sizes are log-normally distributed.
+- Creation timestamps are spread over several years, skewed towards the
+  present; ``updated_at`` and ``release_ts`` follow creation.
+
+Rows are written with ``COPY ... FROM STDIN`` on PostgreSQL and batched
+``executemany`` inserts on other databases; the generated ``manifests`` are
+split off into ``entity_manifest`` rows, protocol tags are parsed into
+``entity_protocol`` rows and every entity gets its first ``entity_version``
+snapshot.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import io
+import itertools
+import json
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table, insert, select
+from sqlalchemy.engine import Engine
+
+from app.core.semver import UNPARSED_VERSION, parse_version
+from app.db.changes import bump_change
+from app.db.versions import entity_document, version_row
+from app.models.entity import (
+    Base,
+    Entity,
+    EntityManifest,
+    EntityProtocol,
+    EntityVersion,
+    manifest_hash,
+)
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Callback receiving (rows written, total rows)
+ProgressCallback = Callable[[int, int], None]
+
+# Entity types with their relative frequency
+TYPES = ("agent", "tool", "mcp_server")
+TYPE_WEIGHTS = (5, 3, 2)
+
+WORDS = (
+    "agent", "data", "smart", "cloud", "secure", "fast", "insight", "pilot", "nexus", "flow",
+    "graph", "vector", "query", "guard", "scout", "forge", "relay", "atlas", "signal", "prism",
+    "quantum", "echo", "orbit", "spark", "matrix", "pulse", "vision", "logic", "sage", "swift",
+)
+CAPABILITIES = (
+    "task_planning", "web_browsing", "code_execution", "retrieval", "summarization",
+    "data_analysis", "reasoning", "memory_management", "translation", "database_query",
+    "web_scraping", "customer_support", "sentiment_analysis", "visualization", "reporting",
+    "prediction", "html_parsing", "schema_introspection", "threat_detection", "log_analysis",
+    "static_analysis", "image_generation", "speech_to_text", "scheduling",
+)
+FRAMEWORKS = (
+    "langchain", "llamaindex", "transformers", "fastapi", "pytorch", "autogen", "crewai",
+    "openai-agents", "pandas", "tensorflow", "scikit-learn", "sqlalchemy", "spacy", "haystack",
+    "semantic-kernel", "dspy", "scrapy", "selenium", "ray", "jax",
+)
+PROVIDERS = (
+    "openai", "anthropic", "google", "mistral", "meta", "cohere", "ollama", "groq",
+    "together", "bedrock", "azure", "deepseek",
+)
+PROTOCOLS = ("mcp@0.1", "a2a@1.0", "openapi@3.1", "mcp@0.2", "acp@0.1", "a2a@0.9", "grpc@1.0")
+LICENSES = ("MIT", "Apache-2.0", "BSD-3-Clause", "GPL-3.0", "MPL-2.0", "Commercial", None)
+
+# Catalog time span: entities are created between these instants
+EPOCH_START = datetime(2021, 1, 1, tzinfo=timezone.utc)
+EPOCH_END = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# Rows per INSERT/COPY batch
+DEFAULT_BATCH_SIZE = 5_000
+
+
+def _long_tail(head: Sequence[str], size: int) -> List[str]:
+    """Extend a tag vocabulary with generated rare tags up to ``size`` entries."""
+    tail = (f"{a}_{b}" for a, b in itertools.permutations(WORDS, 2))
+    return list(head) + list(itertools.islice(tail, max(0, size - len(head))))
+
+
+class ZipfSampler:
+    """Draw distinct tags from a vocabulary with Zipf-distributed popularity.
+
+    Args:
+        vocabulary: Tags ordered from most to least popular.
+        exponent: Zipf exponent ``s``; the tag at rank ``k`` has weight ``1/k**s``.
+    """
+
+    def __init__(self, vocabulary: Sequence[str], exponent: float = 1.1) -> None:
+        self.vocabulary = list(vocabulary)
+        self._cumulative = list(
+            itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, len(vocabulary) + 1))
+        )
+
+    def sample(self, rng: random.Random, count: int) -> List[str]:
+        """Return up to ``count`` distinct tags in draw order."""
+        count = min(count, len(self.vocabulary))
+        total = self._cumulative[-1]
+        chosen: Dict[str, None] = {}
+        # Popular tags repeat often; bound the draws so rare counts terminate quickly
+        for _ in range(count * 8):
+            if len(chosen) == count:
+                break
+            index = bisect.bisect_left(self._cumulative, rng.random() * total)
+            chosen[self.vocabulary[min(index, len(self.vocabulary) - 1)]] = None
+        return list(chosen)
+
+
+_CAPABILITY_SAMPLER = ZipfSampler(_long_tail(CAPABILITIES, 400))
+_FRAMEWORK_SAMPLER = ZipfSampler(_long_tail(FRAMEWORKS, 120))
+_PROVIDER_SAMPLER = ZipfSampler(PROVIDERS, exponent=1.3)
+_PROTOCOL_SAMPLER = ZipfSampler(PROTOCOLS, exponent=1.5)
+_TYPE_CUMULATIVE = list(itertools.accumulate(TYPE_WEIGHTS))
+
+
+def entity_type(index: int) -> str:
+    """Return the entity type of the ``index``-th synthetic entity.
+
+    The type depends only on the index so that benchmarks can address
+    entities by uid without reading the catalog.
+    """
+    slot = (index * 7919) % _TYPE_CUMULATIVE[-1]
+    return TYPES[bisect.bisect_right(_TYPE_CUMULATIVE, slot)]
+
+
+def entity_uid(index: int) -> str:
+    """Return the uid of the ``index``-th synthetic entity."""
+    return f"{entity_type(index)}-{index:08d}"
+
+
+def _lognormal_int(rng: random.Random, mu: float, sigma: float, low: int, high: int) -> int:
+    return max(low, min(high, int(rng.lognormvariate(mu, sigma))))
+
+
+def _manifest(rng: random.Random, index: int, protocol: str) -> Dict[str, Any]:
+    """Build a protocol manifest with a log-normally distributed number of tools."""
+    name, _, version = protocol.partition("@")
+    tools = _lognormal_int(rng, 1.2, 0.9, 0, 200)
+    return {
+        "protocol": name,
+        "schema_version": version,
+        "endpoint": f"https://api.example.com/{index}/{name}",
+        "auth": rng.choice(("none", "bearer", "oauth2", "api_key")),
+        "tools": [
+            {
+                "name": f"{rng.choice(WORDS)}_{i}",
+                "description": " ".join(rng.choices(WORDS, k=rng.randint(3, 20))),
+                "input_schema": {"type": "object", "properties": {"input": {"type": "string"}}},
+            }
+            for i in range(tools)
+        ],
+    }
+
+
+def _entity_row(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Build the column values of one synthetic entity."""
+    kind = entity_type(index)
+    name = " ".join(w.title() for w in rng.choices(WORDS, k=rng.randint(1, 3)))
+    capabilities = _CAPABILITY_SAMPLER.sample(rng, rng.randint(1, 8))
+    protocols = _PROTOCOL_SAMPLER.sample(rng, _lognormal_int(rng, 0.3, 0.5, 1, 4))
+
+    span = (EPOCH_END - EPOCH_START).total_seconds()
+    # sqrt skews creation towards the present (catalog growth)
+    created = EPOCH_START + timedelta(seconds=span * rng.random() ** 0.5)
+    updated = min(EPOCH_END, created + timedelta(seconds=rng.expovariate(1 / (30 * 86400))))
+    release = created + (updated - created) * rng.random() if rng.random() < 0.8 else None
+
+    words = _lognormal_int(rng, 4.5, 1.0, 5, 5_000)
+    return {
+        "uid": f"{kind}-{index:08d}",
+        "type": kind,
+        "name": f"{name} {index}",
+        "version": f"{rng.randint(0, 5)}.{rng.randint(0, 20)}.{rng.randint(0, 50)}",
+        "summary": f"{name} for {capabilities[0].replace('_', ' ')}",
+        "description": " ".join(rng.choices(WORDS, k=words)),
+        "license": rng.choice(LICENSES),
+        "homepage": f"https://example.com/{kind}/{index}",
+        "source_url": f"https://github.com/example/{kind}-{index}",
+        "capabilities": capabilities,
+        "frameworks": _FRAMEWORK_SAMPLER.sample(rng, rng.randint(0, 5)),
+        "providers": _PROVIDER_SAMPLER.sample(rng, rng.randint(0, 4)),
+        "protocols": protocols,
+        "manifests": {p: _manifest(rng, index, p) for p in protocols},
+        "readme_blob_ref": None,
+        "quality_score": round(min(100.0, max(0.0, rng.gauss(65, 18))), 2),
+        "release_ts": release,
+        "created_at": created,
+        "updated_at": updated,
+    }
+
+
+def generate_entities(size: int, seed: int = 42, start: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield ``size`` deterministic synthetic entity rows.
+
+    Args:
+        size: Number of entities to generate.
+        seed: Random seed; the same seed always yields the same catalog.
+        start: Index (and uid number) of the first entity.
+
+    Yields:
+        Dict[str, Any]: Column values for one ``entity`` row, plus its
+        ``manifests`` keyed by protocol.
+
+    Example:
+        >>> rows = list(generate_entities(3, seed=1))
+        >>> rows[0]["uid"]
+        'agent-00000000'
+    """
+    rng = random.Random(seed)
+    for index in range(start, start + size):
+        yield _entity_row(rng, index)
+
+
+def next_entity_index(engine: Engine) -> int:
+    """Return the index after the highest synthetic uid already stored.
+
+    Appending from this index never collides with earlier runs, whatever
+    their seed.
+    """
+    highest = -1
+    with engine.connect() as conn:
+        for uid in conn.execution_options(yield_per=10_000).execute(select(Entity.uid)).scalars():
+            _, _, number = uid.rpartition("-")
+            if len(number) == 8 and number.isdigit():
+                highest = max(highest, int(number))
+    return highest + 1
+
+
+def _batches(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        yield batch
+
+
+def _table_rows(
+    batch: List[Dict[str, Any]], change_seq: int
+) -> List[Tuple[Table, List[Dict[str, Any]]]]:
+    """Split generated entities into rows per table, in foreign-key order.
+
+    Manifests become ``entity_manifest`` rows, protocol tags ``entity_protocol``
+    rows, and each entity gets its parsed version columns, its ``change_seq``
+    stamp and its first release snapshot in ``entity_version`` (the
+    ORM validators and events are bypassed here).
+    """
+    entities, protocols, manifests, versions = [], [], [], []
+    for row in batch:
+        row = dict(row, change_seq=change_seq)
+        parsed = parse_version(row["version"]) or UNPARSED_VERSION
+        row.update(zip(("version_major", "version_minor", "version_patch", "version_pre"), parsed))
+        for protocol, body in (row.pop("manifests", None) or {}).items():
+            manifests.append(
+                {"uid": row["uid"], "protocol": protocol, "body": body, "hash": manifest_hash(body)}
+            )
+        for tag in dict.fromkeys(row["protocols"] or []):
+            protocols.append({"uid": row["uid"], **EntityProtocol.values(tag)})
+        document = entity_document(row)
+        versions.append(version_row(row["uid"], 1, document, document, True, row["updated_at"]))
+        entities.append(row)
+    return [
+        (Entity.__table__, entities),
+        (EntityProtocol.__table__, protocols),
+        (EntityManifest.__table__, manifests),
+        (EntityVersion.__table__, versions),
+    ]
+
+
+def _copy_batch(engine: Engine, batch: List[Dict[str, Any]]) -> None:
+    """Write a batch with PostgreSQL ``COPY ... FROM STDIN`` (CSV)."""
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            cursor.execute(
+                "UPDATE change_counter SET value = value + 1 WHERE name = 'entity' RETURNING value"
+            )
+            (change_seq,) = cursor.fetchone()
+            for table, rows in _table_rows(batch, change_seq):
+                if not rows:
+                    continue
+                columns = list(rows[0])
+                buffer = io.StringIO()
+                # QUOTE_NONNUMERIC quotes every string, so unquoted empty fields are NULL
+                writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+                for row in rows:
+                    writer.writerow([
+                        json.dumps(value) if isinstance(value, (list, dict))
+                        else value.isoformat() if isinstance(value, datetime)
+                        else value
+                        for value in (row[c] for c in columns)
+                    ])
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _insert_batch(engine: Engine, batch: List[Dict[str, Any]]) -> None:
+    """Write a batch with a single ``executemany`` INSERT per table."""
+    with engine.begin() as conn:
+        for table, rows in _table_rows(batch, bump_change(conn, "entity")):
+            if rows:
+                conn.execute(insert(table), rows)
+
+
+def write_entities(
+    engine: Engine,
+    rows: Iterable[Dict[str, Any]],
+    total: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """Bulk-write entity rows in batches.
+
+    Args:
+        engine: Target database engine.
+        rows: Entity rows (e.g. from :func:`generate_entities`).
+        total: Expected number of rows (for progress reporting).
+        batch_size: Rows per COPY/INSERT batch.
+        progress: Optional callback invoked after every batch.
+
+    Returns:
+        int: Number of rows written.
+    """
+    write = _copy_batch if engine.dialect.name == "postgresql" else _insert_batch
+    written = 0
+    for batch in _batches(rows, batch_size):
+        write(engine, batch)
+        written += len(batch)
+        if progress is not None:
+            progress(written, total)
+    return written
+
+
+def seed_synthetic_catalog(
+    engine: Engine,
+    size: int,
+    seed: int = 42,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    truncate: bool = True,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """Create the schema if needed and fill it with a synthetic catalog.
+
+    Args:
+        engine: Target database engine.
+        size: Number of entities to generate.
+        seed: Random seed for the generator.
+        batch_size: Rows per COPY/INSERT batch.
+        truncate: Delete existing entities first; otherwise new uids are
+            numbered after the existing synthetic ones.
+        progress: Optional callback invoked after every batch.
+
+    Returns:
+        int: Number of rows written.
+    """
+    Base.metadata.create_all(bind=engine)
+    if truncate:
+        with engine.begin() as conn:
+            conn.execute(EntityVersion.__table__.delete())
+            conn.execute(EntityManifest.__table__.delete())
+            conn.execute(EntityProtocol.__table__.delete())
+            conn.execute(Entity.__table__.delete())
+            bump_change(conn, "entity")
+        start = 0
+    else:
+        start = next_entity_index(engine)
+    logger.info(
+        f"Seeding {size} synthetic entities from index {start} (seed={seed}, dialect={engine.dialect.name})"
+    )
+    return write_entities(engine, generate_entities(size, seed, start), size, batch_size, progress)
@@ -0,0 +1,192 @@
+"""Entity Version History.
+
+Every release of an entity (an insert, or an update that changes
+``Entity.version``) is recorded in ``entity_version``. To keep storage
+proportional to what actually changes, a release is stored as a JSON merge
+patch (RFC 7386) against the previous release, except every
+``VERSION_SNAPSHOT_INTERVAL``-th one, which holds the full document. Any
+release is therefore rebuilt from one snapshot plus fewer than
+``VERSION_SNAPSHOT_INTERVAL`` deltas, fetched in a single query.
+
+Rows are written by mapper events on ``Entity`` on the flushing connection,
+so they commit (or roll back) with the entity change itself. Bulk writes that
+bypass the ORM (the synthetic seeder) record the first snapshot themselves.
+
+The versioned document covers the descriptive fields in
+``VERSIONED_FIELDS``. READMEs are versioned through ``readme_blob_ref``:
+blobs are content-addressed and never overwritten.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Mapper, Session, attributes
+
+from app.core.config import settings
+from app.models.entity import Entity, EntityVersion
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Entity fields captured by each release
+VERSIONED_FIELDS = (
+    "version",
+    "summary",
+    "description",
+    "license",
+    "homepage",
+    "source_url",
+    "capabilities",
+    "frameworks",
+    "providers",
+    "protocols",
+    "readme_blob_ref",
+    "release_ts",
+)
+
+# Version rows as selected by chain_query
+_CHAIN_COLUMNS = (
+    EntityVersion.seq,
+    EntityVersion.version,
+    EntityVersion.release_ts,
+    EntityVersion.snapshot,
+    EntityVersion.data,
+    EntityVersion.created_at,
+)
+
+
+def entity_document(values: Any) -> Dict[str, Any]:
+    """Build the versioned document of an entity.
+
+    Args:
+        values: ``Entity`` instance or mapping of column values.
+
+    Returns:
+        Dict[str, Any]: JSON-serializable document over ``VERSIONED_FIELDS``.
+    """
+    get = values.get if isinstance(values, Mapping) else lambda f: getattr(values, f, None)
+    document = {}
+    for field in VERSIONED_FIELDS:
+        value = get(field)
+        document[field] = value.isoformat() if isinstance(value, datetime) else value
+    return document
+
+
+def diff_documents(old: Mapping[str, Any], new: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return the merge patch turning ``old`` into ``new``.
+
+    Documents share a fixed key set, so a patch is just the changed keys with
+    their new values (lists are replaced whole, as in RFC 7386).
+    """
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+def apply_deltas(rows: Sequence[Any]) -> Dict[str, Any]:
+    """Rebuild a document from a snapshot row followed by delta rows."""
+    document: Dict[str, Any] = {}
+    for row in rows:
+        if row.snapshot:
+            document = dict(row.data)
+        else:
+            document.update(row.data)
+    return document
+
+
+def chain_query(uid: str, seq: Optional[int] = None) -> Any:
+    """Select the rows needed to rebuild release ``seq`` (default: latest).
+
+    That is the newest snapshot at or before ``seq`` and every delta after
+    it, in order; a single range scan of the primary key.
+    """
+    base = select(func.max(EntityVersion.seq)).where(
+        EntityVersion.uid == uid, EntityVersion.snapshot.is_(True)
+    )
+    stmt = select(*_CHAIN_COLUMNS).where(EntityVersion.uid == uid)
+    if seq is not None:
+        base = base.where(EntityVersion.seq <= seq)
+        stmt = stmt.where(EntityVersion.seq <= seq)
+    return stmt.where(EntityVersion.seq >= base.scalar_subquery()).order_by(EntityVersion.seq)
+
+
+def reconstruct(db: Session, uid: str, seq: int) -> Optional[Tuple[Row, Dict[str, Any]]]:
+    """Rebuild one release of an entity.
+
+    Args:
+        db: Database session.
+        uid: Entity uid.
+        seq: Release number.
+
+    Returns:
+        Optional[Tuple[Row, Dict[str, Any]]]: The release's row and its full
+        document, or None if there is no such release.
+    """
+    rows = db.execute(chain_query(uid, seq)).all()
+    if not rows or rows[-1].seq != seq:
+        return None
+    return rows[-1], apply_deltas(rows)
+
+
+def version_row(
+    uid: str,
+    seq: int,
+    document: Dict[str, Any],
+    data: Dict[str, Any],
+    snapshot: bool,
+    created_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Build the column values of an ``entity_version`` row.
+
+    Args:
+        uid: Entity uid.
+        seq: Release number.
+        document: Full document of the release.
+        data: What to store: ``document`` itself or a delta.
+        snapshot: Whether ``data`` is the full document.
+        created_at: Recording time (default: now).
+    """
+    release_ts = document.get("release_ts")
+    return {
+        "uid": uid,
+        "seq": seq,
+        "version": document["version"],
+        "release_ts": datetime.fromisoformat(release_ts) if release_ts else None,
+        "snapshot": snapshot,
+        "data": data,
+        "created_at": created_at or datetime.now(timezone.utc),
+    }
+
+
+def _record(connection: Connection, target: Entity) -> None:
+    document = entity_document(target)
+    chain: List[Row] = connection.execute(chain_query(target.uid)).all()
+    if not chain:
+        row = version_row(target.uid, 1, document, document, True)
+    else:
+        # Snapshot once the chain to rebuild would reach the interval
+        snapshot = len(chain) >= settings.VERSION_SNAPSHOT_INTERVAL
+        data = document if snapshot else diff_documents(apply_deltas(chain), document)
+        row = version_row(target.uid, chain[-1].seq + 1, document, data, snapshot)
+    connection.execute(insert(EntityVersion), row)
+    logger.debug(f"Recorded release {row['seq']} of {target.uid} (v{row['version']})")
+
+
+@event.listens_for(Entity, "after_insert")
+def _record_insert(mapper: Mapper, connection: Connection, target: Entity) -> None:
+    _record(connection, target)
+
+
+@event.listens_for(Entity, "after_update")
+def _record_update(mapper: Mapper, connection: Connection, target: Entity) -> None:
+    if attributes.get_history(target, "version").has_changes():
+        _record(connection, target)
@@ -13,14 +13,27 @@ License:
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.api import api_router
+from app.api.routes import health as health_routes
+from app.core.compression import CompressionMiddleware, available_codecs, get_compression_cache
 from app.core.config import settings
+from app.core.guest_sessions import guest_session_collector
+from app.core.lifespan import AppResources, InFlightMiddleware, get_lifecycle
+from app.core.metrics import REGISTRY, SnapshotWriter, pool_collector
+from app.core.profiling import ProfilingMiddleware
+from app.core.ratelimit import RateLimitMiddleware, RateLimitRule
+from app.core.timing import TimedRoute, TimingMiddleware
+from app.db.graph import get_connection_graph
+from app.db.search_index import get_search_index
+from app.db.session import engine
+from app.db.snapshot import get_catalog_snapshots
 
 # Configure structured logging
 logging.basicConfig(
@@ -29,6 +42,72 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Scrape-time gauges for /metrics
+REGISTRY.add_collector(pool_collector(engine))
+REGISTRY.add_collector(guest_session_collector)
+
+# Worker-lifetime resources (started and released by the lifespan below)
+resources = AppResources(
+    engine,
+    get_lifecycle(),
+    metrics_writer=(
+        SnapshotWriter(REGISTRY, settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_INTERVAL)
+        if settings.METRICS_MULTIPROC_DIR
+        else None
+    ),
+    warmup=settings.STARTUP_WARMUP,
+    warm_connections=settings.STARTUP_WARM_CONNECTIONS,
+    drain_timeout=settings.SHUTDOWN_DRAIN_SECONDS,
+)
+
+# Shared catalog snapshot for entity lists (mapped, or built, before traffic)
+if settings.CATALOG_SNAPSHOT_ENABLED:
+    _snapshots = get_catalog_snapshots()
+    resources.add_startup(_snapshots.start)
+    resources.add_cleanup(_snapshots.stop)
+    REGISTRY.add_collector(_snapshots.collect)
+
+# Per-worker in-memory search index for entity lists (built before traffic)
+if settings.SEARCH_INDEX_ENABLED:
+    _search_index = get_search_index()
+    resources.add_startup(_search_index.start)
+    resources.add_cleanup(_search_index.stop)
+    REGISTRY.add_collector(_search_index.collect)
+
+# Per-worker connection graph for "people you may know" (built before traffic)
+if settings.CONNECTION_GRAPH_ENABLED:
+    _connection_graph = get_connection_graph()
+    resources.add_startup(_connection_graph.start)
+    resources.add_cleanup(_connection_graph.stop)
+    REGISTRY.add_collector(_connection_graph.collect)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Manage application start-up and graceful shutdown.
+
+    Start-up logs the configuration, starts background flushers and warms the
+    connection pool and caches before uvicorn accepts connections. Shutdown
+    drains in-flight requests, stops background work and disposes the engine.
+
+    Args:
+        app: The FastAPI application.
+
+    Yields:
+        None: Control while the application serves requests.
+    """
+    logger.info(f"Starting {settings.APP_NAME} v1.0.0")
+    logger.info(f"Environment: {settings.APP_ENV}")
+    logger.info(f"Debug mode: {settings.APP_DEBUG}")
+    logger.info(f"Database URL: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'sqlite'}")  # noqa: E501
+    await resources.startup(app)
+    try:
+        yield
+    finally:
+        logger.info(f"Shutting down {settings.APP_NAME}")
+        await resources.shutdown()
+
+
 # Initialize FastAPI application
 app = FastAPI(
     title=settings.APP_NAME,
@@ -37,7 +116,47 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
+app.router.route_class = TimedRoute
+
+# On-demand request profiling (innermost; not installed at all when disabled)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval_ms=settings.PROFILING_INTERVAL_MS,
+        admin_token=settings.ADMIN_TOKEN,
+    )
+
+# Throttle authentication routes per client IP (registered before CORS so that
+# 429 responses still carry CORS headers)
+_auth_rule = RateLimitRule.per_minute(
+    settings.RATE_LIMIT_AUTH_PER_MINUTE, settings.RATE_LIMIT_AUTH_BURST
+)
+app.add_middleware(
+    RateLimitMiddleware,
+    rules={
+        "/api/auth/login": _auth_rule,
+        "/api/auth/register": _auth_rule,
+        "/api/auth/guest": _auth_rule,
+    },
+)
+
+# Compress responses (gzip, plus br/zstd when installed); compressed bodies of
+# identical responses are reused from a bounded cache
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        codecs=available_codecs(
+            [name.strip() for name in settings.COMPRESSION_ENCODINGS.split(",") if name.strip()],
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+            zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+        ),
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        cache=get_compression_cache(),
+    )
 
 # Configure CORS middleware
 app.add_middleware(
@@ -48,29 +167,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include API routers
-app.include_router(api_router, prefix="/api")
-
+# Request timing (outside the other middleware, so it sees the full cost of every request)
+if settings.TIMING_ENABLED:
+    app.add_middleware(TimingMiddleware, emit_header=settings.SERVER_TIMING_HEADER)
 
-@app.on_event("startup")
-async def startup_event() -> None:
-    """Execute startup tasks when the application starts.
+# In-flight accounting for graceful shutdown (outermost)
+app.add_middleware(InFlightMiddleware, lifecycle=get_lifecycle())
 
-    Logs application startup information and initializes necessary services.
-    """
-    logger.info(f"Starting {settings.APP_NAME} v1.0.0")
-    logger.info(f"Environment: {settings.APP_ENV}")
-    logger.info(f"Debug mode: {settings.APP_DEBUG}")
-    logger.info(f"Database URL: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'sqlite'}")  # noqa: E501
-
-
-@app.on_event("shutdown")
-async def shutdown_event() -> None:
-    """Execute cleanup tasks when the application shuts down.
-
-    Ensures graceful shutdown of all services and connections.
-    """
-    logger.info(f"Shutting down {settings.APP_NAME}")
+# Include API routers
+app.include_router(api_router, prefix="/api")
+app.include_router(health_routes.router)
 
 
 @app.get("/", tags=["meta"], response_model=Dict[str, Any])
@@ -92,6 +198,8 @@ async def root() -> JSONResponse:
             "description": "LinkedIn for AI Agents - Professional network for AI agents and tools",
             "docs": "/docs",
             "health": "/health",
+            "liveness": "/health/live",
+            "readiness": "/health/ready",
             "author": "Ruslan Magana",
             "website": "https://ruslanmv.com",
         }
@@ -103,7 +211,8 @@ async def health() -> Dict[str, str]:
     """Health check endpoint for monitoring and load balancers.
 
     This endpoint is used by orchestration tools, monitoring systems, and load balancers
-    to verify that the application is running and responsive.
+    to verify that the application is running and responsive. It performs no I/O;
+    use ``/health/ready`` to also verify database connectivity.
 
     Returns:
         dict: Health status containing status and application name.
@@ -114,3 +223,23 @@ async def health() -> Dict[str, str]:
     """
     logger.debug("Health check performed")
     return {"status": "ok", "app": settings.APP_NAME}
+
+
+@app.get("/metrics", tags=["meta"], response_class=PlainTextResponse, include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    """Prometheus metrics endpoint.
+
+    Exposes request latency histograms per route and status, SQL statements per
+    request, cache hit/miss counters, connection pool usage, guest sessions and
+    process memory/GC statistics. With ``METRICS_MULTIPROC_DIR`` set, metrics
+    from all uvicorn workers are aggregated.
+
+    Returns:
+        PlainTextResponse: Metrics in the Prometheus text exposition format.
+    """
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(
+        REGISTRY.render(settings.METRICS_MULTIPROC_DIR),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
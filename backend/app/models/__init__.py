@@ -10,6 +10,21 @@ License:
     Apache 2.0
 """
 
-from app.models.entity import Base, Entity
+from app.models.change import ChangeCounter
+from app.models.connection import Connection
+from app.models.entity import Base, Entity, EntityManifest, EntityProtocol, EntityVersion
+from app.models.feed import Post, TimelineEntry
+from app.models.job import Job
 
-__all__ = ["Base", "Entity"]
+__all__ = [
+    "Base",
+    "ChangeCounter",
+    "Connection",
+    "Entity",
+    "EntityManifest",
+    "EntityProtocol",
+    "EntityVersion",
+    "Job",
+    "Post",
+    "TimelineEntry",
+]
@@ -0,0 +1,66 @@
+"""Database Model for Change Counters.
+
+This module defines the ``change_counter`` table: one row per tracked table
+(``entity``, ``job``) whose value is bumped by every transaction writing to
+that table (see ``app.db.changes``).
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import BigInteger, Integer, String, event, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.entity import Base
+
+# Tables whose writes are counted
+TRACKED_TABLES = ("entity", "job")
+
+
+class ChangeCounter(Base):
+    """Database model holding the change counter of one table.
+
+    Writers bump the row inside their own transaction, so the row lock
+    orders them: a counter value read back from the database means every
+    transaction that took a lower value has committed.
+
+    Attributes:
+        name: Tracked table name (primary key).
+        value: Number of write transactions so far.
+    """
+
+    __tablename__ = "change_counter"
+
+    name: Mapped[str] = mapped_column(
+        String,
+        primary_key=True,
+        doc="Tracked table name",
+    )
+    value: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        nullable=False,
+        default=0,
+        doc="Number of write transactions so far",
+    )
+
+    def __repr__(self) -> str:
+        """Return a string representation of the ChangeCounter.
+
+        Returns:
+            str: A developer-friendly string representation.
+        """
+        return f"<ChangeCounter name={self.name} value={self.value}>"
+
+
+@event.listens_for(ChangeCounter.__table__, "after_create")
+def _create_counters(target: Any, connection: Connection, **kw: Any) -> None:
+    """Add the counter rows when the table is created by ``create_all``."""
+    connection.execute(insert(target), [{"name": name, "value": 0} for name in TRACKED_TABLES])
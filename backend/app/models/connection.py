@@ -0,0 +1,69 @@
+"""Database Models for the Agent Connection Graph.
+
+This module defines the ``connection`` table: undirected links between
+entities, as shown on the network page.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.entity import Base
+
+
+class Connection(Base):
+    """Database model holding one direction of a connection between entities.
+
+    Connections are undirected but every link is stored as two rows,
+    ``(a, b)`` and ``(b, a)``, so "connections of X" is always a range scan
+    on the ``(src, dst)`` primary key whichever side created the link. The
+    ``(dst, src)`` index serves the reverse lookups (cascading deletes and
+    consistency checks), and ``created_at`` lets the in-memory graph
+    (``app.db.graph``) pick up new rows incrementally.
+
+    Attributes:
+        src: Entity the row belongs to (primary key, with ``dst``).
+        dst: Connected entity.
+        created_at: Timestamp when the link was made.
+    """
+
+    __tablename__ = "connection"
+    __table_args__ = (
+        Index("ix_connection_dst_src", "dst", "src"),
+        Index("ix_connection_created_at", "created_at"),
+    )
+
+    src: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("entity.uid", ondelete="CASCADE"),
+        primary_key=True,
+        doc="Entity the row belongs to",
+    )
+    dst: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("entity.uid", ondelete="CASCADE"),
+        primary_key=True,
+        doc="Connected entity",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Timestamp when the link was made",
+    )
+
+    def __repr__(self) -> str:
+        """Return a string representation of the Connection.
+
+        Returns:
+            str: A developer-friendly string representation.
+        """
+        return f"<Connection {self.src} -> {self.dst}>"
@@ -12,11 +12,40 @@ License:
 
 from __future__ import annotations
 
+import hashlib
+import json
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import JSON, DateTime, Float, String, Text
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, validates
+
+from app.core.semver import UNPARSED_VERSION, parse_protocol, parse_version
+
+
+def manifest_hash(body: Any) -> str:
+    """Return the SHA-256 of a manifest's canonical JSON form.
+
+    Args:
+        body: Manifest document.
+
+    Returns:
+        str: Hex digest; equal manifests hash equally whatever their key order.
+    """
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
 
 
 class Base(DeclarativeBase):
@@ -46,6 +75,9 @@ class Entity(Base):
         type: Entity type (e.g., "agent", "tool", "mcp_server").
         name: Human-readable name of the entity.
         version: Semantic version string (e.g., "1.0.0").
+        version_major, version_minor, version_patch, version_pre: Sortable
+            components parsed from ``version`` on assignment (see
+            ``app.core.semver``); indexed together for range filters and sorting.
         summary: Brief one-line description.
         description: Detailed multi-line description in Markdown.
         license: Software license identifier (e.g., "Apache-2.0").
@@ -54,13 +86,17 @@ class Entity(Base):
         capabilities: List of capabilities/features the entity provides.
         frameworks: List of frameworks the entity is built with.
         providers: List of AI providers the entity supports.
-        protocols: List of communication protocols (e.g., ["a2a@1.0", "mcp@0.1"]).
-        manifests: Protocol-specific manifest data as JSON.
+        protocols: List of communication protocols (e.g., ["a2a@1.0", "mcp@0.1"]);
+            mirrored, parsed, into ``entity_protocol`` on assignment.
+        manifests: Protocol-specific manifests keyed by protocol; stored in the
+            ``entity_manifest`` table and loaded on first access.
         readme_blob_ref: Reference to README content blob.
         quality_score: Computed quality score (0.0 to 100.0).
         release_ts: Timestamp of the latest release.
         created_at: Timestamp when the entity was first created.
         updated_at: Timestamp of the last update.
+        change_seq: ``entity`` change counter value of the last write
+            (see ``app.db.changes``).
 
     Example:
         >>> entity = Entity(
@@ -74,6 +110,12 @@ class Entity(Base):
     """
 
     __tablename__ = "entity"
+    __table_args__ = (
+        Index(
+            "ix_entity_semver",
+            "version_major", "version_minor", "version_patch", "version_pre", "uid",
+        ),
+    )
 
     # Primary identifiers
     uid: Mapped[str] = mapped_column(
@@ -99,6 +141,29 @@ class Entity(Base):
         doc="Semantic version string (e.g., 1.0.0)",
     )
 
+    # Parsed version (maintained by _parse_version)
+    version_major: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        doc="Major version (-1 if the version is not SemVer-like)",
+    )
+    version_minor: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        doc="Minor version",
+    )
+    version_patch: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        doc="Patch version",
+    )
+    version_pre: Mapped[Optional[str]] = mapped_column(
+        # Byte-wise collation: the sort key must not be compared linguistically
+        String().with_variant(String(collation="C"), "postgresql"),
+        nullable=True,
+        doc="Prerelease sort key ('~' for releases)",
+    )
+
     # Descriptive content
     summary: Mapped[Optional[str]] = mapped_column(
         Text,
@@ -151,10 +216,18 @@ class Entity(Base):
         default=list,
         doc="Supported protocols (e.g., ['a2a@1.0', 'mcp@0.1'])",
     )
-    manifests: Mapped[Optional[dict[str, Any]]] = mapped_column(
-        JSON,
-        nullable=True,
-        doc="Protocol-specific manifest data as JSON",
+    protocol_rows: Mapped[List["EntityProtocol"]] = relationship(
+        back_populates="entity",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        doc="Parsed protocol tags (maintained by _sync_protocols)",
+    )
+    manifest_rows: Mapped[List["EntityManifest"]] = relationship(
+        back_populates="entity",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="EntityManifest.protocol",
+        doc="Protocol manifests, kept off the entity row",
     )
 
     # Content references
@@ -188,8 +261,60 @@ class Entity(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
+        index=True,
+        onupdate=func.now(),
         doc="Timestamp of the last update",
     )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        nullable=False,
+        default=0,
+        server_default="0",
+        index=True,
+        doc="Change counter value of the last write",
+    )
+
+    @validates("version")
+    def _parse_version(self, key: str, value: str) -> str:
+        """Keep the parsed version columns in step with ``version``."""
+        parsed = parse_version(value) or UNPARSED_VERSION
+        self.version_major, self.version_minor, self.version_patch, self.version_pre = parsed
+        return value
+
+    @validates("protocols")
+    def _sync_protocols(self, key: str, value: Optional[List[str]]) -> Optional[List[str]]:
+        """Keep the ``entity_protocol`` rows in step with ``protocols``."""
+        tags = list(dict.fromkeys(value or []))
+        existing = {row.tag: row for row in self.protocol_rows}
+        for tag, row in existing.items():
+            if tag not in tags:
+                self.protocol_rows.remove(row)
+        for tag in tags:
+            if tag not in existing:
+                self.protocol_rows.append(EntityProtocol.from_tag(tag))
+        return value
+
+    @property
+    def manifests(self) -> Dict[str, Any]:
+        """Protocol-specific manifests keyed by protocol (lazy-loaded)."""
+        return {row.protocol: row.body for row in self.manifest_rows}
+
+    @manifests.setter
+    def manifests(self, value: Optional[Dict[str, Any]]) -> None:
+        """Replace the manifests, leaving rows whose content hash is unchanged
+        untouched so unchanged manifests are never rewritten."""
+        value = value or {}
+        existing = {row.protocol: row for row in self.manifest_rows}
+        for protocol, row in existing.items():
+            if protocol not in value:
+                self.manifest_rows.remove(row)
+        for protocol, body in value.items():
+            digest = manifest_hash(body)
+            row = existing.get(protocol)
+            if row is None:
+                self.manifest_rows.append(EntityManifest(protocol=protocol, body=body, hash=digest))
+            elif row.hash != digest:
+                row.body, row.hash = body, digest
 
     def __repr__(self) -> str:
         """Return a string representation of the Entity.
@@ -198,3 +323,204 @@ class Entity(Base):
             str: A developer-friendly string representation.
         """
         return f"<Entity uid={self.uid} type={self.type} name={self.name} v={self.version}>"
+
+
+class EntityProtocol(Base):
+    """Database model holding one parsed protocol tag of an entity.
+
+    ``Entity.protocols`` keeps the tags as written; this table splits each
+    into a family name and sortable version components (see
+    ``app.core.semver``) so that "every entity speaking ``mcp`` >= 0.1" is an
+    index range scan on ``ix_entity_protocol_version``.
+
+    Attributes:
+        uid: Owning entity (primary key, with ``tag``).
+        tag: Protocol tag as written (e.g., "mcp@0.1").
+        name: Lower-case protocol family (e.g., "mcp").
+        version: Version part of the tag (e.g., "0.1"; empty if none).
+        version_major, version_minor, version_patch, version_pre: Parsed
+            version (major -1 if the version is missing or not SemVer-like).
+    """
+
+    __tablename__ = "entity_protocol"
+    __table_args__ = (
+        Index(
+            "ix_entity_protocol_version",
+            "name", "version_major", "version_minor", "version_patch", "version_pre", "uid",
+        ),
+    )
+
+    uid: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("entity.uid", ondelete="CASCADE"),
+        primary_key=True,
+        doc="Owning entity uid",
+    )
+    tag: Mapped[str] = mapped_column(
+        String,
+        primary_key=True,
+        doc="Protocol tag as written",
+    )
+    name: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        doc="Lower-case protocol family",
+    )
+    version: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        doc="Version part of the tag",
+    )
+    version_major: Mapped[int] = mapped_column(Integer, nullable=False, doc="Major version")
+    version_minor: Mapped[int] = mapped_column(Integer, nullable=False, doc="Minor version")
+    version_patch: Mapped[int] = mapped_column(Integer, nullable=False, doc="Patch version")
+    version_pre: Mapped[str] = mapped_column(
+        String().with_variant(String(collation="C"), "postgresql"),
+        nullable=False,
+        doc="Prerelease sort key ('~' for releases)",
+    )
+
+    entity: Mapped[Entity] = relationship(back_populates="protocol_rows")
+
+    @staticmethod
+    def values(tag: str) -> Dict[str, Any]:
+        """Column values (except ``uid``) of the row for a tag."""
+        name, version, parsed = parse_protocol(tag)
+        return {
+            "tag": tag,
+            "name": name,
+            "version": version,
+            "version_major": parsed.major,
+            "version_minor": parsed.minor,
+            "version_patch": parsed.patch,
+            "version_pre": parsed.prerelease,
+        }
+
+    @classmethod
+    def from_tag(cls, tag: str) -> "EntityProtocol":
+        """Build the row for a protocol tag."""
+        return cls(**cls.values(tag))
+
+    def __repr__(self) -> str:
+        """Return a string representation of the EntityProtocol.
+
+        Returns:
+            str: A developer-friendly string representation.
+        """
+        return f"<EntityProtocol uid={self.uid} tag={self.tag}>"
+
+
+class EntityManifest(Base):
+    """Database model holding one protocol manifest of an entity.
+
+    Manifests are unbounded JSON documents; keeping them in their own table
+    keeps ``entity`` rows narrow for list queries, and lets a single
+    protocol's manifest be fetched by primary key.
+
+    Attributes:
+        uid: Owning entity (primary key, with ``protocol``).
+        protocol: Protocol the manifest describes (e.g., "mcp@0.1").
+        body: Manifest document.
+        hash: SHA-256 of the canonical JSON body (see :func:`manifest_hash`);
+            used to skip unchanged writes and as the HTTP ETag.
+    """
+
+    __tablename__ = "entity_manifest"
+
+    uid: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("entity.uid", ondelete="CASCADE"),
+        primary_key=True,
+        doc="Owning entity uid",
+    )
+    protocol: Mapped[str] = mapped_column(
+        String,
+        primary_key=True,
+        doc="Protocol the manifest describes",
+    )
+    body: Mapped[Any] = mapped_column(
+        JSON,
+        nullable=False,
+        doc="Manifest document",
+    )
+    hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        doc="SHA-256 of the canonical JSON body",
+    )
+
+    entity: Mapped[Entity] = relationship(back_populates="manifest_rows")
+
+    def __repr__(self) -> str:
+        """Return a string representation of the EntityManifest.
+
+        Returns:
+            str: A developer-friendly string representation.
+        """
+        return f"<EntityManifest uid={self.uid} protocol={self.protocol} hash={self.hash[:12]}>"
+
+
+class EntityVersion(Base):
+    """Database model recording one release of an entity.
+
+    Releases are stored compactly: most rows hold only the fields that
+    changed since the previous release (a JSON merge patch), and every
+    ``VERSION_SNAPSHOT_INTERVAL``-th row holds the full document, so any
+    release is rebuilt from at most that many rows (see ``app.db.versions``).
+
+    Attributes:
+        uid: Owning entity (primary key, with ``seq``).
+        seq: Release number within the entity, starting at 1.
+        version: Version string of the release.
+        release_ts: Release timestamp, if known.
+        snapshot: Whether ``data`` is a full document rather than a delta.
+        data: Full document or delta against the previous release.
+        created_at: Timestamp when the release was recorded.
+    """
+
+    __tablename__ = "entity_version"
+
+    uid: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("entity.uid", ondelete="CASCADE"),
+        primary_key=True,
+        doc="Owning entity uid",
+    )
+    seq: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        doc="Release number within the entity",
+    )
+    version: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        doc="Version string of the release",
+    )
+    release_ts: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Release timestamp",
+    )
+    snapshot: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        doc="Whether data is a full document",
+    )
+    data: Mapped[Dict[str, Any]] = mapped_column(
+        JSON,
+        nullable=False,
+        doc="Full document or merge patch against the previous release",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Timestamp when the release was recorded",
+    )
+
+    def __repr__(self) -> str:
+        """Return a string representation of the EntityVersion.
+
+        Returns:
+            str: A developer-friendly string representation.
+        """
+        return f"<EntityVersion uid={self.uid} seq={self.seq} v={self.version}>"
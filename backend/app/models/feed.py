@@ -0,0 +1,145 @@
+"""Database Models for the Activity Feed.
+
+This module defines the ``post`` table of entity posts and the
+``timeline_entry`` table of materialized per-entity timelines.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.entity import Base
+
+# Integer primary keys autoincrement on SQLite only as INTEGER
+PostId = BigInteger().with_variant(Integer, "sqlite")
+
+
+class Post(Base):
+    """Database model representing a post by an entity.
+
+    Post ids increase with time, so ``id`` doubles as the timeline sort key
+    and keyset cursor.
+
+    Posts by authors with fewer than ``FEED_FANOUT_MAX_FOLLOWERS``
+    connections are copied into every connection's timeline when written
+    (``fanout`` true). Posts by larger authors are not (``fanout`` false);
+    readers pull them at read time through the partial index
+    ``ix_post_pulled``, which holds only those posts.
+
+    Attributes:
+        id: Post id (increasing).
+        author: Entity that wrote the post.
+        content: Post text.
+        fanout: Whether the post was pushed to followers' timelines.
+        likes: Like count.
+        comments: Comment count.
+        created_at: Timestamp when the post was written.
+    """
+
+    __tablename__ = "post"
+    __table_args__ = (
+        Index("ix_post_author_id", "author", "id"),
+        Index(
+            "ix_post_pulled",
+            "author",
+            "id",
+            postgresql_where=text("NOT fanout"),
+            sqlite_where=text("NOT fanout"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(
+        PostId,
+        primary_key=True,
+        autoincrement=True,
+        doc="Post id (increasing)",
+    )
+    author: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("entity.uid", ondelete="CASCADE"),
+        nullable=False,
+        doc="Entity that wrote the post",
+    )
+    content: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        doc="Post text",
+    )
+    fanout: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        doc="Whether the post was pushed to followers' timelines",
+    )
+    likes: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Like count",
+    )
+    comments: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Comment count",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Timestamp when the post was written",
+    )
+
+    def __repr__(self) -> str:
+        """Return a string representation of the Post.
+
+        Returns:
+            str: A developer-friendly string representation.
+        """
+        return f"<Post id={self.id} author={self.author} fanout={self.fanout}>"
+
+
+class TimelineEntry(Base):
+    """Database model placing one post in one entity's timeline.
+
+    A dashboard page is a range scan of the ``(owner, post_id)`` primary key
+    in descending order, instead of a join across every connection's posts.
+
+    Attributes:
+        owner: Entity whose timeline holds the entry (primary key, with
+            ``post_id``).
+        post_id: Post shown in the timeline.
+    """
+
+    __tablename__ = "timeline_entry"
+    __table_args__ = (
+        Index("ix_timeline_entry_post_id", "post_id"),
+    )
+
+    owner: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("entity.uid", ondelete="CASCADE"),
+        primary_key=True,
+        doc="Entity whose timeline holds the entry",
+    )
+    post_id: Mapped[int] = mapped_column(
+        PostId,
+        ForeignKey("post.id", ondelete="CASCADE"),
+        primary_key=True,
+        doc="Post shown in the timeline",
+    )
+
+    def __repr__(self) -> str:
+        """Return a string representation of the TimelineEntry.
+
+        Returns:
+            str: A developer-friendly string representation.
+        """
+        return f"<TimelineEntry owner={self.owner} post_id={self.post_id}>"
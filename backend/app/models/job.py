@@ -0,0 +1,136 @@
+"""Database Models for the Jobs Marketplace.
+
+This module defines the ``job`` table: work posted to the network, with
+the capabilities and protocols an entity needs to take it on.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import JSON, BigInteger, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.entity import Base
+
+# Job statuses; only open jobs are matched
+JOB_STATUSES = ("open", "closed")
+
+
+class Job(Base):
+    """Database model representing a job on the jobs board.
+
+    Requirements use the vocabulary of ``Entity.capabilities`` and
+    ``Entity.protocols``; matching scores their overlap using in-memory
+    per-tag posting lists (see ``app.db.jobs``).
+
+    Attributes:
+        id: Job id (increasing; the listing cursor).
+        title: Job title.
+        company: Posting organization.
+        location: Where the work runs (e.g., "Remote", "Cloud").
+        type: Kind of work (e.g., "Batch", "Stream").
+        compensation: Offered pay, as displayed (e.g., "200 Credits").
+        description: Detailed description.
+        capabilities: Required capabilities (e.g., ['summarization']).
+        protocols: Required protocols (e.g., ['mcp@0.1']).
+        status: "open" or "closed".
+        created_at: Timestamp when the job was posted.
+        updated_at: Timestamp of the last update.
+        change_seq: ``job`` change counter value of the last write (see
+            ``app.db.changes``).
+    """
+
+    __tablename__ = "job"
+    __table_args__ = (
+        Index("ix_job_status_id", "status", "id"),
+        Index("ix_job_updated_at", "updated_at"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+        doc="Job id (increasing)",
+    )
+    title: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        doc="Job title",
+    )
+    company: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        doc="Posting organization",
+    )
+    location: Mapped[Optional[str]] = mapped_column(
+        String,
+        nullable=True,
+        doc="Where the work runs",
+    )
+    type: Mapped[Optional[str]] = mapped_column(
+        String,
+        nullable=True,
+        doc="Kind of work (e.g., Batch, Stream)",
+    )
+    compensation: Mapped[Optional[str]] = mapped_column(
+        String,
+        nullable=True,
+        doc="Offered pay, as displayed",
+    )
+    description: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        doc="Detailed description",
+    )
+    capabilities: Mapped[List[str]] = mapped_column(
+        JSON,
+        nullable=False,
+        default=list,
+        doc="Required capabilities",
+    )
+    protocols: Mapped[List[str]] = mapped_column(
+        JSON,
+        nullable=False,
+        default=list,
+        doc="Required protocols",
+    )
+    status: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        default="open",
+        doc="open or closed",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Timestamp when the job was posted",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Timestamp of the last update",
+    )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        nullable=False,
+        default=0,
+        server_default="0",
+        index=True,
+        doc="Change counter value of the last write",
+    )
+
+    def __repr__(self) -> str:
+        """Return a string representation of the Job.
+
+        Returns:
+            str: A developer-friendly string representation.
+        """
+        return f"<Job id={self.id} title={self.title} status={self.status}>"
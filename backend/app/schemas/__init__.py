@@ -10,6 +10,23 @@ License:
     Apache 2.0
 """
 
+from app.schemas.admin import (
+    ProfileSummary,
+    SlowQueryEntry,
+    SlowQueryFingerprint,
+    SlowQueryReport,
+    SqlCacheStats,
+)
 from app.schemas.entity import EntityBase, EntityCreate, EntityRead, EntitySearchItem
 
-__all__ = ["EntityBase", "EntityCreate", "EntityRead", "EntitySearchItem"]
+__all__ = [
+    "EntityBase",
+    "EntityCreate",
+    "EntityRead",
+    "EntitySearchItem",
+    "ProfileSummary",
+    "SlowQueryEntry",
+    "SlowQueryFingerprint",
+    "SlowQueryReport",
+    "SqlCacheStats",
+]
@@ -0,0 +1,119 @@
+"""Admin API Schemas.
+
+This module defines Pydantic schemas for the operational admin endpoints.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SlowQueryFingerprint(BaseModel):
+    """Aggregated statistics for one normalized statement shape.
+
+    Attributes:
+        fingerprint: Stable identifier of the normalized statement.
+        statement: Normalized SQL (literals replaced by ``?``).
+        count: Number of slow executions recorded.
+        total_ms: Total time of recorded executions.
+        mean_ms: Mean time of recorded executions.
+        max_ms: Slowest recorded execution.
+        routes: Calling route templates with execution counts.
+        explain: Captured query plan, if any.
+    """
+
+    fingerprint: str = Field(..., description="Fingerprint identifier")
+    statement: str = Field(..., description="Normalized SQL statement")
+    count: int = Field(..., description="Slow executions recorded")
+    total_ms: float = Field(..., description="Total duration in milliseconds")
+    mean_ms: float = Field(..., description="Mean duration in milliseconds")
+    max_ms: float = Field(..., description="Maximum duration in milliseconds")
+    routes: Dict[str, int] = Field(default_factory=dict, description="Calling routes")
+    explain: Optional[str] = Field(None, description="Captured EXPLAIN output")
+
+
+class SlowQueryEntry(BaseModel):
+    """A single recorded slow statement.
+
+    Attributes:
+        fingerprint: Fingerprint of the statement.
+        statement: Normalized SQL.
+        parameters: Redacted bound parameters.
+        duration_ms: Execution time.
+        route: Route template that issued the statement.
+        recorded_at: When the statement finished.
+    """
+
+    fingerprint: str = Field(..., description="Fingerprint identifier")
+    statement: str = Field(..., description="Normalized SQL statement")
+    parameters: Any = Field(None, description="Redacted parameters")
+    duration_ms: float = Field(..., description="Duration in milliseconds")
+    route: str = Field(..., description="Calling route template")
+    recorded_at: datetime = Field(..., description="Completion timestamp")
+
+
+class SlowQueryReport(BaseModel):
+    """Slow-query report for this worker.
+
+    Attributes:
+        threshold_ms: Current slow-query threshold.
+        fingerprints: Slowest statement shapes by total time.
+        recent: Most recent slow statements, newest first.
+    """
+
+    threshold_ms: float = Field(..., description="Slow-query threshold in milliseconds")
+    fingerprints: List[SlowQueryFingerprint] = Field(default_factory=list)
+    recent: List[SlowQueryEntry] = Field(default_factory=list)
+
+
+class ProfileSummary(BaseModel):
+    """Summary of a captured request profile.
+
+    Attributes:
+        profile_id: Profile identifier (also sent as ``X-Profile-Id``).
+        method: HTTP method of the profiled request.
+        path: Request path.
+        route: Route template that handled the request.
+        status: Response status code.
+        started_at: When the request started.
+        duration_ms: Request duration.
+        samples: Number of stack samples taken.
+    """
+
+    profile_id: str = Field(..., description="Profile identifier")
+    method: str = Field(..., description="HTTP method")
+    path: str = Field(..., description="Request path")
+    route: str = Field("", description="Route template")
+    status: int = Field(..., description="Response status code")
+    started_at: datetime = Field(..., description="Request start timestamp")
+    duration_ms: float = Field(..., description="Request duration in milliseconds")
+    samples: int = Field(..., description="Stack samples taken")
+
+
+class SqlCacheStats(BaseModel):
+    """Compiled SQL statement cache statistics for this worker.
+
+    Attributes:
+        hits: Executions served from the compiled cache.
+        misses: Executions that compiled their statement.
+        hit_ratio: ``hits / (hits + misses)``.
+        size: Entries currently in the engine's compiled cache.
+        capacity: Maximum entries of the compiled cache.
+        templates: Pre-built entity list statement templates.
+    """
+
+    hits: int = Field(..., description="Compiled cache hits")
+    misses: int = Field(..., description="Compiled cache misses")
+    hit_ratio: float = Field(..., description="Hit ratio (0-1)")
+    size: int = Field(..., description="Cached compiled statements")
+    capacity: int = Field(..., description="Compiled cache capacity")
+    templates: int = Field(..., description="Pre-built list statement templates")
@@ -0,0 +1,70 @@
+"""Pydantic Schemas for the Agent Connection Graph.
+
+This module defines the response schemas of the connection endpoints:
+an entity's connections and its suggested connections.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ConnectionItem(BaseModel):
+    """Schema for one connection of an entity.
+
+    Attributes:
+        id: Connected entity.
+        type: Entity type of the connected entity.
+        name: Name of the connected entity.
+        connected_at: When the connection was made.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str = Field(..., description="Connected entity uid")
+    type: str = Field(..., description="Entity type")
+    name: str = Field(..., description="Entity name")
+    connected_at: datetime = Field(..., description="When the connection was made")
+
+
+class ConnectionPage(BaseModel):
+    """Schema for a page of connections (ordered by connected uid).
+
+    Attributes:
+        items: Connections on this page.
+        next_after: Cursor for the next page (pass as ``after``); None on
+            the last page.
+    """
+
+    items: List[ConnectionItem] = Field(default_factory=list)
+    next_after: Optional[str] = Field(
+        None,
+        description="Pass as `after` to fetch the next page",
+    )
+
+
+class ConnectionSuggestion(BaseModel):
+    """Schema for a suggested connection ("people you may know").
+
+    Attributes:
+        id: Suggested entity.
+        type: Entity type of the suggested entity.
+        name: Name of the suggested entity.
+        mutuals: Connections shared with the requesting entity.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str = Field(..., description="Suggested entity uid")
+    type: str = Field(..., description="Entity type")
+    name: str = Field(..., description="Entity name")
+    mutuals: int = Field(..., ge=1, description="Connections in common")
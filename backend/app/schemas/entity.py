@@ -284,3 +284,94 @@ class EntityCreate(BaseModel):
     protocols: List[str] = Field(default_factory=list)
     manifests: Optional[Dict[str, Any]] = None
     quality_score: float = Field(default=0.0, ge=0.0, le=100.0)
+
+
+class EntityVersionSummary(BaseModel):
+    """Schema for one release in an entity's version history.
+
+    Attributes:
+        seq: Release number within the entity (1 = first recorded).
+        version: Version string of the release.
+        release_ts: Release timestamp, if known.
+        created_at: When the release was recorded.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    seq: int = Field(..., description="Release number within the entity")
+    version: str = Field(..., description="Version string")
+    release_ts: Optional[datetime] = Field(None, description="Release timestamp")
+    created_at: datetime = Field(..., description="When the release was recorded")
+
+
+class EntityVersionPage(BaseModel):
+    """Schema for a page of version history (newest first).
+
+    Attributes:
+        items: Releases on this page.
+        next_before: Cursor for the next page (pass as ``before``); None on
+            the last page.
+    """
+
+    items: List[EntityVersionSummary] = Field(default_factory=list)
+    next_before: Optional[int] = Field(
+        None,
+        description="Pass as `before` to fetch the next page",
+    )
+
+
+class EntityVersionRead(EntityVersionSummary):
+    """Schema for the full state of an entity at one release.
+
+    Attributes:
+        summary: Brief description at the release.
+        description: Detailed description at the release.
+        license: License identifier at the release.
+        homepage: Homepage URL at the release.
+        source_url: Source repository URL at the release.
+        capabilities: Capabilities at the release.
+        frameworks: Frameworks at the release.
+        providers: Providers at the release.
+        protocols: Protocols at the release.
+        readme_blob_ref: README blob at the release.
+    """
+
+    summary: Optional[str] = None
+    description: Optional[str] = None
+    license: Optional[str] = None
+    homepage: Optional[str] = None
+    source_url: Optional[str] = None
+    capabilities: List[str] = Field(default_factory=list)
+    frameworks: List[str] = Field(default_factory=list)
+    providers: List[str] = Field(default_factory=list)
+    protocols: List[str] = Field(default_factory=list)
+    readme_blob_ref: Optional[str] = None
+
+
+class ProtocolVersionInfo(BaseModel):
+    """Schema for one version of a protocol family in the catalog.
+
+    Attributes:
+        version: Version as written in protocol tags (e.g., "0.1").
+        entities: Number of entities speaking this version.
+        compatible: Spoken versions satisfying ``^version``.
+    """
+
+    version: str = Field(..., description="Protocol version")
+    entities: int = Field(..., description="Entities speaking this version")
+    compatible: List[str] = Field(
+        default_factory=list,
+        description="Spoken versions that satisfy ^version",
+    )
+
+
+class ProtocolMatrixRead(BaseModel):
+    """Schema for the compatibility matrix of a protocol family.
+
+    Attributes:
+        protocol: Protocol family (e.g., "mcp").
+        versions: Spoken versions, oldest first.
+    """
+
+    protocol: str = Field(..., description="Protocol family")
+    versions: List[ProtocolVersionInfo] = Field(default_factory=list)
@@ -0,0 +1,69 @@
+"""Pydantic Schemas for the Activity Feed.
+
+This module defines request and response schemas for posts and timelines.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class PostCreate(BaseModel):
+    """Schema for writing a post.
+
+    Attributes:
+        content: Post text.
+    """
+
+    content: str = Field(..., min_length=1, max_length=5000, description="Post text")
+
+
+class FeedItem(BaseModel):
+    """Schema for one post in a feed.
+
+    Attributes:
+        id: Post id (also the keyset cursor).
+        author: Entity that wrote the post.
+        author_name: Name of the author.
+        author_type: Entity type of the author.
+        content: Post text.
+        likes: Like count.
+        comments: Comment count.
+        created_at: When the post was written.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int = Field(..., description="Post id")
+    author: str = Field(..., description="Author entity uid")
+    author_name: str = Field(..., description="Author name")
+    author_type: str = Field(..., description="Author entity type")
+    content: str = Field(..., description="Post text")
+    likes: int = Field(0, description="Like count")
+    comments: int = Field(0, description="Comment count")
+    created_at: datetime = Field(..., description="When the post was written")
+
+
+class FeedPage(BaseModel):
+    """Schema for a page of posts (newest first).
+
+    Attributes:
+        items: Posts on this page.
+        next_before: Cursor for the next page (pass as ``before``); None on
+            the last page.
+    """
+
+    items: List[FeedItem] = Field(default_factory=list)
+    next_before: Optional[int] = Field(
+        None,
+        description="Pass as `before` to fetch the next page",
+    )
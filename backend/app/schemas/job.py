@@ -0,0 +1,132 @@
+"""Pydantic Schemas for the Jobs Marketplace.
+
+This module defines request and response schemas for jobs and for matches
+between jobs and entities.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobBase(BaseModel):
+    """Base schema for job fields set by the poster.
+
+    Attributes:
+        title: Job title.
+        company: Posting organization.
+        location: Where the work runs.
+        type: Kind of work (e.g., "Batch", "Stream").
+        compensation: Offered pay, as displayed.
+        description: Detailed description.
+        capabilities: Required capabilities.
+        protocols: Required protocols (matched by family, e.g. "mcp").
+    """
+
+    title: str = Field(..., min_length=1, max_length=200, description="Job title")
+    company: str = Field(..., min_length=1, max_length=200, description="Posting organization")
+    location: Optional[str] = Field(None, description="Where the work runs")
+    type: Optional[str] = Field(None, description="Kind of work")
+    compensation: Optional[str] = Field(None, description="Offered pay")
+    description: Optional[str] = Field(None, description="Detailed description")
+    capabilities: List[str] = Field(default_factory=list, description="Required capabilities")
+    protocols: List[str] = Field(default_factory=list, description="Required protocols")
+
+
+class JobCreate(JobBase):
+    """Schema for posting a job."""
+
+    pass
+
+
+class JobUpdate(BaseModel):
+    """Schema for updating a job; only fields that are set change.
+
+    Attributes:
+        title: Job title.
+        description: Detailed description.
+        capabilities: Required capabilities.
+        protocols: Required protocols.
+        status: "open" or "closed" (closed jobs are not matched).
+    """
+
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    capabilities: Optional[List[str]] = None
+    protocols: Optional[List[str]] = None
+    status: Optional[Literal["open", "closed"]] = None
+
+
+class JobRead(JobBase):
+    """Schema for a job in responses.
+
+    Attributes:
+        id: Job id.
+        status: "open" or "closed".
+        created_at: When the job was posted.
+        updated_at: When the job last changed.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int = Field(..., description="Job id")
+    status: str = Field(..., description="open or closed")
+    created_at: datetime = Field(..., description="When the job was posted")
+    updated_at: datetime = Field(..., description="When the job last changed")
+
+
+class JobPage(BaseModel):
+    """Schema for a page of jobs (newest first).
+
+    Attributes:
+        items: Jobs on this page.
+        next_before: Cursor for the next page (pass as ``before``); None on
+            the last page.
+    """
+
+    items: List[JobRead] = Field(default_factory=list)
+    next_before: Optional[int] = Field(
+        None,
+        description="Pass as `before` to fetch the next page",
+    )
+
+
+class JobMatch(BaseModel):
+    """Schema for an open job matched to an entity.
+
+    Attributes:
+        job: The job.
+        score: Share of the job's requirements the entity meets (0-1].
+        matched: Requirement tags the entity meets.
+    """
+
+    job: JobRead
+    score: float = Field(..., gt=0.0, le=1.0, description="Share of requirements met")
+    matched: List[str] = Field(default_factory=list, description="Requirement tags met")
+
+
+class JobCandidate(BaseModel):
+    """Schema for an entity matched to a job.
+
+    Attributes:
+        id: Entity uid.
+        type: Entity type.
+        name: Entity name.
+        score: Share of the job's requirements the entity meets (0-1].
+        matched: Requirement tags the entity meets.
+    """
+
+    id: str = Field(..., description="Entity uid")
+    type: str = Field(..., description="Entity type")
+    name: str = Field(..., description="Entity name")
+    score: float = Field(..., gt=0.0, le=1.0, description="Share of requirements met")
+    matched: List[str] = Field(default_factory=list, description="Requirement tags met")
@@ -0,0 +1,341 @@
+"""Production Server Entry Point.
+
+``python -m app.server`` starts the API with a worker count and connection
+pool sized for the container it runs in:
+
+- the CPU quota is read from the cgroup (v2 ``cpu.max`` or v1
+  ``cpu.cfs_quota_us``/``cpu.cfs_period_us``) and capped by the process CPU
+  affinity, so a container limited to 2 CPUs on a 64-core host starts
+  ``2 x WORKERS_PER_CPU`` workers rather than 64; ``WORKERS`` overrides it;
+- with ``DB_CONNECTION_BUDGET`` set, each worker's ``DB_POOL_SIZE`` and
+  ``DB_MAX_OVERFLOW`` are trimmed (overflow first) so that
+  ``workers x (pool_size + max_overflow)`` never exceeds the budget;
+- under gunicorn with ``SERVER_PRELOAD``, the app is imported once in the
+  master and the heap is frozen (``gc.freeze``) before forking, so settings,
+  pre-built statements and other read-only data stay shared copy-on-write.
+
+gunicorn is an optional dependency (``pip install .[server]``). Without it
+the server falls back to uvicorn's own multi-process mode, which sizes
+workers and pools the same way but imports the app in every worker.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import Settings, settings
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# Seconds added to the drain period before gunicorn kills a worker
+_GRACE_MARGIN = 5.0
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit(root: str = CGROUP_ROOT) -> Optional[float]:
+    """Read the CPU quota of the current cgroup.
+
+    Args:
+        root: cgroup filesystem mount point.
+
+    Returns:
+        Optional[float]: Number of CPUs the quota allows, or None when the
+        cgroup sets no limit (or cannot be read).
+
+    Example:
+        >>> cgroup_cpu_limit()  # "150000 100000" in cpu.max
+        1.5
+    """
+    base = Path(root)
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    cpu_max = _read(base / "cpu.max")
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+        if quota == "max":
+            return None
+        try:
+            return int(quota) / int(period or 100000)
+        except (ValueError, ZeroDivisionError):
+            return None
+    # cgroup v1: quota of -1 means unlimited
+    for directory in ("cpu", "cpu,cpuacct", "cpuacct,cpu"):
+        quota = _read(base / directory / "cpu.cfs_quota_us")
+        period = _read(base / directory / "cpu.cfs_period_us")
+        if quota is None or period is None:
+            continue
+        try:
+            if int(quota) <= 0:
+                return None
+            return int(quota) / int(period)
+        except (ValueError, ZeroDivisionError):
+            return None
+    return None
+
+
+def available_cpus(root: str = CGROUP_ROOT) -> float:
+    """Return the CPUs this process may actually use.
+
+    Args:
+        root: cgroup filesystem mount point.
+
+    Returns:
+        float: The smaller of the cgroup quota and the CPU affinity count.
+    """
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:  # Not available on macOS
+        cpus = float(os.cpu_count() or 1)
+    limit = cgroup_cpu_limit(root)
+    return min(cpus, limit) if limit is not None else cpus
+
+
+def worker_count(cpus: float, per_cpu: float = 1.0, maximum: int = 16) -> int:
+    """Derive the number of worker processes from the available CPUs.
+
+    Args:
+        cpus: CPUs available (may be fractional under a quota).
+        per_cpu: Workers per CPU.
+        maximum: Upper bound.
+
+    Returns:
+        int: Between 1 and ``maximum``.
+    """
+    return max(1, min(maximum, math.floor(cpus * per_cpu)))
+
+
+def pool_settings(
+    workers: int,
+    pool_size: int,
+    max_overflow: int,
+    budget: Optional[int],
+) -> Tuple[int, int]:
+    """Fit per-worker pool sizes into a connection budget.
+
+    Overflow connections are given up first, then persistent ones, so every
+    worker keeps at least one connection.
+
+    Args:
+        workers: Worker processes sharing the budget.
+        pool_size: Configured persistent connections per worker.
+        max_overflow: Configured overflow connections per worker.
+        budget: Connections all workers may hold together, or None.
+
+    Returns:
+        Tuple[int, int]: ``(pool_size, max_overflow)`` for each worker.
+
+    Raises:
+        ValueError: If the budget is smaller than the number of workers.
+
+    Example:
+        >>> pool_settings(8, 5, 10, budget=50)
+        (5, 1)
+    """
+    if budget is None:
+        return pool_size, max_overflow
+    per_worker = budget // workers
+    if per_worker < 1:
+        raise ValueError(
+            f"DB_CONNECTION_BUDGET={budget} cannot give each of {workers} workers a connection"
+        )
+    size = min(pool_size, per_worker)
+    return size, min(max_overflow, per_worker - size)
+
+
+@dataclass
+class ServerPlan:
+    """Worker and pool sizing chosen for this container.
+
+    Attributes:
+        cpus: CPUs available to the process.
+        workers: Worker processes to start.
+        pool_size: Persistent connections per worker.
+        max_overflow: Overflow connections per worker.
+    """
+
+    cpus: float
+    workers: int
+    pool_size: int
+    max_overflow: int
+
+    @property
+    def max_connections(self) -> int:
+        """Connections all workers may hold at peak."""
+        return self.workers * (self.pool_size + self.max_overflow)
+
+
+def plan_server(config: Settings, cgroup_root: str = CGROUP_ROOT) -> ServerPlan:
+    """Size workers and pools from the settings and the container limits.
+
+    Args:
+        config: Application settings.
+        cgroup_root: cgroup filesystem mount point.
+
+    Returns:
+        ServerPlan: The chosen sizing.
+    """
+    cpus = available_cpus(cgroup_root)
+    workers = config.WORKERS or worker_count(cpus, config.WORKERS_PER_CPU, config.WORKERS_MAX)
+    budget = config.DB_CONNECTION_BUDGET
+    if budget is not None and workers > budget:
+        logger.warning(
+            f"{workers} workers exceed DB_CONNECTION_BUDGET={budget}; starting {budget}"
+        )
+        workers = budget
+    pool_size, max_overflow = pool_settings(
+        workers, config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW, budget
+    )
+    return ServerPlan(round(cpus, 2), workers, pool_size, max_overflow)
+
+
+def apply_plan(plan: ServerPlan, config: Settings) -> None:
+    """Hand the pool sizes to the app before it creates its engine.
+
+    The settings object is updated for a preloaded app (same process) and
+    the environment for workers that import the app themselves.
+    """
+    config.DB_POOL_SIZE = plan.pool_size
+    config.DB_MAX_OVERFLOW = plan.max_overflow
+    os.environ["DB_POOL_SIZE"] = str(plan.pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(plan.max_overflow)
+
+
+def _freeze_heap(server: Any) -> None:
+    """gunicorn ``when_ready`` hook: keep preloaded objects out of GC scans.
+
+    Without this, the first collection in each worker touches every object
+    header inherited from the master and un-shares those pages.
+    """
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Froze {gc.get_freeze_count()} preloaded objects before forking workers")
+
+
+def _reset_engine(server: Any, worker: Any) -> None:
+    """gunicorn ``post_fork`` hook: never share pooled connections with the master."""
+    from app.db.session import engine
+
+    engine.dispose(close=False)
+
+
+def _uvicorn_worker_class() -> str:
+    """Prefer the maintained ``uvicorn-worker`` package when installed."""
+    try:
+        import uvicorn_worker  # noqa: F401
+    except ImportError:
+        return "uvicorn.workers.UvicornWorker"
+    return "uvicorn_worker.UvicornWorker"
+
+
+def gunicorn_options(plan: ServerPlan, config: Settings) -> Dict[str, Any]:
+    """Build the gunicorn configuration for ``plan``.
+
+    Args:
+        plan: Worker and pool sizing.
+        config: Application settings.
+
+    Returns:
+        Dict[str, Any]: gunicorn settings by name.
+    """
+    return {
+        "bind": f"{config.SERVER_HOST}:{config.SERVER_PORT}",
+        "workers": plan.workers,
+        "worker_class": _uvicorn_worker_class(),
+        "preload_app": config.SERVER_PRELOAD,
+        "graceful_timeout": int(config.SHUTDOWN_DRAIN_SECONDS + _GRACE_MARGIN),
+        "forwarded_allow_ips": "*",
+        "accesslog": None,
+        "when_ready": _freeze_heap if config.SERVER_PRELOAD else None,
+        "post_fork": _reset_engine,
+    }
+
+
+def _run_gunicorn(options: Dict[str, Any]) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):  # type: ignore[misc]
+        """Embedded gunicorn application serving ``app.main:app``."""
+
+        def load_config(self) -> None:
+            for key, value in options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self) -> Any:
+            from app.main import app
+
+            return app
+
+    Application().run()
+
+
+def _run_uvicorn(plan: ServerPlan, config: Settings) -> None:
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host=config.SERVER_HOST,
+        port=config.SERVER_PORT,
+        workers=plan.workers,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        timeout_graceful_shutdown=int(config.SHUTDOWN_DRAIN_SECONDS + _GRACE_MARGIN),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point (``python -m app.server``)."""
+    parser = argparse.ArgumentParser(description="Run the API with CPU-aware worker sizing.")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the worker and pool sizing and exit",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    plan = plan_server(settings)
+    logger.info(
+        f"Server plan: {plan.cpus} CPUs -> {plan.workers} workers, pool "
+        f"{plan.pool_size}+{plan.max_overflow} per worker "
+        f"(at most {plan.max_connections} database connections)"
+    )
+    if args.dry_run:
+        return
+    apply_plan(plan, settings)
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        if settings.SERVER_PRELOAD:
+            logger.warning("gunicorn is not installed; running uvicorn workers without preload")
+        _run_uvicorn(plan, settings)
+        return
+    _run_gunicorn(gunicorn_options(plan, settings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""Benchmark Suite for the Network MatrixHub API.
+
+Reproducible load tests for the entity and authentication routes. See
+``python -m benchmarks --help`` and ``benchmarks/README.md``.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
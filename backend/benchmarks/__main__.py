@@ -0,0 +1,199 @@
+"""Benchmark Command-Line Entry Point.
+
+Usage:
+    python -m benchmarks --size 10000
+    python -m benchmarks --size 100000 --concurrency 32 --save results/base.json
+    python -m benchmarks --size 100000 --compare results/base.json
+    python -m benchmarks --database-url postgresql://user:pw@localhost/bench --size 1000000
+    python -m benchmarks --url http://localhost:8000 --no-seed --scenario 'auth_*'
+
+By default the application runs in-process (``httpx.ASGITransport``, with its
+lifespan started as under uvicorn) against a SQLite file under
+``benchmarks/.data``; pass ``--database-url`` to seed and query a dedicated
+PostgreSQL database instead. Seeding replaces the whole catalog, so the
+database the application is configured with is refused unless ``--force``.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import fnmatch
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Load-test the MatrixHub entity and auth API.",
+    )
+    parser.add_argument("--size", type=int, default=10_000,
+                        help="Number of synthetic entities (e.g. 10000, 100000, 1000000)")
+    parser.add_argument("--seed", type=int, default=42, help="Catalog and request seed")
+    parser.add_argument("--database-url", default=None,
+                        help="Dedicated database to seed and query (default: SQLite file per size)")
+    parser.add_argument("--force", action="store_true",
+                        help="Allow --database-url to be the application's own database (it is wiped)")
+    parser.add_argument("--url", default=None,
+                        help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--no-seed", action="store_true", help="Skip catalog seeding")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--warmup", type=int, default=20, help="Warm-up requests per scenario")
+    parser.add_argument("--scenario", action="append", default=None,
+                        help="Only run scenarios matching this glob (repeatable)")
+    parser.add_argument("--rate-limit", action="store_true",
+                        help="Keep auth rate limiting enabled (disabled by default)")
+    parser.add_argument("--save", type=Path, default=None, help="Write results JSON here")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Baseline JSON to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed relative p95/throughput change (default 0.15)")
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace, catalog_size: int) -> Dict[str, Dict[str, Any]]:
+    import httpx
+
+    from benchmarks.runner import run_scenario
+    from benchmarks.scenarios import all_scenarios
+
+    scenarios = [
+        s for s in all_scenarios()
+        if not args.scenario or any(fnmatch.fnmatch(s.name, p) for p in args.scenario)
+    ]
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30.0)
+        lifespan: Any = contextlib.nullcontext()
+    else:
+        from app.main import app
+
+        # ASGITransport sends no lifespan events; run start-up (warm-up,
+        # background refreshers) and shutdown as uvicorn would
+        lifespan = app.router.lifespan_context(app)
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=30.0)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    async with lifespan, client:
+        for scenario in scenarios:
+            results[scenario.name] = await run_scenario(
+                client, scenario, catalog_size, args.requests, args.concurrency,
+                warmup=args.warmup, seed=args.seed,
+            )
+            r = results[scenario.name]
+            print(f"  {scenario.name:<36} p95={r['p95_ms']:.2f} ms  {r['throughput_rps']:.0f} req/s",
+                  file=sys.stderr)
+    return results
+
+
+def _same_database(url: str, other: str) -> bool:
+    """Return whether two SQLAlchemy URLs point at the same database."""
+    from sqlalchemy.engine import make_url
+
+    a, b = make_url(url), make_url(other)
+    if a.get_backend_name() != b.get_backend_name():
+        return False
+    if a.get_backend_name() == "sqlite":
+        return Path(a.database or "").resolve() == Path(b.database or "").resolve()
+    return (a.host, a.port, a.database) == (b.host, b.port, b.database)
+
+
+def _app_database_url(environ_url: Optional[str]) -> str:
+    """Return the database the application is configured with (environment, .env or default)."""
+    if environ_url:
+        return environ_url
+    from app.core.config import Settings
+
+    saved = os.environ.pop("DATABASE_URL", None)
+    try:
+        return Settings().DATABASE_URL
+    finally:
+        if saved is not None:
+            os.environ["DATABASE_URL"] = saved
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Seed the catalog, run the scenarios and report.
+
+    Returns:
+        int: Process exit code (1 if a regression against ``--compare`` was found).
+    """
+    args = parse_args(argv)
+    database_url = args.database_url or (
+        f"sqlite:///{BENCH_DIR / '.data' / f'catalog-{args.size}-{args.seed}.sqlite'}"
+    )
+    if database_url.startswith("sqlite:///"):
+        Path(database_url.removeprefix("sqlite:///")).parent.mkdir(parents=True, exist_ok=True)
+
+    # Configure the application before it is imported
+    environ_url = os.environ.get("DATABASE_URL")
+    os.environ["DATABASE_URL"] = database_url
+    if (
+        args.database_url
+        and not args.no_seed
+        and not args.force
+        and _same_database(database_url, _app_database_url(environ_url))
+    ):
+        print(
+            "Refusing to seed the application's own database (seeding deletes the catalog); "
+            "pass a dedicated --database-url, or --force.",
+            file=sys.stderr,
+        )
+        return 2
+    if not args.rate_limit:
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+    from benchmarks.catalog import seed_catalog
+    from benchmarks.report import build_report, compare_reports, format_table, load_report, save_report
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if not args.no_seed:
+        from app.db.session import engine
+
+        seed_catalog(engine, args.size, args.seed)
+    # Request logging would dominate the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = asyncio.run(_run(args, args.size))
+    report = build_report(
+        {
+            "database": database_url.split("@")[-1] if "@" in database_url else database_url.split(":")[0],
+            "size": args.size,
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "target": args.url or "in-process",
+        },
+        results,
+    )
+    print(format_table(results))
+    if args.save:
+        save_report(report, args.save)
+        print(f"\nSaved results to {args.save}")
+    if args.compare:
+        regressions = compare_reports(load_report(args.compare), report, args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.compare}:")
+            print("\n".join(f"  - {r}" for r in regressions))
+            return 1
+        print(f"\nNo regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
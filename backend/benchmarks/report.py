@@ -0,0 +1,106 @@
+"""Benchmark Baselines and Regression Comparison.
+
+Results are stored as JSON documents with run metadata (commit, database,
+catalog size, concurrency) so that runs from different commits can be
+compared scenario by scenario.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def git_commit() -> str:
+    """Return the current git commit hash, or ``"unknown"`` outside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def build_report(meta: Dict[str, Any], results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Assemble a baseline document from run metadata and scenario results."""
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": results,
+    }
+
+
+def save_report(report: Dict[str, Any], path: Path) -> None:
+    """Write a report to ``path`` as indented JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    """Read a report previously written by :func:`save_report`."""
+    return json.loads(path.read_text())
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = 0.15,
+) -> List[str]:
+    """List regressions of ``current`` against ``baseline``.
+
+    A scenario regresses when its p95 latency grows, or its throughput drops,
+    by more than ``tolerance`` (a fraction), or when it reports new errors.
+
+    Args:
+        baseline: Baseline report.
+        current: Report of the run under test.
+        tolerance: Allowed relative change before flagging a regression.
+
+    Returns:
+        List[str]: Human-readable regression descriptions (empty if none).
+    """
+    regressions: List[str] = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        if before["p95_ms"] > 0 and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {before['p95_ms']:.2f} ms -> {now['p95_ms']:.2f} ms"
+            )
+        if now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {before['throughput_rps']:.1f} -> "
+                f"{now['throughput_rps']:.1f} req/s"
+            )
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+def format_table(results: Dict[str, Dict[str, Any]]) -> str:
+    """Render scenario results as a fixed-width text table."""
+    header = f"{'scenario':<36} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    lines = [header, "-" * len(header)]
+    for name, r in results.items():
+        lines.append(
+            f"{name:<36} {r['throughput_rps']:>9.1f} {r['p50_ms']:>9.2f} "
+            f"{r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['errors']:>7d}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,122 @@
+"""Concurrent Benchmark Runner and Statistics.
+
+Drives scenarios with a fixed number of concurrent clients over an
+``httpx.AsyncClient`` (either in-process through ``ASGITransport`` or against
+a running server) and summarizes latency percentiles and throughput.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from typing import Any, Dict, List, Sequence
+
+import httpx
+
+from benchmarks.scenarios import Scenario
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Return the ``pct`` percentile of pre-sorted values (linear interpolation).
+
+    Args:
+        sorted_values: Values in ascending order.
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        float: Interpolated percentile, or 0.0 for an empty sequence.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return float(sorted_values[low])
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(latencies_ms: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Summarize one scenario run.
+
+    Args:
+        latencies_ms: Per-request latencies in milliseconds.
+        errors: Requests that failed or returned an unexpected status.
+        elapsed: Wall-clock duration of the run in seconds.
+
+    Returns:
+        Dict[str, Any]: Request count, error count, throughput and percentiles.
+    """
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / count, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3) if count else 0.0,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    catalog_size: int,
+    requests: int,
+    concurrency: int,
+    warmup: int = 10,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """Issue ``requests`` requests for a scenario from ``concurrency`` clients.
+
+    Args:
+        client: HTTP client bound to the application.
+        scenario: Scenario to run.
+        catalog_size: Number of seeded entities (bounds generated ids).
+        requests: Number of measured requests.
+        concurrency: Number of concurrent clients.
+        warmup: Unmeasured requests issued first (fills caches and pools).
+        seed: Seed for request parameter generation.
+
+    Returns:
+        Dict[str, Any]: Summary produced by :func:`summarize`.
+    """
+    rng = random.Random(f"{seed}:{scenario.name}")
+    plan = [scenario.build(rng, catalog_size) for _ in range(warmup + requests)]
+
+    for req in plan[:warmup]:
+        await client.request(req.method, req.path, params=req.params, json=req.json)
+
+    measured = iter(plan[warmup:])
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for req in measured:
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    req.method, req.path, params=req.params, json=req.json
+                )
+                ok = response.status_code == scenario.expected_status
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
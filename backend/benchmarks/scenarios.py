@@ -0,0 +1,110 @@
+"""Benchmark Scenarios.
+
+Each scenario describes one kind of request (method, path, query or body)
+and the status code it is expected to return. Request parameters are drawn
+from a seeded random generator so that runs are reproducible.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from app.db.synthetic import PROTOCOLS, TYPES, WORDS, entity_uid
+
+
+@dataclass(frozen=True)
+class Request:
+    """A single HTTP request to issue."""
+
+    method: str
+    path: str
+    params: Optional[Dict[str, Any]] = None
+    json: Optional[Dict[str, Any]] = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A named request generator with its expected status code."""
+
+    name: str
+    build: Callable[[random.Random, int], Request]
+    expected_status: int = 200
+
+
+def _list_scenario(filters: tuple[str, ...]) -> Scenario:
+    """Build a ``GET /api/entities`` scenario for one filter combination."""
+
+    def build(rng: random.Random, size: int) -> Request:
+        params: Dict[str, Any] = {"limit": 20}
+        if "q" in filters:
+            params["q"] = rng.choice(WORDS)
+        if "type" in filters:
+            params["type"] = rng.choice(TYPES)
+        if "protocol" in filters:
+            params["protocol"] = rng.choice(PROTOCOLS[:4])
+        return Request("GET", "/api/entities", params=params)
+
+    label = "+".join(filters) if filters else "none"
+    return Scenario(f"list_entities[{label}]", build)
+
+
+def _deep_page(rng: random.Random, size: int) -> Request:
+    offset = rng.randint(0, max(0, min(size, 10_000) - 20))
+    return Request("GET", "/api/entities", params={"limit": 20, "offset": offset})
+
+
+def _get_entity(rng: random.Random, size: int) -> Request:
+    return Request("GET", f"/api/entities/{entity_uid(rng.randrange(max(size, 1)))}")
+
+
+def _get_missing(rng: random.Random, size: int) -> Request:
+    return Request("GET", f"/api/entities/missing-{rng.getrandbits(32):08x}")
+
+
+def _login(rng: random.Random, size: int) -> Request:
+    return Request("POST", "/api/auth/login", json={"username": "demo", "password": "demo123"})
+
+
+def _register(rng: random.Random, size: int) -> Request:
+    suffix = f"{rng.getrandbits(48):012x}"
+    return Request(
+        "POST",
+        "/api/auth/register",
+        json={
+            "agent_id": f"bench-{suffix}",
+            "email": f"bench-{suffix}@example.com",
+            "password": "benchmark-password",
+        },
+    )
+
+
+def _guest(rng: random.Random, size: int) -> Request:
+    return Request("POST", "/api/auth/guest", json={})
+
+
+def all_scenarios() -> List[Scenario]:
+    """Return every scenario: all ``list_entities`` filter combinations,
+    pagination, ``get_entity`` hits and misses, and the auth routes."""
+    scenarios = [
+        _list_scenario(combo)
+        for r in range(4)
+        for combo in itertools.combinations(("q", "type", "protocol"), r)
+    ]
+    scenarios += [
+        Scenario("list_entities[offset]", _deep_page),
+        Scenario("get_entity", _get_entity),
+        Scenario("get_entity[missing]", _get_missing, expected_status=404),
+        Scenario("auth_login", _login),
+        Scenario("auth_register", _register, expected_status=201),
+        Scenario("auth_guest", _guest),
+    ]
+    return scenarios
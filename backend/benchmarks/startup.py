@@ -0,0 +1,132 @@
+"""Cold-Start Benchmark with an Import-Time Budget.
+
+Starts fresh interpreters and measures, for each run:
+
+- ``import_ms``: ``import app.main`` (settings, engine, routers, middleware),
+- ``startup_ms``: application start-up events, including warm-up,
+- ``first_request_ms``: the first ``GET /openapi.json`` after start-up.
+
+The median of ``import_ms + startup_ms`` is checked against ``--budget-ms``
+and the process exits with status 1 when it is exceeded, so CI can fail on
+cold-start regressions. ``--importtime`` prints the slowest modules from
+``python -X importtime``.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --budget-ms 2500
+    python -m benchmarks.startup --importtime 25
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Executed in a fresh interpreter for every run
+_CHILD = """
+import json, logging, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.db.session import engine
+from app.models.entity import Base
+Base.metadata.create_all(bind=engine)
+logging.disable(logging.WARNING)
+t2 = time.perf_counter()
+with TestClient(app.main.app) as client:
+    t3 = time.perf_counter()
+    client.get("/openapi.json")
+    t4 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t3 - t2) * 1000,
+    "first_request_ms": (t4 - t3) * 1000,
+}))
+"""
+
+
+def _env(database_url: str) -> Dict[str, str]:
+    return {**os.environ, "DATABASE_URL": database_url}
+
+
+def measure(database_url: str) -> Dict[str, float]:
+    """Measure one cold start in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=BACKEND_DIR, env=_env(database_url), capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us)."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def importtime_report(database_url: str, top: int) -> str:
+    """Return the ``top`` slowest imports of ``app.main`` by self time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=_env(database_url), capture_output=True, text=True, check=True,
+    )
+    modules = sorted(parse_importtime(result.stderr), key=lambda m: m[1], reverse=True)
+    lines = [f"{'module':<56} {'self ms':>9} {'cumul ms':>9}"]
+    lines += [f"{name:<56} {s / 1000:>9.1f} {c / 1000:>9.1f}" for name, s, c in modules[:top]]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the cold-start benchmark.
+
+    Returns:
+        int: Exit code (1 if the median cold start exceeds the budget).
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Fail if median import + start-up exceeds this")
+    parser.add_argument("--database-url", default="sqlite://",
+                        help="Database used during start-up (default: in-memory SQLite)")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                        help="Also print the N slowest imports")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.database_url) for _ in range(args.runs)]
+    medians = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+    total = medians["import_ms"] + medians["startup_ms"]
+    for key, value in medians.items():
+        print(f"{key:<18} {value:>9.1f} ms (median of {args.runs})")
+    print(f"{'cold_start_ms':<18} {total:>9.1f} ms")
+
+    if args.importtime:
+        print()
+        print(importtime_report(args.database_url, args.importtime))
+
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"\nCold start {total:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
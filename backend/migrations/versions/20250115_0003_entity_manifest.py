@@ -0,0 +1,72 @@
+"""Move entity manifests to the entity_manifest table
+
+Revision ID: 20250115_0003
+Revises: 20241227_0002
+Create Date: 2025-01-15 10:00:00
+
+"""
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20250115_0003'
+down_revision = '20241227_0002'
+branch_labels = None
+depends_on = None
+
+# Rows copied per INSERT while moving data
+BATCH_SIZE = 1000
+
+
+def _hash(body) -> str:
+    """Same digest as app.models.entity.manifest_hash (frozen here)."""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Create entity_manifest, copy the manifests over and drop entity.manifests."""
+
+    manifest = op.create_table(
+        'entity_manifest',
+        sa.Column('uid', sa.String(), nullable=False),
+        sa.Column('protocol', sa.String(), nullable=False),
+        sa.Column('body', sa.JSON(), nullable=False),
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['uid'], ['entity.uid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('uid', 'protocol'),
+    )
+
+    # Copy existing manifests, one row per protocol
+    conn = op.get_bind()
+    result = conn.execution_options(yield_per=BATCH_SIZE).execute(
+        sa.text("SELECT uid, manifests FROM entity WHERE manifests IS NOT NULL")
+    )
+    for partition in result.partitions():
+        rows = [
+            {"uid": uid, "protocol": protocol, "body": body, "hash": _hash(body)}
+            for uid, manifests in partition
+            for protocol, body in (manifests or {}).items()
+        ]
+        if rows:
+            op.bulk_insert(manifest, rows)
+
+    op.drop_column('entity', 'manifests')
+
+
+def downgrade() -> None:
+    """Restore entity.manifests from entity_manifest and drop the table."""
+
+    op.add_column('entity', sa.Column('manifests', sa.JSON(), nullable=True))
+    op.execute("""
+        UPDATE entity SET manifests = m.manifests
+        FROM (
+            SELECT uid, json_object_agg(protocol, body) AS manifests
+            FROM entity_manifest GROUP BY uid
+        ) AS m
+        WHERE entity.uid = m.uid
+    """)
+    op.drop_table('entity_manifest')
@@ -0,0 +1,54 @@
+"""Add entity_version history table
+
+Revision ID: 20250115_0004
+Revises: 20250115_0003
+Create Date: 2025-01-15 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20250115_0004'
+down_revision = '20250115_0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create entity_version and record the current state as release 1."""
+
+    op.create_table(
+        'entity_version',
+        sa.Column('uid', sa.String(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('version', sa.String(), nullable=False),
+        sa.Column('release_ts', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('snapshot', sa.Boolean(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['uid'], ['entity.uid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('uid', 'seq'),
+    )
+
+    # Seed each entity's history with a full snapshot (fields as in
+    # app.db.versions.VERSIONED_FIELDS)
+    op.execute("""
+        INSERT INTO entity_version (uid, seq, version, release_ts, snapshot, data, created_at)
+        SELECT uid, 1, version, release_ts, true,
+               json_build_object(
+                   'version', version, 'summary', summary, 'description', description,
+                   'license', license, 'homepage', homepage, 'source_url', source_url,
+                   'capabilities', capabilities, 'frameworks', frameworks,
+                   'providers', providers, 'protocols', protocols,
+                   'readme_blob_ref', readme_blob_ref, 'release_ts', release_ts
+               ),
+               updated_at
+        FROM entity
+    """)
+
+
+def downgrade() -> None:
+    """Drop entity_version."""
+
+    op.drop_table('entity_version')
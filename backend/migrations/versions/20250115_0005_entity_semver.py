@@ -0,0 +1,93 @@
+"""Add parsed semantic version columns to entity
+
+Revision ID: 20250115_0005
+Revises: 20250115_0004
+Create Date: 2025-01-15 12:00:00
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20250115_0005'
+down_revision = '20250115_0004'
+branch_labels = None
+depends_on = None
+
+# Rows updated per executemany while backfilling
+BATCH_SIZE = 1000
+
+# Same grammar as app.core.semver.VERSION_PATTERN (frozen here)
+_VERSION = re.compile(
+    r"^\s*[vV]?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+[0-9A-Za-z.-]+)?\s*$"
+)
+
+
+def _parse_version(text):
+    """Same components as app.core.semver.parse_version (frozen here).
+
+    Versions that are not SemVer-like get (-1, 0, 0, "").
+    """
+    match = _VERSION.match(text or "")
+    if match is None:
+        return -1, 0, 0, ""
+    major, minor, patch = (int(part or 0) for part in match.group(1, 2, 3))
+    if max(major, minor, patch) > 2**31 - 1:
+        return -1, 0, 0, ""
+    prerelease = match.group(4)
+    if not prerelease:
+        return major, minor, patch, "~"
+    parts = []
+    for identifier in prerelease.split("."):
+        if identifier.isdigit():
+            digits = str(int(identifier))
+            parts.append(f"0{len(digits):02d}{digits}")
+        else:
+            parts.append(f"1{identifier}")
+    return major, minor, patch, ",".join(parts)
+
+
+def upgrade() -> None:
+    """Add version_major/minor/patch/pre, backfill them and index them."""
+
+    op.add_column('entity', sa.Column('version_major', sa.Integer(), nullable=True))
+    op.add_column('entity', sa.Column('version_minor', sa.Integer(), nullable=True))
+    op.add_column('entity', sa.Column('version_patch', sa.Integer(), nullable=True))
+    # Byte-wise collation: the prerelease sort key must not be compared linguistically
+    op.add_column('entity', sa.Column('version_pre', sa.String(collation='C'), nullable=True))
+
+    # Backfill from the version strings
+    conn = op.get_bind()
+    update = sa.text("""
+        UPDATE entity SET version_major = :major, version_minor = :minor,
+                          version_patch = :patch, version_pre = :pre
+        WHERE uid = :uid
+    """)
+    result = conn.execution_options(yield_per=BATCH_SIZE).execute(
+        sa.text("SELECT uid, version FROM entity")
+    )
+    for partition in result.partitions():
+        params = []
+        for uid, version in partition:
+            major, minor, patch, pre = _parse_version(version)
+            params.append({"uid": uid, "major": major, "minor": minor, "patch": patch, "pre": pre})
+        conn.execute(update, params)
+
+    op.create_index(
+        'ix_entity_semver',
+        'entity',
+        ['version_major', 'version_minor', 'version_patch', 'version_pre', 'uid'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the parsed version columns and their index."""
+
+    op.drop_index('ix_entity_semver', table_name='entity')
+    op.drop_column('entity', 'version_pre')
+    op.drop_column('entity', 'version_patch')
+    op.drop_column('entity', 'version_minor')
+    op.drop_column('entity', 'version_major')
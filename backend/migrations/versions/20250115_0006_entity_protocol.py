@@ -0,0 +1,107 @@
+"""Add entity_protocol table of parsed protocol tags
+
+Revision ID: 20250115_0006
+Revises: 20250115_0005
+Create Date: 2025-01-15 13:00:00
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20250115_0006'
+down_revision = '20250115_0005'
+branch_labels = None
+depends_on = None
+
+# Rows inserted per batch while backfilling
+BATCH_SIZE = 1000
+
+# Same grammar as app.core.semver.VERSION_PATTERN (frozen here)
+_VERSION = re.compile(
+    r"^\s*[vV]?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+[0-9A-Za-z.-]+)?\s*$"
+)
+
+
+def _parse_version(text):
+    """Same components as app.core.semver.parse_version (frozen here).
+
+    Versions that are not SemVer-like get (-1, 0, 0, "").
+    """
+    match = _VERSION.match(text or "")
+    if match is None:
+        return -1, 0, 0, ""
+    major, minor, patch = (int(part or 0) for part in match.group(1, 2, 3))
+    if max(major, minor, patch) > 2**31 - 1:
+        return -1, 0, 0, ""
+    prerelease = match.group(4)
+    if not prerelease:
+        return major, minor, patch, "~"
+    parts = []
+    for identifier in prerelease.split("."):
+        if identifier.isdigit():
+            digits = str(int(identifier))
+            parts.append(f"0{len(digits):02d}{digits}")
+        else:
+            parts.append(f"1{identifier}")
+    return major, minor, patch, ",".join(parts)
+
+
+def _row(uid, tag):
+    """Same values as app.models.entity.EntityProtocol.values (frozen here)."""
+    name, _, version = tag.strip().partition("@")
+    major, minor, patch, pre = _parse_version(version)
+    return {
+        "uid": uid, "tag": tag, "name": name.lower(), "version": version,
+        "version_major": major, "version_minor": minor,
+        "version_patch": patch, "version_pre": pre,
+    }
+
+
+def upgrade() -> None:
+    """Create entity_protocol, fill it from entity.protocols and index it."""
+
+    table = op.create_table(
+        'entity_protocol',
+        sa.Column('uid', sa.String(), nullable=False),
+        sa.Column('tag', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.String(), nullable=False),
+        sa.Column('version_major', sa.Integer(), nullable=False),
+        sa.Column('version_minor', sa.Integer(), nullable=False),
+        sa.Column('version_patch', sa.Integer(), nullable=False),
+        sa.Column('version_pre', sa.String(collation='C'), nullable=False),
+        sa.ForeignKeyConstraint(['uid'], ['entity.uid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('uid', 'tag'),
+    )
+
+    conn = op.get_bind()
+    result = conn.execution_options(yield_per=BATCH_SIZE).execute(
+        sa.text("SELECT uid, protocols FROM entity").columns(
+            sa.column('uid', sa.String()), sa.column('protocols', sa.JSON())
+        )
+    )
+    for partition in result.partitions():
+        rows = [
+            _row(uid, tag)
+            for uid, protocols in partition
+            for tag in dict.fromkeys(protocols or [])
+        ]
+        if rows:
+            op.bulk_insert(table, rows)
+
+    op.create_index(
+        'ix_entity_protocol_version',
+        'entity_protocol',
+        ['name', 'version_major', 'version_minor', 'version_patch', 'version_pre', 'uid'],
+    )
+
+
+def downgrade() -> None:
+    """Drop entity_protocol."""
+
+    op.drop_index('ix_entity_protocol_version', table_name='entity_protocol')
+    op.drop_table('entity_protocol')
@@ -0,0 +1,39 @@
+"""Add connection table for the agent connection graph
+
+Revision ID: 20250115_0007
+Revises: 20250115_0006
+Create Date: 2025-01-15 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20250115_0007'
+down_revision = '20250115_0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create connection with indexes for both directions and for new rows."""
+
+    op.create_table(
+        'connection',
+        sa.Column('src', sa.String(), nullable=False),
+        sa.Column('dst', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['src'], ['entity.uid'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['dst'], ['entity.uid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('src', 'dst'),
+    )
+    op.create_index('ix_connection_dst_src', 'connection', ['dst', 'src'])
+    op.create_index('ix_connection_created_at', 'connection', ['created_at'])
+
+
+def downgrade() -> None:
+    """Drop connection."""
+
+    op.drop_index('ix_connection_created_at', table_name='connection')
+    op.drop_index('ix_connection_dst_src', table_name='connection')
+    op.drop_table('connection')
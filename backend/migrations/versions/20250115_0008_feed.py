@@ -0,0 +1,59 @@
+"""Add post and timeline_entry tables for the activity feed
+
+Revision ID: 20250115_0008
+Revises: 20250115_0007
+Create Date: 2025-01-15 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20250115_0008'
+down_revision = '20250115_0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create post (with the pulled-post partial index) and timeline_entry."""
+
+    op.create_table(
+        'post',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('author', sa.String(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('fanout', sa.Boolean(), nullable=False),
+        sa.Column('likes', sa.Integer(), nullable=False),
+        sa.Column('comments', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['author'], ['entity.uid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_post_author_id', 'post', ['author', 'id'])
+    op.create_index(
+        'ix_post_pulled',
+        'post',
+        ['author', 'id'],
+        postgresql_where=sa.text('NOT fanout'),
+    )
+
+    op.create_table(
+        'timeline_entry',
+        sa.Column('owner', sa.String(), nullable=False),
+        sa.Column('post_id', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['owner'], ['entity.uid'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['post_id'], ['post.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('owner', 'post_id'),
+    )
+    op.create_index('ix_timeline_entry_post_id', 'timeline_entry', ['post_id'])
+
+
+def downgrade() -> None:
+    """Drop timeline_entry and post."""
+
+    op.drop_index('ix_timeline_entry_post_id', table_name='timeline_entry')
+    op.drop_table('timeline_entry')
+    op.drop_index('ix_post_pulled', table_name='post')
+    op.drop_index('ix_post_author_id', table_name='post')
+    op.drop_table('post')
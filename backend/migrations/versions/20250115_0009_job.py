@@ -0,0 +1,51 @@
+"""Add job table for the jobs marketplace
+
+Also indexes entity.updated_at, which the job match index reads to pick up
+changed entities.
+
+Revision ID: 20250115_0009
+Revises: 20250115_0008
+Create Date: 2025-01-15 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20250115_0009'
+down_revision = '20250115_0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create job and its indexes, and index entity.updated_at."""
+
+    op.create_table(
+        'job',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('company', sa.String(), nullable=False),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('type', sa.String(), nullable=True),
+        sa.Column('compensation', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('capabilities', sa.JSON(), nullable=False),
+        sa.Column('protocols', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_job_status_id', 'job', ['status', 'id'])
+    op.create_index('ix_job_updated_at', 'job', ['updated_at'])
+    op.create_index('ix_entity_updated_at', 'entity', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Drop job and the entity.updated_at index."""
+
+    op.drop_index('ix_entity_updated_at', table_name='entity')
+    op.drop_index('ix_job_updated_at', table_name='job')
+    op.drop_index('ix_job_status_id', table_name='job')
+    op.drop_table('job')
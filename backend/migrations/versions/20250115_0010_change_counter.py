@@ -0,0 +1,47 @@
+"""Add change_counter and change_seq for monotonic change detection
+
+Per-worker views detected changes by max(updated_at), which misses updates
+on SQLite and transactions committing out of start order on PostgreSQL.
+Writers now bump a counter row per table and stamp rows with its value.
+
+Revision ID: 20250115_0010
+Revises: 20250115_0009
+Create Date: 2025-01-15 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20250115_0010'
+down_revision = '20250115_0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create change_counter and add indexed change_seq columns to entity and job."""
+
+    counter = op.create_table(
+        'change_counter',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.bulk_insert(counter, [{'name': 'entity', 'value': 0}, {'name': 'job', 'value': 0}])
+
+    for table in ('entity', 'job'):
+        op.add_column(
+            table,
+            sa.Column('change_seq', sa.BigInteger(), nullable=False, server_default='0'),
+        )
+        op.create_index(f'ix_{table}_change_seq', table, ['change_seq'])
+
+
+def downgrade() -> None:
+    """Drop the change_seq columns and change_counter."""
+
+    for table in ('job', 'entity'):
+        op.drop_index(f'ix_{table}_change_seq', table_name=table)
+        op.drop_column(table, 'change_seq')
+    op.drop_table('change_counter')
@@ -10,15 +10,28 @@ License:
     Apache 2.0
 """
 
+import os
+import tempfile
+
+# Tests use their own engine; skip warming the default database at start-up
+os.environ.setdefault("STARTUP_WARMUP", "false")
+# ... and building the connection graph from it (suggestions fall back to SQL)
+os.environ.setdefault("CONNECTION_GRAPH_ENABLED", "false")
+# Keep captured profiles out of the host-wide default directory
+os.environ.setdefault("PROFILING_DIR", tempfile.mkdtemp(prefix="matrixhub-profiles-"))
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.core.guest_sessions import get_guest_registry
+from app.core.ratelimit import get_rate_limiter
 from app.db.session import get_db
 from app.main import app
 from app.models.entity import Base
+from tests.query_counter import QueryCounter
 
 # Create in-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -34,7 +47,7 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 @pytest.fixture
 def db_session():
     """Create a clean database session for each test.
-    
+
     Yields:
         Session: Test database session.
     """
@@ -48,12 +61,29 @@ def db_session():
 
 
 @pytest.fixture
-def client(db_session):
+def queries():
+    """Record SQL statements executed on the test database.
+
+    Yields:
+        QueryCounter: Active query counter (see ``tests/query_counter.py``).
+    """
+    with QueryCounter(engine) as counter:
+        yield counter
+
+
+@pytest.fixture
+def client(db_session, queries, request):
     """Create a test client with a test database session.
-    
+
+    Every request made through the client is checked for N+1 queries
+    (disable with ``@pytest.mark.allow_n_plus_one``). ``@pytest.mark.max_queries(n)``
+    additionally bounds the statements issued by each request.
+
     Args:
         db_session: Test database session fixture.
-    
+        queries: Query counter fixture.
+        request: Pytest request (for markers).
+
     Yields:
         TestClient: FastAPI test client.
     """
@@ -64,6 +94,15 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    get_rate_limiter().reset()
+    get_guest_registry().clear()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+    marker = request.node.get_closest_marker("max_queries")
+    if marker is not None:
+        for recorded in queries.requests:
+            queries.assert_max(marker.args[0], route=recorded.route)
+    if request.node.get_closest_marker("allow_n_plus_one") is None:
+        queries.assert_no_n_plus_one()
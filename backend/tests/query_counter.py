@@ -0,0 +1,145 @@
+"""SQL Query Counting and N+1 Detection for Tests.
+
+``QueryCounter`` listens to an engine's cursor events and records every
+statement, grouped by the HTTP request that issued it (via the request
+timings context set by ``TimingMiddleware``). Tests can then assert an upper
+bound on the number of statements, and the N+1 detector flags statements
+with the same fingerprint repeated within one request.
+
+Example:
+    >>> with QueryCounter(engine) as queries:
+    ...     client.get("/api/entities")
+    >>> queries.assert_max(1)
+    >>> queries.assert_no_n_plus_one()
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.slow_query import normalize_sql
+from app.core.timing import RequestTimings, current_timings
+
+# A statement repeated this many times within one request is an N+1 suspect
+N_PLUS_ONE_THRESHOLD = 3
+
+
+class RecordedRequest:
+    """Statements executed while serving one request."""
+
+    __slots__ = ("route", "statements")
+
+    def __init__(self, route: str) -> None:
+        self.route = route
+        self.statements: List[str] = []
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        """Return fingerprints executed at least ``threshold`` times."""
+        counts = Counter(normalize_sql(s) for s in self.statements)
+        return {sql: n for sql, n in counts.items() if n >= threshold}
+
+
+class QueryCounter:
+    """Context manager recording SQL statements executed on an engine.
+
+    Args:
+        engine: Engine to listen on.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.statements: List[str] = []
+        # Keyed by the request's timings object itself (identity hash): an
+        # id() key could be reused once a finished request's timings is freed
+        self._requests: Dict[RequestTimings, RecordedRequest] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "after_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        event.remove(self.engine, "after_cursor_execute", self._record)
+
+    def _record(self, conn: Any, cursor: Any, statement: str, parameters: Any,
+                context: Any, executemany: bool) -> None:
+        timings = current_timings()
+        with self._lock:
+            self.statements.append(statement)
+            if timings is None:
+                return
+            request = self._requests.get(timings)
+            if request is None:
+                request = self._requests[timings] = RecordedRequest(timings.route or "<unmatched>")
+            request.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        """Total number of statements recorded."""
+        return len(self.statements)
+
+    @property
+    def requests(self) -> List[RecordedRequest]:
+        """Per-request statement records, in order of first statement."""
+        return list(self._requests.values())
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.statements.clear()
+            self._requests.clear()
+
+    def n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, str, int]]:
+        """Find statements repeated within a single request.
+
+        Args:
+            threshold: Minimum repetitions of one fingerprint to report.
+
+        Returns:
+            List of (route, normalized statement, repetitions).
+        """
+        return [
+            (request.route, sql, n)
+            for request in self.requests
+            for sql, n in request.repeated(threshold).items()
+        ]
+
+    def assert_max(self, limit: int, route: Optional[str] = None) -> None:
+        """Fail if more than ``limit`` statements ran (in total, or per request
+        when ``route`` is given).
+
+        Raises:
+            AssertionError: If the bound is exceeded; the message lists the SQL.
+        """
+        if route is None:
+            groups = [("<all>", self.statements)]
+        else:
+            groups = [(r.route, r.statements) for r in self.requests if r.route == route]
+        for label, statements in groups:
+            if len(statements) > limit:
+                listing = "\n".join(f"  {i + 1}. {normalize_sql(s)}" for i, s in enumerate(statements))
+                raise AssertionError(
+                    f"{label}: expected at most {limit} queries, got {len(statements)}:\n{listing}"
+                )
+
+    def assert_no_n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> None:
+        """Fail if any request repeated a statement fingerprint ``threshold`` times.
+
+        Raises:
+            AssertionError: Listing each suspect route and statement.
+        """
+        suspects = self.n_plus_one(threshold)
+        if suspects:
+            listing = "\n".join(f"  {route}: {n}x {sql}" for route, sql, n in suspects)
+            raise AssertionError(f"Possible N+1 queries detected:\n{listing}")
@@ -0,0 +1,62 @@
+"""Unit Tests for the Benchmark Suite Helpers.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+import pytest
+
+from benchmarks.__main__ import _same_database, main
+from benchmarks.report import compare_reports
+from benchmarks.runner import percentile, summarize
+from benchmarks.startup import parse_importtime
+from benchmarks.scenarios import all_scenarios
+
+
+def test_percentile_interpolates():
+    """Test nearest-rank interpolation on a small sample."""
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 100) == 5.0
+    assert percentile(values, 95) == pytest.approx(4.8)
+    assert percentile([], 99) == 0.0
+
+
+def test_every_list_filter_combination_is_covered():
+    """Test that list_entities is exercised with all 8 filter combinations."""
+    names = {s.name for s in all_scenarios() if s.name.startswith("list_entities[")}
+    assert "list_entities[none]" in names
+    assert "list_entities[q+type+protocol]" in names
+    assert len(names) == 9  # 8 filter combinations + deep pagination
+
+
+def test_compare_reports_flags_regressions():
+    """Test that p95 growth and new errors beyond tolerance are reported."""
+    base = {"results": {"a": summarize([10.0] * 100, 0, 1.0)}}
+    same = {"results": {"a": summarize([10.5] * 100, 0, 1.0)}}
+    slow = {"results": {"a": summarize([20.0] * 100, 3, 1.0)}}
+    assert compare_reports(base, same, tolerance=0.1) == []
+    regressions = compare_reports(base, slow, tolerance=0.1)
+    assert any("p95" in r for r in regressions)
+    assert any("errors" in r for r in regressions)
+
+
+def test_parse_importtime():
+    """Test parsing of python -X importtime output."""
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   app.core.config\n"
+        "import time:      3000 |       3120 | app.main\n"
+    )
+    assert parse_importtime(output) == [("app.core.config", 120, 120), ("app.main", 3000, 3120)]
+
+
+def test_refuses_to_seed_the_app_database(monkeypatch):
+    """Test that the configured application database is never wiped by seeding."""
+    assert _same_database("sqlite:///./app.sqlite", "sqlite+pysqlite:///app.sqlite")
+    assert not _same_database("postgresql://u:p@db/app", "postgresql+psycopg://u:p@db/bench")
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://matrixhub:secret@db:5432/app")
+    assert main(["--database-url", "postgresql://matrixhub:other@db:5432/app"]) == 2
@@ -0,0 +1,98 @@
+"""Unit Tests for the Blob Store and README Endpoint.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core import blobs, readme
+from app.core.blobs import BlobStore
+from app.core.config import settings
+from app.core.readme import ReadmeRenderer
+from app.models.entity import Entity
+
+README = b"# Data Agent\n\nFetches <b>data</b>.\n" + b"x" * 4000
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Point the process-wide blob store at a temporary directory."""
+    monkeypatch.setattr(settings, "BLOB_STORE_DIR", str(tmp_path / "blobs"))
+    blobs.get_blob_store.cache_clear()
+    readme.get_readme_renderer.cache_clear()
+    yield blobs.get_blob_store()
+    blobs.get_blob_store.cache_clear()
+    readme.get_readme_renderer.cache_clear()
+
+
+def test_put_is_content_addressed_and_deduplicated(tmp_path):
+    """Test references, layout, dedup and rejection of malformed refs."""
+    store = BlobStore(str(tmp_path))
+    ref = store.put(b"hello")
+    assert ref.startswith("sha256:") and store.put(b"hello") == ref
+    assert store.put_stream(io.BytesIO(b"hello")) == ref
+    digest = ref.split(":")[1]
+    assert store.path(ref) == tmp_path / digest[:2] / digest[2:4] / digest
+    assert store.read(ref) == b"hello"
+    assert not list(tmp_path.rglob(".upload-*"))
+    with pytest.raises(ValueError):
+        store.path("sha256:../../etc/passwd")
+
+
+def test_renderer_caches_within_byte_bound(tmp_path):
+    """Test that rendered HTML is escaped, cached and evicted by size."""
+    store = BlobStore(str(tmp_path))
+    first, second = store.put(README), store.put(b"# Other\n" * 600)
+    renderer = ReadmeRenderer(store, max_bytes=6000)
+    html = renderer.html(first)
+    assert b"<b>" not in html and b"&lt;b&gt;" in html
+    assert renderer.html(first) is html
+    renderer.html(second)
+    assert len(renderer.cache) == 1 and renderer.cache.size <= 6000
+
+
+def test_readme_endpoint(client, db_session, store):
+    """Test 404s, ETag revalidation, ranges and the HTML variant."""
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        Entity(uid="agent-1", type="agent", name="Data Agent", version="1.0.0",
+               readme_blob_ref=store.put(README), created_at=now, updated_at=now),
+        Entity(uid="agent-2", type="agent", name="Bare Agent", version="1.0.0",
+               created_at=now, updated_at=now),
+        Entity(uid="agent-3", type="agent", name="Odd Agent", version="1.0.0",
+               readme_blob_ref="s3://bucket/README.md", created_at=now, updated_at=now),
+    ])
+    db_session.commit()
+
+    assert client.get("/api/entities/missing/readme").status_code == 404
+    assert client.get("/api/entities/agent-2/readme").status_code == 404
+    assert client.get("/api/entities/agent-3/readme").status_code == 404
+
+    response = client.get("/api/entities/agent-1/readme")
+    assert response.status_code == 200
+    assert response.content == README
+    assert response.headers["content-type"].startswith("text/markdown")
+    etag = response.headers["etag"].removeprefix("W/")  # Weakened if compressed
+
+    cached = client.get("/api/entities/agent-1/readme", headers={"If-None-Match": f"W/{etag}"})
+    assert cached.status_code == 304 and cached.content == b""
+
+    partial = client.get(
+        "/api/entities/agent-1/readme", headers={"Range": "bytes=2-5", "If-Range": etag}
+    )
+    assert partial.status_code == 206 and partial.content == README[2:6]
+    stale = client.get(
+        "/api/entities/agent-1/readme", headers={"Range": "bytes=2-5", "If-Range": '"old"'}
+    )
+    assert stale.status_code == 200 and stale.content == README
+
+    html = client.get("/api/entities/agent-1/readme?format=html")
+    assert html.status_code == 200 and html.headers["content-type"].startswith("text/html")
+    assert html.headers["etag"].removeprefix("W/") != etag
@@ -0,0 +1,67 @@
+"""Unit Tests for Monotonic Change Markers.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from datetime import datetime, timezone
+
+from app.db.changes import change_marker, change_markers
+from app.db.jobs import MatchIndex, match_tags
+from app.db.snapshot import catalog_fingerprint
+from app.db.synthetic import seed_synthetic_catalog
+from app.models.entity import Entity
+from tests.conftest import engine
+
+
+def test_orm_writes_bump_the_counter_and_stamp_rows(db_session):
+    """Test inserts, updates and deletes, and that no-op flushes and rollbacks leave no trace."""
+    start = change_marker(db_session, "entity")
+    now = datetime.now(timezone.utc)
+    entity = Entity(uid="agent-x", type="agent", name="X", version="1.0.0",
+                    created_at=now, updated_at=now)
+    db_session.add(entity)
+    db_session.commit()
+    assert entity.change_seq == change_marker(db_session, "entity") == start + 1
+
+    entity.name = entity.name  # Unchanged: nothing to write
+    db_session.commit()
+    assert change_markers(db_session, ["entity", "job"]) == {"entity": start + 1, "job": 0}
+
+    entity.summary = "Renamed"
+    db_session.flush()
+    db_session.rollback()
+    assert change_marker(db_session, "entity") == start + 1
+
+    entity.summary = "Renamed"
+    db_session.commit()
+    assert entity.change_seq == start + 2
+
+    db_session.delete(entity)
+    db_session.commit()
+    assert change_marker(db_session, "entity") == start + 3
+
+
+def test_fingerprint_and_match_index_see_updates_with_old_timestamps(db_session):
+    """Test that a commit stamped earlier than rows already seen is still picked up.
+
+    On PostgreSQL ``updated_at`` is the transaction's start time, so a long
+    transaction can commit a timestamp older than the last refresh.
+    """
+    seed_synthetic_catalog(engine, size=10, seed=2)
+    index = MatchIndex(interval=0.0)
+    index.sync(db_session)
+    fingerprint = catalog_fingerprint(engine)
+
+    entity = db_session.query(Entity).first()
+    entity.capabilities = ["zebra-herding"]
+    entity.updated_at = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    db_session.commit()
+
+    assert catalog_fingerprint(engine) != fingerprint
+    index.sync(db_session)
+    found = index.entities_for(db_session, match_tags(["zebra-herding"], []), 5)
+    assert [match.key for match in found] == [entity.uid]
@@ -0,0 +1,109 @@
+"""Unit Tests for Response Compression.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+import gzip
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import (
+    CompressionMiddleware,
+    PrecompressedCache,
+    available_codecs,
+    negotiate,
+)
+from app.db.synthetic import seed_synthetic_catalog
+from tests.conftest import engine
+
+PAYLOAD = {"items": [{"id": i, "name": f"entity-{i}"} for i in range(200)]}
+
+
+def build_app(cache=None):
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware, codecs=available_codecs(["gzip"]), minimum_size=500, cache=cache
+    )
+
+    @app.get("/big")
+    def big():
+        return JSONResponse(PAYLOAD, headers={"ETag": '"v1"', "Accept-Ranges": "bytes"})
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (f"{json.dumps({'n': i})}\n".encode() for i in range(3)),
+            media_type="application/x-ndjson",
+        )
+
+    return app
+
+
+def test_negotiate_respects_q_values():
+    """Test that q=0 excludes a coding and the highest q wins."""
+    codecs = available_codecs(["gzip"])
+    assert negotiate("gzip, deflate", codecs).name == "gzip"
+    assert negotiate("gzip;q=0, identity", codecs) is None
+    assert negotiate("*", codecs).name == "gzip"
+    assert negotiate("", codecs) is None
+
+
+def test_single_body_compression_threshold_and_cache():
+    """Test size threshold, headers and reuse of precompressed bodies."""
+    cache = PrecompressedCache(max_bytes=1 << 20)
+    client = TestClient(build_app(cache))
+    headers = {"Accept-Encoding": "gzip"}
+
+    response = client.get("/big", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    # Ranges would address the identity body, not the compressed one
+    assert "accept-ranges" not in response.headers
+    assert int(response.headers["content-length"]) < len(json.dumps(PAYLOAD))
+    assert response.json() == PAYLOAD
+    assert len(cache) == 1
+    client.get("/big", headers=headers)
+    assert len(cache) == 1  # Second response served from the cache
+
+    small = client.get("/small", headers=headers)
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+
+    plain = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.json() == PAYLOAD
+
+
+def test_streamed_body_is_compressed_incrementally():
+    """Test that streamed responses are gzip-encoded without Content-Length."""
+    client = TestClient(build_app())
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw).decode().splitlines() == [
+        '{"n": 0}', '{"n": 1}', '{"n": 2}'
+    ]
+
+
+def test_export_streams_ndjson(client, db_session):
+    """Test the NDJSON catalog export endpoint."""
+    seed_synthetic_catalog(engine, size=30, seed=3)
+    response = client.get("/api/entities/export?type=tool")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows and all(row["type"] == "tool" for row in rows)
+    scores = [row["quality_score"] for row in rows]
+    assert scores == sorted(scores, reverse=True)
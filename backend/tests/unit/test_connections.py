@@ -0,0 +1,137 @@
+"""Unit Tests for the Agent Connection Graph.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, insert
+
+from app.core.config import settings
+from app.db import graph as graph_module
+from app.db.graph import ConnectionGraph, suggestions_query
+from app.models.connection import Connection
+from app.models.entity import Entity
+from tests.conftest import engine
+
+UIDS = [f"agent-{i:02d}" for i in range(40)]
+
+
+@pytest.fixture
+def network(db_session):
+    """Entities with no connections yet."""
+    now = datetime.now(timezone.utc)
+    db_session.add_all(
+        Entity(uid=uid, type="agent", name=uid.title(), version="1.0.0", created_at=now, updated_at=now)
+        for uid in UIDS
+    )
+    db_session.commit()
+    return db_session
+
+
+def link(session, pairs):
+    now = datetime.now(timezone.utc)
+    for a, b in pairs:
+        session.add_all([Connection(src=a, dst=b, created_at=now), Connection(src=b, dst=a, created_at=now)])
+    session.commit()
+
+
+def assert_matches_sql(graph, session):
+    for uid in UIDS:
+        expected = [tuple(row) for row in session.execute(suggestions_query(uid, 5))]
+        assert graph.suggestions(uid, 5) == expected, uid
+
+
+def test_connection_endpoints(client, network, monkeypatch):
+    """Test connect, keyset listing, suggestions and disconnect."""
+    a, b, c, d, e = UIDS[:5]
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    admin = {"X-Admin-Token": "s3cret"}
+    assert client.put(f"/api/entities/{a}/connections/{b}").status_code == 403
+    assert client.delete(f"/api/entities/{a}/connections/{b}", headers={"X-Admin-Token": "x"}).status_code == 403
+    for other in (b, c, d):
+        assert client.put(f"/api/entities/{a}/connections/{other}", headers=admin).status_code == 204
+    assert client.put(f"/api/entities/{b}/connections/{a}", headers=admin).status_code == 204
+    for other in (b, c):
+        assert client.put(f"/api/entities/{e}/connections/{other}", headers=admin).status_code == 204
+
+    first = client.get(f"/api/entities/{a}/connections", params={"limit": 2}).json()
+    assert [item["id"] for item in first["items"]] == [b, c]
+    rest = client.get(f"/api/entities/{a}/connections", params={"after": first["next_after"]}).json()
+    assert [item["id"] for item in rest["items"]] == [d] and rest["next_after"] is None
+
+    suggestions = client.get(f"/api/entities/{a}/suggestions").json()
+    assert [(s["id"], s["mutuals"]) for s in suggestions] == [(e, 2)]
+
+    assert client.delete(f"/api/entities/{c}/connections/{a}", headers=admin).status_code == 204
+    assert [item["id"] for item in client.get(f"/api/entities/{c}/connections").json()["items"]] == [e]
+    assert client.get(f"/api/entities/{a}/suggestions").json()[0]["mutuals"] == 1
+
+    assert client.put(f"/api/entities/{a}/connections/{a}", headers=admin).status_code == 400
+    assert client.put(f"/api/entities/{a}/connections/nobody", headers=admin).status_code == 404
+    assert client.get("/api/entities/nobody/connections").status_code == 404
+    assert client.get("/api/entities/nobody/suggestions").status_code == 404
+
+
+def test_graph_matches_sql(network):
+    """Test that CSR suggestions rank exactly as the SQL self-join."""
+    rng = random.Random(7)
+    link(network, {tuple(sorted(rng.sample(UIDS, 2))) for _ in range(150)})
+    graph = ConnectionGraph(engine)
+    graph.build()
+    assert_matches_sql(graph, network)
+    assert graph.suggestions("unknown", 5) == []
+
+
+def test_graph_follows_writes(network, monkeypatch):
+    """Test local commits, external inserts and deletes, and compaction."""
+    link(network, [(UIDS[0], UIDS[1]), (UIDS[1], UIDS[2])])
+    graph = ConnectionGraph(engine)
+    graph.start()
+    try:
+        assert graph.suggestions(UIDS[0], 5) == [(UIDS[2], 1)]
+
+        # Local commits apply immediately; rollbacks do not
+        link(network, [(UIDS[2], UIDS[3]), (UIDS[0], UIDS[3])])
+        network.add(Connection(src=UIDS[0], dst=UIDS[9], created_at=datetime.now(timezone.utc)))
+        network.flush()
+        network.rollback()
+        assert graph.suggestions(UIDS[0], 5) == [(UIDS[2], 2)]
+        network.delete(network.get(Connection, (UIDS[0], UIDS[1])))
+        network.delete(network.get(Connection, (UIDS[1], UIDS[0])))
+        network.commit()
+        assert graph.suggestions(UIDS[0], 5) == [(UIDS[2], 1)]
+
+        # Other processes: inserts are read incrementally, deletes force a rebuild
+        later = datetime.now(timezone.utc) + timedelta(seconds=1)
+        with engine.begin() as conn:
+            conn.execute(insert(Connection), [
+                {"src": UIDS[3], "dst": UIDS[4], "created_at": later},
+                {"src": UIDS[4], "dst": UIDS[3], "created_at": later},
+            ])
+        builds = []
+        monkeypatch.setattr(graph, "build", lambda: builds.append(1))
+        graph.refresh()
+        assert builds == []
+        assert graph.suggestions(UIDS[4], 5) == [(UIDS[0], 1), (UIDS[2], 1)]
+        monkeypatch.undo()
+
+        with engine.begin() as conn:
+            conn.execute(delete(Connection).where(Connection.src.in_([UIDS[3], UIDS[4]])))
+            conn.execute(delete(Connection).where(Connection.dst.in_([UIDS[3], UIDS[4]])))
+        graph.refresh()
+        assert graph.suggestions(UIDS[4], 5) == []
+
+        monkeypatch.setattr(graph_module, "COMPACT_MIN", 0)
+        link(network, [(a, b) for a, b in zip(UIDS[10:30], UIDS[11:31])])
+        graph.refresh()
+        assert graph._delta == 0
+        assert_matches_sql(graph, network)
+    finally:
+        graph.stop()
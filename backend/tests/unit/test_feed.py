@@ -0,0 +1,95 @@
+"""Unit Tests for the Activity Feed.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.db.feed import get_timeline_cache
+from app.models.connection import Connection
+from app.models.entity import Entity
+from app.models.feed import Post, TimelineEntry
+
+UIDS = ["alpha", "bravo", "charlie", "delta"]
+ADMIN = {"X-Admin-Token": "s3cret"}
+
+
+@pytest.fixture
+def network(db_session, monkeypatch):
+    """Four entities; alpha, bravo and charlie connected to delta, alpha to bravo."""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    now = datetime.now(timezone.utc)
+    db_session.add_all(
+        Entity(uid=uid, type="agent", name=uid.title(), version="1.0.0", created_at=now, updated_at=now)
+        for uid in UIDS
+    )
+    for a, b in [("alpha", "delta"), ("bravo", "delta"), ("charlie", "delta"), ("alpha", "bravo")]:
+        db_session.add_all([Connection(src=a, dst=b, created_at=now), Connection(src=b, dst=a, created_at=now)])
+    db_session.commit()
+    get_timeline_cache().clear()
+    yield db_session
+    get_timeline_cache().clear()
+
+
+def post(client, author, content):
+    response = client.post(f"/api/entities/{author}/posts", json={"content": content}, headers=ADMIN)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def feed(client, uid, **params):
+    response = client.get(f"/api/entities/{uid}/feed", params=params)
+    assert response.status_code == 200
+    page = response.json()
+    return [item["content"] for item in page["items"]], page["next_before"]
+
+
+def test_push_timelines_and_cache(client, network):
+    """Test fan-out on write, keyset pages and cache invalidation by new posts."""
+    post(client, "alpha", "a1")
+    post(client, "delta", "d1")
+    post(client, "bravo", "b1")
+    assert network.query(TimelineEntry).filter_by(owner="delta").count() == 3
+    assert feed(client, "delta") == (["b1", "d1", "a1"], None)
+    assert feed(client, "charlie") == (["d1"], None)
+
+    first, cursor = feed(client, "alpha", limit=2)
+    assert first == ["b1", "d1"]
+    assert feed(client, "alpha", before=cursor) == (["a1"], None)
+
+    # Cached first page is refreshed by a post that reaches the timeline
+    assert feed(client, "delta", limit=1)[0] == ["b1"]
+    post(client, "charlie", "c1")
+    assert feed(client, "delta", limit=1)[0] == ["c1"]
+
+    posts = client.get("/api/entities/delta/posts").json()
+    assert [item["content"] for item in posts["items"]] == ["d1"]
+    assert posts["items"][0]["author_name"] == "Delta"
+    assert client.get("/api/entities/nobody/feed").status_code == 404
+    assert client.post("/api/entities/nobody/posts", json={"content": "x"}, headers=ADMIN).status_code == 404
+    assert client.post("/api/entities/delta/posts", json={"content": "x"}).status_code == 403
+
+
+def test_pull_for_large_authors(client, network, monkeypatch):
+    """Test that large authors are merged in at read time instead of pushed."""
+    post(client, "alpha", "a1")
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 2)
+    post(client, "delta", "d1")
+    post(client, "bravo", "b1")
+    post(client, "delta", "d2")
+
+    assert [p.fanout for p in network.query(Post).order_by(Post.id)] == [True, False, True, False]
+    assert network.query(TimelineEntry).filter_by(owner="alpha").count() == 2
+    assert feed(client, "alpha") == (["d2", "b1", "d1", "a1"], None)
+    assert feed(client, "charlie") == (["d2", "d1"], None)
+
+    first, cursor = feed(client, "alpha", limit=3, before=999)
+    assert first == ["d2", "b1", "d1"]
+    assert feed(client, "alpha", limit=3, before=cursor) == (["a1"], None)
@@ -0,0 +1,211 @@
+"""Unit Tests for the Guest Session Registry.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from fastapi import status
+
+from app.core.circuit import CircuitBreaker
+from app.core.config import settings
+from app.core.guest_sessions import GuestSessionRegistry, RedisGuestSessionStore
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """The sorted-set and hash commands used by the Redis store, in memory."""
+
+    def __init__(self) -> None:
+        self.zsets, self.hashes = {}, {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("connection refused")
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def zadd(self, key, mapping, nx=False, xx=False):
+        self._check()
+        zset = self.zsets.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            if (nx and member in zset) or (xx and member not in zset):
+                continue
+            added += member not in zset
+            zset[member] = score
+        return added
+
+    def zscore(self, key, member):
+        self._check()
+        return self.zsets.get(key, {}).get(member)
+
+    def zcard(self, key):
+        self._check()
+        return len(self.zsets.get(key, {}))
+
+    def zrem(self, key, *members):
+        self._check()
+        zset = self.zsets.get(key, {})
+        return sum(zset.pop(m, None) is not None for m in members)
+
+    def zrangebyscore(self, key, low, high, start=0, num=None):
+        self._check()
+        found = sorted((score, m) for m, score in self.zsets.get(key, {}).items() if score <= high)
+        return [m for _, m in found[start:None if num is None else start + num]]
+
+    def zpopmin(self, key, count=1):
+        self._check()
+        popped = sorted((score, m) for m, score in self.zsets.get(key, {}).items())[:count]
+        for _, member in popped:
+            del self.zsets[key][member]
+        return [(m, score) for score, m in popped]
+
+    def hset(self, key, field, value):
+        self._check()
+        self.hashes.setdefault(key, {})[field] = str(value)
+
+    def hget(self, key, field):
+        self._check()
+        return self.hashes.get(key, {}).get(field)
+
+    def hdel(self, key, *fields):
+        self._check()
+        return sum(self.hashes.get(key, {}).pop(f, None) is not None for f in fields)
+
+    def hincrby(self, key, field, amount):
+        self._check()
+        values = self.hashes.setdefault(key, {})
+        values[field] = str(int(values.get(field, 0)) + amount)
+
+    def hgetall(self, key):
+        self._check()
+        return dict(self.hashes.get(key, {}))
+
+    def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.zsets.pop(key, None)
+            self.hashes.pop(key, None)
+
+
+class FakePipeline:
+    """Queues commands and runs them on ``execute()``."""
+
+    def __init__(self, client) -> None:
+        self.client, self.calls = client, []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def redis_store(client, clock, max_sessions=100):
+    local = GuestSessionRegistry(ttl=10.0, max_sessions=max_sessions, clock=clock)
+    circuit = CircuitBreaker("redis", clock=clock)
+    return RedisGuestSessionStore(
+        "redis://", ttl=10.0, max_sessions=max_sessions, fallback=local,
+        client=client, circuit=circuit, clock=clock,
+    )
+
+
+def test_sessions_expire_after_ttl():
+    """Test that untouched sessions expire and touched ones slide."""
+    clock = FakeClock()
+    registry = GuestSessionRegistry(ttl=10.0, max_sessions=100, clock=clock)
+    idle = registry.create()
+    active = registry.create()
+
+    clock.now = 6.0
+    assert registry.get(active.guest_id) is active
+
+    clock.now = 12.0
+    assert registry.get(idle.guest_id) is None
+    assert registry.get(active.guest_id) is active
+    assert registry.stats()["expired_total"] == 1
+
+
+def test_cap_evicts_least_recently_used():
+    """Test that exceeding the cap evicts the least recently used session."""
+    registry = GuestSessionRegistry(ttl=60.0, max_sessions=2, clock=FakeClock())
+    first = registry.create()
+    second = registry.create()
+    registry.get(first.guest_id)
+    registry.create()
+
+    assert registry.get(second.guest_id) is None
+    assert registry.get(first.guest_id) is not None
+    stats = registry.stats()
+    assert stats["live"] == 2
+    assert stats["evicted_total"] == 1
+
+
+def test_redis_store_is_shared_by_workers():
+    """Test that sessions, expiry, the cap and totals are shared through Redis."""
+    client, clock = FakeRedis(), FakeClock()
+    first, second = redis_store(client, clock, max_sessions=2), redis_store(client, clock, max_sessions=2)
+    a = first.create()
+    b = second.create()
+    assert second.get(a.guest_id).created_at == a.created_at
+
+    clock.now = 6.0
+    assert first.get(a.guest_id) is not None
+    clock.now = 12.0
+    assert first.get(b.guest_id) is None
+    stats = second.stats()
+    assert (stats["live"], stats["expired_total"]) == (1, 1)
+
+    second.create()
+    first.create()
+    assert first.get(a.guest_id) is None
+    assert first.stats() == {"live": 2, "capacity": 2, "created_total": 4, "expired_total": 1, "evicted_total": 1}
+    assert (first.created_total, second.created_total) == (2, 2)
+
+
+def test_redis_outage_falls_back_to_local_sessions():
+    """Test that sessions created during an outage stay readable by their worker."""
+    client, clock = FakeRedis(), FakeClock()
+    store = redis_store(client, clock)
+    client.down = True
+    record = store.create()
+    assert not store.shared
+    assert store.get(record.guest_id) is not None
+
+    client.down = False
+    clock.now = 2.0
+    assert store.get("guest-deadbeef") is None and store.shared
+    assert store.get(record.guest_id) is not None
+
+
+def test_guest_profile_requires_live_session(client, monkeypatch):
+    """Test guest profiles and the admin-only stats endpoint."""
+    guest_id = client.post("/api/auth/guest", json={}).json()["user_id"]
+
+    response = client.get(f"/api/auth/profile/{guest_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["created_at"] is not None
+
+    # Sessions are not shared here, so another worker may own an unknown id
+    response = client.get("/api/auth/profile/guest-deadbeef")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["created_at"] is None
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/api/auth/guest/stats").status_code == status.HTTP_403_FORBIDDEN
+    stats = client.get("/api/auth/guest/stats", headers={"X-Admin-Token": "s3cret"})
+    assert stats.json()["live"] == 1
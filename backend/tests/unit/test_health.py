@@ -29,3 +29,42 @@ def test_root_endpoint(client):
     assert "version" in data
     assert data["author"] == "Ruslan Magana"
     assert data["website"] == "https://ruslanmv.com"
+
+
+def test_liveness_endpoint(client):
+    """Test that the liveness probe answers without touching the database."""
+    response = client.get("/health/live")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "ok"
+
+
+def test_readiness_endpoint(client):
+    """Test that the readiness probe reports ready against the test database."""
+    from app.core.health import ReadinessProbe, get_readiness_probe
+    from tests.conftest import engine
+
+    probe = ReadinessProbe(engine, cache_seconds=60, pool_saturation=0.9)
+    client.app.dependency_overrides[get_readiness_probe] = lambda: probe
+    response = client.get("/health/ready")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["checks"]["database"]["status"] == "ok"
+    assert data["checks"]["migrations"]["status"] == "skipped"
+
+
+def test_readiness_failure_is_cached(client):
+    """Test that an unreachable database yields 503 and the result is cached."""
+    from sqlalchemy import create_engine
+
+    from app.core.health import ReadinessProbe, get_readiness_probe
+
+    broken = create_engine("sqlite:////nonexistent-dir/db.sqlite")
+    probe = ReadinessProbe(broken, cache_seconds=60, pool_saturation=0.9)
+    client.app.dependency_overrides[get_readiness_probe] = lambda: probe
+    first = client.get("/health/ready")
+    assert first.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert first.json()["checks"]["database"]["status"] == "fail"
+    cached = probe._result
+    client.get("/health/ready")
+    assert probe._result is cached
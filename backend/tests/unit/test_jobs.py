@@ -0,0 +1,114 @@
+"""Unit Tests for the Jobs Marketplace.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.db.jobs import get_match_index, match_tags
+from app.models.entity import Entity
+
+ENTITIES = {
+    "log-agent": (["Log-Analysis", "summarization"], ["mcp@0.1"], 90.0),
+    "translator": (["translation"], ["a2a@1.0"], 80.0),
+    "generalist": (["log-analysis", "translation", "summarization"], ["mcp@0.2", "a2a@1.0"], 50.0),
+}
+
+JOBS = [
+    {"title": "Log File Analysis", "company": "ServerCorps", "capabilities": ["log-analysis"], "protocols": ["mcp"]},
+    {"title": "Real-time Translation", "company": "GlobalMeet", "capabilities": ["translation"], "protocols": ["a2a@1.0"]},
+    {"title": "Incident Digest", "company": "OpsCo", "capabilities": ["log-analysis", "summarization", "alerting"]},
+]
+
+ADMIN = {"X-Admin-Token": "s3cret"}
+
+
+@pytest.fixture
+def board(client, db_session, monkeypatch):
+    """Entities and posted jobs, with a cold match index."""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    now = datetime.now(timezone.utc)
+    db_session.add_all(
+        Entity(uid=uid, type="agent", name=uid.title(), version="1.0.0", capabilities=caps,
+               protocols=protocols, quality_score=quality, created_at=now, updated_at=now)
+        for uid, (caps, protocols, quality) in ENTITIES.items()
+    )
+    db_session.commit()
+    get_match_index().clear()
+    ids = []
+    assert client.post("/api/jobs", json=JOBS[0]).status_code == 403
+    for job in JOBS:
+        response = client.post("/api/jobs", json=job, headers=ADMIN)
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    yield ids
+    get_match_index().clear()
+
+
+def matches(client, uid, **params):
+    response = client.get("/api/jobs/match", params={"entity": uid, **params})
+    assert response.status_code == 200
+    return [(m["job"]["title"], round(m["score"], 2)) for m in response.json()]
+
+
+def test_match_tags_normalize():
+    """Test that capabilities are case-folded and protocols reduced to families."""
+    assert match_tags([" Planning ", ""], ["MCP@0.1", "a2a"]) == {
+        "capability:planning", "protocol:mcp", "protocol:a2a",
+    }
+
+
+def test_match_jobs_to_entity(client, board):
+    """Test overlap scores, min_score and closing jobs."""
+    assert matches(client, "log-agent") == [("Log File Analysis", 1.0), ("Incident Digest", 0.67)]
+    assert matches(client, "generalist") == [
+        ("Real-time Translation", 1.0), ("Log File Analysis", 1.0), ("Incident Digest", 0.67),
+    ]
+    assert matches(client, "translator", min_score=0.6) == [("Real-time Translation", 1.0)]
+
+    assert client.patch(f"/api/jobs/{board[0]}", json={"status": "closed"}, headers=ADMIN).status_code == 200
+    assert matches(client, "log-agent") == [("Incident Digest", 0.67)]
+    open_jobs = client.get("/api/jobs", params={"limit": 1}).json()
+    assert [job["title"] for job in open_jobs["items"]] == ["Incident Digest"]
+    assert client.get("/api/jobs", params={"before": open_jobs["next_before"]}).json()["next_before"] is None
+    assert client.get("/api/jobs/match", params={"entity": "nobody"}).status_code == 404
+
+
+def test_candidates_for_job(client, board, db_session, monkeypatch):
+    """Test entity ranking for a job and pick-up of changed entities."""
+    def candidates(job_id):
+        response = client.get(f"/api/jobs/{job_id}/candidates")
+        assert response.status_code == 200
+        return [(c["id"], round(c["score"], 2)) for c in response.json()]
+
+    assert candidates(board[2]) == [("log-agent", 0.67), ("generalist", 0.67)]
+    assert candidates(board[1]) == [("translator", 1.0), ("generalist", 1.0)]
+
+    monkeypatch.setattr(get_match_index(), "interval", 0.0)
+    entity = db_session.get(Entity, "translator")
+    entity.capabilities = ["alerting"]
+    db_session.commit()
+    assert candidates(board[2])[-1] == ("translator", 0.33)
+    assert candidates(board[1]) == [("generalist", 1.0), ("translator", 0.5)]
+
+    db_session.delete(db_session.get(Entity, "generalist"))
+    db_session.commit()
+    assert [uid for uid, _ in candidates(board[1])] == ["translator"]
+    assert client.get("/api/jobs/999/candidates").status_code == 404
+
+
+def test_refresh_does_not_block_matching(client, board, db_session, monkeypatch):
+    """Test that requests keep matching while another one refreshes."""
+    index = get_match_index()
+    assert matches(client, "log-agent") == [("Log File Analysis", 1.0), ("Incident Digest", 0.67)]
+    monkeypatch.setattr(index, "interval", 0.0)
+    with index._refreshing:
+        assert [m.key for m in index.jobs_for(db_session, match_tags(["translation"], []), 5)] == [board[1]]
+    assert matches(client, "translator") == [("Real-time Translation", 1.0)]
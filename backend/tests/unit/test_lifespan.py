@@ -0,0 +1,106 @@
+"""Unit Tests for Lifespan Resource Management.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+import asyncio
+import os
+import signal
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+
+from app.core.lifespan import AppResources, InFlightMiddleware, Lifecycle
+
+
+def test_drain_waits_for_in_flight_requests():
+    """Test that draining returns once in-flight requests finish, or times out."""
+    lifecycle = Lifecycle()
+    lifecycle.in_flight = 1
+
+    async def finish_later():
+        await asyncio.sleep(0.1)
+        lifecycle.in_flight = 0
+
+    async def scenario():
+        finisher = asyncio.create_task(finish_later())
+        drained = await lifecycle.drain(timeout=2.0)
+        await finisher
+        return drained
+
+    assert asyncio.run(scenario()) is True
+    lifecycle.in_flight = 1
+    assert asyncio.run(lifecycle.drain(timeout=0.1)) is False
+
+
+def test_sigterm_starts_draining_before_the_server_handler():
+    """Test that SIGTERM marks the worker draining, then runs the server's handler."""
+    lifecycle = Lifecycle()
+    seen = []
+    originals = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+    signal.signal(signal.SIGTERM, lambda signum, frame: seen.append(lifecycle.draining))
+    try:
+        lifecycle.install_signal_handlers()
+        os.kill(os.getpid(), signal.SIGTERM)
+    finally:
+        for signum, handler in originals.items():
+            signal.signal(signum, handler)
+    assert seen == [True]
+    assert lifecycle.draining
+
+
+def test_lifespan_disposes_engine_and_rejects_requests_while_draining():
+    """Test that shutdown disposes the engine and new requests get 503."""
+    engine = create_engine("sqlite://")
+    disposed = []
+    event.listen(engine, "engine_disposed", lambda e: disposed.append(e))
+    lifecycle = Lifecycle()
+    resources = AppResources(engine, lifecycle, warmup=False, drain_timeout=1.0)
+    cleaned = []
+    resources.add_cleanup(lambda: cleaned.append(True))
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await resources.startup(app)
+        yield
+        await resources.shutdown()
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(InFlightMiddleware, lifecycle=lifecycle)
+
+    @app.get("/ping")
+    def ping():
+        return {"in_flight": lifecycle.in_flight}
+
+    with TestClient(app) as client:
+        assert client.get("/ping").json() == {"in_flight": 1}
+        lifecycle.draining = True
+        response = client.get("/ping")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["connection"] == "close"
+
+    assert disposed == [engine]
+    assert cleaned == [True]
+    assert lifecycle.in_flight == 0
+
+
+def test_readiness_fails_while_draining(client):
+    """Test that /health/ready reports 503 once shutdown has begun."""
+    from app.core.health import ReadinessProbe, get_readiness_probe
+    from app.core.lifespan import get_lifecycle
+    from tests.conftest import engine
+
+    draining = Lifecycle()
+    draining.draining = True
+    probe = ReadinessProbe(engine, cache_seconds=0, pool_saturation=0.9)
+    client.app.dependency_overrides[get_readiness_probe] = lambda: probe
+    client.app.dependency_overrides[get_lifecycle] = lambda: draining
+    response = client.get("/health/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["checks"]["lifecycle"]["status"] == "fail"
@@ -0,0 +1,72 @@
+"""Unit Tests for Entity Manifest Storage.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db.synthetic import seed_synthetic_catalog
+from app.models.entity import Entity, EntityManifest, manifest_hash
+from tests.conftest import engine
+
+MCP = {"endpoint": "https://example.com/mcp", "tools": [{"name": "query"}]}
+
+
+def _add_entity(db_session, **manifests):
+    now = datetime.now(timezone.utc)
+    entity = Entity(uid="mcp-1", type="mcp_server", name="Query Server", version="1.0.0",
+                    protocols=list(manifests), manifests=manifests,
+                    created_at=now, updated_at=now)
+    db_session.add(entity)
+    db_session.commit()
+    return entity
+
+
+def test_manifest_hash_is_canonical():
+    """Test that key order does not change the hash."""
+    assert manifest_hash({"a": 1, "b": [1, 2]}) == manifest_hash({"b": [1, 2], "a": 1})
+    assert manifest_hash({"a": 1}) != manifest_hash({"a": 2})
+
+
+def test_setter_only_rewrites_changed_manifests(db_session):
+    """Test add, unchanged, changed and removed manifests."""
+    entity = _add_entity(db_session, **{"mcp@0.1": MCP, "a2a@1.0": {"card": 1}})
+    unchanged = next(row for row in entity.manifest_rows if row.protocol == "mcp@0.1")
+
+    entity.manifests = {"mcp@0.1": dict(MCP), "openapi@3.1": {"paths": {}}}
+    assert unchanged not in db_session.dirty
+    db_session.commit()
+
+    rows = db_session.query(EntityManifest).order_by(EntityManifest.protocol).all()
+    assert [row.protocol for row in rows] == ["mcp@0.1", "openapi@3.1"]
+    assert rows[0].hash == manifest_hash(MCP)
+
+
+def test_manifest_endpoint_and_entity_detail(client, db_session):
+    """Test the per-protocol endpoint, ETag revalidation and the full profile."""
+    _add_entity(db_session, **{"mcp@0.1": MCP})
+
+    response = client.get("/api/entities/mcp-1/manifests/mcp@0.1")
+    assert response.status_code == 200 and response.json() == MCP
+    etag = response.headers["etag"]
+    assert etag == f'"{manifest_hash(MCP)}"'
+    assert client.get(
+        "/api/entities/mcp-1/manifests/mcp@0.1", headers={"If-None-Match": etag}
+    ).status_code == 304
+    assert client.get("/api/entities/mcp-1/manifests/a2a@1.0").status_code == 404
+
+    assert client.get("/api/entities/mcp-1").json()["manifests"] == {"mcp@0.1": MCP}
+
+
+@pytest.mark.max_queries(3)
+def test_export_loads_manifests_per_batch(client, db_session):
+    """Test that the export eager-loads manifests instead of one query per entity."""
+    seed_synthetic_catalog(engine, size=40, seed=5)
+    rows = client.get("/api/entities/export").text.splitlines()
+    assert len(rows) == 40
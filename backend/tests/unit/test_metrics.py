@@ -0,0 +1,70 @@
+"""Unit Tests for Metrics Exposition.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+import json
+import os
+
+from fastapi import status
+
+from app.core.metrics import REGISTRY, Counter, Histogram, MetricsRegistry
+
+
+def test_metrics_endpoint_exposes_request_and_process_metrics(client):
+    """Test that /metrics reports route latency, query counts and process stats."""
+    client.get("/api/entities")
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/entities",status="200"}' in body
+    assert 'db_queries_per_request_bucket{route="/api/entities",le="1"}' in body
+    assert 'cache_requests_total{cache="sql_compiled"' in body
+    assert "process_resident_memory_bytes" in body
+    assert "guest_sessions_live" in body
+    assert "# TYPE guest_sessions_created_total counter" in body
+    assert "# TYPE python_gc_collections_total counter" in body
+
+
+def test_multiprocess_snapshots_are_summed(tmp_path):
+    """Test that counters and histograms from several workers are merged."""
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("jobs_total", "Jobs", ("kind",)))
+    histogram = registry.register(Histogram("work_seconds", "Work", buckets=(1.0,)))
+
+    # Simulate an exited worker that left a snapshot behind
+    counter.inc(2, "a")
+    histogram.observe(0.5)
+    snapshot = registry.snapshot()
+    snapshot["pid"] = 999_999_999
+    (tmp_path / "metrics-999999999.json").write_text(json.dumps(snapshot))
+
+    counter.reset()
+    histogram.reset()
+    counter.inc(3, "a")
+    histogram.observe(2.0)
+
+    body = registry.render(str(tmp_path))
+    assert 'jobs_total{kind="a"} 5' in body
+    assert 'work_seconds_bucket{le="1"} 1' in body
+    assert 'work_seconds_bucket{le="+Inf"} 2' in body
+    assert "work_seconds_count 2" in body
+    assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
+
+    # The exited worker's snapshot was folded into the retired totals
+    assert not (tmp_path / "metrics-999999999.json").exists()
+    assert (tmp_path / "metrics-retired.json").exists()
+    counter.inc(1, "a")
+    assert 'jobs_total{kind="a"} 6' in registry.render(str(tmp_path))
+
+
+def test_process_cpu_is_a_counter():
+    """Test that CPU time is exposed as a Prometheus counter."""
+    body = REGISTRY.render()
+    assert "# TYPE process_cpu_seconds_total counter" in body
@@ -0,0 +1,99 @@
+"""Unit Tests for On-Demand Request Profiling.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiling import ProfileStore, ProfilingMiddleware, RequestProfile, get_profile_store
+from app.main import app
+
+
+def _busy_leaf(profile):
+    profile.sample()
+
+
+def test_profile_renders_collapsed_and_speedscope():
+    """Test that samples of registered threads are exported in both formats."""
+    profile = RequestProfile("GET", "/api/entities", interval_ms=5.0)
+    profile.enter_thread()
+    for _ in range(3):
+        _busy_leaf(profile)
+    profile.exit_thread()
+    profile.sample()  # Thread no longer registered: ignored
+
+    assert profile.samples == 3
+    line = profile.collapsed().splitlines()[0]
+    assert line.endswith(" 3")
+    assert "_busy_leaf (" in line
+
+    doc = profile.speedscope()
+    sampled = doc["profiles"][0]
+    assert sampled["type"] == "sampled"
+    assert sampled["weights"] == [15.0]
+    names = [doc["shared"]["frames"][i]["name"] for i in sampled["samples"][0]]
+    assert names[-1] == "sample" and "_busy_leaf" in names
+
+
+def test_middleware_requires_admin_token(client, monkeypatch):
+    """Test that X-Profile needs the admin token and results reach the admin API."""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    store = get_profile_store()
+    store.clear()
+    profiled = TestClient(
+        ProfilingMiddleware(app, interval_ms=1.0, admin_token="s3cret", store=store)
+    )
+
+    response = profiled.get("/api/entities", headers={"X-Profile": "1"})
+    assert response.status_code == status.HTTP_200_OK
+    assert "x-profile-id" not in response.headers
+
+    response = profiled.get(
+        "/api/entities", headers={"X-Profile": "1", "X-Admin-Token": "s3cret"}
+    )
+    profile_id = response.headers["x-profile-id"]
+    assert store.get(profile_id).route == "/api/entities"
+
+    admin = {"X-Admin-Token": "s3cret"}
+    listed = client.get("/api/admin/profiles", headers=admin).json()
+    assert [p["profile_id"] for p in listed] == [profile_id]
+    collapsed = client.get(
+        f"/api/admin/profiles/{profile_id}", params={"format": "collapsed"}, headers=admin
+    )
+    assert collapsed.headers["content-type"].startswith("text/plain")
+    assert client.get("/api/admin/profiles/missing", headers=admin).status_code == 404
+    store.clear()
+
+
+def test_store_evicts_oldest(tmp_path):
+    """Test that the profile store is bounded."""
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+    profiles = [RequestProfile("GET", f"/{i}", 5.0) for i in range(3)]
+    for profile in profiles:
+        store.add(profile)
+    assert [p.path for p in store.list()] == ["/2", "/1"]
+    assert store.get(profiles[0].profile_id) is None
+
+
+def test_store_is_shared_between_workers(tmp_path):
+    """Test that a profile captured by one worker is served by another."""
+    captured, other = ProfileStore(str(tmp_path), 5), ProfileStore(str(tmp_path), 5)
+    profile = RequestProfile("GET", "/api/entities", interval_ms=5.0)
+    profile.enter_thread()
+    _busy_leaf(profile)
+    profile.exit_thread()
+    profile.route, profile.status = "/api/entities", 200
+    captured.add(profile)
+
+    loaded = other.get(profile.profile_id)
+    assert loaded.route == "/api/entities" and loaded.status == 200
+    assert loaded.collapsed() == profile.collapsed()
+    assert other.get("../etc") is None
+    other.clear()
+    assert captured.list() == []
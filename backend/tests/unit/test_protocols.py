@@ -0,0 +1,92 @@
+"""Unit Tests for Protocol Compatibility Matching.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db.protocols import get_protocol_matrix_cache
+from app.models.entity import Entity, EntityProtocol
+
+CATALOG = {
+    "mcp-old": ["mcp@0.1"],
+    "mcp-new": ["MCP@0.2", "a2a@1.0"],
+    "mcp-both": ["mcp@0.1.3", "mcp@0.2"],
+    "a2a-beta": ["a2a@0.9"],
+    "bare": ["grpc"],
+}
+
+
+@pytest.fixture
+def catalog(db_session):
+    """Entities with assorted protocol tags, and a cold matrix cache."""
+    now = datetime.now(timezone.utc)
+    db_session.add_all(
+        Entity(uid=uid, type="mcp_server", name=uid, version="1.0.0", protocols=protocols,
+               quality_score=float(i), created_at=now, updated_at=now)
+        for i, (uid, protocols) in enumerate(CATALOG.items())
+    )
+    db_session.commit()
+    get_protocol_matrix_cache().clear()
+    yield db_session
+    get_protocol_matrix_cache().clear()
+
+
+def test_protocol_rows_follow_protocols(catalog):
+    """Test that tags are parsed on write and kept in sync on update."""
+    entity = catalog.get(Entity, "mcp-new")
+    assert sorted((r.name, r.version) for r in entity.protocol_rows) == [("a2a", "1.0"), ("mcp", "0.2")]
+    entity.protocols = ["a2a@1.1"]
+    catalog.commit()
+    assert [r.tag for r in catalog.query(EntityProtocol).filter_by(uid="mcp-new")] == ["a2a@1.1"]
+
+
+def test_compatible_endpoint(client, catalog):
+    """Test version ranges, case-insensitive families and bad bounds."""
+    def uids(**params):
+        response = client.get("/api/entities/compatible", params=params)
+        assert response.status_code == 200
+        return [item["id"] for item in response.json()]
+
+    assert uids(protocol="mcp") == ["mcp-both", "mcp-new", "mcp-old"]
+    assert uids(protocol="mcp", min="0.2") == ["mcp-both", "mcp-new"]
+    assert uids(protocol="mcp", min="0.1", max="0.2") == ["mcp-both", "mcp-old"]
+    assert uids(protocol="A2A", min="1.0") == ["mcp-new"]
+    assert uids(protocol="mcp", min="5.0") == []
+    assert uids(protocol="grpc") == ["bare"]
+    assert uids(protocol="grpc", min="1") == []
+    assert client.get("/api/entities/compatible", params={"protocol": "mcp", "min": "x"}).status_code == 422
+
+
+def test_compatibility_matrix(client, catalog):
+    """Test versions, counts and caret compatibility per family."""
+    matrix = client.get("/api/entities/compatible/matrix", params={"protocol": "mcp"}).json()
+    assert matrix == {
+        "protocol": "mcp",
+        "versions": [
+            {"version": "0.1", "entities": 1, "compatible": ["0.1", "0.1.3"]},
+            {"version": "0.1.3", "entities": 1, "compatible": ["0.1.3"]},
+            {"version": "0.2", "entities": 2, "compatible": ["0.2"]},
+        ],
+    }
+    a2a = client.get("/api/entities/compatible/matrix", params={"protocol": "a2a"}).json()
+    assert [v["compatible"] for v in a2a["versions"]] == [["0.9"], ["1.0"]]
+
+
+def test_new_protocols_are_visible_immediately(client, catalog):
+    """Test that committed protocol rows refresh the cached matrix and ranges."""
+    assert client.get("/api/entities/compatible/matrix", params={"protocol": "mcp"}).json()["versions"]
+    assert client.get("/api/entities/compatible", params={"protocol": "mcp", "min": "1.0"}).json() == []
+
+    catalog.get(Entity, "bare").protocols = ["mcp@1.2"]
+    catalog.commit()
+    matrix = client.get("/api/entities/compatible/matrix", params={"protocol": "mcp"}).json()
+    assert matrix["versions"][-1] == {"version": "1.2", "entities": 1, "compatible": ["1.2"]}
+    response = client.get("/api/entities/compatible", params={"protocol": "mcp", "min": "1.0"})
+    assert [item["id"] for item in response.json()] == ["bare"]
@@ -0,0 +1,56 @@
+"""Unit Tests for the Pre-Built Entity Query Templates.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from datetime import datetime, timezone
+
+from fastapi import status
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+from app.db.queries import LIST_TEMPLATES, list_entities_query
+from app.models.entity import Entity
+
+
+def test_each_filter_combination_reuses_one_template():
+    """Test that requests with different values share the same statement object."""
+    a, params_a = list_entities_query("data", "agent", None, 20, 0)
+    b, params_b = list_entities_query("graph", "tool", None, 50, 100)
+    assert a is b
+    assert params_b == {"limit": 50, "offset": 100, "pattern": "%graph%", "type": "tool"}
+    assert len({id(stmt) for stmt in LIST_TEMPLATES.values()}) == 16
+
+
+def test_list_view_selects_only_list_columns():
+    """Test that heavy columns are not loaded for the list view."""
+    stmt, _ = list_entities_query(None, None, None, 20, 0)
+    names = {column.name for column in stmt.selected_columns}
+    assert "description" not in names and "manifests" not in names
+    assert {"uid", "name", "quality_score"} <= names
+
+
+def test_repeated_list_requests_hit_compiled_cache(client, db_session, monkeypatch):
+    """Test that list requests after the first are compiled-cache hits."""
+    now = datetime.now(timezone.utc)
+    db_session.add(Entity(uid="agent-1", type="agent", name="Data Agent", version="1.0.0",
+                          summary="data", protocols=["mcp@0.1"], quality_score=1.0,
+                          created_at=now, updated_at=now))
+    db_session.commit()
+    params = {"q": "data", "type": "agent", "protocol": "mcp"}
+    assert client.get("/api/entities", params=params).json()[0]["id"] == "agent-1"
+
+    hits_before = CACHE_REQUESTS.values().get(("sql_compiled", "hit"), 0)
+    misses_before = CACHE_REQUESTS.values().get(("sql_compiled", "miss"), 0)
+    client.get("/api/entities", params={**params, "q": "agent", "limit": 5, "offset": 1})
+    assert CACHE_REQUESTS.values().get(("sql_compiled", "hit"), 0) == hits_before + 1
+    assert CACHE_REQUESTS.values().get(("sql_compiled", "miss"), 0) == misses_before
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    stats = client.get("/api/admin/sql-cache", headers={"X-Admin-Token": "s3cret"})
+    assert stats.status_code == status.HTTP_200_OK
+    assert stats.json()["templates"] == 16
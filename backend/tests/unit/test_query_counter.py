@@ -0,0 +1,74 @@
+"""Unit Tests for the Query-Count and N+1 Detection Harness.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+
+from app.core.timing import RequestTimings, _current
+from app.models.entity import Entity
+from tests.conftest import engine
+from tests.query_counter import QueryCounter
+
+
+def _add_entities(db_session, count):
+    now = datetime.now(timezone.utc)
+    db_session.add_all(
+        Entity(uid=f"agent-{i}", type="agent", name=f"Agent {i}", version="1.0.0",
+               quality_score=float(i), created_at=now, updated_at=now)
+        for i in range(count)
+    )
+    db_session.commit()
+
+
+@pytest.mark.max_queries(1)
+def test_list_entities_is_a_single_query(client, db_session, queries):
+    """Test that listing entities issues one statement regardless of page size."""
+    _add_entities(db_session, 10)
+    queries.reset()
+    response = client.get("/api/entities?limit=10")
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 10
+    assert [r.route for r in queries.requests] == ["/api/entities"]
+
+
+def test_assert_max_reports_statements(db_session):
+    """Test that exceeding the bound fails with the offending SQL listed."""
+    with QueryCounter(engine) as queries:
+        db_session.execute(select(Entity)).all()
+        db_session.execute(select(Entity.uid)).all()
+    assert queries.count == 2
+    with pytest.raises(AssertionError, match="expected at most 1 queries, got 2"):
+        queries.assert_max(1)
+
+
+def test_detects_repeated_fingerprint_within_request(db_session):
+    """Test that per-row lookups within one request are flagged as N+1."""
+    timings = RequestTimings(0.0)
+    timings.route = "/api/fake"
+    with QueryCounter(engine) as queries:
+        token = _current.set(timings)
+        try:
+            for i in range(4):
+                db_session.execute(select(Entity).where(Entity.uid == f"agent-{i}")).all()
+        finally:
+            _current.reset(token)
+        # Outside any request: not attributed, never flagged
+        for i in range(4):
+            db_session.execute(select(Entity).where(Entity.uid == f"agent-{i}")).all()
+
+    suspects = queries.n_plus_one()
+    assert len(suspects) == 1
+    route, sql, repetitions = suspects[0]
+    assert (route, repetitions) == ("/api/fake", 4)
+    assert "WHERE entity.uid = ?" in sql
+    with pytest.raises(AssertionError, match="N\\+1"):
+        queries.assert_no_n_plus_one()
@@ -0,0 +1,118 @@
+"""Unit Tests for Token-Bucket Rate Limiting.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+import asyncio
+import threading
+
+from fastapi import status
+
+from app.core.circuit import CircuitBreaker
+from app.core.config import settings
+from app.core.ratelimit import InMemoryRateLimitBackend, RateLimiter, RateLimitRule, RedisRateLimitBackend
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_allows_burst_then_refills():
+    """Test that a bucket allows `burst` hits and refills at `rate`."""
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(clock=clock)
+    rule = RateLimitRule(rate=1.0, burst=3)
+
+    assert [backend.hit("k", rule)[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = backend.hit("k", rule)
+    assert not allowed
+    assert retry_after > 0
+
+    clock.now += 1.0
+    assert backend.hit("k", rule)[0]
+
+
+def test_idle_buckets_are_evicted():
+    """Test that fully refilled buckets are dropped on the next sweep."""
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(sweep_interval=10.0, clock=clock)
+    rule = RateLimitRule(rate=1.0, burst=2)
+
+    backend.hit("a", rule)
+    backend.hit("b", rule)
+    assert len(backend) == 2
+
+    clock.now += 11.0
+    backend.hit("c", rule)
+    assert len(backend) == 1
+
+
+def test_blocking_backend_runs_off_the_event_loop():
+    """Test that async hits on a network backend run in a worker thread."""
+    class SlowBackend(InMemoryRateLimitBackend):
+        blocking = True
+
+        def hit(self, key, rule):
+            self.thread = threading.current_thread()
+            return super().hit(key, rule)
+
+    backend = SlowBackend()
+    limiter = RateLimiter(backend)
+    assert asyncio.run(limiter.ahit("k", RateLimitRule(rate=1.0, burst=1))) == (True, 0.0)
+    assert backend.thread is not threading.main_thread()
+
+
+def test_redis_outage_opens_the_circuit():
+    """Test that an unreachable Redis is skipped until a trial call succeeds."""
+    class FlakyRedis:
+        calls = 0
+        down = True
+
+        def register_script(self, script):
+            def run(keys, args):
+                self.calls += 1
+                if self.down:
+                    raise ConnectionError("connection refused")
+                return [1, "0"]
+            return run
+
+    clock, client = FakeClock(), FlakyRedis()
+    circuit = CircuitBreaker("redis", base_delay=1.0, max_delay=4.0, clock=clock)
+    backend = RedisRateLimitBackend("redis://", InMemoryRateLimitBackend(clock=clock), client=client, circuit=circuit)
+    rule = RateLimitRule(rate=1.0, burst=100)
+
+    assert all(backend.hit("k", rule)[0] for _ in range(10))
+    assert client.calls == 1 and circuit.is_open
+
+    clock.now += 1.0
+    backend.hit("k", rule)
+    assert client.calls == 2
+    clock.now += 1.0
+    backend.hit("k", rule)
+    assert client.calls == 2  # Cool-down doubled to 2s
+
+    client.down = False
+    clock.now += 1.0
+    backend.hit("k", rule)
+    backend.hit("k", rule)
+    assert client.calls == 4 and not circuit.is_open
+
+
+def test_guest_route_is_throttled(client):
+    """Test that the guest endpoint returns 429 once the IP burst is spent."""
+    codes = [
+        client.post("/api/auth/guest", json={}).status_code
+        for _ in range(settings.RATE_LIMIT_AUTH_BURST + 1)
+    ]
+    assert codes[:-1] == [status.HTTP_200_OK] * settings.RATE_LIMIT_AUTH_BURST
+    assert codes[-1] == status.HTTP_429_TOO_MANY_REQUESTS
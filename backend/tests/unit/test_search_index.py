@@ -0,0 +1,90 @@
+"""Unit Tests for the In-Process Search Index.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from app.db import search_index as search_index_module
+from app.db.queries import list_entities_query
+from app.db.search_index import SearchIndex
+from app.db.synthetic import seed_synthetic_catalog
+from app.models.entity import Entity
+from tests.conftest import TestingSessionLocal, engine
+
+QUERIES = [
+    (None, None, None),
+    ("data", None, None),
+    ("ata an", None, None),
+    ("-", None, None),
+    (None, "tool", None),
+    (None, None, "mcp"),
+    (None, None, '", "'),
+    ("a", "agent", "a2a"),
+    ("no-such-term", None, None),
+    (None, "unknown", None),
+]
+
+
+def assert_matches_sql(index, session):
+    for q, type, protocol in QUERIES:
+        for limit, offset in [(20, 0), (7, 13), (10, 290)]:
+            stmt, params = list_entities_query(q, type, protocol, limit, offset)
+            expected = [row.uid for row in session.execute(stmt, params)]
+            got = [row.uid for row in index.list_entities(q, type, protocol, limit, offset)]
+            assert got == expected, (q, type, protocol, limit, offset)
+
+
+def test_index_matches_sql_results(db_session):
+    """Test that every filter combination returns the same page as SQL."""
+    seed_synthetic_catalog(engine, size=300, seed=11)
+    index = SearchIndex(engine)
+    assert index.build()
+    assert_matches_sql(index, db_session)
+
+
+def test_index_follows_committed_writes(db_session, monkeypatch):
+    """Test incremental updates, deletes, rollbacks and compaction."""
+    seed_synthetic_catalog(engine, size=300, seed=5)
+    index = SearchIndex(engine)
+    index.start()
+    try:
+        top = index.list_entities(None, None, None, 1, 0)[0]
+        entity = db_session.query(Entity).order_by(Entity.quality_score).first()
+        entity.name = "Zebra Telemetry Agent"
+        entity.quality_score = top.quality_score + 1
+        db_session.commit()
+        assert index.list_entities(None, None, None, 1, 0)[0].uid == entity.uid
+        assert [r.uid for r in index.list_entities("zebra tele", None, None, 5, 0)] == [entity.uid]
+
+        db_session.delete(entity)
+        db_session.commit()
+        assert index.list_entities("zebra", None, None, 5, 0) == []
+
+        other = TestingSessionLocal()
+        victim = other.query(Entity).first()
+        other.delete(victim)
+        other.flush()
+        other.rollback()
+        other.close()
+        assert_matches_sql(index, db_session)
+
+        # Enough writes fold the overflow list back into a new segment
+        monkeypatch.setattr(search_index_module, "COMPACT_MIN", 3)
+        for entity in db_session.query(Entity).limit(20):
+            entity.quality_score = 100.0 - entity.quality_score
+        db_session.commit()
+        assert len(index._state.overflow) <= 3
+        assert_matches_sql(index, db_session)
+    finally:
+        index.stop()
+
+
+def test_index_refuses_large_catalogs(db_session):
+    """Test that catalogs above the limit are left to SQL."""
+    seed_synthetic_catalog(engine, size=20, seed=1)
+    index = SearchIndex(engine, max_entities=10)
+    assert not index.build()
+    assert index.list_entities(None, None, None, 5, 0) is None
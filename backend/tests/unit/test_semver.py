@@ -0,0 +1,62 @@
+"""Unit Tests for Semantic Version Parsing and Version Queries.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.semver import UNPARSED, parse_range, parse_version
+from app.models.entity import Entity
+
+# SemVer 2.0 precedence example, lowest first
+PRECEDENCE = [
+    "1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-alpha.beta", "1.0.0-beta",
+    "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0", "1.2.0", "1.10.0", "2.0.0",
+]
+
+
+def test_parsed_versions_sort_by_precedence():
+    """Test that component tuples order versions as SemVer does."""
+    parsed = [parse_version(v) for v in PRECEDENCE]
+    assert parsed == sorted(parsed)
+    assert parse_version("v2") == parse_version("2.0.0+build.7")
+    assert parse_version("latest") is None
+    assert parse_range(">=2.0, <3") == [(">=", parse_version("2.0.0")), ("<", parse_version("3"))]
+    with pytest.raises(ValueError):
+        parse_range(">=two")
+
+
+def test_version_filter_and_sort(client, db_session):
+    """Test range filters and version order through the list endpoint."""
+    now = datetime.now(timezone.utc)
+    versions = ["1.9.0", "2.0.0-rc.1", "2.0.0", "2.10.1", "2.2.0", "3.0.0", "nightly"]
+    db_session.add_all(
+        Entity(uid=f"tool-{i}", type="tool", name=f"Tool {i}", version=version,
+               created_at=now, updated_at=now)
+        for i, version in enumerate(versions)
+    )
+    db_session.commit()
+    assert db_session.get(Entity, "tool-6").version_major == UNPARSED
+
+    def listed(**params):
+        response = client.get("/api/entities", params={"sort": "version", **params})
+        assert response.status_code == 200
+        return [item["version"] for item in response.json()]
+
+    assert listed() == ["3.0.0", "2.10.1", "2.2.0", "2.0.0", "2.0.0-rc.1", "1.9.0", "nightly"]
+    assert listed(version=">=2.0,<3") == ["2.10.1", "2.2.0", "2.0.0"]
+    assert listed(version="<2") == ["2.0.0-rc.1", "1.9.0"]
+    assert listed(version="!=2.2.0,>2.0.0") == ["3.0.0", "2.10.1"]
+    assert client.get("/api/entities", params={"version": "~>1"}).status_code == 422
+
+    # Changing the version re-parses it
+    entity = db_session.get(Entity, "tool-0")
+    entity.version = "4.0.0"
+    db_session.commit()
+    assert listed(limit=1) == ["4.0.0"]
@@ -0,0 +1,64 @@
+"""Unit Tests for Production Server Sizing.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+import pytest
+
+from app.core.config import Settings
+from app.server import cgroup_cpu_limit, plan_server, pool_settings, worker_count
+
+
+def test_cgroup_cpu_limit_reads_v2_and_v1_quotas(tmp_path):
+    """Test cgroup v2 cpu.max, v1 CFS quota and unlimited cgroups."""
+    v2 = tmp_path / "v2"
+    v2.mkdir()
+    (v2 / "cpu.max").write_text("150000 100000\n")
+    assert cgroup_cpu_limit(str(v2)) == 1.5
+    (v2 / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_limit(str(v2)) is None
+
+    v1 = tmp_path / "v1" / "cpu,cpuacct"
+    v1.mkdir(parents=True)
+    (v1 / "cpu.cfs_quota_us").write_text("200000")
+    (v1 / "cpu.cfs_period_us").write_text("100000")
+    assert cgroup_cpu_limit(str(tmp_path / "v1")) == 2.0
+    (v1 / "cpu.cfs_quota_us").write_text("-1")
+    assert cgroup_cpu_limit(str(tmp_path / "v1")) is None
+
+    assert cgroup_cpu_limit(str(tmp_path / "missing")) is None
+
+
+def test_worker_count_bounds():
+    """Test that fractional quotas round down but never below one worker."""
+    assert worker_count(0.5) == 1
+    assert worker_count(2.9) == 2
+    assert worker_count(4, per_cpu=2.0) == 8
+    assert worker_count(64, maximum=16) == 16
+
+
+def test_pool_settings_fit_connection_budget():
+    """Test that overflow is trimmed before persistent connections."""
+    assert pool_settings(4, 5, 10, budget=None) == (5, 10)
+    assert pool_settings(4, 5, 10, budget=100) == (5, 10)
+    assert pool_settings(8, 5, 10, budget=50) == (5, 1)
+    assert pool_settings(8, 5, 10, budget=20) == (2, 0)
+    with pytest.raises(ValueError):
+        pool_settings(8, 5, 10, budget=4)
+
+
+def test_plan_server_uses_cgroup_limit_and_budget(tmp_path):
+    """Test the full plan for a 2-CPU container with a 30-connection budget."""
+    (tmp_path / "cpu.max").write_text("200000 100000")
+    config = Settings(WORKERS_PER_CPU=2.0, DB_CONNECTION_BUDGET=30, WORKERS="")
+    plan = plan_server(config, cgroup_root=str(tmp_path))
+    assert plan.cpus <= 2.0
+    assert plan.workers == int(plan.cpus * 2)
+    assert plan.max_connections <= 30
+
+    pinned = plan_server(Settings(WORKERS=3), cgroup_root=str(tmp_path))
+    assert pinned.workers == 3 and (pinned.pool_size, pinned.max_overflow) == (5, 10)
@@ -0,0 +1,45 @@
+"""Unit Tests for the Slow-Query Log.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from fastapi import status
+
+from app.core.config import settings
+from app.core.slow_query import get_slow_query_log, normalize_sql, redact_parameters
+
+
+def test_normalize_sql_collapses_literals_and_binds():
+    """Test that statements differing only in values share a fingerprint."""
+    a = normalize_sql("SELECT * FROM entity WHERE type = 'agent' AND uid IN (1, 2, 3) LIMIT 10")
+    b = normalize_sql("SELECT *  FROM entity\nWHERE type = %(type_1)s AND uid IN (?, ?) LIMIT ?")
+    assert a == b == "SELECT * FROM entity WHERE type = ? AND uid IN (?...) LIMIT ?"
+
+
+def test_redact_parameters_hides_values():
+    """Test that parameter values are replaced by type/length markers."""
+    assert redact_parameters({"q": "%secret%", "n": 5}) == {"q": "<str:8>", "n": "<int>"}
+    assert redact_parameters([[1], [2]], executemany=True) == "<2 parameter sets>"
+
+
+def test_admin_endpoint_reports_slow_queries(client, monkeypatch):
+    """Test that slow statements are attributed to routes and exposed to admins."""
+    log = get_slow_query_log()
+    log.clear()
+    monkeypatch.setattr(log, "threshold_ms", 0.0)
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+
+    client.get("/api/entities", params={"q": "data", "type": "agent"})
+
+    assert client.get("/api/admin/slow-queries").status_code == status.HTTP_403_FORBIDDEN
+    response = client.get("/api/admin/slow-queries", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    entity_queries = [f for f in report["fingerprints"] if "FROM entity" in f["statement"]]
+    assert entity_queries
+    assert entity_queries[0]["routes"] == {"/api/entities": 1}
+    assert all("data" not in str(q["parameters"]) for q in report["recent"])
@@ -0,0 +1,112 @@
+"""Unit Tests for the Shared-Memory Catalog Snapshot.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+import time
+
+from sqlalchemy import event
+
+from app.db.queries import list_entities_query
+from app.db.snapshot import CatalogSnapshots
+from app.db.synthetic import seed_synthetic_catalog
+from app.models.entity import Entity
+from tests.conftest import engine
+
+
+def test_snapshot_matches_sql_results(db_session, tmp_path):
+    """Test that every filter combination returns the same page as SQL."""
+    seed_synthetic_catalog(engine, size=300, seed=7)
+    snapshot = CatalogSnapshots(engine, str(tmp_path)).publish()
+    assert snapshot.rows == 300
+
+    for q, type, protocol in [
+        (None, None, None),
+        ("data", None, None),
+        (None, "tool", None),
+        (None, None, "mcp"),
+        ("a", "agent", "a2a"),
+        ("no-such-term", None, None),
+        (None, "unknown", None),
+    ]:
+        for limit, offset in [(20, 0), (7, 13)]:
+            stmt, params = list_entities_query(q, type, protocol, limit, offset)
+            expected = [row.uid for row in db_session.execute(stmt, params)]
+            got = [row.uid for row in snapshot.list_entities(q, type, protocol, limit, offset)]
+            assert got == expected, (q, type, protocol, limit, offset)
+
+    row = snapshot.list_entities(None, None, None, 1, 0)[0]
+    entity = db_session.get(Entity, row.uid)
+    assert (row.name, row.capabilities, row.quality_score) == (
+        entity.name, entity.capabilities, entity.quality_score
+    )
+
+
+def test_followers_map_new_generations_published_by_leader(db_session, tmp_path):
+    """Test leader election, change detection and generation swap."""
+    seed_synthetic_catalog(engine, size=50, seed=1)
+    leader = CatalogSnapshots(engine, str(tmp_path))
+    follower = CatalogSnapshots(engine, str(tmp_path))
+    leader.refresh()
+    follower.refresh()
+    assert leader.is_leader and not follower.is_leader
+    old = follower.current()
+    assert old is not None and old.generation == 1
+
+    # Unchanged catalog: no new generation
+    leader.refresh()
+    assert leader.current().generation == 1
+
+    entity = db_session.query(Entity).first()
+    entity.name = "Renamed Snapshot Entity"
+    db_session.commit()
+    leader.refresh()
+    follower.refresh()
+    assert follower.current().generation == 2
+    renamed = follower.current().list_entities("renamed snapshot", None, None, 5, 0)
+    assert [row.uid for row in renamed] == [entity.uid]
+
+    # The previous generation stays readable for requests still holding it
+    assert old.list_entities(None, None, None, 5, 0)
+    leader.stop()
+    follower.stop()
+
+
+def test_local_writes_bypass_older_snapshots(db_session, tmp_path):
+    """Test read-your-writes: a committed change hides snapshots built before it."""
+    seed_synthetic_catalog(engine, size=20, seed=3)
+    snapshots = CatalogSnapshots(engine, str(tmp_path), interval=60.0)
+    snapshots.start()
+    try:
+        assert snapshots.current() is not None
+        entity = db_session.query(Entity).first()
+        entity.quality_score = 100.0
+        db_session.commit()
+        assert snapshots.current() is None
+
+        snapshots.refresh()
+        assert snapshots.current().list_entities(None, None, None, 1, 0)[0].uid == entity.uid
+    finally:
+        snapshots.stop()
+
+
+def test_writes_committed_during_a_build_are_not_counted_as_included(db_session, tmp_path):
+    """Test that built_at is taken before the snapshot reads any row."""
+    seed_synthetic_catalog(engine, size=20, seed=5)
+    snapshots = CatalogSnapshots(engine, str(tmp_path))
+
+    def commit_meanwhile(conn, cursor, statement, *args):
+        if "ORDER BY" in statement:
+            snapshots._written_at = time.time()
+
+    event.listen(engine, "before_cursor_execute", commit_meanwhile)
+    try:
+        snapshot = snapshots.publish()
+    finally:
+        event.remove(engine, "before_cursor_execute", commit_meanwhile)
+    assert snapshot.built_at < snapshots._written_at
+    assert snapshots.current() is None
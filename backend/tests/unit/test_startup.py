@@ -0,0 +1,35 @@
+"""Unit Tests for Start-Up Warm-Up.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from sqlalchemy import create_engine
+
+from app.core.metrics import CACHE_REQUESTS
+from app.core.startup import warm_up
+from app.main import app
+from tests.conftest import engine
+
+
+def test_warm_up_prebuilds_openapi_and_compiles_list_queries(db_session, monkeypatch):
+    """Test that warm-up fills the OpenAPI and compiled SQL caches."""
+    monkeypatch.setattr(app, "openapi_schema", None)
+    durations = warm_up(app, engine, connections=2)
+    assert set(durations) == {"openapi", "pool", "sql_cache"}
+    assert app.openapi_schema is not None
+
+    # A second warm-up compiles nothing new: all sixteen templates are cached
+    misses = CACHE_REQUESTS.values().get(("sql_compiled", "miss"), 0)
+    warm_up(app, engine, connections=1)
+    assert CACHE_REQUESTS.values().get(("sql_compiled", "miss"), 0) == misses
+
+
+def test_warm_up_tolerates_unreachable_database():
+    """Test that database failures are logged and skipped, not raised."""
+    broken = create_engine("sqlite:////nonexistent-dir/db.sqlite")
+    durations = warm_up(app, broken)
+    assert "openapi" in durations and "pool" not in durations and "sql_cache" not in durations
@@ -0,0 +1,51 @@
+"""Unit Tests for Request Timing Instrumentation.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from app.core.metrics import REQUEST_LATENCY
+from app.core.timing import parse_request_start
+
+
+def _timing_metrics(header: str) -> dict:
+    """Parse a Server-Timing header into {name: duration_ms}."""
+    metrics = {}
+    for part in header.split(","):
+        fields = part.strip().split(";")
+        durations = [f for f in fields[1:] if f.startswith("dur=")]
+        metrics[fields[0]] = float(durations[0][4:])
+    return metrics
+
+
+def test_server_timing_header_reports_db_time(client):
+    """Test that entity listing reports handler, db and serialization timings."""
+    response = client.get("/api/entities")
+    assert response.status_code == 200
+
+    header = response.headers["server-timing"]
+    metrics = _timing_metrics(header)
+    assert {"app", "handler", "db", "ser"} <= metrics.keys()
+    assert metrics["app"] >= metrics["handler"] >= metrics["db"] > 0
+    assert 'desc="1 queries"' in header
+
+
+def test_latency_histogram_uses_route_template(client):
+    """Test that latency is recorded per route template, not per raw path."""
+    REQUEST_LATENCY.reset()
+    client.get("/api/entities/does-not-exist")
+
+    series = REQUEST_LATENCY.series()
+    assert ("GET", "/api/entities/{uid}", "404") in series
+
+
+def test_parse_request_start_units():
+    """Test that X-Request-Start is accepted in s, ms and us."""
+    now = 1_700_000_010.0
+    assert parse_request_start("t=1700000000", now) == 10.0
+    assert parse_request_start("1700000000000", now) == 10.0
+    assert parse_request_start("t=1700000000000000", now) == 10.0
+    assert parse_request_start("garbage", now) == 0.0
@@ -0,0 +1,70 @@
+"""Unit Tests for Entity Version History.
+
+Author:
+    Ruslan Magana (ruslanmv.com)
+
+License:
+    Apache 2.0
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.versions import reconstruct
+from app.models.entity import Entity, EntityVersion
+
+
+def _release_history(db_session, releases):
+    """Create an entity and publish ``releases`` more versions of it."""
+    now = datetime.now(timezone.utc)
+    entity = Entity(uid="agent-1", type="agent", name="Data Agent", version="1.0.0",
+                    summary="v1.0.0", capabilities=["retrieval"], created_at=now, updated_at=now)
+    db_session.add(entity)
+    db_session.commit()
+    for minor in range(1, releases + 1):
+        entity.version = f"1.{minor}.0"
+        entity.summary = f"v1.{minor}.0"
+        if minor == 2:
+            entity.capabilities = ["retrieval", "reasoning"]
+        db_session.commit()
+    return entity
+
+
+def test_deltas_between_snapshots(db_session, monkeypatch):
+    """Test storage layout and reconstruction of every release."""
+    monkeypatch.setattr(settings, "VERSION_SNAPSHOT_INTERVAL", 3)
+    entity = _release_history(db_session, 6)
+
+    # Metadata-only edits do not create releases
+    entity.name = "Renamed Agent"
+    db_session.commit()
+
+    rows = db_session.scalars(select(EntityVersion).order_by(EntityVersion.seq)).all()
+    assert [row.snapshot for row in rows] == [True, False, False, True, False, False, True]
+    assert rows[1].data == {"version": "1.1.0", "summary": "v1.1.0"}
+
+    for seq in range(1, 8):
+        row, document = reconstruct(db_session, "agent-1", seq)
+        assert document["version"] == row.version == f"1.{seq - 1}.0"
+        assert document["summary"] == f"v1.{seq - 1}.0"
+        assert document["capabilities"] == (["retrieval"] if seq < 3 else ["retrieval", "reasoning"])
+    assert reconstruct(db_session, "agent-1", 8) is None
+
+
+def test_versions_endpoints(client, db_session):
+    """Test keyset pagination and the per-version endpoint."""
+    _release_history(db_session, 4)
+
+    first = client.get("/api/entities/agent-1/versions?limit=2").json()
+    assert [item["version"] for item in first["items"]] == ["1.4.0", "1.3.0"]
+    second = client.get(f"/api/entities/agent-1/versions?limit=2&before={first['next_before']}").json()
+    assert [item["version"] for item in second["items"]] == ["1.2.0", "1.1.0"]
+    last = client.get(f"/api/entities/agent-1/versions?limit=2&before={second['next_before']}").json()
+    assert [item["seq"] for item in last["items"]] == [1] and last["next_before"] is None
+
+    release = client.get("/api/entities/agent-1/versions/1.1.0").json()
+    assert release["summary"] == "v1.1.0" and release["capabilities"] == ["retrieval"]
+    assert client.get("/api/entities/agent-1/versions/9.9.9").status_code == 404
+    assert client.get("/api/entities/missing/versions").status_code == 404